@@ -0,0 +1,26 @@
+"""
+Performance benchmarks for jaxrts.
+
+The benchmarks evaluate every model registered in :py:mod:`jaxrts.models` for
+all the keys it is allowed for, on a set of energy grids and for plasmas with
+a different number of ion species. For each case, the time spent on lowering
+and compiling the evaluation is recorded separately from the steady-state run
+time, together with the memory required by the compiled executable.
+
+The results are written to a JSON report, which can be compared against the
+report of a previous release with :py:mod:`benchmarks.compare`.
+
+Examples
+--------
+Run the full suite and store the report::
+
+    python -m benchmarks -o report.json
+
+Only run the free-free models on the small grid::
+
+    python -m benchmarks --keys "free-free scattering" --grids small
+
+Compare two reports::
+
+    python -m benchmarks.compare old_report.json report.json
+"""
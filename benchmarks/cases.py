@@ -0,0 +1,176 @@
+"""
+Definition of the benchmark cases, i.e., the energy grids, the plasma states
+and the models which are evaluated.
+"""
+
+import inspect
+from dataclasses import dataclass
+
+from jax import numpy as jnp
+
+import jaxrts
+
+ureg = jaxrts.ureg
+
+#: Number of points of the :py:attr:`jaxrts.setup.Setup.measured_energy` for
+#: the different grid sizes.
+grid_sizes = {
+    "small": 64,
+    "medium": 512,
+    "large": 4096,
+}
+
+#: The ion species used for plasmas with 1, 2 and 4 components, together with
+#: their ionization and their partial mass density in g/cc.
+species = {
+    1: [("C", 2.0, 3.5)],
+    2: [("C", 2.0, 1.5), ("H", 1.0, 0.2)],
+    4: [("C", 2.0, 1.0), ("H", 1.0, 0.1), ("O", 2.5, 0.8), ("N", 2.2, 0.6)],
+}
+
+#: Models which are not meant to be used with more than one ion species.
+single_component_only = [
+    jaxrts.models.ArkhipovIonFeat,
+    jaxrts.models.Gregori2003IonFeat,
+    jaxrts.models.Gregori2006IonFeat,
+]
+
+
+@dataclass(frozen=True)
+class BenchmarkCase:
+    """
+    A single model, evaluated for one key, on one grid for one number of ion
+    species.
+    """
+
+    key: str
+    model: type
+    grid: str
+    no_of_ions: int
+
+    @property
+    def name(self) -> str:
+        return (
+            f"{self.key}/{self.model.__name__}/"
+            + f"{self.grid}/{self.no_of_ions}"
+        )
+
+
+def benchmarked_models() -> list[type]:
+    """
+    All concrete models registered in :py:mod:`jaxrts.models`.
+    :py:class:`jaxrts.models.Neglect` is skipped, as it does no work.
+    """
+    return [
+        model
+        for model in jaxrts.models._all_models
+        if not inspect.isabstract(model) and model is not jaxrts.models.Neglect
+    ]
+
+
+def cases(
+    keys: list[str] | None = None,
+    models: list[str] | None = None,
+    grids: list[str] | None = None,
+    no_of_ions: list[int] | None = None,
+) -> list[BenchmarkCase]:
+    """
+    Collect all benchmark cases. All arguments are filters, ``None`` selects
+    everything.
+    """
+    if grids is None:
+        grids = list(grid_sizes.keys())
+    if no_of_ions is None:
+        no_of_ions = list(species.keys())
+
+    out = []
+    for model in benchmarked_models():
+        if models is not None and model.__name__ not in models:
+            continue
+        for key in model.allowed_keys:
+            if keys is not None and key not in keys:
+                continue
+            for n in no_of_ions:
+                if n > 1 and model in single_component_only:
+                    continue
+                for grid in grids:
+                    out.append(BenchmarkCase(key, model, grid, n))
+    return out
+
+
+def setup(grid: str) -> jaxrts.setup.Setup:
+    """
+    The :py:class:`jaxrts.setup.Setup` for the given grid size.
+    """
+    return jaxrts.setup.Setup(
+        ureg("145°"),
+        ureg("5keV"),
+        jnp.linspace(4.5, 5.5, grid_sizes[grid]) * ureg.kiloelectron_volts,
+        lambda x: jaxrts.instrument_function.instrument_gaussian(
+            x, 2 * ureg.electron_volt / ureg.hbar
+        ),
+    )
+
+
+def plasma_state(no_of_ions: int) -> jaxrts.PlasmaState:
+    """
+    A :py:class:`jaxrts.PlasmaState` with ``no_of_ions`` ion species.
+    """
+    elements, Z_free, rho = zip(*species[no_of_ions])
+    return jaxrts.PlasmaState(
+        ions=[jaxrts.Element(e) for e in elements],
+        Z_free=jnp.array(Z_free),
+        mass_density=jnp.array(rho) * ureg.gram / ureg.centimeter**3,
+        T_e=jnp.array([80]) * ureg.electron_volt / ureg.k_B,
+    )
+
+
+def _peak_function(no_of_ions: int):
+    def peak_function(k):
+        return jnp.ones((no_of_ions, no_of_ions)) * ureg.dimensionless
+
+    return peak_function
+
+
+def model_arguments(model: type, no_of_ions: int) -> tuple:
+    """
+    The arguments required to initialize ``model``, if any.
+    """
+    if model == jaxrts.models.ConstantChemPotential:
+        return (123.45 * ureg.electron_volt,)
+    if model == jaxrts.models.ConstantDebyeTemp:
+        return (314.1 * ureg.kelvin,)
+    if model == jaxrts.models.ConstantScreeningLength:
+        return (12.1 * ureg.angstrom,)
+    if model == jaxrts.models.ConstantIPD:
+        return (23.42 * ureg.electron_volt,)
+    if model == jaxrts.models.ElectronicLFCConstant:
+        return (1.2,)
+    if model == jaxrts.models.FixedSii:
+        return (jnp.ones((no_of_ions, no_of_ions)) * ureg.dimensionless,)
+    if model == jaxrts.models.PeakCollection:
+        return (
+            jnp.array([1, 2]) / (1 * ureg.angstrom),
+            jnp.array([1, 1]),
+            _peak_function(no_of_ions),
+        )
+    if model == jaxrts.models.DebyeWallerSolid:
+        return (
+            jaxrts.models.FixedSii(
+                jnp.ones((no_of_ions, no_of_ions)) * ureg.dimensionless
+            ),
+            jaxrts.models.PeakCollection(
+                *model_arguments(jaxrts.models.PeakCollection, no_of_ions)
+            ),
+        )
+    return ()
+
+
+def prepare(case: BenchmarkCase) -> tuple:
+    """
+    Create the plasma state (with the model of the case set) and the setup
+    for a benchmark case.
+    """
+    state = plasma_state(case.no_of_ions)
+    state[case.key] = case.model(*model_arguments(case.model, case.no_of_ions))
+    return state, setup(case.grid)
@@ -0,0 +1,126 @@
+"""
+Compare two benchmark reports, e.g., of two releases.
+
+The exit code is ``1`` if any case got slower (or needs more memory) than
+allowed by the thresholds, so that the comparison can be used in CI.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+#: The quantities which are compared, with a function to extract them from a
+#: single result.
+metrics = {
+    "compile": lambda r: r["lower_time"] + r["compile_time"],
+    "run": lambda r: r["run_time"]["median"],
+    "memory": lambda r: r["memory"].get("peak_bytes"),
+}
+
+
+def load(path: str | Path) -> dict:
+    """
+    Load a report, and map the names of the cases to their results.
+    """
+    report = json.loads(Path(path).read_text())
+    return {r["name"]: r for r in report["results"]}
+
+
+def compare(
+    old: dict, new: dict, thresholds: dict[str, float]
+) -> tuple[list[dict], list[str]]:
+    """
+    Compare the results of two reports (as returned by :py:func:`~.load`).
+
+    Parameters
+    ----------
+    old, new: dict
+        The results of the old and the new report.
+    thresholds: dict[str, float]
+        For every metric, the ratio new/old above which a case is considered
+        a regression.
+
+    Returns
+    -------
+    list[dict]
+        One entry per case present in both reports, with the ratios new/old
+        for all metrics and a list of the metrics that regressed.
+    list[str]
+        Names of the cases which fail in the new, but not in the old report.
+    """
+    rows = []
+    new_failures = []
+    for name in sorted(old.keys() & new.keys()):
+        o, n = old[name], new[name]
+        if n["status"] != "ok":
+            if o["status"] == "ok":
+                new_failures.append(name)
+            continue
+        if o["status"] != "ok":
+            continue
+        row = {"name": name, "ratios": {}, "regressions": []}
+        for metric, get in metrics.items():
+            o_val, n_val = get(o), get(n)
+            if not o_val or n_val is None:
+                continue
+            ratio = n_val / o_val
+            row["ratios"][metric] = ratio
+            if ratio > thresholds[metric]:
+                row["regressions"].append(metric)
+        rows.append(row)
+    return rows, new_failures
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.compare",
+        description="Compare two jaxrts benchmark reports.",
+    )
+    parser.add_argument("old", type=Path, help="The reference report.")
+    parser.add_argument("new", type=Path, help="The report to check.")
+    for metric, default in [("compile", 1.5), ("run", 1.2), ("memory", 1.2)]:
+        parser.add_argument(
+            f"--{metric}-threshold",
+            type=float,
+            default=default,
+            help=f"Maximal allowed ratio new/old for the {metric} "
+            + f"metric (default: {default}).",
+        )
+    parser.add_argument(
+        "-a",
+        "--all",
+        action="store_true",
+        help="Print all cases, not only the regressions.",
+    )
+    args = parser.parse_args(argv)
+
+    thresholds = {
+        metric: getattr(args, f"{metric}_threshold") for metric in metrics
+    }
+    rows, new_failures = compare(load(args.old), load(args.new), thresholds)
+
+    width = max([len(r["name"]) for r in rows] + [4])
+    print(f"{'case':<{width}}" + "".join(f"{m:>10}" for m in metrics))
+    for row in rows:
+        if not (args.all or row["regressions"]):
+            continue
+        cells = ""
+        for metric in metrics:
+            ratio = row["ratios"].get(metric)
+            mark = "!" if metric in row["regressions"] else " "
+            cells += "         -" if ratio is None else f"{ratio:9.2f}{mark}"
+        print(f"{row['name']:<{width}}{cells}")
+    for name in new_failures:
+        print(f"{name:<{width}}    FAILED")
+
+    regressions = [r for r in rows if r["regressions"]]
+    print(
+        f"\n{len(rows)} cases compared, {len(regressions)} regressions, "
+        + f"{len(new_failures)} new failures."
+    )
+    return 1 if (regressions or new_failures) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,250 @@
+"""
+Run the benchmark cases and write the JSON report.
+"""
+
+import argparse
+import datetime
+import json
+import logging
+import platform
+import statistics
+import sys
+import time
+from importlib import metadata
+from pathlib import Path
+
+import jax
+
+from jaxrts.plasmastate import PlasmaState
+
+from . import cases as _cases
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+#: Version of the report format. Increase it if the layout of the report
+#: changes in a way that :py:mod:`benchmarks.compare` has to know about.
+REPORT_VERSION = 1
+
+_evaluate = jax.jit(PlasmaState.evaluate, static_argnames=["key"])
+
+
+def _max_rss() -> int | None:
+    """
+    The peak resident set size of the process, in bytes.
+    """
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+def _memory(compiled) -> dict:
+    """
+    The memory required by a compiled executable, as reported by XLA, and the
+    peak memory of the device, if the backend reports it.
+    """
+    out = {}
+    try:
+        stats = compiled.memory_analysis()
+    except Exception:  # Not all backends implement the analysis
+        stats = None
+    if stats is not None:
+        out["argument_bytes"] = stats.argument_size_in_bytes
+        out["output_bytes"] = stats.output_size_in_bytes
+        out["temp_bytes"] = stats.temp_size_in_bytes
+        out["generated_code_bytes"] = stats.generated_code_size_in_bytes
+        out["peak_bytes"] = (
+            stats.argument_size_in_bytes
+            + stats.output_size_in_bytes
+            + stats.temp_size_in_bytes
+            - stats.alias_size_in_bytes
+        )
+    device_stats = jax.devices()[0].memory_stats()
+    if device_stats is not None and "peak_bytes_in_use" in device_stats:
+        out["device_peak_bytes"] = device_stats["peak_bytes_in_use"]
+    return out
+
+
+def run_case(case: _cases.BenchmarkCase, repeats: int = 5) -> dict:
+    """
+    Benchmark a single case.
+
+    The evaluation is lowered and compiled explicitly, so that the compile
+    time does not pollute the run times. Afterwards, the compiled function is
+    called ``repeats`` times.
+
+    Returns
+    -------
+    dict
+        The result of the case. If the case failed, ``"status"`` is
+        ``"error"`` and the exception is stored under ``"error"``.
+    """
+    result = {
+        "name": case.name,
+        "key": case.key,
+        "model": case.model.__name__,
+        "grid": case.grid,
+        "no_of_energies": _cases.grid_sizes[case.grid],
+        "no_of_ions": case.no_of_ions,
+    }
+    try:
+        state, setup = _cases.prepare(case)
+
+        t0 = time.perf_counter()
+        lowered = _evaluate.lower(state, case.key, setup)
+        t1 = time.perf_counter()
+        compiled = lowered.compile()
+        t2 = time.perf_counter()
+
+        # The first call can include some one-time overhead, e.g., for
+        # transferring the arguments. Don't count it as a run.
+        jax.block_until_ready(compiled(state, setup))
+        t3 = time.perf_counter()
+
+        run_times = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            jax.block_until_ready(compiled(state, setup))
+            run_times.append(time.perf_counter() - start)
+    except Exception as err:
+        logger.warning(f"{case.name} failed: {err!r}")
+        result["status"] = "error"
+        result["error"] = repr(err)
+        return result
+
+    result["status"] = "ok"
+    result["lower_time"] = t1 - t0
+    result["compile_time"] = t2 - t1
+    result["first_call_time"] = t3 - t2
+    result["run_time"] = {
+        "min": min(run_times),
+        "median": statistics.median(run_times),
+        "mean": statistics.mean(run_times),
+        "repeats": repeats,
+    }
+    result["memory"] = _memory(compiled)
+    logger.info(
+        f"{case.name}: compile {t2 - t0:.3f}s, "
+        + f"run {result['run_time']['median'] * 1e3:.3f}ms"
+    )
+    return result
+
+
+def _version(package: str) -> str | None:
+    try:
+        return metadata.version(package)
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def environment() -> dict:
+    """
+    Information about the environment the benchmarks were run in.
+    """
+    device = jax.devices()[0]
+    return {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "backend": jax.default_backend(),
+        "device": device.device_kind,
+        "no_of_devices": jax.device_count(),
+        "x64": jax.config.read("jax_enable_x64"),
+        "versions": {
+            p: _version(p)
+            for p in ["jaxrts", "jax", "jaxlib", "jpu", "quadax"]
+        },
+    }
+
+
+def run(benchmark_cases: list[_cases.BenchmarkCase], repeats: int = 5) -> dict:
+    """
+    Run all ``benchmark_cases`` and return the report.
+    """
+    results = []
+    for i, case in enumerate(benchmark_cases):
+        logger.info(f"[{i + 1}/{len(benchmark_cases)}] {case.name}")
+        results.append(run_case(case, repeats))
+        # Don't let the executables of previous cases pile up.
+        jax.clear_caches()
+    return {
+        "report_version": REPORT_VERSION,
+        "environment": environment(),
+        "max_rss_bytes": _max_rss(),
+        "results": results,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Benchmark the models of jaxrts.",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=Path,
+        default=Path("benchmark_report.json"),
+        help="Path of the JSON report.",
+    )
+    parser.add_argument(
+        "--keys", nargs="+", help="Only benchmark models for these keys."
+    )
+    parser.add_argument(
+        "--models", nargs="+", help="Only benchmark these models (by name)."
+    )
+    parser.add_argument(
+        "--grids",
+        nargs="+",
+        choices=list(_cases.grid_sizes.keys()),
+        help="Only use these energy grids.",
+    )
+    parser.add_argument(
+        "--ions",
+        nargs="+",
+        type=int,
+        choices=list(_cases.species.keys()),
+        help="Only use plasmas with these numbers of ion species.",
+    )
+    parser.add_argument(
+        "-r",
+        "--repeats",
+        type=int,
+        default=5,
+        help="Number of timed calls per case, after compilation.",
+    )
+    parser.add_argument(
+        "--list", action="store_true", help="Only list the cases."
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    # The models log warnings when defaults are set, which is expected here.
+    logging.getLogger("jaxrts").setLevel(logging.ERROR)
+
+    benchmark_cases = _cases.cases(
+        keys=args.keys,
+        models=args.models,
+        grids=args.grids,
+        no_of_ions=args.ions,
+    )
+    if args.list:
+        for case in benchmark_cases:
+            print(case.name)
+        return 0
+
+    report = run(benchmark_cases, args.repeats)
+    args.output.write_text(json.dumps(report, indent=2))
+    failed = [r["name"] for r in report["results"] if r["status"] != "ok"]
+    logger.info(
+        f"Wrote {len(report['results'])} results to {args.output}, "
+        + f"{len(failed)} failed."
+    )
+    return 0
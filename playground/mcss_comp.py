@@ -117,18 +117,15 @@ def plot_mcss_comparison(mcss_file):
     if jnp.any(state.Z_free - jnp.floor(state.Z_free) != 0):
         state = state.expand_integer_ionization_states()
 
-    sharding = jax.sharding.PositionalSharding(jax.devices())
     energy = (
         ureg(f"{central_energy} eV")
         - jnp.linspace(jnp.max(E), jnp.min(E), 2046) * ureg.electron_volt
     )
-    sharded_energy = jax.device_put(energy, sharding)
-    # sharded_energy = energy
 
     setup = jaxrts.setup.Setup(
         ureg(f"{theta}°"),
         ureg(f"{central_energy} eV"),
-        sharded_energy,
+        energy,
         # ureg(f"{central_energy} eV")
         # + jnp.linspace(-700, 200, 2000) * ureg.electron_volt,
         partial(
@@ -172,9 +169,10 @@ def plot_mcss_comparison(mcss_file):
         / (1 * ureg.k_B * state.T_e)
     )
 
-    I = state.probe(setup)
+    # Distribute the energy channels over all (host) devices
+    I = jaxrts.sharding.probe(state, setup)
     t0 = time.time()
-    state.probe(setup)
+    jaxrts.sharding.probe(state, setup).magnitude.block_until_ready()
     print(f"One sample takes {time.time()-t0}s.")
     norm = jnpu.max(
         state.evaluate("free-free scattering", setup)
@@ -3,36 +3,47 @@ __version__ = "0.2.0"
 from . import (
     analysis,
     bound_free,
+    compilation,
     elements,
+    emulator,
+    fitting,
     form_factors,
     free_bound,
     free_free,
     helpers,
     hnc_potentials,
     instrument_function,
+    instrumentation,
     ion_feature,
     math,
     models,
     plasma_physics,
     plasmastate,
     saha,
+    sampling,
     saving,
     setup,
+    sharding,
     static_structure_factors,
+    training_data,
     units,
 )
 from .elements import Element
-from .plasmastate import PlasmaState
+from .plasmastate import PlasmaState, PlasmaStateBatch
 from .setup import Setup
 from .units import ureg
 
 __all__ = [
     "Element",
     "PlasmaState",
+    "PlasmaStateBatch",
     "Setup",
     "analysis",
     "bound_free",
+    "compilation",
     "elements",
+    "emulator",
+    "fitting",
     "form_factors",
     "free_bound",
     "free_free",
@@ -40,15 +51,19 @@ __all__ = [
     "hnc_potentials",
     "hypernetted_chain",
     "instrument_function",
+    "instrumentation",
     "ion_feature",
     "math",
     "models",
     "plasma_physics",
     "plasmastate",
     "saha",
+    "sampling",
     "saving",
     "setup",
+    "sharding",
     "static_structure_factors",
+    "training_data",
     "units",
     "ureg",
 ]
@@ -5,6 +5,7 @@ Some analysis functions, mainly used for benchmarking and testing.
 from functools import partial
 
 import jax
+import jpu
 from jax import numpy as jnp
 from jpu import numpy as jnpu
 
@@ -30,28 +31,43 @@ def twoSidedLaplace(
        I \\exp(-\\tau E) \\mathrm{d}E
 
     """
+    # The transform is evaluated on plain arrays, with all energies in eV.
+    E_shift = E_shift.m_as(ureg.electron_volt)
+    tau = tau.m_as(1 / ureg.electron_volt)
+    if jpu.core.is_quantity(intensity):
+        intensity_unit = intensity.units
+        intensity = intensity.magnitude
+    else:
+        intensity_unit = ureg.dimensionless
     # Set default values for E_min and E_max if they are not given
-    E_min = jnpu.min(E_shift) if E_min is None else E_min
-    E_max = jnpu.max(E_shift) if E_max is None else E_max
+    if E_min is None:
+        E_min = jnp.min(E_shift)
+    else:
+        E_min = E_min.m_as(ureg.electron_volt)
+    if E_max is None:
+        E_max = jnp.max(E_shift)
+    else:
+        E_max = E_max.m_as(ureg.electron_volt)
 
     # Sort energy and intensity for the integration
-    inten_sorted = intensity[jnpu.argsort(E_shift)]
-    E_sorted = E_shift[jnpu.argsort(E_shift)]
+    order = jnp.argsort(E_shift)
+    inten_sorted = intensity[order]
+    E_sorted = E_shift[order]
 
     # Integrate in energy space (this way, the integral is numerically more
     # stable compared to omega_space. This results in a dimensionless result,
     # when considering dynamic structure factors
-    kernel = inten_sorted * jnpu.exp(-tau * E_sorted) / ureg.hbar
-    kernel_unit = kernel.units
+    kernel = inten_sorted * jnp.exp(-tau * E_sorted)
     # Set the kernel to 0 where the energy is outside of the defined range,
     # i.e., don't include it for the integral
-    cut_kernel = jnpu.where(
-        (E_sorted >= E_min) & (E_sorted <= E_max), kernel.m_as(kernel_unit), 0
+    cut_kernel = jnp.where(
+        (E_sorted >= E_min) & (E_sorted <= E_max), kernel, 0
     )
     return (
-        jnp.trapezoid(cut_kernel, (E_sorted).m_as(ureg.electron_volt))
-        * kernel_unit
+        jnp.trapezoid(cut_kernel, E_sorted)
+        * intensity_unit
         * ureg.electron_volt
+        / ureg.hbar
     )
 
 
@@ -4,9 +4,12 @@ electrons to the dynamic structure factor.
 """
 
 import logging
+from functools import cache
 
+import jax
 import jax.numpy as jnp
 import jpu.numpy as jnpu
+import numpy as onp
 from jax import jit
 from jax.scipy.special import factorial
 
@@ -14,6 +17,22 @@ from .units import Quantity, ureg
 
 logger = logging.getLogger(__name__)
 
+#: The quantum numbers ``(n, l)`` of the orbitals, in the order of
+#: :py:func:`jaxrts.elements.electron_distribution_ionized_state` and
+#: :py:func:`jaxrts.form_factors.pauling_size_screening_constants`.
+orbitals = (
+    (1, 0),
+    (2, 0),
+    (2, 1),
+    (3, 0),
+    (3, 1),
+    (3, 2),
+    (4, 0),
+    (4, 1),
+    (4, 2),
+    (4, 3),
+)
+
 
 def _xi(n: int, Zeff: Quantity, omega: Quantity, k: Quantity):
     omega_c = (ureg.hbar * k**2) / (2 * ureg.m_e)
@@ -600,3 +619,137 @@ def J_impulse_approx(
     ) / (1 * ureg.c * k)
 
     return jnpu.sum(intensity, axis=0)
+
+
+@cache
+def compton_profile_table(n_grid: int = 4096) -> tuple[onp.ndarray]:
+    """
+    Tabulate the hydrogenic Compton profiles of all :py:data:`~.orbitals` on
+    a grid of the dimensionless momentum :math:`\\xi = n q / (Z_\\text{eff}
+    \\alpha)`.
+
+    The profiles of :cite:`Schumacher.1975` and their first order asymmetric
+    corrections :cite:`Gregori.2004` scale with :math:`Z_\\text{eff}` and
+    :math:`k` as
+
+    .. math::
+
+        J_{nl}(\\omega, k) = \\frac{j_{nl}(\\xi)}{Z_\\text{eff}\\alpha}
+        + \\frac{h_{nl}(\\xi)}{k a_0}\\,,
+
+    so that one table per orbital describes all elements and effective
+    charges. The grid is uniform in :math:`u = \\xi / (1 + |\\xi|)`, which
+    covers :math:`-\\infty < \\xi < \\infty` and resolves the peak at
+    :math:`\\xi = 0`. The tables are calculated once per ``n_grid``.
+
+    Parameters
+    ----------
+    n_grid: int
+        The number of intervals of the grid in :math:`u`.
+
+    Returns
+    -------
+    onp.ndarray
+        :math:`j_{nl}`, with the shape ``(len(orbitals), n_grid + 1)``.
+    onp.ndarray
+        :math:`h_{nl}`, with the shape ``(len(orbitals), n_grid + 1)``. Zero
+        for the orbitals without a correction.
+    """
+    u = onp.linspace(-1, 1, n_grid + 1)[1:-1]
+    xi = u / (1 - onp.abs(u))
+    j = onp.zeros((len(orbitals), n_grid + 1))
+    h = onp.zeros((len(orbitals), n_grid + 1))
+    # For Zeff = 1 and k = alpha / a_0, the profiles are j / alpha and
+    # h / alpha. The tables must not depend on a surrounding trace.
+    Zeff = 1 * ureg.dimensionless
+    k = ureg.alpha / ureg.a_0
+    with jax.ensure_compile_time_eval():
+        for i, (n, l) in enumerate(orbitals):  # noqa: E741
+            omega = (ureg.hbar * k**2) / (2 * ureg.m_e) + (
+                xi / n
+            ) * ureg.alpha * ureg.c * k
+            J = globals()[f"_J{n}{l}_Schum75"](omega, k, Zeff)
+            j[i, 1:-1] = onp.asarray((J * ureg.alpha).m_as(ureg.dimensionless))
+            if f"_J{n}{l}_HR" in globals():
+                J = globals()[f"_J{n}{l}_HR"](omega, k, Zeff)
+                h[i, 1:-1] = onp.asarray(
+                    (J * ureg.alpha).m_as(ureg.dimensionless)
+                )
+    return j, h
+
+
+def _interp_table(table: onp.ndarray, xi: jnp.ndarray) -> jnp.ndarray:
+    """
+    Linearly interpolate a table of :py:func:`~.compton_profile_table`. The
+    first axis of ``xi`` are the orbitals.
+    """
+    n_grid = table.shape[1] - 1
+    u = xi / (1 + jnp.abs(xi))
+    s = (u + 1) * (n_grid / 2)
+    idx = jnp.clip(jnp.floor(s).astype(int), 0, n_grid - 1)
+    w = s - idx
+    rows = jnp.arange(table.shape[0]).reshape((-1,) + (1,) * (xi.ndim - 1))
+    table = jnp.asarray(table)
+    return table[rows, idx] * (1 - w) + table[rows, idx + 1] * w
+
+
+def J_impulse_tabulated(
+    omega: Quantity,
+    k: Quantity,
+    pop: jnp.ndarray,
+    Zeff: jnp.ndarray,
+    E_b: Quantity,
+    n_grid: int = 4096,
+) -> Quantity:
+    """
+    The bound-free contribution of :py:func:`~.J_impulse_approx`, calculated
+    by interpolating the profiles of :py:func:`~.compton_profile_table`.
+
+    The first axis of ``pop``, ``Zeff`` and ``E_b`` are the
+    :py:data:`~.orbitals`. Any further axes (e.g., the ions of a plasma) are
+    evaluated at once, without a loop over them.
+
+    Parameters
+    ----------
+    omega: Quantity
+        The frequency shifts, with the shape ``(n_omega,)``.
+    k: Quantity
+        The length of the scattering vector.
+    pop: jnp.ndarray
+        The number of electrons per orbital, with the shape
+        ``(len(orbitals), ...)``.
+    Zeff: jnp.ndarray
+        The effective charges seen by the electrons of every orbital.
+    E_b: Quantity
+        The binding energies of the orbitals.
+    n_grid: int
+        The resolution of the table, see :py:func:`~.compton_profile_table`.
+
+    Returns
+    -------
+    Quantity
+        The bound-free contribution, with the shape ``(..., n_omega)``.
+    """
+    j, h = compton_profile_table(n_grid)
+    pop = jnp.asarray(pop)[..., jnp.newaxis]
+    if isinstance(Zeff, Quantity):
+        Zeff = Zeff.m_as(ureg.dimensionless)
+    Zeff = jnp.asarray(Zeff)[..., jnp.newaxis]
+    # Unoccupied orbitals might have an unphysical effective charge
+    Zeff = jnp.where(pop > 0, Zeff, 1.0)
+    n = jnp.array([n for n, _ in orbitals]).reshape(
+        (-1,) + (1,) * (pop.ndim - 1)
+    )
+    omega_c = (ureg.hbar * k**2) / (2 * ureg.m_e)
+    q = ((omega - omega_c) / (ureg.c * k)).m_as(ureg.dimensionless)
+    alpha = (1 * ureg.alpha).m_as(ureg.dimensionless)
+    xi = n * q / (Zeff * alpha)
+    J = _interp_table(j, xi) / (Zeff * alpha) + _interp_table(h, xi) / (
+        k * ureg.a_0
+    ).m_as(ureg.dimensionless)
+    edge = jnp.heaviside(
+        (omega * ureg.hbar - E_b[..., jnp.newaxis]).m_as(ureg.electron_volt),
+        0.5,
+    )
+    intensity = jnp.where(pop > 0, pop * J * edge, 0.0)
+    return jnp.sum(intensity, axis=0) / (1 * ureg.c * k)
@@ -0,0 +1,182 @@
+"""
+This submodule contains helpers to reduce the time spent on compiling the
+jitted functions of jaxrts.
+
+Compiling a full :py:meth:`jaxrts.plasmastate.PlasmaState.probe` can take
+tens of seconds, e.g., when HNC calculations are combined with a Born-Mermin
+free-free model. JAX can store compiled executables on disk, so that
+subsequent Python processes can re-use them. :py:func:`~.enable_cache` turns
+this persistent compilation cache on, and :py:func:`~.warmup` compiles a
+:py:class:`~jaxrts.plasmastate.PlasmaState` ahead of time, reporting the
+compile times per model.
+
+Examples
+--------
+>>> jaxrts.compilation.enable_cache("/tmp/jaxrts_cache")
+>>> probe, times = jaxrts.compilation.warmup(state, setup)
+>>> S_ee = probe(state, setup)
+"""
+
+import logging
+import os
+import time
+from pathlib import Path
+
+import jax
+from jax.experimental.compilation_cache import compilation_cache
+
+from .plasmastate import PlasmaState
+from .setup import Setup
+
+logger = logging.getLogger(__name__)
+
+#: The environment variable which can be used to set the default cache
+#: directory.
+CACHE_DIR_ENV = "JAXRTS_CACHE_DIR"
+
+#: The model keys that are evaluated by
+#: :py:meth:`jaxrts.plasmastate.PlasmaState.probe`.
+probe_keys = [
+    "ionic scattering",
+    "free-free scattering",
+    "bound-free scattering",
+    "free-bound scattering",
+]
+
+
+def default_cache_dir() -> Path:
+    """
+    The default directory for the persistent compilation cache. This is the
+    value of the environment variable ``JAXRTS_CACHE_DIR``, if set, and
+    ``~/.cache/jaxrts`` otherwise.
+    """
+    if CACHE_DIR_ENV in os.environ:
+        return Path(os.environ[CACHE_DIR_ENV])
+    return Path.home() / ".cache" / "jaxrts"
+
+
+def enable_cache(
+    cache_dir: str | Path | None = None,
+    min_compile_time: float = 1.0,
+) -> Path:
+    """
+    Enable JAX's persistent compilation cache.
+
+    Parameters
+    ----------
+    cache_dir: str | Path | None
+        The directory where compiled executables are stored. If ``None``, the
+        :py:func:`~.default_cache_dir` is used. The directory is created if it
+        does not exist.
+    min_compile_time: float
+        Only computations that took longer than this time (in seconds) to
+        compile are written to the cache.
+
+    Returns
+    -------
+    Path
+        The cache directory.
+    """
+    if cache_dir is None:
+        cache_dir = default_cache_dir()
+    cache_dir = Path(cache_dir).expanduser()
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    # If the cache was used before, it has to be reset so that the new
+    # directory is picked up.
+    compilation_cache.reset_cache()
+    jax.config.update("jax_enable_compilation_cache", True)
+    jax.config.update("jax_compilation_cache_dir", str(cache_dir))
+    jax.config.update(
+        "jax_persistent_cache_min_compile_time_secs", min_compile_time
+    )
+    jax.config.update("jax_persistent_cache_min_entry_size_bytes", -1)
+    logger.info(f"Persistent compilation cache enabled in {cache_dir}.")
+    return cache_dir
+
+
+def disable_cache() -> None:
+    """
+    Disable the persistent compilation cache, again.
+    """
+    compilation_cache.reset_cache()
+    jax.config.update("jax_compilation_cache_dir", None)
+    jax.config.update("jax_enable_compilation_cache", False)
+
+
+def _compile(fun, *args) -> tuple:
+    """
+    Lower and compile ``fun`` for the given arguments.
+
+    Returns
+    -------
+    jax.stages.Compiled
+        The compiled function.
+    dict
+        The time spent on lowering and compiling, in seconds.
+    """
+    t0 = time.perf_counter()
+    lowered = fun.lower(*args)
+    t1 = time.perf_counter()
+    compiled = lowered.compile()
+    t2 = time.perf_counter()
+    return compiled, {"lower": t1 - t0, "compile": t2 - t1}
+
+
+_evaluate = jax.jit(PlasmaState.evaluate, static_argnames=["key"])
+
+
+def warmup(
+    plasma_state: PlasmaState,
+    setup: Setup,
+    keys: list[str] | None = None,
+) -> tuple:
+    """
+    Compile :py:meth:`jaxrts.plasmastate.PlasmaState.probe` ahead of time for
+    the shapes given by ``plasma_state`` and ``setup``.
+
+    Additionally, every model in ``keys`` is compiled on it's own to measure
+    which model dominates the compile time. The times are logged and returned.
+    If the persistent cache is enabled (see :py:func:`~.enable_cache`), all
+    executables are written to disk, so that the next process can load,
+    rather than compile them.
+
+    Parameters
+    ----------
+    plasma_state: PlasmaState
+        The plasma state. Only the shapes of the parameters and the models
+        matter.
+    setup: Setup
+        The setup. Only the shape of the energy grid matters.
+    keys: list[str] | None
+        The model keys which should be compiled individually. Defaults to the
+        keys evaluated by :py:meth:`~jaxrts.plasmastate.PlasmaState.probe`.
+        If an empty list is given, only ``probe`` is compiled.
+
+    Returns
+    -------
+    jax.stages.Compiled
+        The compiled ``probe`` function. It has to be called with
+        ``(plasma_state, setup)`` of the same shapes and models.
+    dict
+        Mapping of the model keys (and ``"probe"``) to a dictionary with the
+        times spent on lowering and compiling, in seconds.
+    """
+    if keys is None:
+        keys = probe_keys
+
+    times = {}
+    for key in keys:
+        _, times[key] = _compile(_evaluate, plasma_state, key, setup)
+        logger.info(
+            f"Compiled '{key}' ({plasma_state[key].__name__}) in "
+            + f"{times[key]['lower'] + times[key]['compile']:.2f}s."
+        )
+    compiled_probe, times["probe"] = _compile(
+        PlasmaState.probe, plasma_state, setup
+    )
+    logger.info(
+        "Compiled probe in "
+        + f"{times['probe']['lower'] + times['probe']['compile']:.2f}s."
+    )
+    return compiled_probe, times
@@ -2,10 +2,12 @@
 This submodule contains data for different chemical elements.
 """
 
+from functools import cached_property, lru_cache
 from typing import Any
 
 import jax
 import jpu.numpy as jnpu
+import numpy as onp
 from jax import numpy as jnp
 
 from .helpers import invert_dict, orbital_array
@@ -1682,3 +1684,104 @@ class MixElement(Element):
         )
 
         self.atomic_radius_calc = 0 * ureg.picometer
+
+
+class SpeciesTable:
+    """
+    The data of a list of ion species in a structure of arrays, so that
+    quantities of all species can be calculated at once, rather than in a
+    Python loop over the ions.
+
+    Per-species entries have the shape ``(nions,)``. Per-orbital entries have
+    the shape ``(10, nions)``, with the orbitals in the order of
+    :py:func:`~.electron_distribution_ionized_state`. Per-ionization-step
+    entries have the shape ``(nions, max(Z))``, padded for the lighter
+    elements (see :py:attr:`~.ionization_mask`).
+
+    Use :py:func:`~.species_table` to obtain a (cached) instance.
+    """
+
+    def __init__(self, ions: tuple[Element]) -> None:
+        self.ions = tuple(ions)
+        # The data of an Element is static, while a MixElement might contain
+        # traced values.
+        xp = onp if all(type(ion) is Element for ion in ions) else jnp
+
+        #: The symbols of the ions
+        self.symbols: tuple[str] = tuple(ion.symbol for ion in ions)
+        #: The atomic numbers
+        self.Z = xp.array([ion.Z for ion in ions])
+        #: The atomic masses
+        self.atomic_mass: Quantity = xp.array(
+            [ion.atomic_mass.m_as(ureg.atomic_mass_constant) for ion in ions]
+        ) * (1 * ureg.atomic_mass_constant)
+        #: The calculated atomic radii
+        self.atomic_radius: Quantity = xp.array(
+            [ion.atomic_radius_calc.m_as(ureg.picometer) for ion in ions]
+        ) * (1 * ureg.picometer)
+        #: The binding energies of the orbitals, shape ``(10, nions)``
+        self.binding_energies: Quantity = xp.stack(
+            [ion.binding_energies.m_as(ureg.electron_volt) for ion in ions],
+            axis=1,
+        ) * (1 * ureg.electron_volt)
+
+    @property
+    def nions(self) -> int:
+        return len(self.ions)
+
+    @cached_property
+    def _ionization_ladder(self) -> tuple:
+        Z_max = max(ion.Z for ion in self.ions)
+        energies = onp.zeros((self.nions, Z_max))
+        log_g_ratio = onp.zeros((self.nions, Z_max))
+        mask = onp.zeros((self.nions, Z_max), dtype=bool)
+        for i, ion in enumerate(self.ions):
+            stat_weight = onp.asarray(ion.ionization.statistical_weights)
+            energies[i, : ion.Z] = ion.ionization.energies.m_as(
+                ureg.electron_volt
+            )
+            log_g_ratio[i, : ion.Z] = onp.log(
+                stat_weight[1:] / stat_weight[:-1]
+            )
+            mask[i, : ion.Z] = True
+        return energies * (1 * ureg.electron_volt), log_g_ratio, mask
+
+    @property
+    def ionization_energies(self) -> Quantity:
+        """
+        The ionization energies of all ionization steps, padded with zeros.
+        Only available for :py:class:`~.Element` s.
+        """
+        return self._ionization_ladder[0]
+
+    @property
+    def log_g_ratio(self) -> onp.ndarray:
+        """
+        The logarithm of the ratio of statistical weights of the upper and
+        lower state of all ionization steps, :math:`\\log(g_{j+1} / g_j)`,
+        padded with zeros.
+        """
+        return self._ionization_ladder[1]
+
+    @property
+    def ionization_mask(self) -> onp.ndarray:
+        """
+        ``True`` for the ionization steps that exist.
+        """
+        return self._ionization_ladder[2]
+
+
+@lru_cache
+def _cached_species_table(ions: tuple[Element]) -> SpeciesTable:
+    return SpeciesTable(ions)
+
+
+def species_table(ions: list[Element]) -> SpeciesTable:
+    """
+    The :py:class:`~.SpeciesTable` of ``ions``. Tables of
+    :py:class:`~.Element` s are calculated only once per combination.
+    """
+    ions = tuple(ions)
+    if all(type(ion) is Element for ion in ions):
+        return _cached_species_table(ions)
+    return SpeciesTable(ions)
@@ -0,0 +1,799 @@
+"""
+This submodule contains emulators, i.e., small neural networks which are
+trained to reproduce the static ion-ion structure factors :math:`S_{ab}` of
+an expensive model (e.g.,
+:py:class:`jaxrts.models.OnePotentialHNCIonFeat`). Once trained, they are
+evaluated with the :py:class:`jaxrts.models.EmulatedIonFeat` model, which
+falls back to the expensive model outside the training domain.
+
+An :py:class:`~.Emulator` describes a plasma of an arbitrary number of
+elements with a fixed composition. Its inputs are
+
+- ``theta``: the electron degeneracy :math:`k_B T_e / E_F`,
+- ``rho``: the total mass density in g/cc,
+- ``Z_<symbol>``: the mean ionization of every element,
+- ``T_i/T_e``: the ratio of the (mean) ion and the electron temperature,
+- ``k/q_k``: the scattering vector in units of the Fermi wave number.
+
+``theta``, ``rho``, ``T_i/T_e`` and ``k/q_k`` enter the network
+logarithmically. The outputs are the upper triangle of :math:`S_{ab}` of the
+elements.
+
+The networks are plain JAX functions, so that no additional dependency is
+required. Emulators are stored as ``.npz`` files with a versioned header
+(see :py:data:`~.format_version`).
+
+Examples
+--------
+>>> emulator = jaxrts.emulator.Emulator.create(
+>>>     jax.random.PRNGKey(0),
+>>>     state,
+>>>     {"theta": (0.1, 10), "rho": (0.5, 5), "Z_C": (1, 5), "k/q_k": (0.1, 5)},
+>>> )
+>>> x, S = jaxrts.emulator.generate_training_data(
+>>>     emulator, state, 10000, jax.random.PRNGKey(1)
+>>> )
+>>> emulator, history = jaxrts.emulator.train(
+>>>     emulator, x, S, jax.random.PRNGKey(2)
+>>> )
+>>> emulator.save("C.npz")
+>>> state["ionic scattering"] = jaxrts.models.EmulatedIonFeat("C.npz")
+"""
+
+import datetime
+import json
+import logging
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import jax
+import jax.numpy as jnp
+import jpu.numpy as jnpu
+import numpy as onp
+from jax.sharding import Mesh, NamedSharding
+from jax.sharding import PartitionSpec as P
+
+from .instrument_function import instrument_gaussian
+from .plasma_physics import fermi_energy
+from .setup import Setup, get_probe_setup
+from .units import ureg
+
+if TYPE_CHECKING:
+    from .plasmastate import PlasmaState
+
+logger = logging.getLogger(__name__)
+
+#: The version of the file format written by :py:meth:`~.Emulator.save`.
+#: Files with a newer version cannot be loaded.
+format_version = 1
+
+_activations = {
+    "tanh": jnp.tanh,
+    "softplus": jax.nn.softplus,
+    "gelu": jax.nn.gelu,
+    "relu": jax.nn.relu,
+}
+
+# Inputs which enter the network logarithmically
+_log_inputs = ("theta", "rho", "T_i/T_e", "k/q_k")
+
+
+def input_names(elements: tuple[str]) -> tuple[str]:
+    """
+    The names of the inputs of an emulator for the ``elements``.
+    """
+    return ("theta", "rho", *[f"Z_{e}" for e in elements], "T_i/T_e", "k/q_k")
+
+
+def output_names(elements: tuple[str]) -> tuple[str]:
+    """
+    The names of the outputs of an emulator for the ``elements``, i.e., the
+    upper triangle of :math:`S_{ab}`.
+    """
+    return tuple(
+        f"S_{a}{b}" for i, a in enumerate(elements) for b in elements[i:]
+    )
+
+
+def _membership(elements: tuple[str], plasma_state: "PlasmaState"):
+    """
+    Matrix with the shape ``(len(elements), nions)``, which is one, if an ion
+    of ``plasma_state`` is of the element.
+    """
+    symbols = [ion.symbol for ion in plasma_state.ions]
+    unknown = set(symbols) - set(elements)
+    if unknown:
+        raise ValueError(
+            f"The emulator is trained for {elements}, but the plasma state "
+            + f"contains {sorted(unknown)}."
+        )
+    return onp.array([[s == e for s in symbols] for e in elements], float)
+
+
+class Emulator:
+    """
+    A multi-layer perceptron, predicting the static structure factors
+    :math:`S_{ab}` of a plasma with a fixed composition.
+    """
+
+    def __init__(
+        self,
+        elements: tuple[str],
+        composition: jnp.ndarray,
+        weights: list[tuple[jnp.ndarray, jnp.ndarray]],
+        input_min: jnp.ndarray,
+        input_max: jnp.ndarray,
+        output_mean: jnp.ndarray | None = None,
+        output_std: jnp.ndarray | None = None,
+        activation: str = "tanh",
+        metadata: dict | None = None,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        elements: tuple[str]
+            The symbols of the elements.
+        composition: jnp.ndarray
+            The number fractions of the ``elements``.
+        weights: list[tuple[jnp.ndarray, jnp.ndarray]]
+            The weight matrix and bias of every layer.
+        input_min, input_max: jnp.ndarray
+            The training domain, in the (partly logarithmic) coordinates of
+            the inputs.
+        output_mean, output_std: jnp.ndarray | None
+            The mean and standard deviation of the training outputs, which
+            are used to scale the output of the network.
+        activation: str
+            The activation function of the hidden layers, one of ``"tanh"``,
+            ``"softplus"``, ``"gelu"`` or ``"relu"``. Smooth activations are
+            preferable, if gradients are required (e.g., for fitting).
+        metadata: dict | None
+            Additional information, e.g., on the reference model and the
+            training. It has to be serializable to JSON.
+        """
+        if activation not in _activations:
+            raise ValueError(
+                f"Unknown activation '{activation}'. Use one of "
+                + f"{list(_activations.keys())}."
+            )
+        n_out = len(output_names(elements))
+        #: The symbols of the elements.
+        self.elements: tuple[str] = tuple(elements)
+        #: The number fractions of the elements.
+        self.composition: jnp.ndarray = jnp.asarray(composition)
+        #: The weight matrix and bias of every layer.
+        self.weights: list[tuple[jnp.ndarray, jnp.ndarray]] = [
+            (jnp.asarray(W), jnp.asarray(b)) for W, b in weights
+        ]
+        #: The lower bounds of the training domain.
+        self.input_min: jnp.ndarray = jnp.asarray(input_min, dtype=float)
+        #: The upper bounds of the training domain.
+        self.input_max: jnp.ndarray = jnp.asarray(input_max, dtype=float)
+        #: The mean of the training outputs.
+        self.output_mean: jnp.ndarray = (
+            jnp.zeros(n_out) if output_mean is None else output_mean
+        )
+        #: The standard deviation of the training outputs.
+        self.output_std: jnp.ndarray = (
+            jnp.ones(n_out) if output_std is None else output_std
+        )
+        #: The activation function of the hidden layers.
+        self.activation: str = activation
+        #: Additional information on the emulator.
+        self.metadata: dict = {} if metadata is None else dict(metadata)
+
+    @classmethod
+    def create(
+        cls,
+        key: jax.Array,
+        plasma_state: "PlasmaState",
+        domain: dict[str, tuple[float, float]],
+        hidden: tuple[int] = (64, 64),
+        activation: str = "tanh",
+    ) -> "Emulator":
+        """
+        Create an untrained emulator for the elements and the composition of
+        ``plasma_state``.
+
+        Parameters
+        ----------
+        key: jax.Array
+            The random key for the initial weights.
+        plasma_state: PlasmaState
+            The plasma state, defining the elements and their composition.
+        domain: dict[str, tuple[float, float]]
+            The lower and upper bound of every input (see
+            :py:func:`~.input_names`), in physical units. ``"T_i/T_e"``
+            defaults to ``(1, 1)``.
+        hidden: tuple[int]
+            The number of neurons of the hidden layers.
+        activation: str
+            The activation function of the hidden layers.
+        """
+        elements = tuple(
+            dict.fromkeys(ion.symbol for ion in plasma_state.ions)
+        )
+        composition = (
+            _membership(elements, plasma_state) @ plasma_state.number_fraction
+        )
+        domain = {"T_i/T_e": (1.0, 1.0), **domain}
+        names = input_names(elements)
+        missing = [n for n in names if n not in domain]
+        if missing:
+            raise ValueError(f"The domain of {missing} is not given.")
+        bounds = onp.array([domain[n] for n in names], dtype=float)
+        for i, n in enumerate(names):
+            if n in _log_inputs:
+                bounds[i] = onp.log10(bounds[i])
+
+        sizes = [len(names), *hidden, len(output_names(elements))]
+        weights = []
+        for n_in, n_out in zip(sizes[:-1], sizes[1:]):
+            key, subkey = jax.random.split(key)
+            # Glorot initialization
+            W = jax.random.normal(subkey, (n_in, n_out)) * jnp.sqrt(
+                2 / (n_in + n_out)
+            )
+            weights.append((W, jnp.zeros(n_out)))
+        return cls(
+            elements,
+            composition,
+            weights,
+            bounds[:, 0],
+            bounds[:, 1],
+            activation=activation,
+        )
+
+    @property
+    def input_names(self) -> tuple[str]:
+        return input_names(self.elements)
+
+    @property
+    def output_names(self) -> tuple[str]:
+        return output_names(self.elements)
+
+    @property
+    def hidden(self) -> tuple[int]:
+        """
+        The number of neurons of the hidden layers.
+        """
+        return tuple(W.shape[1] for W, _ in self.weights[:-1])
+
+    @property
+    def domain(self) -> dict[str, tuple[float, float]]:
+        """
+        The training domain, in physical units.
+        """
+        out = {}
+        for name, lo, hi in zip(
+            self.input_names, self.input_min, self.input_max
+        ):
+            if name in _log_inputs:
+                lo, hi = 10**lo, 10**hi
+            out[name] = (float(lo), float(hi))
+        return out
+
+    def features(
+        self, plasma_state: "PlasmaState", setup: Setup
+    ) -> jnp.ndarray:
+        """
+        The inputs of the emulator for ``plasma_state`` at the scattering
+        vector of ``setup``, in the (partly logarithmic) coordinates of the
+        network.
+        """
+        M = _membership(self.elements, plasma_state)
+        x = plasma_state.number_fraction
+        Z = M @ (x * plasma_state.Z_free) / (M @ x)
+        E_f = fermi_energy(plasma_state.n_e)
+        q_k = jnpu.sqrt(2 * ureg.electron_mass * E_f)
+        theta = (plasma_state.T_e * ureg.k_B / E_f).m_as(ureg.dimensionless)
+        rho = jnpu.sum(plasma_state.mass_density).m_as(
+            ureg.gram / ureg.centimeter**3
+        )
+        T_ratio = (jnpu.sum(x * plasma_state.T_i) / plasma_state.T_e).m_as(
+            ureg.dimensionless
+        )
+        k = (setup.k * (1 * ureg.hbar) / q_k).m_as(ureg.dimensionless)
+        return jnp.concatenate(
+            [
+                jnp.log10(jnp.atleast_1d(theta)),
+                jnp.log10(jnp.atleast_1d(rho)),
+                Z,
+                jnp.log10(jnp.atleast_1d(T_ratio)),
+                jnp.log10(jnp.atleast_1d(k)),
+            ]
+        )
+
+    def composition_of(self, plasma_state: "PlasmaState") -> jnp.ndarray:
+        """
+        The number fractions of the :py:attr:`~.elements` in
+        ``plasma_state``.
+        """
+        M = _membership(self.elements, plasma_state)
+        return M @ plasma_state.number_fraction
+
+    def in_domain(
+        self,
+        features: jnp.ndarray,
+        composition: jnp.ndarray,
+        rtol: float = 1e-3,
+    ) -> jnp.ndarray:
+        """
+        ``True`` if the ``features`` are within the training domain and the
+        ``composition`` agrees with the one of the emulator (within ``rtol``
+        of the width of the domain, or of the composition).
+        """
+        tol = rtol * jnp.maximum(self.input_max - self.input_min, 1.0)
+        inside = jnp.all(
+            (features >= self.input_min - tol)
+            & (features <= self.input_max + tol)
+        )
+        return inside & jnp.allclose(
+            composition, self.composition, rtol=rtol, atol=rtol
+        )
+
+    @jax.jit
+    def __call__(self, features: jnp.ndarray) -> jnp.ndarray:
+        """
+        Evaluate the network for the ``features`` (with the shape ``(...,
+        n_inputs)``) and return the upper triangle of :math:`S_{ab}`.
+        """
+        width = self.input_max - self.input_min
+        h = jnp.where(
+            width > 0,
+            2 * (features - self.input_min) / jnp.where(width > 0, width, 1)
+            - 1,
+            0.0,
+        )
+        activation = _activations[self.activation]
+        for W, b in self.weights[:-1]:
+            h = activation(h @ W + b)
+        W, b = self.weights[-1]
+        return (h @ W + b) * self.output_std + self.output_mean
+
+    def structure_factors(
+        self, plasma_state: "PlasmaState", features: jnp.ndarray
+    ) -> jnp.ndarray:
+        """
+        The :math:`S_{ab}` of all ions of ``plasma_state`` (as a
+        dimensionless array with the shape ``(nions, nions)``).
+
+        If an element is represented by multiple ions (e.g., for a plasma
+        state with expanded ionization states, see
+        :py:meth:`jaxrts.plasmastate.PlasmaState.expand_integer_ionization_states`),
+        the ions are treated as randomly labelled atoms of the element, i.e.,
+        :math:`S_{ab} = \\delta_{ab} + \\sqrt{x_a x_b / (x_s x_t)}
+        (S_{st} - \\delta_{st})`, where :math:`s` and :math:`t` are the
+        elements of the ions :math:`a` and :math:`b`.
+        """
+        n = len(self.elements)
+        S_triu = self(features)
+        i, j = jnp.triu_indices(n)
+        S_el = jnp.zeros((n, n)).at[i, j].set(S_triu).at[j, i].set(S_triu)
+
+        M = _membership(self.elements, plasma_state)
+        x = plasma_state.number_fraction
+        x_el = M @ x
+        # Map ions to elements
+        idx = onp.argmax(M, axis=0)
+        weight = jnp.sqrt(jnp.outer(x, x) / jnp.outer(x_el[idx], x_el[idx]))
+        delta_el = jnp.eye(n)[idx][:, idx]
+        return jnp.eye(plasma_state.nions) + weight * (
+            S_el[idx][:, idx] - delta_el
+        )
+
+    def save(self, path: str | Path) -> None:
+        """
+        Save the emulator to an ``.npz`` file.
+        """
+        header = {
+            "format_version": format_version,
+            "elements": list(self.elements),
+            "inputs": list(self.input_names),
+            "outputs": list(self.output_names),
+            "activation": self.activation,
+            "metadata": self.metadata,
+        }
+        arrays = {
+            "composition": self.composition,
+            "input_min": self.input_min,
+            "input_max": self.input_max,
+            "output_mean": self.output_mean,
+            "output_std": self.output_std,
+        }
+        for i, (W, b) in enumerate(self.weights):
+            arrays[f"W{i}"] = W
+            arrays[f"b{i}"] = b
+        with open(path, "wb") as f:
+            onp.savez(
+                f,
+                header=onp.array(json.dumps(header)),
+                **{k: onp.asarray(v) for k, v in arrays.items()},
+            )
+
+    @classmethod
+    def load(cls, path: str | Path) -> "Emulator":
+        """
+        Load an emulator saved with :py:meth:`~.save`.
+
+        Raises
+        ------
+        ValueError
+            If the file was written by a newer version of the format, or if
+            the inputs or outputs stored in the file do not match the ones
+            of this version of jaxrts.
+        """
+        with onp.load(path) as f:
+            header = json.loads(str(f["header"]))
+            arrays = {k: f[k] for k in f.files if k != "header"}
+        if header["format_version"] > format_version:
+            raise ValueError(
+                f"{path} was written in version {header['format_version']} "
+                + f"of the emulator format, but only versions up to "
+                + f"{format_version} are supported."
+            )
+        elements = tuple(header["elements"])
+        if tuple(header["inputs"]) != input_names(elements) or tuple(
+            header["outputs"]
+        ) != output_names(elements):
+            raise ValueError(
+                f"The inputs or outputs of the emulator in {path} do not "
+                + "match the ones expected for its elements."
+            )
+        n_layers = len([k for k in arrays if k.startswith("W")])
+        weights = [(arrays[f"W{i}"], arrays[f"b{i}"]) for i in range(n_layers)]
+        return cls(
+            elements,
+            arrays["composition"],
+            weights,
+            arrays["input_min"],
+            arrays["input_max"],
+            jnp.asarray(arrays["output_mean"]),
+            jnp.asarray(arrays["output_std"]),
+            header["activation"],
+            header["metadata"],
+        )
+
+    # The following is required to jit an Emulator
+    def _tree_flatten(self):
+        children = (
+            self.composition,
+            self.weights,
+            self.input_min,
+            self.input_max,
+            self.output_mean,
+            self.output_std,
+        )
+        aux_data = (
+            self.elements,
+            self.activation,
+            json.dumps(self.metadata, sort_keys=True),
+        )  # static values
+        return (children, aux_data)
+
+    @classmethod
+    def _tree_unflatten(cls, aux_data, children):
+        obj = object.__new__(cls)
+        (
+            obj.composition,
+            obj.weights,
+            obj.input_min,
+            obj.input_max,
+            obj.output_mean,
+            obj.output_std,
+        ) = children
+        elements, obj.activation, metadata = aux_data
+        obj.elements = tuple(elements)
+        obj.metadata = json.loads(metadata)
+        return obj
+
+
+jax.tree_util.register_pytree_node(
+    Emulator,
+    Emulator._tree_flatten,
+    Emulator._tree_unflatten,
+)
+
+
+def _reference_S_ab(
+    features: jnp.ndarray,
+    emulator: Emulator,
+    plasma_state: "PlasmaState",
+    setup: Setup,
+) -> jnp.ndarray:
+    """
+    Calculate the upper triangle of :math:`S_{ab}` with the ``"ionic
+    scattering"`` model of ``plasma_state``, for the given ``features``.
+    """
+    n = len(emulator.elements)
+    log_theta, log_rho, Z = features[0], features[1], features[2 : 2 + n]
+    log_T_ratio, log_k = features[2 + n], features[3 + n]
+
+    state = jax.tree_util.tree_map(lambda leaf: leaf, plasma_state)
+    mass_fraction = state.mass_density / jnpu.sum(state.mass_density)
+    state.mass_density = (
+        mass_fraction * 10**log_rho * (1 * ureg.gram / ureg.centimeter**3)
+    )
+    state.Z_free = Z
+    E_f = fermi_energy(state.n_e)
+    state.T_e = 10**log_theta * E_f / ureg.k_B
+    state.T_i = jnp.ones(state.nions) * 10**log_T_ratio * state.T_e
+    q_k = jnpu.sqrt(2 * ureg.electron_mass * E_f)
+    probe_setup = get_probe_setup(10**log_k * q_k / (1 * ureg.hbar), setup)
+
+    S_ab = state["ionic scattering"].S_ii(state, probe_setup)
+    i, j = jnp.triu_indices(n)
+    return S_ab.m_as(ureg.dimensionless)[i, j]
+
+
+@partial(jax.jit, static_argnames=["mesh"])
+def _reference_batch(features, emulator, plasma_state, setup, mesh):
+    # Imported here, as jaxrts.sharding depends on the models, which use this
+    # module.
+    from .sharding import batch_axis
+
+    if mesh is not None:
+        features = jax.lax.with_sharding_constraint(
+            features, NamedSharding(mesh, P(batch_axis))
+        )
+    return jax.vmap(_reference_S_ab, in_axes=(0, None, None, None))(
+        features, emulator, plasma_state, setup
+    )
+
+
+def reference_structure_factors(
+    emulator: Emulator,
+    plasma_state: "PlasmaState",
+    features: jnp.ndarray,
+    batch_size: int = 64,
+    mesh: Mesh | None = None,
+) -> jnp.ndarray:
+    """
+    Calculate :math:`S_{ab}` with the ``"ionic scattering"`` model of
+    ``plasma_state`` (e.g.,
+    :py:class:`jaxrts.models.OnePotentialHNCIonFeat`) for the inputs
+    ``features`` of the ``emulator``.
+
+    The samples are evaluated in batches of ``batch_size``, with
+    :py:func:`jax.vmap`. If a ``mesh`` is given (see
+    :py:func:`jaxrts.sharding.device_mesh`), every batch is distributed over
+    its :py:data:`jaxrts.sharding.batch_axis`.
+
+    Parameters
+    ----------
+    emulator: Emulator
+        The emulator, defining the elements.
+    plasma_state: PlasmaState
+        The plasma state, with one ion per element of the emulator, defining
+        the composition and all models required by the reference model.
+    features: jnp.ndarray
+        The inputs (in the coordinates of the network), with the shape
+        ``(n_samples, n_inputs)``.
+    batch_size: int
+        The number of samples evaluated at once. Has to be a multiple of the
+        number of devices along the batch axis of ``mesh``.
+    mesh: Mesh | None
+        The device mesh.
+
+    Returns
+    -------
+    jnp.ndarray
+        The upper triangle of :math:`S_{ab}`, with the shape ``(n_samples,
+        n_outputs)``. Samples for which the reference model did not give a
+        finite result contain NaN.
+    """
+    from .sharding import batch_axis
+
+    symbols = [ion.symbol for ion in plasma_state.ions]
+    if tuple(symbols) != emulator.elements:
+        raise ValueError(
+            f"The plasma state has to contain one ion per element "
+            + f"{emulator.elements}, but it contains {symbols}."
+        )
+    if mesh is not None and batch_size % mesh.shape[batch_axis] != 0:
+        raise ValueError(
+            f"The batch size {batch_size} is not a multiple of the "
+            + f"{mesh.shape[batch_axis]} devices along the batch axis."
+        )
+    setup = Setup(
+        ureg("90°"),
+        ureg("10keV"),
+        jnp.linspace(9.9, 10.1, 3) * ureg.kiloelectron_volt,
+        partial(instrument_gaussian, sigma=ureg("1eV") / ureg.hbar),
+    )
+    features = jnp.asarray(features, dtype=float)
+    outputs = []
+    for start in range(0, len(features), batch_size):
+        batch = features[start : start + batch_size]
+        n = len(batch)
+        # Pad the last batch, so that all batches have the same shape
+        batch = jnp.concatenate(
+            [batch, jnp.repeat(batch[-1:], batch_size - n, axis=0)]
+        )
+        outputs.append(
+            _reference_batch(batch, emulator, plasma_state, setup, mesh)[:n]
+        )
+        logger.info(f"Calculated {start + n}/{len(features)} samples.")
+    return jnp.concatenate(outputs)
+
+
+def generate_training_data(
+    emulator: Emulator,
+    plasma_state: "PlasmaState",
+    n_samples: int,
+    key: jax.Array,
+    batch_size: int = 64,
+    mesh: Mesh | None = None,
+) -> tuple[jnp.ndarray, jnp.ndarray]:
+    """
+    Calculate :math:`S_{ab}` with the ``"ionic scattering"`` model of
+    ``plasma_state`` for random inputs, drawn uniformly within the domain of
+    the ``emulator`` (see :py:func:`~.reference_structure_factors`).
+
+    The name of the reference model is stored in the metadata of the
+    ``emulator``. For large data sets, which should be written to disk while
+    they are generated, see :py:mod:`jaxrts.training_data`.
+
+    Parameters
+    ----------
+    n_samples: int
+        The number of samples.
+    key: jax.Array
+        The random key.
+
+    See :py:func:`~.reference_structure_factors` for the other arguments.
+
+    Returns
+    -------
+    jnp.ndarray
+        The inputs (in the coordinates of the network), with the shape
+        ``(n_samples, n_inputs)``.
+    jnp.ndarray
+        The upper triangle of :math:`S_{ab}`, with the shape ``(n_samples,
+        n_outputs)``.
+    """
+    emulator.metadata["reference"] = plasma_state["ionic scattering"].__name__
+    features = jax.random.uniform(
+        key,
+        (n_samples, len(emulator.input_min)),
+        minval=emulator.input_min,
+        maxval=emulator.input_max,
+    )
+    outputs = reference_structure_factors(
+        emulator, plasma_state, features, batch_size, mesh
+    )
+    return features, outputs
+
+
+def train(
+    emulator: Emulator,
+    inputs: jnp.ndarray,
+    outputs: jnp.ndarray,
+    key: jax.Array,
+    n_epochs: int = 500,
+    batch_size: int = 128,
+    learning_rate: float = 1e-3,
+    validation_fraction: float = 0.2,
+) -> tuple[Emulator, dict[str, list[float]]]:
+    """
+    Train the ``emulator`` on the ``inputs`` and ``outputs`` (see
+    :py:func:`~.generate_training_data`), by minimizing the mean squared
+    error of the scaled outputs with the Adam optimizer.
+
+    Samples with non-finite outputs are discarded.
+
+    Parameters
+    ----------
+    emulator: Emulator
+        The emulator, whose weights are used as the starting point.
+    inputs, outputs: jnp.ndarray
+        The training data.
+    key: jax.Array
+        The random key for the split into training and validation data and
+        the shuffling.
+    n_epochs: int
+        The number of passes through the training data.
+    batch_size: int
+        The number of samples per step.
+    learning_rate: float
+        The learning rate of the Adam optimizer.
+    validation_fraction: float
+        The fraction of the samples which is used for validation, only.
+
+    Returns
+    -------
+    Emulator
+        The trained emulator. The root mean squared errors of every output on
+        the validation data are stored in its metadata.
+    dict[str, list[float]]
+        The losses on the training and validation data after every epoch.
+    """
+    finite = jnp.all(jnp.isfinite(outputs), axis=1)
+    if not jnp.all(finite):
+        logger.warning(
+            f"Discarding {int(jnp.sum(~finite))} samples with non-finite "
+            + "outputs."
+        )
+    inputs, outputs = inputs[finite], outputs[finite]
+    key, subkey = jax.random.split(key)
+    order = jax.random.permutation(subkey, len(inputs))
+    n_val = int(validation_fraction * len(inputs))
+    x_val, y_val = inputs[order[:n_val]], outputs[order[:n_val]]
+    x_train, y_train = inputs[order[n_val:]], outputs[order[n_val:]]
+    batch_size = min(batch_size, len(x_train))
+
+    mean = jnp.mean(y_train, axis=0)
+    std = jnp.std(y_train, axis=0)
+    std = jnp.where(std > 0, std, 1.0)
+    children, aux_data = emulator._tree_flatten()
+    emulator = Emulator._tree_unflatten(aux_data, (*children[:4], mean, std))
+
+    def loss(weights, x, y):
+        children, aux_data = emulator._tree_flatten()
+        model = Emulator._tree_unflatten(
+            aux_data, (children[0], weights, *children[2:])
+        )
+        return jnp.mean(((model(x) - y) / std) ** 2)
+
+    b1, b2, eps = 0.9, 0.999, 1e-8
+
+    def adam(carry, batch):
+        weights, m, v, t = carry
+        value, grad = jax.value_and_grad(loss)(weights, *batch)
+        t = t + 1
+        m = jax.tree_util.tree_map(lambda m, g: b1 * m + (1 - b1) * g, m, grad)
+        v = jax.tree_util.tree_map(
+            lambda v, g: b2 * v + (1 - b2) * g**2, v, grad
+        )
+        weights = jax.tree_util.tree_map(
+            lambda w, m, v: w
+            - learning_rate
+            * (m / (1 - b1**t))
+            / (jnp.sqrt(v / (1 - b2**t)) + eps),
+            weights,
+            m,
+            v,
+        )
+        return (weights, m, v, t), value
+
+    @jax.jit
+    def epoch(carry, key):
+        n_batches = len(x_train) // batch_size
+        idx = jax.random.permutation(key, len(x_train))[
+            : n_batches * batch_size
+        ].reshape(n_batches, batch_size)
+        carry, values = jax.lax.scan(adam, carry, (x_train[idx], y_train[idx]))
+        return carry, jnp.mean(values), loss(carry[0], x_val, y_val)
+
+    zeros = jax.tree_util.tree_map(jnp.zeros_like, emulator.weights)
+    carry = (emulator.weights, zeros, zeros, 0)
+    history = {"train": [], "validation": []}
+    for i, subkey in enumerate(jax.random.split(key, n_epochs)):
+        carry, train_loss, val_loss = epoch(carry, subkey)
+        history["train"].append(float(train_loss))
+        history["validation"].append(float(val_loss))
+        if (i + 1) % max(n_epochs // 10, 1) == 0:
+            logger.info(
+                f"Epoch {i + 1}/{n_epochs}: training loss {train_loss:.3e}, "
+                + f"validation loss {val_loss:.3e}."
+            )
+
+    children, aux_data = emulator._tree_flatten()
+    emulator = Emulator._tree_unflatten(
+        aux_data, (children[0], carry[0], *children[2:])
+    )
+    rmse = jnp.sqrt(jnp.mean((emulator(x_val) - y_val) ** 2, axis=0))
+    emulator.metadata.update(
+        {
+            "n_training_samples": len(x_train),
+            "n_validation_samples": n_val,
+            "validation_rmse": dict(
+                zip(emulator.output_names, map(float, rmse))
+            ),
+            "created": datetime.datetime.now(
+                datetime.timezone.utc
+            ).isoformat(),
+        }
+    )
+    return emulator, history
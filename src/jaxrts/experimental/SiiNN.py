@@ -7,6 +7,12 @@ Models have to be trained, for each sample type, separately. Tools for doing so
 are provided in the `tools/SiiInterpolation/` directory of the jaxrts
 repository. The trained network is saved as an :py:mod:`orbax` checkpoint (with
 slight additions to save properties of the net architecture.
+
+.. note::
+
+   :py:mod:`jaxrts.emulator` and :py:class:`jaxrts.models.EmulatedIonFeat`
+   provide this functionality for an arbitrary number of ion species, without
+   requiring :py:mod:`flax` and :py:mod:`orbax`.
 """
 
 import json
@@ -0,0 +1,759 @@
+"""
+This submodule fits the parameters of a
+:py:class:`jaxrts.plasmastate.PlasmaState` to a measured spectrum.
+
+The free parameters are described by :py:class:`~.Parameter` objects, which
+can refer to attributes of the plasma state (e.g., ``T_e``,
+``mass_density`` or ``Z_free``) or to attributes of its models. Bounded
+parameters are transformed to an unbounded internal representation, so that
+the optimizers do not have to handle constraints.
+
+The residuals and the loss are pure functions of the internal parameters,
+which can be jitted, differentiated (see :py:func:`~.value_and_grad`) and
+vectorized with :py:func:`jax.vmap`, e.g., over multiple starting points or
+multiple measured spectra. Two optimizers are provided,
+:py:func:`~.levenberg_marquardt` for least-squares problems and
+:py:func:`~.lbfgs` for general losses. :py:func:`~.fit` combines everything,
+including uncertainties from the Laplace approximation of the posterior.
+
+Examples
+--------
+>>> parameters = (
+>>>     jaxrts.fitting.Parameter("T_e", 1, 100, unit="eV/k_B"),
+>>>     jaxrts.fitting.Parameter("Z_free", 0, 6, index=0),
+>>> )
+>>> result = jaxrts.fitting.fit(
+>>>     state, setup, data, parameters, initial=[[20, 2], [50, 4]]
+>>> )
+>>> print(result)
+"""
+
+import logging
+from functools import partial
+
+import jax
+import jax.numpy as jnp
+
+from .plasmastate import PlasmaState
+from .setup import Setup
+from .units import Quantity, ureg
+
+logger = logging.getLogger(__name__)
+
+
+class Parameter:
+    """
+    A free parameter of a fit.
+
+    Parameters with a lower and an upper bound are mapped to the real axis
+    via a logistic function, parameters with only one bound via an
+    exponential and unbounded parameters are not transformed.
+    """
+
+    def __init__(
+        self,
+        name: str | tuple[str],
+        lower: float | None = None,
+        upper: float | None = None,
+        unit: str | None = None,
+        key: str | None = None,
+        index: int | None = None,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        name: str | tuple[str]
+            The name of the attribute of the plasma state (or the model, see
+            ``key``) which is fitted. If a tuple of names is given, all these
+            attributes are set to the same value, e.g., ``("T_e", "T_i")``
+            for a common temperature of electrons and ions.
+        lower, upper: float | None
+            The bounds of the parameter, in units of ``unit``.
+        unit: str | None
+            The unit of the values and bounds of the parameter, e.g.,
+            ``"eV/k_B"`` for a temperature. If ``None``, the units of the
+            attribute are used.
+        key: str | None
+            If not ``None``, the parameter is an attribute of the model
+            stored under this key, e.g., ``"ipd"``. Only attributes which are
+            pytree children of the model can be fitted.
+        index: int | None
+            For array attributes, e.g., ``Z_free``, the index of the fitted
+            entry. If ``None``, all entries are set to the same value.
+        """
+        #: The name(s) of the fitted attribute(s).
+        self.names: tuple[str] = (name,) if isinstance(name, str) else name
+        #: The lower bound of the parameter, in units of :py:attr:`~.unit`.
+        self.lower: float | None = lower
+        #: The upper bound of the parameter, in units of :py:attr:`~.unit`.
+        self.upper: float | None = upper
+        #: The unit of the parameter.
+        self.unit: str | None = unit
+        #: The key of the model, if the parameter is a model attribute.
+        self.key: str | None = key
+        #: The index of the fitted entry of an array attribute.
+        self.index: int | None = index
+
+    @property
+    def label(self) -> str:
+        label = "/".join(self.names)
+        if self.key is not None:
+            label = f"{self.key}.{label}"
+        if self.index is not None:
+            label += f"[{self.index}]"
+        return label
+
+    def to_physical(self, u: jnp.ndarray) -> jnp.ndarray:
+        """
+        Transform the internal, unbounded value ``u`` to the value of the
+        parameter.
+        """
+        if self.lower is not None and self.upper is not None:
+            return self.lower + (self.upper - self.lower) * jax.nn.sigmoid(u)
+        if self.lower is not None:
+            return self.lower + jnp.exp(u)
+        if self.upper is not None:
+            return self.upper - jnp.exp(u)
+        return u
+
+    def to_internal(self, x: jnp.ndarray) -> jnp.ndarray:
+        """
+        The inverse of :py:meth:`~.to_physical`.
+        """
+        x = jnp.asarray(x, dtype=float)
+        if self.lower is not None and self.upper is not None:
+            y = (x - self.lower) / (self.upper - self.lower)
+            return jnp.log(y) - jnp.log1p(-y)
+        if self.lower is not None:
+            return jnp.log(x - self.lower)
+        if self.upper is not None:
+            return jnp.log(self.upper - x)
+        return x
+
+    def log_jacobian(self, u: jnp.ndarray) -> jnp.ndarray:
+        """
+        The logarithm of the derivative of :py:meth:`~.to_physical` at the
+        internal value ``u``.
+        """
+        u = jnp.asarray(u, dtype=float)
+        if self.lower is not None and self.upper is not None:
+            return (
+                jnp.log(self.upper - self.lower)
+                + jax.nn.log_sigmoid(u)
+                + jax.nn.log_sigmoid(-u)
+            )
+        if self.lower is not None or self.upper is not None:
+            return u
+        return jnp.zeros_like(u)
+
+    def _set(self, obj, x: jnp.ndarray) -> None:
+        for name in self.names:
+            old = getattr(obj, name)
+            if isinstance(old, Quantity):
+                unit = old.units if self.unit is None else ureg(self.unit)
+                old_m = old.m_as(unit)
+            else:
+                unit, old_m = None, jnp.asarray(old)
+            if self.index is None:
+                new = jnp.broadcast_to(x, jnp.shape(old_m)).astype(float)
+            else:
+                new = old_m.astype(float).at[self.index].set(x)
+            setattr(obj, name, new if unit is None else new * unit)
+
+    def get(self, plasma_state: PlasmaState) -> jnp.ndarray:
+        """
+        The current value of the parameter in ``plasma_state``, in units of
+        :py:attr:`~.unit`.
+        """
+        obj = (
+            plasma_state if self.key is None else plasma_state.models[self.key]
+        )
+        value = getattr(obj, self.names[0])
+        if isinstance(value, Quantity):
+            value = value.m_as(value.units if self.unit is None else self.unit)
+        value = jnp.asarray(value)
+        if self.index is not None:
+            return value[self.index]
+        return jnp.mean(value)
+
+    def __repr__(self) -> str:
+        return (
+            f"Parameter({self.label}, lower={self.lower}, "
+            + f"upper={self.upper}, unit={self.unit})"
+        )
+
+    def _key(self) -> tuple:
+        return (
+            self.names,
+            self.lower,
+            self.upper,
+            self.unit,
+            self.key,
+            self.index,
+        )
+
+    # Parameters are static arguments of jitted functions
+    def __hash__(self) -> int:
+        return hash(self._key())
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Parameter):
+            return self._key() == other._key()
+        return NotImplemented
+
+
+def to_physical(parameters: tuple[Parameter], u: jnp.ndarray) -> jnp.ndarray:
+    """
+    Transform the internal values ``u`` (last axis) of all ``parameters``.
+    """
+    return jnp.stack(
+        [p.to_physical(u[..., i]) for i, p in enumerate(parameters)], axis=-1
+    )
+
+
+def to_internal(parameters: tuple[Parameter], x: jnp.ndarray) -> jnp.ndarray:
+    """
+    The inverse of :py:func:`~.to_physical`.
+    """
+    x = jnp.asarray(x, dtype=float)
+    return jnp.stack(
+        [p.to_internal(x[..., i]) for i, p in enumerate(parameters)], axis=-1
+    )
+
+
+def apply(
+    parameters: tuple[Parameter], x: jnp.ndarray, plasma_state: PlasmaState
+) -> PlasmaState:
+    """
+    Return a copy of ``plasma_state``, with the ``parameters`` set to the
+    values ``x``. The original state is not modified.
+    """
+    state = jax.tree_util.tree_map(lambda leaf: leaf, plasma_state)
+    for i, p in enumerate(parameters):
+        p._set(state if p.key is None else state.models[p.key], x[i])
+    return state
+
+
+def residuals(
+    u: jnp.ndarray,
+    parameters: tuple[Parameter],
+    plasma_state: PlasmaState,
+    setup: Setup,
+    data: jnp.ndarray,
+    sigma: jnp.ndarray | float = 1.0,
+    free_amplitude: bool = True,
+) -> jnp.ndarray:
+    """
+    The normalized residuals :math:`(A I(u) - d) / \\sigma` between the
+    spectrum :math:`I` calculated by
+    :py:meth:`jaxrts.plasmastate.PlasmaState.probe` and the measured ``data``
+    :math:`d`.
+
+    Parameters
+    ----------
+    u: jnp.ndarray
+        The internal values of the ``parameters``.
+    parameters: tuple[Parameter]
+        The free parameters.
+    plasma_state: PlasmaState
+        The plasma state, defining the models and all fixed parameters.
+    setup: Setup
+        The setup of the measurement.
+    data: jnp.ndarray
+        The measured spectrum, on the :py:attr:`~.Setup.measured_energy`. If
+        ``free_amplitude`` is ``False``, it has to be given in units of
+        seconds (or as a Quantity).
+    sigma: jnp.ndarray | float
+        The uncertainty of ``data``.
+    free_amplitude: bool
+        If ``True``, the amplitude :math:`A` is chosen, such that the
+        residuals are minimal, i.e., the data can have arbitrary units.
+        Otherwise, :math:`A = 1`.
+    """
+    state = apply(parameters, to_physical(parameters, u), plasma_state)
+    model = state.probe(setup).m_as(ureg.second)
+    if isinstance(data, Quantity):
+        data = data.m_as(ureg.second) if not free_amplitude else data.m
+    w = 1 / sigma**2
+    if free_amplitude:
+        amplitude = jnp.sum(w * model * data) / jnp.sum(w * model**2)
+        model = amplitude * model
+    return (model - data) / sigma
+
+
+def loss(
+    u: jnp.ndarray,
+    parameters: tuple[Parameter],
+    plasma_state: PlasmaState,
+    setup: Setup,
+    data: jnp.ndarray,
+    sigma: jnp.ndarray | float = 1.0,
+    free_amplitude: bool = True,
+) -> jnp.ndarray:
+    """
+    The :math:`\\chi^2`, i.e., the sum of the squared :py:func:`~.residuals`.
+    See there for the arguments.
+    """
+    return jnp.sum(
+        residuals(
+            u, parameters, plasma_state, setup, data, sigma, free_amplitude
+        )
+        ** 2
+    )
+
+
+#: The jitted value and gradient of :py:func:`~.loss`, with respect to the
+#: internal parameters.
+value_and_grad = jax.jit(
+    jax.value_and_grad(loss), static_argnames=["parameters", "free_amplitude"]
+)
+
+
+def levenberg_marquardt(
+    fun,
+    u0: jnp.ndarray,
+    max_iter: int = 100,
+    tol: float = 1e-8,
+) -> tuple[jnp.ndarray, jnp.ndarray, jnp.ndarray]:
+    """
+    Minimize :math:`\\sum_i f_i(u)^2` with the Levenberg-Marquardt algorithm.
+    The damping is updated as proposed by :cite:`Nielsen.1999`.
+
+    The Jacobian is calculated with forward-mode differentiation, i.e., with
+    one (vectorized) evaluation per parameter. The function can be jitted and
+    used with :py:func:`jax.vmap`.
+
+    Parameters
+    ----------
+    fun: Callable
+        The residuals, as a function of the parameters.
+    u0: jnp.ndarray
+        The starting point.
+    max_iter: int
+        The maximal number of iterations.
+    tol: float
+        The iteration stops if the maximal component of the gradient, or the
+        relative change of the parameters, is smaller than ``tol``.
+
+    Returns
+    -------
+    jnp.ndarray
+        The parameters at the minimum.
+    jnp.ndarray
+        The sum of the squared residuals at the minimum.
+    jnp.ndarray
+        The number of iterations.
+    """
+    jac = jax.jacfwd(lambda u: (fun(u), fun(u)), has_aux=True)
+
+    def linearize(u):
+        J, r = jac(u)
+        return r, J
+
+    def condition(val):
+        *_, i, done = val
+        return (~done) & (i < max_iter)
+
+    def step(val):
+        u, r, J, lam, nu, i, _ = val
+        A = J.T @ J
+        g = J.T @ r
+        diag = jnp.diag(A) + jnp.finfo(A.dtype).eps
+        delta = jnp.linalg.solve(A + lam * jnp.diag(diag), -g)
+        u_new = u + delta
+        r_new, J_new = linearize(u_new)
+
+        chi2, chi2_new = jnp.sum(r**2), jnp.sum(r_new**2)
+        predicted = jnp.dot(delta, lam * diag * delta - g)
+        rho = (chi2 - chi2_new) / predicted
+        accept = (rho > 0) & jnp.isfinite(chi2_new)
+
+        u, r, J = jax.tree_util.tree_map(
+            lambda new, old: jnp.where(accept, new, old),
+            (u_new, r_new, J_new),
+            (u, r, J),
+        )
+        lam = jnp.where(
+            accept,
+            lam * jnp.maximum(1 / 3, 1 - (2 * rho - 1) ** 3),
+            lam * nu,
+        )
+        nu = jnp.where(accept, 2.0, 2 * nu)
+        done = (jnp.max(jnp.abs(J.T @ r)) < tol) | (
+            accept
+            & (jnp.max(jnp.abs(delta)) < tol * (1 + jnp.max(jnp.abs(u))))
+        )
+        return u, r, J, lam, nu, i + 1, done
+
+    r0, J0 = linearize(u0)
+    u, r, *_, n_iter, _ = jax.lax.while_loop(
+        condition, step, (u0, r0, J0, 1e-3, 2.0, 0, False)
+    )
+    return u, jnp.sum(r**2), n_iter
+
+
+def lbfgs(
+    fun,
+    u0: jnp.ndarray,
+    max_iter: int = 200,
+    tol: float = 1e-8,
+    history: int = 10,
+) -> tuple[jnp.ndarray, jnp.ndarray, jnp.ndarray]:
+    """
+    Minimize the scalar ``fun`` with the limited-memory BFGS algorithm
+    :cite:`Nocedal.2006`, using a backtracking line search (Armijo
+    condition). The function can be jitted and used with :py:func:`jax.vmap`.
+
+    Parameters
+    ----------
+    fun: Callable
+        The function to minimize.
+    u0: jnp.ndarray
+        The starting point.
+    max_iter: int
+        The maximal number of iterations.
+    tol: float
+        The iteration stops if the maximal component of the gradient is
+        smaller than ``tol``, or if the relative decrease of ``fun`` in the
+        last step is smaller than ``tol``.
+    history: int
+        The number of previous steps used to approximate the Hessian.
+
+    Returns
+    -------
+    jnp.ndarray
+        The parameters at the minimum.
+    jnp.ndarray
+        The value of ``fun`` at the minimum.
+    jnp.ndarray
+        The number of iterations.
+    """
+    value_and_grad = jax.value_and_grad(fun)
+    n = u0.shape[0]
+
+    def direction(g, S, Y, rho):
+        # Two-loop recursion. The newest pair is the last entry, unused
+        # entries have rho == 0 and do not contribute.
+        def first(q, k):
+            alpha = rho[k] * jnp.dot(S[k], q)
+            return q - alpha * Y[k], alpha
+
+        q, alpha = jax.lax.scan(first, g, jnp.arange(history)[::-1])
+        alpha = alpha[::-1]
+        yy = jnp.dot(Y[-1], Y[-1])
+        gamma = jnp.where(yy > 0, jnp.dot(S[-1], Y[-1]) / yy, 1.0)
+        r = gamma * q
+
+        def second(r, k):
+            beta = rho[k] * jnp.dot(Y[k], r)
+            return r + S[k] * (alpha[k] - beta), None
+
+        r, _ = jax.lax.scan(second, r, jnp.arange(history))
+        return -r
+
+    def line_search(u, f, g, d):
+        slope = jnp.dot(g, d)
+
+        def condition(val):
+            t, f_new, _, j = val
+            return (~(f_new <= f + 1e-4 * t * slope)) & (j < 30)
+
+        def shrink(val):
+            t, *_, j = val
+            t = t / 2
+            f_new, g_new = value_and_grad(u + t * d)
+            f_new = jnp.where(jnp.isfinite(f_new), f_new, jnp.inf)
+            return t, f_new, g_new, j + 1
+
+        f_new, g_new = value_and_grad(u + d)
+        f_new = jnp.where(jnp.isfinite(f_new), f_new, jnp.inf)
+        t, f_new, g_new, _ = jax.lax.while_loop(
+            condition, shrink, (1.0, f_new, g_new, 0)
+        )
+        return t, f_new, g_new
+
+    def condition(val):
+        _, f, g, *_, f_prev, i = val
+        return (
+            (jnp.max(jnp.abs(g)) > tol)
+            & (f_prev - f > tol * jnp.abs(f))
+            & (i < max_iter)
+        )
+
+    def step(val):
+        u, f, g, S, Y, rho, _, i = val
+        d = direction(g, S, Y, rho)
+        # Fall back to steepest descent, if d is not a descent direction
+        d = jnp.where(jnp.dot(d, g) < 0, d, -g)
+        t, f_new, g_new = line_search(u, f, g, d)
+        s, y = t * d, g_new - g
+        sy = jnp.dot(s, y)
+        # Only keep pairs with positive curvature
+        keep = sy > 1e-12 * jnp.sqrt(jnp.dot(s, s) * jnp.dot(y, y))
+        S = jnp.where(keep, jnp.roll(S, -1, axis=0).at[-1].set(s), S)
+        Y = jnp.where(keep, jnp.roll(Y, -1, axis=0).at[-1].set(y), Y)
+        rho = jnp.where(
+            keep, jnp.roll(rho, -1).at[-1].set(1 / jnp.where(keep, sy, 1)), rho
+        )
+        return u + s, f_new, g_new, S, Y, rho, f, i + 1
+
+    f0, g0 = value_and_grad(u0)
+    u, f, *_, n_iter = jax.lax.while_loop(
+        condition,
+        step,
+        (
+            u0,
+            f0,
+            g0,
+            jnp.zeros((history, n)),
+            jnp.zeros((history, n)),
+            jnp.zeros(history),
+            jnp.inf,
+            0,
+        ),
+    )
+    return u, f, n_iter
+
+
+@partial(
+    jax.jit,
+    static_argnames=["parameters", "free_amplitude", "method", "max_iter"],
+)
+def solve(
+    u0: jnp.ndarray,
+    parameters: tuple[Parameter],
+    plasma_state: PlasmaState,
+    setup: Setup,
+    data: jnp.ndarray,
+    sigma: jnp.ndarray | float = 1.0,
+    free_amplitude: bool = True,
+    method: str = "lm",
+    max_iter: int = 100,
+    tol: float = 1e-8,
+) -> tuple[jnp.ndarray, jnp.ndarray, jnp.ndarray]:
+    """
+    Minimize the :py:func:`~.loss`, starting at the internal parameters
+    ``u0``. This is the jitted core of :py:func:`~.fit`, which can be used
+    with :py:func:`jax.vmap`, e.g., to fit many spectra at once.
+
+    Parameters
+    ----------
+    method: str
+        ``"lm"`` for :py:func:`~.levenberg_marquardt`, or ``"lbfgs"`` for
+        :py:func:`~.lbfgs`.
+
+    See :py:func:`~.residuals` for the other arguments.
+
+    Returns
+    -------
+    jnp.ndarray
+        The internal parameters at the minimum.
+    jnp.ndarray
+        The :math:`\\chi^2` at the minimum.
+    jnp.ndarray
+        The number of iterations.
+    """
+    args = (parameters, plasma_state, setup, data, sigma, free_amplitude)
+    if method == "lm":
+        return levenberg_marquardt(
+            lambda u: residuals(u, *args), u0, max_iter, tol
+        )
+    if method == "lbfgs":
+        return lbfgs(lambda u: loss(u, *args), u0, max_iter, tol)
+    raise ValueError(f"Unknown method '{method}'. Use 'lm' or 'lbfgs'.")
+
+
+@partial(
+    jax.jit,
+    static_argnames=["parameters", "free_amplitude", "method"],
+)
+def covariance(
+    u: jnp.ndarray,
+    parameters: tuple[Parameter],
+    plasma_state: PlasmaState,
+    setup: Setup,
+    data: jnp.ndarray,
+    sigma: jnp.ndarray | float = 1.0,
+    free_amplitude: bool = True,
+    method: str = "gauss-newton",
+) -> jnp.ndarray:
+    """
+    The covariance of the (physical) parameters in the Laplace approximation,
+    i.e., the inverse of the Hessian of :math:`\\chi^2 / 2` at the minimum
+    ``u``, transformed from the internal to the physical parameters.
+
+    Parameters
+    ----------
+    method: str
+        ``"gauss-newton"`` approximates the Hessian by :math:`J^T J`, where
+        :math:`J` is the Jacobian of the residuals. ``"hessian"`` uses the
+        full Hessian of the loss.
+
+    See :py:func:`~.residuals` for the other arguments.
+    """
+    args = (parameters, plasma_state, setup, data, sigma, free_amplitude)
+    if method == "gauss-newton":
+        J = jax.jacfwd(residuals)(u, *args)
+        H = J.T @ J
+    elif method == "hessian":
+        H = jax.hessian(loss)(u, *args) / 2
+    else:
+        raise ValueError(
+            f"Unknown method '{method}'. Use 'gauss-newton' or 'hessian'."
+        )
+    D = jax.jacfwd(partial(to_physical, parameters))(u)
+    return D @ jnp.linalg.pinv(H) @ D.T
+
+
+class FitResult:
+    """
+    The result of :py:func:`~.fit`.
+    """
+
+    def __init__(
+        self,
+        parameters: tuple[Parameter],
+        values: jnp.ndarray,
+        chi2: float,
+        n_iter: int,
+        covariance: jnp.ndarray,
+        dof: int,
+        starts_chi2: jnp.ndarray,
+    ) -> None:
+        #: The fitted parameters.
+        self.parameters = parameters
+        #: The best-fit values, in the units of the parameters.
+        self.values = values
+        #: The :math:`\chi^2` of the best fit.
+        self.chi2 = chi2
+        #: The number of iterations of the best fit.
+        self.n_iter = n_iter
+        #: The covariance of the parameters.
+        self.covariance = covariance
+        #: The number of degrees of freedom, i.e., the number of data points
+        #: minus the number of parameters.
+        self.dof = dof
+        #: The :math:`\chi^2` reached from every starting point.
+        self.starts_chi2 = starts_chi2
+
+    @property
+    def uncertainties(self) -> jnp.ndarray:
+        """
+        The standard deviations of the parameters.
+        """
+        return jnp.sqrt(jnp.diag(self.covariance))
+
+    @property
+    def reduced_chi2(self) -> float:
+        return self.chi2 / self.dof
+
+    def as_dict(self) -> dict[str, tuple[float, float]]:
+        """
+        Map the labels of the parameters to their values and uncertainties.
+        """
+        return {
+            p.label: (float(v), float(e))
+            for p, v, e in zip(
+                self.parameters, self.values, self.uncertainties
+            )
+        }
+
+    def __str__(self) -> str:
+        lines = [
+            f"{p.label}: {v:g} ± {e:g} {p.unit or ''}".rstrip()
+            for p, v, e in zip(
+                self.parameters, self.values, self.uncertainties
+            )
+        ]
+        lines.append(f"chi2/dof: {self.chi2:g}/{self.dof}")
+        return "\n".join(lines)
+
+
+def fit(
+    plasma_state: PlasmaState,
+    setup: Setup,
+    data: jnp.ndarray | Quantity,
+    parameters: tuple[Parameter],
+    initial: jnp.ndarray | None = None,
+    sigma: jnp.ndarray | float | None = None,
+    free_amplitude: bool = True,
+    method: str = "lm",
+    max_iter: int = 100,
+    tol: float = 1e-8,
+    uncertainty: str = "gauss-newton",
+) -> FitResult:
+    """
+    Fit the ``parameters`` of ``plasma_state`` to the measured spectrum
+    ``data``.
+
+    Parameters
+    ----------
+    plasma_state: PlasmaState
+        The plasma state, defining the models and all fixed parameters.
+    setup: Setup
+        The setup of the measurement.
+    data: jnp.ndarray | Quantity
+        The measured spectrum, on the :py:attr:`~.Setup.measured_energy`.
+    parameters: tuple[Parameter]
+        The free parameters.
+    initial: jnp.ndarray | None
+        The starting values of the parameters, in their units. Either of
+        shape ``(len(parameters),)``, or ``(n_starts, len(parameters))`` for
+        a multi-start fit, where all starts are optimized simultaneously
+        (with :py:func:`jax.vmap`) and the best result is returned. If
+        ``None``, the values of ``plasma_state`` are used.
+    sigma: jnp.ndarray | float | None
+        The uncertainty of ``data``. If ``None``, all points are weighted
+        equally and the covariance is scaled by the reduced
+        :math:`\\chi^2`.
+    free_amplitude: bool
+        If ``True``, the data can have arbitrary units, and the amplitude of
+        the calculated spectrum is fitted, too (see :py:func:`~.residuals`).
+    method: str
+        The optimizer, ``"lm"`` or ``"lbfgs"`` (see :py:func:`~.solve`).
+    max_iter: int
+        The maximal number of iterations.
+    tol: float
+        The tolerance of the optimizer.
+    uncertainty: str
+        The approximation of the Hessian for the covariance, see
+        :py:func:`~.covariance`.
+
+    Returns
+    -------
+    FitResult
+        The best-fit values and their uncertainties.
+    """
+    parameters = tuple(parameters)
+    if initial is None:
+        initial = jnp.array([p.get(plasma_state) for p in parameters])
+    initial = jnp.atleast_2d(jnp.asarray(initial, dtype=float))
+    scale_covariance = sigma is None
+    sigma = 1.0 if sigma is None else sigma
+
+    args = (parameters, plasma_state, setup, data, sigma, free_amplitude)
+    u0 = to_internal(parameters, initial)
+    if not jnp.all(jnp.isfinite(u0)):
+        raise ValueError("All starting values have to be within the bounds.")
+    u, chi2, n_iter = jax.vmap(
+        lambda u0: solve(u0, *args, method, max_iter, tol)
+    )(u0)
+    best = int(jnp.nanargmin(chi2))
+    logger.info(
+        f"Best of {len(u0)} starts: chi2 = {chi2[best]:g} after "
+        + f"{n_iter[best]} iterations."
+    )
+
+    dof = len(setup.measured_energy) - len(parameters) - int(free_amplitude)
+    cov = covariance(u[best], *args, uncertainty)
+    if scale_covariance:
+        cov = cov * chi2[best] / dof
+    return FitResult(
+        parameters,
+        to_physical(parameters, u[best]),
+        float(chi2[best]),
+        int(n_iter[best]),
+        cov,
+        dof,
+        chi2,
+    )
@@ -39,11 +39,12 @@ class FreeBoundFlippedSetup(Setup):
     ):
         self.scattering_angle: Quantity = setup.scattering_angle
         self.energy: Quantity = setup.energy
-        self.measured_energy: Quantity = (
+        self._measured_energy: Quantity = (
             2 * setup.energy - setup.measured_energy
         )
-        self.instrument: Callable = setup.instrument
+        self._instrument: Callable = setup.instrument
         self.correct_k_dispersion: bool = setup.correct_k_dispersion
+        self._cache_instrument_kernel()
 
     @property
     def full_k(self) -> Quantity:
@@ -100,6 +101,8 @@ class FreeBoundFlippedSetup(Setup):
             self.energy,
             self.measured_energy,
             self.instrument,
+            self._instrument_kernel,
+            self._instrument_kernel_fft,
         )
         aux_data = (self.correct_k_dispersion,)  # static values
         return (children, aux_data)
@@ -110,8 +113,10 @@ class FreeBoundFlippedSetup(Setup):
         (
             obj.scattering_angle,
             obj.energy,
-            obj.measured_energy,
-            obj.instrument,
+            obj._measured_energy,
+            obj._instrument,
+            obj._instrument_kernel,
+            obj._instrument_kernel_fft,
         ) = children
         (obj.correct_k_dispersion,) = aux_data
         return obj
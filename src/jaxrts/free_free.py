@@ -4,21 +4,21 @@ structure.
 """
 
 import logging
-from functools import partial
+from functools import lru_cache, partial
 from typing import List
 
 import jax
+import numpy as onp
 from jax import jit
 from jax import numpy as jnp
 from jpu import numpy as jnpu
 from quadax import quadgk
 
-from . import math
+from . import instrumentation, math, units
 from .ee_localfieldcorrections import xi_lfc_corrected
 from .plasma_physics import (
     coulomb_potential_fourier,
     epsilon_from_susceptibility,
-    fermi_dirac,
     fermi_energy,
     fermi_wavenumber,
     kin_energy,
@@ -62,6 +62,7 @@ def _W_salpeter(x: jnp.ndarray | float) -> jnp.ndarray:
             epsabs=1e-20,
             epsrel=1e-20,
         )
+        instrumentation.count("quadrature evaluations", errl.neval)
         return integral
 
     integral = integ(x)
@@ -329,6 +330,188 @@ def dielectric_function_RPA_0K(k: Quantity, E: Quantity, n_e: Quantity):
     return 1 - Vee * chi0
 
 
+#: The number of Gauss-Legendre nodes per panel, used when the integrals of
+#: the RPA dielectric function are evaluated with ``quadrature="fixed"``.
+FIXED_QUADRATURE_ORDER = 32
+
+
+@lru_cache
+def _gauss_legendre(order: int) -> tuple[onp.ndarray, onp.ndarray]:
+    """
+    Nodes and weights of the Gauss-Legendre quadrature on :math:`[-1, 1]`.
+    """
+    return onp.polynomial.legendre.leggauss(order)
+
+
+def _fixed_order_quadrature(
+    integrand: callable,
+    breakpoints: jnp.ndarray,
+    order: int = FIXED_QUADRATURE_ORDER,
+) -> jnp.ndarray:
+    """
+    Integrate ``integrand`` from 0 to infinity with a composite Gauss-Legendre
+    rule of fixed order.
+
+    The interval is split into panels at the (non-negative) ``breakpoints``,
+    which should be the positions of kinks, steps or integrable singularities
+    of the integrand. The last panel, from the largest breakpoint to infinity
+    is mapped onto a finite interval by :math:`Q = Q_\\text{max} + t / (1 -
+    t)`, with :math:`t \\in [0, 1)`.
+
+    As the nodes are fixed, all integrals are evaluated at once, as a single
+    tensor contraction, without any adaptive loop.
+
+    Parameters
+    ----------
+    integrand: callable
+        The integrand. It is called with the nodes, which have the shape
+        ``(*breakpoints.shape[:-1], breakpoints.shape[-1] + 1, order)``.
+    breakpoints: jnp.ndarray
+        The breakpoints for every integral, with the integrals along the
+        leading axes, and the breakpoints along the last axis.
+    order: int
+        The number of nodes per panel.
+
+    Returns
+    -------
+    jnp.ndarray
+        The integrals, with shape ``breakpoints.shape[:-1]``.
+    """
+    x, w = _gauss_legendre(order)
+    edges = jnp.sort(
+        jnp.concatenate(
+            [jnp.zeros_like(breakpoints[..., :1]), jnp.abs(breakpoints)],
+            axis=-1,
+        ),
+        axis=-1,
+    )
+    a = edges[..., :-1, jnp.newaxis]
+    b = edges[..., 1:, jnp.newaxis]
+    # Within every panel, the substitution u -> u^2 (3 - 2u) clusters the
+    # nodes at the breakpoints, where the integrand might be singular.
+    u = (x + 1) / 2
+    # Panels of zero width would place all nodes on a breakpoint. Their weights
+    # are zero, anyways, so move the nodes away.
+    nodes = jnp.where(b > a, a + (b - a) * u**2 * (3 - 2 * u), b + 1)
+    weights = (b - a) * 3 * u * (1 - u) * w
+
+    t = (x + 1) / 2
+    tail_nodes = edges[..., -1:, jnp.newaxis] + t / (1 - t)
+    tail_weights = jnp.ones_like(tail_nodes) * (w / 2 / (1 - t) ** 2)
+
+    nodes = jnp.concatenate([nodes, tail_nodes], axis=-2)
+    weights = jnp.concatenate([weights, tail_weights], axis=-2)
+    integral = jnp.sum(integrand(nodes) * weights, axis=(-2, -1))
+    instrumentation.count(
+        "quadrature evaluations",
+        jnp.full(integral.shape, nodes.shape[-2] * nodes.shape[-1]),
+    )
+    return integral
+
+
+def _expand_to_nodes(x: Quantity, shape: tuple) -> Quantity:
+    """
+    Broadcast ``x`` to ``shape`` and append two axes, so that it is compatible
+    with the nodes of :py:func:`~._fixed_order_quadrature`.
+    """
+    return (x * jnp.ones(shape))[..., jnp.newaxis, jnp.newaxis]
+
+
+def _RPA_breakpoints(
+    k: Quantity, kappa: Quantity, chem_pot: Quantity, T: Quantity, unit
+) -> jnp.ndarray:
+    """
+    The breakpoints for the fixed-order quadrature of the RPA dielectric
+    function, in units of ``unit``: The zeros of :math:`\\kappa \\pm k/2`,
+    where the integrands have steps or logarithmic singularities, and the
+    Fermi edge.
+    """
+    eta = (chem_pot / (ureg.k_B * T)).m_as(ureg.dimensionless)
+    shape = jnp.broadcast_shapes(jnp.shape(k.m), jnp.shape(kappa.m))
+    return jnp.stack(
+        [
+            ((kappa - k / 2) * unit).m_as(ureg.dimensionless)
+            * jnp.ones(shape),
+            ((kappa + k / 2) * unit).m_as(ureg.dimensionless)
+            * jnp.ones(shape),
+            jnp.sqrt(jnp.maximum(eta, 0)) * jnp.ones(shape),
+            jnp.sqrt(jnp.maximum(eta, 0) + 10) * jnp.ones(shape),
+        ],
+        axis=-1,
+    )
+
+
+def _RPA_reduced_arguments(
+    unit: Quantity, chem_pot: Quantity, T: Quantity, *wavenumbers: Quantity
+) -> tuple:
+    """
+    The dimensionless arguments of the integrands of the RPA dielectric
+    function (see, e.g., :py:func:`~._RPA_imag_integrand`): :math:`a` and
+    :math:`\\eta` of the Fermi function, and the ``wavenumbers`` in units of
+    ``1 / unit``.
+    """
+    a = (
+        ureg.hbar**2 / (2 * ureg.electron_mass * ureg.k_B * T * unit**2)
+    ).m_as(ureg.dimensionless)
+    eta = (chem_pot / (ureg.k_B * T)).m_as(ureg.dimensionless)
+    return a, eta, *((q * unit).m_as(ureg.dimensionless) for q in wavenumbers)
+
+
+def _fermi_dirac_reduced(Q, a, eta):
+    return 1 / (jnpu.exp(a * Q**2 - eta) + 1)
+
+
+@units.unit_kernel(*6 * [ureg.dimensionless])
+def _RPA_imag_integrand(Q, a, eta, k, kappa, delta):
+    """
+    The integrand of :py:func:`~._imag_diel_func_RPA`.
+
+    All wave numbers are given in units of a reference wave number
+    :math:`q_0`. The Fermi function is :math:`1 / (\\exp(a Q^2 - \\eta) + 1)`,
+    with :math:`a = \\hbar^2 q_0^2 / (2 m_e k_B T)` and :math:`\\eta = \\mu /
+    k_B T`.
+    """
+    f_0 = _fermi_dirac_reduced(Q, a, eta)
+    return (Q * f_0) * (
+        jnpu.arctan((kappa - k / 2 - Q) / delta)
+        + jnpu.arctan((kappa + k / 2 + Q) / delta)
+        - jnpu.arctan((kappa - k / 2 + Q) / delta)
+        - jnpu.arctan((kappa + k / 2 - Q) / delta)
+    )
+
+
+@units.unit_kernel(*6 * [ureg.dimensionless])
+def _RPA_real_integrand(Q, a, eta, k, kappa, delta):
+    """
+    The integrand of :py:func:`~._real_diel_func_RPA`, with the arguments of
+    :py:func:`~._RPA_imag_integrand`.
+    """
+    numerator = (delta**2 + (kappa - k / 2 - Q) ** 2) * (
+        delta**2 + (kappa + k / 2 + Q) ** 2
+    )
+    denominator = (delta**2 + (kappa - k / 2 + Q) ** 2) * (
+        delta**2 + (kappa + k / 2 - Q) ** 2
+    )
+    f_0 = _fermi_dirac_reduced(Q, a, eta)
+    return Q * f_0 * jnpu.log(numerator / denominator)
+
+
+@units.unit_kernel(*5 * [ureg.dimensionless])
+def _RPA_no_damping_integrand(Q, a, eta, k, kappa):
+    """
+    The integrand of :py:func:`~._real_diel_func_RPA_no_damping`, with the
+    arguments of :py:func:`~._RPA_imag_integrand`.
+    """
+    numerator = jnpu.absolute(kappa - k / 2 - Q) * jnpu.absolute(
+        kappa + k / 2 + Q
+    )
+    denominator = jnpu.absolute(kappa - k / 2 + Q) * jnpu.absolute(
+        kappa + k / 2 - Q
+    )
+    f_0 = _fermi_dirac_reduced(Q, a, eta)
+    return Q * f_0 * jnpu.log(numerator / denominator)
+
+
 @jit
 def _imag_diel_func_RPA_no_damping(
     k: Quantity, E: Quantity, chem_pot: Quantity, T: Quantity
@@ -369,9 +552,13 @@ def _imag_diel_func_RPA_no_damping(
     )
 
 
-@jit
+@partial(jit, static_argnames=("quadrature"))
 def _imag_diel_func_RPA(
-    k: Quantity, E: Quantity, chem_pot: Quantity, T: Quantity
+    k: Quantity,
+    E: Quantity,
+    chem_pot: Quantity,
+    T: Quantity,
+    quadrature: str = "quadgk",
 ) -> Quantity:
     """
     The imaginary part of the dielectric function in Random Phase
@@ -391,6 +578,10 @@ def _imag_diel_func_RPA(
         The chemical potential in units of energy.
     T : Quantity
         The plasma temperature in Kelvin.
+    quadrature : str
+        The quadrature used for the integral over the wave numbers. Either
+        ``"quadgk"`` (adaptive) or ``"fixed"`` (see
+        :py:func:`~.dielectric_function_RPA`).
 
     Returns
     -------
@@ -415,29 +606,26 @@ def _imag_diel_func_RPA(
     )
 
     unit = jnpu.sqrt(ureg.hbar**2 / (2 * ureg.electron_mass) / (ureg.k_B * T))
+    a, eta, *wavenumbers = _RPA_reduced_arguments(
+        unit, chem_pot, T, k, kappa, delta
+    )
 
-    def integrand(Q):
-        Q /= unit
-        alph_min_min = kappa - k / 2 - Q
-        alph_min_plu = kappa - k / 2 + Q
-        alph_plu_min = kappa + k / 2 - Q
-        alph_plu_plu = kappa + k / 2 + Q
-        f_0 = fermi_dirac(Q, chem_pot, T)
-        res = (Q * f_0) * (
-            jnpu.arctan(alph_min_min / delta)
-            + jnpu.arctan(alph_plu_plu / delta)
-            - jnpu.arctan(alph_min_plu / delta)
-            - jnpu.arctan(alph_plu_min / delta)
+    if quadrature == "fixed":
+        shape = jnp.broadcast_shapes(jnp.shape(k.m), jnp.shape(kappa.m))
+        nodes = [_expand_to_nodes(q, shape) for q in wavenumbers]
+        integral = _fixed_order_quadrature(
+            lambda Q: _RPA_imag_integrand(Q, a, eta, *nodes),
+            _RPA_breakpoints(k, kappa, chem_pot, T, unit),
         )
-        return (res * unit).m_as(ureg.dimensionless)
-
-    integral, errl = quadgk(
-        integrand,
-        [0, jnp.inf],
-        epsabs=1e-20,
-        epsrel=1e-20,
-        max_ninter=150,
-    )
+    else:
+        integral, errl = quadgk(
+            lambda Q: _RPA_imag_integrand(Q, a, eta, *wavenumbers),
+            [0, jnp.inf],
+            epsabs=1e-20,
+            epsrel=1e-20,
+            max_ninter=150,
+        )
+        instrumentation.count("quadrature evaluations", errl.neval)
     integral *= 1 / unit**2
 
     full = (prefactor * integral).to_base_units()
@@ -447,12 +635,13 @@ def _imag_diel_func_RPA(
     return jnpu.where(delta.m_as(1 / ureg.angstrom) == 0, del0, full)
 
 
-@jit
+@partial(jit, static_argnames=("quadrature"))
 def _real_diel_func_RPA(
     k: Quantity,
     E: Quantity,
     chem_pot: Quantity,
     T: Quantity,
+    quadrature: str = "quadgk",
 ) -> Quantity:
     """
     The real part of the dielectric function in Random Phase
@@ -471,6 +660,10 @@ def _real_diel_func_RPA(
         The chemical potential in units of energy.
     T : Quantity
         The plasma temperature in Kelvin.
+    quadrature : str
+        The quadrature used for the integral over the wave numbers. Either
+        ``"quadgk"`` (adaptive) or ``"fixed"`` (see
+        :py:func:`~.dielectric_function_RPA`).
 
     Returns
     -------
@@ -496,39 +689,39 @@ def _real_diel_func_RPA(
         4 * jnp.pi**2 * ureg.epsilon_0 * ureg.hbar**2 * k**3
     )
     unit = jnpu.sqrt(ureg.hbar**2 / (2 * ureg.electron_mass) / (ureg.k_B * T))
-
-    def integrand(Q):
-        Q /= unit
-        alph_min_min = kappa - k / 2 - Q
-        alph_min_plu = kappa - k / 2 + Q
-        alph_plu_min = kappa + k / 2 - Q
-        alph_plu_plu = kappa + k / 2 + Q
-        numerator = (delta**2 + alph_min_min**2) * (delta**2 + alph_plu_plu**2)
-        denominat = (delta**2 + alph_min_plu**2) * (delta**2 + alph_plu_min**2)
-        ln_arg = numerator / denominat
-        f_0 = fermi_dirac(Q, chem_pot, T)
-        res = Q * f_0 * jnpu.log(ln_arg)
-        return (res * unit).m_as(ureg.dimensionless)
-
-    integral, errl = quadgk(
-        integrand,
-        [0, jnp.inf],
-        epsabs=1e-20,
-        epsrel=1e-20,
-        max_ninter=150,
+    a, eta, *wavenumbers = _RPA_reduced_arguments(
+        unit, chem_pot, T, k, kappa, delta
     )
+
+    if quadrature == "fixed":
+        shape = jnp.broadcast_shapes(jnp.shape(k.m), jnp.shape(kappa.m))
+        nodes = [_expand_to_nodes(q, shape) for q in wavenumbers]
+        integral = _fixed_order_quadrature(
+            lambda Q: _RPA_real_integrand(Q, a, eta, *nodes),
+            _RPA_breakpoints(k, kappa, chem_pot, T, unit),
+        )
+    else:
+        integral, errl = quadgk(
+            lambda Q: _RPA_real_integrand(Q, a, eta, *wavenumbers),
+            [0, jnp.inf],
+            epsabs=1e-20,
+            epsrel=1e-20,
+            max_ninter=150,
+        )
+        instrumentation.count("quadrature evaluations", errl.neval)
     integral *= 1 / unit**2
 
     return 1 + (prefactor * integral).to_base_units()
 
 
-@partial(jit, static_argnames=("unsave"))
+@partial(jit, static_argnames=("unsave", "quadrature"))
 def _real_diel_func_RPA_no_damping(
     k: Quantity,
     E: Quantity,
     chem_pot: Quantity,
     T: Quantity,
     unsave=False,
+    quadrature: str = "quadgk",
 ) -> Quantity:
     """
     The real part of the dielectric function without damping (i.e., in the
@@ -547,6 +740,14 @@ def _real_diel_func_RPA_no_damping(
         The chemical potential in units of energy.
     T : Quantity
         The plasma temperature in Kelvin.
+    unsave : bool
+        If ``False``, the quadrature is split at a point where the integrand
+        diverges. Ignored for ``quadrature="fixed"``, which always splits the
+        integral at all divergences.
+    quadrature : str
+        The quadrature used for the integral over the wave numbers. Either
+        ``"quadgk"`` (adaptive) or ``"fixed"`` (see
+        :py:func:`~.dielectric_function_RPA`).
 
     Returns
     -------
@@ -565,7 +766,21 @@ def _real_diel_func_RPA_no_damping(
     # note there is no factor two missing, it is absorbed in using absolute
     # values instead of squared values in the logarithm in the integrand
 
-    if not unsave:
+    if quadrature == "fixed":
+        unit = jnpu.sqrt(
+            ureg.hbar**2 / (2 * ureg.electron_mass) / (ureg.k_B * T)
+        )
+        shape = jnp.broadcast_shapes(jnp.shape(k.m), jnp.shape(kappa.m))
+        a, eta, *wavenumbers = _RPA_reduced_arguments(
+            unit, chem_pot, T, k, kappa
+        )
+        nodes = [_expand_to_nodes(q, shape) for q in wavenumbers]
+        integral = _fixed_order_quadrature(
+            lambda Q: _RPA_no_damping_integrand(Q, a, eta, *nodes),
+            _RPA_breakpoints(k, kappa, chem_pot, T, unit),
+        )
+
+    elif not unsave:
         diverg_q = jnp.min(
             jnp.array(
                 [
@@ -575,38 +790,26 @@ def _real_diel_func_RPA_no_damping(
             ),
             axis=0,
         )
-        unit = unit = 1 * ureg.angstrom / jnpu.absolute(diverg_q)
-
-        def integrand(Q):
-            Q /= unit
-            alph_min_min = kappa - k / 2 - Q
-            alph_min_plu = kappa - k / 2 + Q
-            alph_plu_min = kappa + k / 2 - Q
-            alph_plu_plu = kappa + k / 2 + Q
-            numerator = jnpu.absolute(alph_min_min) * jnpu.absolute(
-                alph_plu_plu
-            )
-            denominator = jnpu.absolute(alph_min_plu) * jnpu.absolute(
-                alph_plu_min
-            )
-            ln_arg = numerator / denominator
-            f_0 = fermi_dirac(Q, chem_pot, T)
-            res = Q * f_0 * jnpu.log(ln_arg)
-            return (res * unit).m_as(ureg.dimensionless)
+        unit = 1 * ureg.angstrom / jnpu.absolute(diverg_q)
+        a, eta, *wavenumbers = _RPA_reduced_arguments(
+            unit, chem_pot, T, k, kappa
+        )
 
         integral1, errl = quadgk(
-            integrand,
+            lambda Q: _RPA_no_damping_integrand(Q, a, eta, *wavenumbers),
             [0, 1],
             epsabs=1e-20,
             epsrel=1e-20,
             max_ninter=150,
         )
+        instrumentation.count("quadrature evaluations", errl.neval)
         integral2, errl = quadgk(
-            integrand,
+            lambda Q: _RPA_no_damping_integrand(Q, a, eta, *wavenumbers),
             [1, jnp.inf],
             epsabs=1e-20,
             epsrel=1e-20,
         )
+        instrumentation.count("quadrature evaluations", errl.neval)
         integral = integral1 + integral2
 
     else:
@@ -614,31 +817,18 @@ def _real_diel_func_RPA_no_damping(
         unit = jnpu.sqrt(
             ureg.hbar**2 / (2 * ureg.electron_mass) / (ureg.k_B * T)
         )
-
-        def integrand(Q):
-            Q /= unit
-            alph_min_min = kappa - k / 2 - Q
-            alph_min_plu = kappa - k / 2 + Q
-            alph_plu_min = kappa + k / 2 - Q
-            alph_plu_plu = kappa + k / 2 + Q
-            numerator = jnpu.absolute(alph_min_min) * jnpu.absolute(
-                alph_plu_plu
-            )
-            denominat = jnpu.absolute(alph_min_plu) * jnpu.absolute(
-                alph_plu_min
-            )
-            ln_arg = numerator / denominat
-            f_0 = fermi_dirac(Q, chem_pot, T)
-            res = Q * f_0 * jnpu.log(ln_arg)
-            return (res * unit).m_as(ureg.dimensionless)
+        a, eta, *wavenumbers = _RPA_reduced_arguments(
+            unit, chem_pot, T, k, kappa
+        )
 
         integral, errl = quadgk(
-            integrand,
+            lambda Q: _RPA_no_damping_integrand(Q, a, eta, *wavenumbers),
             [0, jnp.inf],
             epsabs=1e-20,
             epsrel=1e-20,
             max_ninter=150,
         )
+        instrumentation.count("quadrature evaluations", errl.neval)
 
     integral *= 1 / unit**2
     return 1 + (prefactor * integral).to_base_units()
@@ -866,13 +1056,14 @@ def dielectric_function_RPA_Dandrea1986(
     )
 
 
-@partial(jit, static_argnames=("unsave"))
+@partial(jit, static_argnames=("unsave", "quadrature"))
 def dielectric_function_RPA_no_damping(
     k: Quantity,
     E: Quantity,
     chem_pot: Quantity,
     T: Quantity,
     unsave: bool = False,
+    quadrature: str = "quadgk",
 ) -> Quantity:
     """
     The the dielectric function without damping (i.e., in the limit nu → 0)
@@ -891,20 +1082,32 @@ def dielectric_function_RPA_no_damping(
         The chemical potential in units of energy.
     T : Quantity
         The plasma temperature in Kelvin.
+    unsave : bool
+        Do not split the adaptive quadrature at the divergence of the
+        integrand.
+    quadrature : str
+        The quadrature used for the real part, see
+        :py:func:`~.dielectric_function_RPA`.
 
     Returns
     -------
     Quantity
         The full dielectric function (complex number)
     """
-    real = _real_diel_func_RPA_no_damping(k, E, chem_pot, T, unsave)
+    real = _real_diel_func_RPA_no_damping(
+        k, E, chem_pot, T, unsave, quadrature
+    )
     imag = _imag_diel_func_RPA_no_damping(k, E, chem_pot, T)
     return real.m_as(ureg.dimensionless) + 1j * imag.m_as(ureg.dimensionless)
 
 
-@jit
+@partial(jit, static_argnames=("quadrature"))
 def dielectric_function_RPA(
-    k: Quantity, E: Quantity, chem_pot: Quantity, T: Quantity
+    k: Quantity,
+    E: Quantity,
+    chem_pot: Quantity,
+    T: Quantity,
+    quadrature: str = "quadgk",
 ) -> Quantity:
     """
     The the dielectric function including potentially a complex argument for E.
@@ -915,6 +1118,24 @@ def dielectric_function_RPA(
     expression for the imaginary component, but the result is used when damping
     is required, e.g., in the Born-Mermin approximation.
 
+    The integrals over the wave numbers are evaluated with an adaptive
+    Gauss-Kronrod quadrature (``quadrature="quadgk"``), by default. The
+    adaptive loop is costly to compile and does not vectorize well. With
+    ``quadrature="fixed"``, a composite Gauss-Legendre rule with
+    :py:data:`~.FIXED_QUADRATURE_ORDER` nodes per panel is used, instead. The
+    panels are split at the steps and singularities of the integrands and at
+    the Fermi edge, and the last panel is mapped from a semi-infinite onto a
+    finite interval. All :math:`(k, \\omega)` are then evaluated as one tensor
+    contraction, which compiles about an order of magnitude faster.
+
+    With the default order, the fixed rule is converged to a relative accuracy
+    of about :math:`10^{-5}`. The deviation from ``"quadgk"`` is below
+    :math:`10^{-8}` for strong damping (:math:`\\nu \\gtrsim 0.1
+    \\omega_{pe}`). It reaches :math:`10^{-3}` without damping and a few
+    percent for weak damping (:math:`\\nu \\approx 10^{-2} \\omega_{pe}`),
+    where the adaptive quadrature does not fully resolve the near-singular
+    integrand (checked against :py:func:`scipy.integrate.quad`).
+
     Parameters
     ----------
     k : Quantity
@@ -927,18 +1148,20 @@ def dielectric_function_RPA(
         The chemical potential in units of energy.
     T : Quantity
         The plasma temperature in Kelvin.
+    quadrature : str
+        Either ``"quadgk"`` or ``"fixed"``.
 
     Returns
     -------
     Quantity
         The full dielectric function (complex number)
     """
-    real = _real_diel_func_RPA(k, E, chem_pot, T)
-    imag = _imag_diel_func_RPA(k, E, chem_pot, T)
+    real = _real_diel_func_RPA(k, E, chem_pot, T, quadrature)
+    imag = _imag_diel_func_RPA(k, E, chem_pot, T, quadrature)
     return real.m_as(ureg.dimensionless) + 1j * imag.m_as(ureg.dimensionless)
 
 
-@partial(jit, static_argnames=("unsave"))
+@partial(jit, static_argnames=("unsave", "quadrature"))
 def S0_ee_RPA_no_damping(
     k: Quantity,
     T_e: Quantity,
@@ -947,6 +1170,7 @@ def S0_ee_RPA_no_damping(
     chem_pot: Quantity,
     lfc: Quantity = 0.0,
     unsave: bool = False,
+    quadrature: str = "quadgk",
 ) -> jnp.ndarray:
     """
     Calculates the free electron dynamics structure using the quantum corrected
@@ -967,6 +1191,9 @@ def S0_ee_RPA_no_damping(
         Can be an interval of values.
     chem_pot : Quantity
         The chemical potential in units of energy.
+    quadrature : str
+        The quadrature used for the dielectric function, see
+        :py:func:`~.dielectric_function_RPA`.
 
     Returns
     -------
@@ -974,14 +1201,16 @@ def S0_ee_RPA_no_damping(
            The free electron dynamic structure.
     """
     E = -E
-    eps = dielectric_function_RPA_no_damping(k, E, chem_pot, T_e, unsave)
+    eps = dielectric_function_RPA_no_damping(
+        k, E, chem_pot, T_e, unsave, quadrature
+    )
     xi0 = noninteracting_susceptibility_from_eps_RPA(eps, k)
     v_k = coulomb_potential_fourier(-1, -1, k)
     xi = xi_lfc_corrected(xi0, v_k, lfc)
     return S0ee_from_susceptibility_FDT(k, T_e, n_e, E, xi)
 
 
-@jit
+@partial(jit, static_argnames=("quadrature"))
 def S0_ee_RPA(
     k: Quantity,
     T_e: Quantity,
@@ -989,6 +1218,7 @@ def S0_ee_RPA(
     E: Quantity | List,
     chem_pot: Quantity,
     lfc: Quantity = 0.0,
+    quadrature: str = "quadgk",
 ) -> jnp.ndarray:
     """
     Calculates the free electron dynamics structure using the quantum corrected
@@ -1009,6 +1239,9 @@ def S0_ee_RPA(
         Can be an interval of values.
     chem_pot : Quantity
         The chemical potential in units of energy.
+    quadrature : str
+        The quadrature used for the dielectric function, see
+        :py:func:`~.dielectric_function_RPA`.
 
     Returns
     -------
@@ -1016,7 +1249,7 @@ def S0_ee_RPA(
            The free electron dynamic structure.
     """
     E = -E
-    eps = dielectric_function_RPA(k, E, chem_pot, T_e)
+    eps = dielectric_function_RPA(k, E, chem_pot, T_e, quadrature)
     xi0 = noninteracting_susceptibility_from_eps_RPA(eps, k)
     v_k = (1 * ureg.elementary_charge**2) / ureg.vacuum_permittivity / k**2
     xi = xi_lfc_corrected(xi0, v_k, lfc)
@@ -1047,6 +1280,7 @@ def inverse_screening_length_exact(T: Quantity, chem_pot: Quantity):
     integral_debye, errl_debye = quadgk(
         integrand_debye, [0, jnp.inf], epsabs=1e-20, epsrel=1e-20
     )
+    instrumentation.count("quadrature evaluations", errl_debye.neval)
     integral_debye *= (1 * ureg.electron_volt) ** (1 / 2)
 
     return jnpu.sqrt(prefactor_debye * integral_debye)
@@ -1071,7 +1305,7 @@ def statically_screened_ie_debye_potential(
     )
 
 
-@jit
+@partial(jit, static_argnames=("quadrature"))
 def collision_frequency_BA_full(
     E: Quantity,
     T: Quantity,
@@ -1080,10 +1314,14 @@ def collision_frequency_BA_full(
     n_e: Quantity,
     chem_pot: Quantity,
     Zf: float,
+    quadrature: str = "quadgk",
 ):
     """
     Calculate the Born electron-ion collision frequency. See
     :cite:`Schorner.2023`, eqn (B1).
+
+    ``quadrature`` selects the quadrature of the RPA dielectric function in
+    the integrand (see :py:func:`~.dielectric_function_RPA`).
     """
 
     w = E / (1 * ureg.hbar)
@@ -1099,10 +1337,12 @@ def collision_frequency_BA_full(
         q /= 1 * ureg.angstrom
 
         eps_zero = dielectric_function_RPA_no_damping(
-            q, 0 * ureg.electron_volt, chem_pot, T, unsave=True
+            q, 0 * ureg.electron_volt, chem_pot, T, True, quadrature
         )
         eps_part = (
-            dielectric_function_RPA_no_damping(q, E, chem_pot, T, unsave=True)
+            dielectric_function_RPA_no_damping(
+                q, E, chem_pot, T, True, quadrature
+            )
             - eps_zero
         )
         res = (q**6 * V_eiS(q) ** 2 * S_ii(q) * eps_part * (1 / w)).m_as(
@@ -1118,6 +1358,7 @@ def collision_frequency_BA_full(
     integral, errl = quadgk(
         integrand, [0, jnp.inf], epsabs=1e-10, epsrel=1e-10
     )
+    instrumentation.count("quadrature evaluations", errl.neval)
     integral_real, integral_imag = integral
     integral = integral_real + 1j * integral_imag
     integral *= 1 * ureg.kilogram**2 * ureg.angstrom**3 / ureg.second**3
@@ -1166,6 +1407,7 @@ def collision_frequency_BA_0K(
     integral, errl = quadgk(
         integrand, [0, jnp.inf], epsabs=1e-10, epsrel=1e-10
     )
+    instrumentation.count("quadrature evaluations", errl.neval)
     integral_real, integral_imag = integral
     integral = integral_real + 1j * integral_imag
     integral *= 1 * ureg.kilogram**2 * ureg.angstrom**3 / ureg.second**3
@@ -1218,6 +1460,7 @@ def collision_frequency_BA_fullFit(
     integral, errl = quadgk(
         integrand, [0, jnp.inf], epsabs=1e-10, epsrel=1e-10
     )
+    instrumentation.count("quadrature evaluations", errl.neval)
     integral_real, integral_imag = integral
     integral = integral_real + 1j * integral_imag
     integral *= 1 * ureg.kilogram**2 * ureg.angstrom**3 / ureg.second**3
@@ -1225,38 +1468,39 @@ def collision_frequency_BA_fullFit(
     return (prefactor * integral).to(1 / ureg.second)
 
 
-@partial(jit, static_argnames=("no_of_points"))
-def collision_frequency_BA_Chapman_interp(
+@partial(jit, static_argnames=("rpa"))
+def collision_frequency_BA_quadrature(
     E: Quantity,
     T: Quantity,
     S_ii: callable,
     V_eiS: callable,
     n_e: Quantity,
-    chem_pot: Quantity,
+    chem_pot: Quantity | None,
     Zf: float,
-    no_of_points: int = 20,
-    E_cutoff: None | Quantity = None,
-):
+    rpa: str = "numerical",
+) -> tuple[Quantity, Quantity]:
     """
-    Calculate the electron-ion collision frequency for the Born approximation,
-    at it is done in :py:func:`~collision_frequency_BA`, but instead of using a
-    quadrature, we evaluate only at a `no_of_point` points between the
-    frequencies :math:`10^-8 \\omega_{pe}` and :math:`1.1
-    \\max(\\mid \\omega \\mid)`.
+    Evaluate the Born collision frequency at the (positive) energies ``E`` by
+    integrating over all wave numbers with :py:func:`quadax.quadgk`. This is
+    the direct quadrature that is used by
+    :py:func:`~.collision_frequency_BA_Chapman_interp` and
+    :py:func:`~.collision_frequency_BA_Chapman_interpFit`, and to create a
+    :py:class:`~.CollisionFrequencyTable`.
+
+    The undamped RPA dielectric function entering the integrand is either
+    calculated numerically (``rpa="numerical"``), or using the fit by
+    :cite:`Dandrea.1986` (``rpa="Dandrea"``). ``chem_pot`` is only required
+    for the former.
 
+    Returns
+    -------
+    Quantity
+        The complex collision frequency.
+    Quantity
+        The absolute error estimate of the quadrature, for all energies
+        combined.
     """
-
-    E_pe = plasma_frequency(n_e) * (1 * ureg.hbar)
-
-    if E_cutoff is None:
-        E_cutoff = 1.1 * jnpu.max(jnpu.max(E))
-
-    interp_E = jnpu.linspace(
-        0.1 * (jnpu.min(jnpu.max(E)) + 1e-6 * E_pe),
-        E_cutoff,
-        no_of_points,
-    )
-    interp_w = interp_E / (1 * ureg.hbar)
+    w = E / (1 * ureg.hbar)
 
     prefactor = (
         -1j
@@ -1268,31 +1512,26 @@ def collision_frequency_BA_Chapman_interp(
 
         q /= 1 * ureg.angstrom
 
-        # t1 = time.time()
-        eps_zero = dielectric_function_RPA_no_damping(
-            q, 0 * ureg.electron_volt, chem_pot, T, unsave=True
-        )
-        # eps_part = (
-        #     jnp.conjugate(
-        #         dielectric_function_RPA_no_damping(q, interp_E, chem_pot, T)
-        #         - eps_zero
-        #     )
-        #     / jnp.abs(eps_zero) ** 2
-        # )
-        eps_part = (
-            dielectric_function_RPA_no_damping(
-                q, interp_E, chem_pot, T, unsave=True
+        if rpa == "Dandrea":
+            eps_zero = dielectric_function_RPA_Dandrea1986(
+                q, 0 * ureg.electron_volt, T, n_e
             )
-            - eps_zero
+            eps_part = (
+                dielectric_function_RPA_Dandrea1986(q, E, T, n_e) - eps_zero
+            )
+        else:
+            eps_zero = dielectric_function_RPA_no_damping(
+                q, 0 * ureg.electron_volt, chem_pot, T, unsave=True
+            )
+            eps_part = (
+                dielectric_function_RPA_no_damping(
+                    q, E, chem_pot, T, unsave=True
+                )
+                - eps_zero
+            )
+        res = (q**6 * V_eiS(q) ** 2 * S_ii(q) * eps_part * (1 / w)).m_as(
+            ureg.kilogram**2 * ureg.angstrom**4 / ureg.second**3
         )
-
-        # jax.debug.print("x : {} " + str(time.time() - t1), eps_part)
-
-        # t1 = time.time()
-        res = (
-            q**6 * V_eiS(q) ** 2 * S_ii(q) * eps_part * (1 / interp_w)
-        ).m_as(ureg.kilogram**2 * ureg.angstrom**4 / ureg.second**3)
-        # jax.debug.print("rest : {} " + str(time.time() - t1), res)
         return jnp.array(
             [
                 jnp.real(res),
@@ -1300,14 +1539,53 @@ def collision_frequency_BA_Chapman_interp(
             ]
         )
 
-    integral, errl = quadgk(
+    integral, info = quadgk(
         integrand, [0, jnp.inf], epsabs=1e-10, epsrel=1e-10
     )
+    instrumentation.count("quadrature evaluations", info.neval)
 
-    integral *= 1 * ureg.kilogram**2 * ureg.angstrom**3 / ureg.second**3
-    integral *= prefactor
+    unit = 1 * ureg.kilogram**2 * ureg.angstrom**3 / ureg.second**3
+    integral = integral[0] + 1j * integral[1]
+    nu = (integral * unit * prefactor).to(1 / ureg.second)
+    err = (info.err * unit * jnpu.absolute(prefactor)).to(1 / ureg.second)
+    return nu, err
 
-    integral_real, integral_imag = integral
+
+@partial(jit, static_argnames=("no_of_points"))
+def collision_frequency_BA_Chapman_interp(
+    E: Quantity,
+    T: Quantity,
+    S_ii: callable,
+    V_eiS: callable,
+    n_e: Quantity,
+    chem_pot: Quantity,
+    Zf: float,
+    no_of_points: int = 20,
+    E_cutoff: None | Quantity = None,
+):
+    """
+    Calculate the electron-ion collision frequency for the Born approximation,
+    at it is done in :py:func:`~collision_frequency_BA`, but instead of using a
+    quadrature, we evaluate only at a `no_of_point` points between the
+    frequencies :math:`10^-8 \\omega_{pe}` and :math:`1.1
+    \\max(\\mid \\omega \\mid)`.
+
+    """
+
+    E_pe = plasma_frequency(n_e) * (1 * ureg.hbar)
+
+    if E_cutoff is None:
+        E_cutoff = 1.1 * jnpu.max(jnpu.max(E))
+
+    interp_E = jnpu.linspace(
+        0.1 * (jnpu.min(jnpu.max(E)) + 1e-6 * E_pe),
+        E_cutoff,
+        no_of_points,
+    )
+    integral, _ = collision_frequency_BA_quadrature(
+        interp_E, T, S_ii, V_eiS, n_e, chem_pot, Zf, "numerical"
+    )
+    integral_real, integral_imag = integral.real, integral.imag
 
     extended_interp_E = (
         jnp.array(
@@ -1320,13 +1598,13 @@ def collision_frequency_BA_Chapman_interp(
     )
     extended_integral_real = jnp.array(
         [
-            *(-1 * integral_real[::-1]).m_as(1 / ureg.second),
+            *(1 * integral_real[::-1]).m_as(1 / ureg.second),
             *integral_real.m_as(1 / ureg.second),
         ]
     ) / (1 * ureg.second)
     extended_integral_imag = jnp.array(
         [
-            *(1 * integral_imag[::-1]).m_as(1 / ureg.second),
+            *(-1 * integral_imag[::-1]).m_as(1 / ureg.second),
             *integral_imag.m_as(1 / ureg.second),
         ]
     ) / (1 * ureg.second)
@@ -1374,43 +1652,10 @@ def collision_frequency_BA_Chapman_interpFit(
         E_cutoff,
         no_of_points,
     )
-    interp_w = interp_E / (1 * ureg.hbar)
-
-    prefactor = (
-        -1j
-        * (ureg.epsilon_0)
-        / (6 * jnp.pi**2 * Zf * ureg.elementary_charge**2 * ureg.electron_mass)
+    integral, _ = collision_frequency_BA_quadrature(
+        interp_E, T, S_ii, V_eiS, n_e, None, Zf, "Dandrea"
     )
-
-    def integrand(q):
-
-        q /= 1 * ureg.angstrom
-
-        # t1 = time.time()
-        eps_zero = dielectric_function_RPA_Dandrea1986(
-            q, 0 * ureg.electron_volt, T, n_e
-        )
-        eps_part = (
-            dielectric_function_RPA_Dandrea1986(q, interp_E, T, n_e) - eps_zero
-        )
-        res = (
-            q**6 * V_eiS(q) ** 2 * S_ii(q) * eps_part * (1 / interp_w)
-        ).m_as(ureg.kilogram**2 * ureg.angstrom**4 / ureg.second**3)
-        return jnp.array(
-            [
-                jnp.real(res),
-                jnp.imag(res),
-            ]
-        )
-
-    integral, errl = quadgk(
-        integrand, [0, jnp.inf], epsabs=1e-10, epsrel=1e-10
-    )
-
-    integral *= 1 * ureg.kilogram**2 * ureg.angstrom**3 / ureg.second**3
-    integral *= prefactor
-
-    integral_real, integral_imag = integral
+    integral_real, integral_imag = integral.real, integral.imag
 
     extended_interp_E = (
         jnp.array(
@@ -1423,13 +1668,13 @@ def collision_frequency_BA_Chapman_interpFit(
     )
     extended_integral_real = jnp.array(
         [
-            *(-1 * integral_real[::-1]).m_as(1 / ureg.second),
+            *(1 * integral_real[::-1]).m_as(1 / ureg.second),
             *integral_real.m_as(1 / ureg.second),
         ]
     ) / (1 * ureg.second)
     extended_integral_imag = jnp.array(
         [
-            *(1 * integral_imag[::-1]).m_as(1 / ureg.second),
+            *(-1 * integral_imag[::-1]).m_as(1 / ureg.second),
             *integral_imag.m_as(1 / ureg.second),
         ]
     ) / (1 * ureg.second)
@@ -1446,7 +1691,191 @@ def collision_frequency_BA_Chapman_interpFit(
     return interpolated_integral.to(1 / ureg.second)
 
 
-@jit
+def _linear_weights(x: jnp.ndarray, grid: jnp.ndarray) -> tuple:
+    """
+    Return the indices of the neighbouring grid points and the weight of the
+    upper one for linear interpolation. ``x`` is clamped to the grid. For a
+    grid with a single point, both indices are zero.
+    """
+    if len(grid) == 1:
+        return 0, 0, 0.0
+    x = jnp.clip(x, grid[0], grid[-1])
+    i = jnp.clip(jnp.searchsorted(grid, x) - 1, 0, len(grid) - 2)
+    return i, i + 1, (x - grid[i]) / (grid[i + 1] - grid[i])
+
+
+class CollisionFrequencyTable:
+    """
+    The Born collision frequency :math:`\\nu(\\omega; T, n_e, Z_f)`, tabulated
+    on a logarithmic energy grid, for a regular grid of electron temperatures,
+    electron densities and mean ionizations.
+
+    The costly quadrature over all wave numbers (see
+    :py:func:`~.collision_frequency_BA_quadrature`) is only done when the table
+    is created (see :py:func:`jaxrts.models.tabulate_collision_frequency`).
+    Calling the table interpolates multi-linearly in :math:`\\log T`,
+    :math:`\\log n_e` and :math:`Z_f`, and linearly in :math:`\\log E`.
+    Negative energies are treated as in
+    :py:func:`~.collision_frequency_BA_Chapman_interp`, i.e., the real part is
+    even and the imaginary part is odd in :math:`E`, and the imaginary part
+    goes linearly to zero below the smallest tabulated energy. Outside the
+    tabulated parameters, the values at the edge of the table are used.
+    """
+
+    def __init__(
+        self,
+        T: Quantity,
+        n_e: Quantity,
+        Z_free: jnp.ndarray,
+        E: Quantity,
+        nu: Quantity,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        T: Quantity
+            The electron temperatures, ascending, shape ``(nT,)``.
+        n_e: Quantity
+            The electron densities, ascending, shape ``(nn,)``.
+        Z_free: jnp.ndarray
+            The mean ionizations, ascending, shape ``(nZ,)``.
+        E: Quantity
+            The positive energies, ascending, shape ``(nE,)``.
+        nu: Quantity
+            The complex collision frequency, shape ``(nT, nn, nZ, nE)``.
+        """
+        self.T = T
+        self.n_e = n_e
+        self.Z_free = jnp.asarray(Z_free)
+        self.E = E
+        self.nu_real = nu.real
+        self.nu_imag = nu.imag
+
+    @property
+    def nu(self) -> Quantity:
+        """
+        The tabulated, complex collision frequency.
+        """
+        return self.nu_real + 1j * self.nu_imag
+
+    @jit
+    def __call__(
+        self, E: Quantity, T: Quantity, n_e: Quantity, Zf: float
+    ) -> Quantity:
+        """
+        Interpolate the collision frequency.
+
+        Parameters
+        ----------
+        E: Quantity
+            The energies at which the collision frequency is evaluated.
+        T: Quantity
+            The electron temperature.
+        n_e: Quantity
+            The electron density.
+        Zf: float
+            The mean ionization.
+
+        Returns
+        -------
+        Quantity
+            The complex collision frequency, with the shape of ``E``.
+        """
+        nu_real = self.nu_real.m_as(1 / ureg.second)
+        nu_imag = self.nu_imag.m_as(1 / ureg.second)
+        for x, grid in [
+            (jnp.log(T.m_as(ureg.kelvin)), jnp.log(self.T.m_as(ureg.kelvin))),
+            (
+                jnp.log(n_e.m_as(1 / ureg.meter**3)),
+                jnp.log(self.n_e.m_as(1 / ureg.meter**3)),
+            ),
+            (Zf, self.Z_free),
+        ]:
+            i0, i1, w = _linear_weights(x, grid)
+            nu_real = (1 - w) * nu_real[i0] + w * nu_real[i1]
+            nu_imag = (1 - w) * nu_imag[i0] + w * nu_imag[i1]
+
+        E = E.m_as(ureg.electron_volt)
+        E_grid = self.E.m_as(ureg.electron_volt)
+        x = jnp.log(jnp.maximum(jnp.abs(E), E_grid[0]))
+        nu_real = jnp.interp(x, jnp.log(E_grid), nu_real)
+        nu_imag = (
+            jnp.sign(E)
+            * jnp.minimum(jnp.abs(E) / E_grid[0], 1)
+            * jnp.interp(x, jnp.log(E_grid), nu_imag)
+        )
+        return (nu_real + 1j * nu_imag) / (1 * ureg.second)
+
+    def _tree_flatten(self):
+        children = (
+            self.T,
+            self.n_e,
+            self.Z_free,
+            self.E,
+            self.nu_real,
+            self.nu_imag,
+        )
+        aux_data = ()
+        return (children, aux_data)
+
+    @classmethod
+    def _tree_unflatten(cls, aux_data, children):
+        obj = object.__new__(cls)
+        (
+            obj.T,
+            obj.n_e,
+            obj.Z_free,
+            obj.E,
+            obj.nu_real,
+            obj.nu_imag,
+        ) = children
+        return obj
+
+
+jax.tree_util.register_pytree_node(
+    CollisionFrequencyTable,
+    CollisionFrequencyTable._tree_flatten,
+    CollisionFrequencyTable._tree_unflatten,
+)
+
+
+@partial(jit, static_argnames=("rpa"))
+def collision_frequency_table_error(
+    table: CollisionFrequencyTable,
+    E: Quantity,
+    T: Quantity,
+    S_ii: callable,
+    V_eiS: callable,
+    n_e: Quantity,
+    chem_pot: Quantity | None,
+    Zf: float,
+    rpa: str = "numerical",
+) -> jnp.ndarray:
+    """
+    Compare a :py:class:`~.CollisionFrequencyTable` to the direct quadrature
+    (:py:func:`~.collision_frequency_BA_quadrature`) at the positive energies
+    ``E``.
+
+    The interpolation error is largest between the nodes of the table. Hence,
+    ``E``, ``T``, ``n_e`` and ``Zf`` should not coincide with tabulated values
+    to obtain a meaningful estimate.
+
+    Returns
+    -------
+    jnp.ndarray
+        The relative deviation :math:`|\\nu_\\text{table} -
+        \\nu_\\text{quad}| / |\\nu_\\text{quad}|` for every energy.
+    """
+    nu_quad, _ = collision_frequency_BA_quadrature(
+        E, T, S_ii, V_eiS, n_e, chem_pot, Zf, rpa
+    )
+    nu_table = table(E, T, n_e, Zf)
+    return (jnpu.absolute(nu_table - nu_quad) / jnpu.absolute(nu_quad)).m_as(
+        ureg.dimensionless
+    )
+
+
+@partial(jit, static_argnames=("quadrature"))
 def dielectric_function_BMA_full(
     k: Quantity,
     E: Quantity | List,
@@ -1456,33 +1885,30 @@ def dielectric_function_BMA_full(
     S_ii: callable,
     V_eiS: callable,
     Zf: float,
+    quadrature: str = "quadgk",
 ) -> jnp.ndarray:
     """
     Calculates the Born-Mermin Approximation for the dielectric function, which
     takes collisions into account.
 
     See, e.g., :cite:`Redmer.2005`, eqn (20) and :cite:`Mermin.1970`, (eqn 8).
+
+    ``quadrature`` selects the quadrature of the RPA dielectric functions (see
+    :py:func:`~.dielectric_function_RPA`).
     """
     w = E / (1 * ureg.hbar)
     coll_freq = collision_frequency_BA_full(
-        E, T, S_ii, V_eiS, n_e, chem_pot, Zf
+        E, T, S_ii, V_eiS, n_e, chem_pot, Zf, quadrature
     )
-
-    numerator = (1 + 1j * coll_freq / w) * (
-        dielectric_function_RPA(k, E + 1j * ureg.hbar * coll_freq, chem_pot, T)
-        - 1
+    eps_RPA = dielectric_function_RPA(
+        k, E + 1j * ureg.hbar * coll_freq, chem_pot, T, quadrature
     )
 
-    denumerator = 1 + 1j * (coll_freq / w) * (
-        (
-            dielectric_function_RPA(
-                k, E + 1j * ureg.hbar * coll_freq, chem_pot, T
-            )
-            - 1
-        )
-    ) / (
+    numerator = (1 + 1j * coll_freq / w) * (eps_RPA - 1)
+
+    denumerator = 1 + 1j * (coll_freq / w) * (eps_RPA - 1) / (
         dielectric_function_RPA_no_damping(
-            k, 0 * ureg.electron_volt, chem_pot, T, unsave=True
+            k, 0 * ureg.electron_volt, chem_pot, T, True, quadrature
         )
         - 1
     )
@@ -1507,7 +1933,7 @@ def S0_ee_RPA_Dandrea(
     return S0ee_from_susceptibility_FDT(k, T, n_e, E, xi)
 
 
-@jit
+@partial(jit, static_argnames=("quadrature"))
 def S0_ee_BMA(
     k: Quantity,
     T: Quantity,
@@ -1518,11 +1944,14 @@ def S0_ee_BMA(
     Zf: float,
     E: Quantity | List,
     lfc: Quantity = 0.0,
+    quadrature: str = "quadgk",
 ) -> jnp.ndarray:
 
     E = -E
 
-    eps = dielectric_function_BMA_full(k, E, chem_pot, T, n_e, S_ii, V_eiS, Zf)
+    eps = dielectric_function_BMA_full(
+        k, E, chem_pot, T, n_e, S_ii, V_eiS, Zf, quadrature
+    )
 
     xi0 = noninteracting_susceptibility_from_eps_RPA(eps, k)
     v_k = (1 * ureg.elementary_charge**2) / ureg.vacuum_permittivity / k**2
@@ -1541,6 +1970,7 @@ def dielectric_function_BMA_chapman_interpFit(
     V_eiS: callable,
     Zf: float,
     no_of_points: int = 20,
+    coll_freq_table: CollisionFrequencyTable | None = None,
 ) -> jnp.ndarray:
     """
     Calculates the Born-Mermin Approximation for the dielectric function, which
@@ -1549,20 +1979,22 @@ def dielectric_function_BMA_chapman_interpFit(
     """
     w = E / (1 * ureg.hbar)
 
-    # Calculate the cut-off energy from the RPA
-
-    See_RPA = S0_ee_RPA_Dandrea(k, T, n_e, E)
-    E_cutoff = (
-        jnpu.min(
-            jnpu.where(See_RPA > jnpu.max(See_RPA * 0.001), E, jnpu.max(E))
+    if coll_freq_table is not None:
+        coll_freq = coll_freq_table(E, T, n_e, Zf)
+    else:
+        # Calculate the cut-off energy from the RPA
+        See_RPA = S0_ee_RPA_Dandrea(k, T, n_e, E)
+        E_cutoff = (
+            jnpu.min(
+                jnpu.where(See_RPA > jnpu.max(See_RPA * 0.001), E, jnpu.max(E))
+            )
+            * 1.5
         )
-        * 1.5
-    )
-    E_cutoff = jnpu.absolute(E_cutoff)
+        E_cutoff = jnpu.absolute(E_cutoff)
 
-    coll_freq = collision_frequency_BA_Chapman_interpFit(
-        E, T, S_ii, V_eiS, n_e, Zf, no_of_points, E_cutoff
-    )
+        coll_freq = collision_frequency_BA_Chapman_interpFit(
+            E, T, S_ii, V_eiS, n_e, Zf, no_of_points, E_cutoff
+        )
 
     numerator = (1 + 1j * coll_freq / w) * (
         dielectric_function_RPA(k, E + 1j * ureg.hbar * coll_freq, chem_pot, T)
@@ -1596,10 +2028,21 @@ def dielectric_function_BMA_Fortmann(
     Zf: float,
     lfc: float = 0,
     no_of_points: int = 20,
+    coll_freq_table: CollisionFrequencyTable | None = None,
 ) -> jnp.ndarray:
 
     xi = susceptibility_BMA_Fortmann(
-        k, E, chem_pot, T, n_e, S_ii, V_eiS, Zf, lfc, no_of_points
+        k,
+        E,
+        chem_pot,
+        T,
+        n_e,
+        S_ii,
+        V_eiS,
+        Zf,
+        lfc,
+        no_of_points,
+        coll_freq_table,
     )
     return epsilon_from_susceptibility(xi, k)
 
@@ -1616,6 +2059,7 @@ def susceptibility_BMA_Fortmann(
     Zf: float,
     lfc: float = 0,
     no_of_points: int = 20,
+    coll_freq_table: CollisionFrequencyTable | None = None,
 ) -> jnp.ndarray:
     """
     Calculates the Born-Mermin Approximation for the dielectric function, which
@@ -1630,20 +2074,22 @@ def susceptibility_BMA_Fortmann(
     """
     w = E / (1 * ureg.hbar)
 
-    # Calculate the cut-off energy from the RPA
-
-    See_RPA = S0_ee_RPA_Dandrea(k, T, n_e, E, lfc)
-    E_cutoff = (
-        jnpu.min(
-            jnpu.where(See_RPA > jnpu.max(See_RPA * 0.001), E, jnpu.max(E))
+    if coll_freq_table is not None:
+        coll_freq = coll_freq_table(E, T, n_e, Zf)
+    else:
+        # Calculate the cut-off energy from the RPA
+        See_RPA = S0_ee_RPA_Dandrea(k, T, n_e, E, lfc)
+        E_cutoff = (
+            jnpu.min(
+                jnpu.where(See_RPA > jnpu.max(See_RPA * 0.001), E, jnpu.max(E))
+            )
+            * 1.5
         )
-        * 1.5
-    )
-    E_cutoff = jnpu.absolute(E_cutoff)
+        E_cutoff = jnpu.absolute(E_cutoff)
 
-    coll_freq = collision_frequency_BA_Chapman_interpFit(
-        E, T, S_ii, V_eiS, n_e, Zf, no_of_points, E_cutoff
-    )
+        coll_freq = collision_frequency_BA_Chapman_interpFit(
+            E, T, S_ii, V_eiS, n_e, Zf, no_of_points, E_cutoff
+        )
 
     V_ee = coulomb_potential_fourier(-1, -1, k)
 
@@ -1680,6 +2126,7 @@ def dielectric_function_BMA_chapman_interp(
     V_eiS: callable,
     Zf: float,
     no_of_points: int = 20,
+    coll_freq_table: CollisionFrequencyTable | None = None,
 ) -> jnp.ndarray:
     """
     Calculates the Born-Mermin Approximation for the dielectric function, which
@@ -1687,20 +2134,22 @@ def dielectric_function_BMA_chapman_interp(
     """
     w = E / (1 * ureg.hbar)
 
-    # Calculate the cut-off energy from the RPA
-
-    See_RPA = S0_ee_RPA_no_damping(k, T, n_e, E, chem_pot, unsave=True)
-    E_cutoff = (
-        jnpu.min(
-            jnpu.where(See_RPA > jnpu.max(See_RPA * 0.001), E, jnpu.max(E))
+    if coll_freq_table is not None:
+        coll_freq = coll_freq_table(E, T, n_e, Zf)
+    else:
+        # Calculate the cut-off energy from the RPA
+        See_RPA = S0_ee_RPA_no_damping(k, T, n_e, E, chem_pot, unsave=True)
+        E_cutoff = (
+            jnpu.min(
+                jnpu.where(See_RPA > jnpu.max(See_RPA * 0.001), E, jnpu.max(E))
+            )
+            * 1.5
         )
-        * 1.5
-    )
-    E_cutoff = jnpu.absolute(E_cutoff)
+        E_cutoff = jnpu.absolute(E_cutoff)
 
-    coll_freq = collision_frequency_BA_Chapman_interp(
-        E, T, S_ii, V_eiS, n_e, chem_pot, Zf, no_of_points, E_cutoff
-    )
+        coll_freq = collision_frequency_BA_Chapman_interp(
+            E, T, S_ii, V_eiS, n_e, chem_pot, Zf, no_of_points, E_cutoff
+        )
 
     numerator = (1 + 1j * coll_freq / w) * (
         dielectric_function_RPA(k, E + 1j * ureg.hbar * coll_freq, chem_pot, T)
@@ -1736,12 +2185,13 @@ def S0_ee_BMA_chapman_interp(
     E: Quantity | List,
     lfc: Quantity = 0.0,
     no_of_points: int = 20,
+    coll_freq_table: CollisionFrequencyTable | None = None,
 ) -> jnp.ndarray:
 
     E = -E
 
     eps = dielectric_function_BMA_chapman_interp(
-        k, E, chem_pot, T, n_e, S_ii, V_eiS, Zf, no_of_points
+        k, E, chem_pot, T, n_e, S_ii, V_eiS, Zf, no_of_points, coll_freq_table
     )
 
     xi0 = noninteracting_susceptibility_from_eps_RPA(eps, k)
@@ -1763,12 +2213,13 @@ def S0_ee_BMA_chapman_interpFit(
     E: Quantity | List,
     lfc: Quantity = 0.0,
     no_of_points: int = 20,
+    coll_freq_table: CollisionFrequencyTable | None = None,
 ) -> jnp.ndarray:
 
     E = -E
 
     eps = dielectric_function_BMA_chapman_interpFit(
-        k, E, chem_pot, T, n_e, S_ii, V_eiS, Zf, no_of_points
+        k, E, chem_pot, T, n_e, S_ii, V_eiS, Zf, no_of_points, coll_freq_table
     )
 
     xi0 = noninteracting_susceptibility_from_eps_RPA(eps, k)
@@ -1790,11 +2241,22 @@ def S0_ee_BMA_Fortmann(
     E: Quantity | List,
     lfc: Quantity = 0.0,
     no_of_points: int = 20,
+    coll_freq_table: CollisionFrequencyTable | None = None,
 ) -> jnp.ndarray:
 
     E = -E
 
     xi = susceptibility_BMA_Fortmann(
-        k, E, chem_pot, T, n_e, S_ii, V_eiS, Zf, lfc, no_of_points
+        k,
+        E,
+        chem_pot,
+        T,
+        n_e,
+        S_ii,
+        V_eiS,
+        Zf,
+        lfc,
+        no_of_points,
+        coll_freq_table,
     )
     return S0ee_from_susceptibility_FDT(k, T, n_e, E, xi)
@@ -9,6 +9,7 @@ short-range part and is also Fourier-transformed to k-space.
 
 import abc
 import logging
+from functools import partial
 from typing import Literal
 
 import jax
@@ -25,6 +26,7 @@ from jaxrts.hypernetted_chain import (
     mass_weighted_T,
     geometric_mean_T,
 )
+from jaxrts.math import dawson, sine_integral_auxiliary_f
 from jaxrts.plasma_physics import (
     fermi_wavenumber,
     fermi_dirac,
@@ -38,6 +40,20 @@ from jaxrts.units import Quantity, to_array, ureg
 logger = logging.getLogger(__name__)
 
 
+class _TransformCache(dict):
+    """
+    Numerically Fourier-transformed potentials of one
+    :py:class:`jaxrts.PlasmaState`, see :py:meth:`HNCPotential._transform`.
+    The entries might be tracers, so they are not copied with the state.
+    """
+
+    def __copy__(self):
+        return _TransformCache()
+
+    def __deepcopy__(self, memo):
+        return _TransformCache()
+
+
 @jax.jit
 def pauli_potential_from_classical_map_SpinAveraged(
     r1: jnp.ndarray, r2: jnp.ndarray, n_e: Quantity, T: Quantity
@@ -288,13 +304,21 @@ class HNCPotential(metaclass=abc.ABCMeta):
         "electron-electron Potential",
     ]
 
+    #: The number of points on which parts of the potential are
+    #: Fourier-transformed numerically, if they are known to decay fast (see
+    #: :py:meth:`~.transform_r`).
+    adaptive_transform_points: int = 2**16
+
     def __init__(
         self,
         include_electrons: Literal[
             "off", "SpinAveraged", "SpinSeparated"
         ] = "off",
     ):
-        self._transform_r = jnpu.linspace(1e-4, 1e4, 2**21) * ureg.a_0
+        #: The grid on which the potential is Fourier-transformed numerically.
+        #: If ``None`` (the default), the grid is chosen by
+        #: :py:meth:`~.transform_r`.
+        self._transform_r: Quantity | None = None
 
         self.model_key = ""
 
@@ -350,27 +374,92 @@ class HNCPotential(metaclass=abc.ABCMeta):
             1 - jnpu.exp(-self.alpha(plasma_state) * _r)
         )
 
-    @jax.jit
+    def decay_radius(self, plasma_state, part: str) -> Quantity | None:
+        """
+        A distance beyond which ``part`` (e.g., ``"short"`` or ``"long"``) of
+        the potential is negligible, or ``None`` if it is long-ranged (i.e.,
+        Coulomb-like). This is used to right-size the grids for numerical
+        Fourier transforms (see :py:meth:`~.transform_r`).
+
+        Per default, only the short-range part, which decays at least as
+        :math:`\\exp(-\\alpha r)`, is considered to be negligible beyond
+        :math:`40 / \\alpha`.
+        """
+        if part == "short":
+            return 40 / jnpu.min(self.alpha(plasma_state))
+        return None
+
+    def transform_r(self, plasma_state, part: str) -> Quantity:
+        """
+        The grid in ``r`` on which ``part`` (e.g., ``"short"`` or ``"long"``)
+        of the potential is Fourier-transformed numerically.
+
+        If :py:attr:`~._transform_r` is set, it is used. Otherwise, parts
+        with a finite :py:meth:`~.decay_radius` are transformed on
+        :py:attr:`~.adaptive_transform_points` points up to five times this
+        radius (the zero-padding refines the resulting grid in ``k``). Other
+        parts are transformed on ``2 ** 21`` points between ``1e-4`` and
+        ``1e4`` Bohr radii.
+        """
+        if self._transform_r is not None:
+            return self._transform_r
+        r_max = 1e4 * ureg.a_0
+        r_decay = self.decay_radius(plasma_state, part)
+        if r_decay is None:
+            return jnpu.linspace(1e-4 * ureg.a_0, r_max, 2**21)
+        return _midpoint_grid(
+            jnpu.minimum(r_max, 5 * r_decay), self.adaptive_transform_points
+        )
+
+    @partial(jax.jit, static_argnames=["part"])
+    def _transform_table(self, plasma_state, part: str) -> tuple:
+        r = self.transform_r(plasma_state, part)
+        return transformPotential(
+            getattr(self, f"{part}_r")(plasma_state, r), r
+        )
+
+    def _transform(self, plasma_state, part: str) -> tuple:
+        """
+        Fourier-transform ``part`` of the potential (i.e., the method
+        ``<part>_r``) numerically, on the grid given by :py:meth:`transform_r`.
+        Returns the transformed potential and the grid in ``k``.
+
+        The result is cached in ``plasma_state``, and re-used for the same
+        potential and state, as long as neither of them changed and the
+        result was obtained in the current trace (so that no tracers leak).
+        Only the entries of the current trace are kept.
+        """
+        cache = plasma_state.__dict__.setdefault(
+            "_hnc_transforms", _TransformCache()
+        )
+        leaves = jax.tree_util.tree_leaves((self, plasma_state))
+        key = (id(self), part, tuple(id(leaf) for leaf in leaves))
+        trace = jax.core.get_opaque_trace_state(convention="jaxrts")
+        if key in cache and cache[key][0] == trace:
+            return cache[key][2]
+        # Entries of other traces can never be re-used. Drop them, so that
+        # they do not keep tracers (or large arrays) alive.
+        for old_key in [k for k, entry in cache.items() if entry[0] != trace]:
+            del cache[old_key]
+        result = self._transform_table(plasma_state, part)
+        # Keep a reference to the leaves so that their ids are not re-used
+        cache[key] = (trace, (self, leaves), result)
+        return result
+
     def short_k(self, plasma_state, k: Quantity) -> Quantity:
         """
         The Fourier transform of :py:meth:`~short_r`.
         """
-        V_k, _k = transformPotential(
-            self.short_r(plasma_state, self._transform_r), self._transform_r
-        )
+        V_k, _k = self._transform(plasma_state, "short")
         return hnc_interp(k, _k, V_k)
 
-    @jax.jit
     def long_k(self, plasma_state, k: Quantity) -> Quantity:
         """
-        The Foutier transform of :py:meth:`~short_k`.
+        The Fourier transform of :py:meth:`~long_r`.
         """
-        V_k, _k = transformPotential(
-            self.long_r(plasma_state, self._transform_r), self._transform_r
-        )
+        V_k, _k = self._transform(plasma_state, "long")
         return hnc_interp(k, _k, V_k)
 
-    @jax.jit
     def full_k(self, plasma_state, k):
         return self.short_k(plasma_state, k) + self.long_k(plasma_state, k)
 
@@ -731,7 +820,7 @@ class ScaledPotential(HNCPotential):
     @classmethod
     def _tree_unflatten(cls, aux_data, children):
         obj = object.__new__(cls)
-        (obj.potential, obj.factor) = children
+        obj.potential, obj.factor = children
         obj.model_key = aux_data["model_key"]
         obj._include_electrons = aux_data["include_electrons"]
         return obj
@@ -760,6 +849,19 @@ class CoulombPotential(HNCPotential):
         _k = k[jnp.newaxis, jnp.newaxis, :]
         return self.q2(plasma_state) / ureg.vacuum_permittivity / _k**2
 
+    @jax.jit
+    def short_k(self, plasma_state, k: Quantity):
+        """
+        .. math::
+
+            q^2 / (\\varepsilon_0 (k^2 + \\alpha^2))
+
+        """
+        _k = k[jnp.newaxis, jnp.newaxis, :]
+        return self.q2(plasma_state) / (
+            ureg.epsilon_0 * (_k**2 + self.alpha(plasma_state) ** 2)
+        )
+
     @jax.jit
     def long_k(self, plasma_state, k: Quantity):
         """
@@ -829,6 +931,23 @@ class DebyeHueckelPotential(HNCPotential):
 
         return pref * numerator / denumerator
 
+    @jax.jit
+    def short_k(self, plasma_state, k):
+        """
+        .. math::
+
+            q^2 / (\\varepsilon_0 (k^2 + (\\kappa + \\alpha)^2))
+
+        """
+        _k = k[jnp.newaxis, jnp.newaxis, :]
+        return self.q2(plasma_state) / (
+            ureg.epsilon_0
+            * (
+                _k**2
+                + (self.kappa(plasma_state) + self.alpha(plasma_state)) ** 2
+            )
+        )
+
 
 class KelbgPotential(HNCPotential):
     """
@@ -886,6 +1005,27 @@ class KelbgPotential(HNCPotential):
             )
         )
 
+    @jax.jit
+    def full_k(self, plasma_state, k: Quantity) -> Quantity:
+        """
+        .. math::
+
+            \\frac{q_a q_b}{\\varepsilon_0 k^2} \\frac{D(y)}{y}
+            \\quad\\text{with}\\quad y = \\frac{k \\lambda_{a b}}{2},
+
+        where :math:`D` is Dawson's integral (see
+        :py:func:`jaxrts.math.dawson`).
+        """
+        _k = k[jnp.newaxis, jnp.newaxis, :]
+        y = (_k * self.lambda_ab(plasma_state) / 2).m_as(ureg.dimensionless)
+        return (
+            self.q2(plasma_state) / (ureg.epsilon_0 * _k**2) * (dawson(y) / y)
+        )
+
+    @jax.jit
+    def short_k(self, plasma_state, k: Quantity) -> Quantity:
+        return self.full_k(plasma_state, k) - self.long_k(plasma_state, k)
+
     @jax.jit
     def short_r(self, plasma_state, r: Quantity) -> Quantity:
         return self.full_r(plasma_state, r) - self.long_r(plasma_state, r)
@@ -1050,6 +1190,51 @@ class KlimontovichKraeftPotential(HNCPotential):
         )
         return pref * (1 + (factor / denominator) * _r) ** (-1)
 
+    @jax.jit
+    def full_k(self, plasma_state, k: Quantity) -> Quantity:
+        """
+        With the notation :math:`V(r) = -A / (1 + b r)` for
+        :py:meth:`~.full_r`,
+
+        .. math::
+
+            V(k) = -\\frac{4 \\pi A}{b k^2}
+            \\left[1 - \\frac{k}{b} f\\left(\\frac{k}{b}\\right)\\right],
+
+        where :math:`f` is the auxiliary function of the sine and cosine
+        integrals (see :py:func:`jaxrts.math.sine_integral_auxiliary_f`).
+        """
+        _k = k[jnp.newaxis, jnp.newaxis, :]
+
+        beta = 1 / (ureg.k_B * self.T(plasma_state))
+        xi = (
+            self.q2(plasma_state)
+            * beta
+            / (4 * jnp.pi * ureg.epsilon_0 * self.lambda_ab(plasma_state))
+        )
+        A = ureg.k_B * self.T(plasma_state) * xi**2 / 16
+        b = (
+            ureg.k_B
+            * self.T(plasma_state)
+            * xi**2
+            / (
+                16
+                * jnpu.absolute(self.q2(plasma_state))
+                / (4 * jnp.pi * ureg.epsilon_0)
+            )
+        )
+        z = (_k / b).m_as(ureg.dimensionless)
+        return (
+            -4
+            * jnp.pi
+            * A
+            / (b * _k**2)
+            * (1 - z * sine_integral_auxiliary_f(z))
+        )
+
+    def long_k(self, plasma_state, k: Quantity) -> Quantity:
+        return self.full_k(plasma_state, k) - self.short_k(plasma_state, k)
+
 
 class DeutschPotential(HNCPotential):
     """
@@ -1085,19 +1270,41 @@ class DeutschPotential(HNCPotential):
         .. math::
 
             q^2 / (k^2 * \\varepsilon_0) *
-            ((1/\\lambda{a b})**2 / (k^2 + (1/\\lambda{a b})^2))
+            ((\\pi/\\lambda_{a b}^2) / (k^2 + \\pi/\\lambda_{a b}^2))
 
         """
         _k = k[jnp.newaxis, jnp.newaxis, :]
+        b2 = jnp.pi / self.lambda_ab(plasma_state) ** 2
 
         return (
             self.q2(plasma_state)
             / (_k**2 * ureg.epsilon_0)
-            * (1 / self.lambda_ab(plasma_state)) ** 2
-            / (
-                _k**2
-                + (1 / (self.lambda_ab(plasma_state) / jnp.sqrt(jnp.pi))) ** 2
-            )
+            * b2
+            / (_k**2 + b2)
+        )
+
+    @jax.jit
+    def short_k(self, plasma_state, k: Quantity) -> Quantity:
+        """
+        The Fourier transform of :py:meth:`~.short_r`, i.e., of the difference
+        between the full potential and a screened Coulomb potential.
+
+        .. math::
+
+            \\frac{q^2}{\\varepsilon_0}
+            \\frac{\\pi / \\lambda_{a b}^2 - \\alpha^2}
+            {(k^2 + \\alpha^2)(k^2 + \\pi / \\lambda_{a b}^2)}
+
+        """
+        _k = k[jnp.newaxis, jnp.newaxis, :]
+        a2 = self.alpha(plasma_state) ** 2
+        b2 = jnp.pi / self.lambda_ab(plasma_state) ** 2
+
+        return (
+            self.q2(plasma_state)
+            / ureg.epsilon_0
+            * (b2 - a2)
+            / ((_k**2 + a2) * (_k**2 + b2))
         )
 
     @jax.jit
@@ -1285,49 +1492,68 @@ class SoftCorePotential(HNCPotential):
 
     @jax.jit
     def short_r(self, plasma_state, r: Quantity) -> Quantity:
-        return jnp.zeros([*self.q.shape[:2], len(r)]) * ureg.electron_volt
+        return (
+            jnp.zeros([*self.q2(plasma_state).shape[:2], len(r)])
+            * ureg.electron_volt
+        )
 
     @jax.jit
-    def full_k(self, plasma_state, k):
-        _k = k[jnp.newaxis, jnp.newaxis, :]
-        # Define a auxiliary short-range version of this potential; While it is
-        # not used, actually, it is easier to Fourier transform.
+    def core_r(self, plasma_state, r: Quantity) -> Quantity:
+        """
+        An auxiliary short-range potential, which is the difference between
+        the Coulomb potential and :py:meth:`~.full_r`. While it is not used,
+        actually, it is easier to Fourier transform.
+
+        .. math::
+
+           q^2 / (4 jnp.pi \\varepsilon_0 * r)
+           \\exp\\left(-\\frac{r^\\beta}{r_{cut}^\\beta}\\right)
+
+        """
+        _r = r[jnp.newaxis, jnp.newaxis, :]
         exp_part = jnpu.exp(
             -(
-                (self._transform_r / self.r_cut(plasma_state)).m_as(
-                    ureg.dimensionless
-                )
+                (_r / self.r_cut(plasma_state)).m_as(ureg.dimensionless)
                 ** self.beta
             )
         )
-        V_s_transform_r = (
+        return (
             self.q2(plasma_state)
-            / (4 * jnp.pi * ureg.epsilon_0 * self._transform_r)
+            / (4 * jnp.pi * ureg.epsilon_0 * _r)
             * exp_part
         )
-        _V_s_transform_k, _k = transformPotential(
-            V_s_transform_r, self._transform_r
-        )
-        V_s_k = hnc_interp(k, _k, _V_s_transform_k)
 
-        # Subtract this from the full, known solution of the Coulomb Potential
-        # in k space.
+    def decay_radius(self, plasma_state, part: str) -> Quantity | None:
+        """
+        See :py:meth:`HNCPotential.decay_radius`. :py:meth:`~.core_r` is
+        negligible beyond 8 times the largest core radius.
+        """
+        if part == "core":
+            return jnpu.maximum(
+                8 * jnpu.max(self.r_cut(plasma_state)), 1 * ureg.a_0
+            )
+        return super().decay_radius(plasma_state, part)
+
+    def full_k(self, plasma_state, k):
+        # Subtract the transform of the core part from the full, known
+        # solution of the Coulomb Potential in k space.
+        _V_core_k, _k = self._transform(plasma_state, "core")
+        V_core_k = hnc_interp(k, _k, _V_core_k)
 
         _k = k[jnp.newaxis, jnp.newaxis, :]
         V_full_Coulomb_k = (
             self.q2(plasma_state) / ureg.vacuum_permittivity / _k**2
         )
 
-        return V_full_Coulomb_k - V_s_k
+        return V_full_Coulomb_k - V_core_k
 
-    @jax.jit
     def long_k(self, plasma_state, k: Quantity) -> Quantity:
-        return self.full_k(k)
+        return self.full_k(plasma_state, k)
 
     @jax.jit
     def short_k(self, plasma_state, k: Quantity) -> Quantity:
         return (
-            jnp.zeros([*self.q.shape[:2], len(k)])
+            jnp.zeros([*self.q2(plasma_state).shape[:2], len(k)])
             * ureg.electron_volt
             * ureg.angstrom**3
         )
@@ -1517,6 +1743,14 @@ class SpinSeparatedEEExchange(HNCPotential):
         )
         return exchange
 
+    def decay_radius(self, plasma_state, part: str) -> Quantity:
+        r_decay = 8 * jnpu.max(self.lambda_ab(plasma_state))
+        if part == "short":
+            return jnpu.minimum(
+                r_decay, super().decay_radius(plasma_state, part)
+            )
+        return r_decay
+
 
 class SpinAveragedEEExchange(HNCPotential):
     """
@@ -1567,15 +1801,38 @@ class SpinAveragedEEExchange(HNCPotential):
 
         return V_P_k
 
+    def decay_radius(self, plasma_state, part: str) -> Quantity:
+        r_decay = 8 * jnpu.max(self.lambda_ab(plasma_state))
+        if part == "short":
+            return jnpu.minimum(
+                r_decay, super().decay_radius(plasma_state, part)
+            )
+        return r_decay
+
+
+def _midpoint_grid(r_max: Quantity, n: int) -> Quantity:
+    """
+    ``n`` equidistant points in ``(0, r_max)``, at the centers of the
+    intervals, as it is assumed by :py:func:`~.transformPotential`.
+    """
+    return (jnp.arange(n) + 0.5) * (r_max / n)
+
 
 @jax.jit
 def transformPotential(V, r) -> Quantity:
     """
-    ToDo: Test this, potentially, there is something wrong, here.
+    Fourier-transform the potential ``V``, given on the equidistant grid
+    ``r``, with a discrete sine transform (DST-IV). Returns the transformed
+    potential and the grid in ``k``.
+
+    The DST-IV evaluates the transform at half-integer multiples of
+    :math:`\\Delta k = \\pi / (n \\Delta r)`, if ``r`` are half-integer
+    multiples of :math:`\\Delta r` (see :py:func:`~._midpoint_grid`). For
+    other grids, the results are only accurate if :math:`k \\gg \\Delta k`.
     """
     dr = r[1] - r[0]
     dk = jnp.pi / (len(r) * dr)
-    k = jnp.pi / r[-1] + jnp.arange(len(r)) * dk
+    k = (jnp.arange(len(r)) + 0.5) * dk
     V_k = _3Dfour(
         k,
         r,
@@ -3,13 +3,18 @@ This submodule is dedicated to the using the hypernetted chain approach
 to calculate static structure factors.
 """
 
-from functools import partial
+import abc
+from functools import lru_cache, partial
 
 import jax
 import jax.interpreters
+import jpu
 import jpu.numpy as jnpu
+import numpy as onp
 from jax import numpy as jnp
+from jax.experimental import io_callback
 
+from jaxrts import instrumentation, units
 from jaxrts.units import Quantity, ureg
 
 
@@ -92,11 +97,22 @@ def fourier_transform_ogata(k, r, f, N, h):
 
 @jax.jit
 def fourier_transform_sine(k, rvals, fvals):
+    """
+    Three-dimensional Fourier transform of a radially symmetric function,
+    evaluated with a DST-IV (see :py:func:`~.dst_iv`).
+
+    ``fvals`` can carry arbitrary leading axes; the transform is taken along
+    the last one, which has to match ``rvals``. All leading entries (e.g., the
+    species pairs of a potential) are transformed in one batched FFT.
+
+    The arguments are either quantities, or plain arrays in consistent units.
+    """
     arg = rvals * fvals
-    units = arg.units
     dr = rvals[1] - rvals[0]
-    res = zaf_dst(arg.m_as(units), 4) * units * (4 * jnp.pi) / k * dr
-    return res
+    if jpu.core.is_quantity(arg):
+        unit = arg.units
+        return dst_iv(arg.m_as(unit)) * unit * (4 * jnp.pi) / k * dr
+    return dst_iv(arg) * (4 * jnp.pi) / k * dr
 
 
 @partial(jax.jit, static_argnames=["isign"])
@@ -335,11 +351,58 @@ def zaf_dst(f, dst_type):
         return out
 
 
-_3Dfour_sine = jax.vmap(
-    jax.vmap(fourier_transform_sine, in_axes=(None, None, 0), out_axes=0),
-    in_axes=(None, None, 1),
-    out_axes=1,
-)
+@lru_cache
+def _dst_iv_twiddles(n: int) -> tuple[onp.ndarray, onp.ndarray]:
+    """
+    Pre- and post-twiddle factors of :py:func:`~.dst_iv` for a grid of
+    length ``n``. These are static for a given grid size, and are therefore
+    computed only once, and enter compiled functions as constants.
+    """
+    m = onp.arange(n // 2)
+    pre = onp.exp(-1j * onp.pi * (m + 0.25) / n)
+    post = onp.exp(-1j * onp.pi * m / n)
+    return pre, post
+
+
+@jax.jit
+def dst_iv(f: jnp.ndarray) -> jnp.ndarray:
+    """
+    Discrete sine transform of type IV along the last axis of ``f``,
+
+    .. math::
+
+        F_k = \\sum_{n=0}^{N-1} f_n
+        \\sin\\left(\\frac{\\pi}{N}
+        \\left(n + \\frac{1}{2}\\right)
+        \\left(k + \\frac{1}{2}\\right)\\right),
+
+    which is the normalization of :py:func:`~.zaf_dst`.
+
+    The real input is packed into a complex array of length :math:`N/2`,
+    :math:`z_m = f_{N-1-2m} + i f_{2m}`, which is multiplied with
+    pre-twiddle factors, transformed with a single FFT of half the length and
+    multiplied with post-twiddle factors. The real and imaginary parts of the
+    result are the even and (reversed) odd entries of :math:`F`. Compared to
+    :py:func:`~.zaf_dst`, which embeds ``f`` in a zero-padded array of length
+    :math:`8N`, this needs a 16th of the FFT length. All leading axes of ``f``
+    are transformed in one batched FFT.
+
+    For odd :math:`N`, this falls back to :py:func:`~.zaf_dst`.
+    """
+    n = f.shape[-1]
+    if n % 2:
+        return jnp.apply_along_axis(lambda x: zaf_dst(x, 4), -1, f)
+    pre, post = _dst_iv_twiddles(n)
+    z = (f[..., ::-2] + 1j * f[..., ::2]) * pre
+    z = jnp.fft.fft(z, axis=-1) * post
+    out = jnp.stack([jnp.real(z), jnp.imag(z)[..., ::-1]], axis=-1)
+    return out.reshape(f.shape)
+
+
+#: The sine transform of :py:func:`~.fourier_transform_sine` is batched over
+#: all leading axes, so it can directly be applied to arrays of shape ``(n,
+#: n, N)``.
+_3Dfour_sine = fourier_transform_sine
 
 _3Dfour_ogata = jax.vmap(
     jax.vmap(
@@ -570,95 +633,717 @@ def pair_distribution_function_two_component_SVT_HNC_ei(
     return jnpu.exp(log_g_r), niter
 
 
+class HNCSolver(metaclass=abc.ABCMeta):
+    """
+    Base class for the iteration schemes that solve the HNC equations for the
+    short-range nodal term :math:`N_{ab}(r)`.
+
+    The HNC equations are written as a fixed-point problem
+    :math:`N = F(N)`, where :math:`F` contains the closure relation and the
+    Ornstein-Zernike relation. A solver gets the function :math:`F` (acting on
+    dimensionless arrays) and an initial guess and returns the solution, the
+    number of iterations, and the history of the residuals. The latter is an
+    array of length :py:attr:`~.max_iter`, which is padded with ``nan``.
+    """
+
+    __name__ = "HNCSolver"
+
+    def __init__(self, tol: float = 1e-6, max_iter: int = 2000) -> None:
+        #: The iteration stops when the sum of the squared residuals falls
+        #: below this value.
+        self.tol: float = tol
+        #: The maximal number of iterations.
+        self.max_iter: int = max_iter
+
+    @abc.abstractmethod
+    def solve(
+        self,
+        fixed_point: callable,
+        N0: jnp.ndarray,
+        mix: float,
+    ) -> tuple[jnp.ndarray, int, jnp.ndarray]:
+        """
+        Solve ``N = fixed_point(N)``, starting from ``N0``.
+
+        Parameters
+        ----------
+        fixed_point: callable
+            The function mapping the nodal term of one iteration onto the
+            next.
+        N0: jnp.ndarray
+            The initial guess.
+        mix: float
+            The damping of the scheme, in [0, 1). A value of zero corresponds
+            to no damping.
+
+        Returns
+        -------
+        jnp.ndarray
+            The solution.
+        int
+            The number of iterations.
+        jnp.ndarray
+            The sum of the squared residuals in every iteration.
+        """
+
+    @property
+    def iteration_limit(self) -> int:
+        """
+        The maximal number of iterations reported by :py:meth:`~.solve`. If
+        this number is reached, the solution did not converge.
+        """
+        return self.max_iter
+
+    def _empty_history(self) -> jnp.ndarray:
+        return jnp.full(self.max_iter, jnp.nan)
+
+    def _tree_flatten(self):
+        children = (self.tol,)
+        aux_data = (self.max_iter,)  # static values
+        return (children, aux_data)
+
+    @classmethod
+    def _tree_unflatten(cls, aux_data, children):
+        obj = object.__new__(cls)
+        (obj.max_iter,) = aux_data
+        (obj.tol,) = children
+        return obj
+
+
+class PicardIteration(HNCSolver):
+    """
+    Plain Picard iteration with linear mixing, as it was published by
+    :cite:`Wunsch.2011`. In every step, :math:`N_{n+1} = (1 - \\text{mix})
+    F(N_n) + \\text{mix} N_n`. The residual is the sum of the squared
+    difference between two subsequent iterations.
+    """
+
+    __name__ = "PicardIteration"
+
+    def solve(self, fixed_point, N0, mix):
+        def condition(val):
+            """
+            If this is False, the loop will stop. Abort if too many steps were
+            reached, or if convergence was reached.
+            """
+            _, err, n_iter, _ = val
+            return (n_iter < self.max_iter) & (err > self.tol)
+
+        def step(val):
+            N, _, i, history = val
+            N_new = (1 - mix) * fixed_point(N) + mix * N
+            err = jnp.sum((N_new - N) ** 2)
+            return N_new, err, i + 1, history.at[i].set(err)
+
+        init = (N0, jnp.inf, 0, self._empty_history())
+        N, _, n_iter, history = jax.lax.while_loop(condition, step, init)
+        return N, n_iter, history
+
+
+class AndersonIteration(HNCSolver):
+    """
+    Anderson mixing (see, e.g., :cite:`Walker.2011`). The new iterate is
+    extrapolated from the last :py:attr:`~.history` iterations, such that the
+    linearized residual :math:`F(N) - N` is minimal. Typically, this needs far
+    less iterations than a :py:class:`~.PicardIteration`.
+
+    The ``mix`` argument damps the update, equivalent to the linear mixing of
+    the :py:class:`~.PicardIteration`. The residual is the sum of the squares
+    of :math:`F(N_n) - N_n`. Should an extrapolated iterate result in a
+    non-finite residual, the history is discarded and the scheme continues
+    with a Picard step from the best iterate found so far, which is also the
+    one that is returned.
+    """
+
+    __name__ = "AndersonIteration"
+
+    def __init__(
+        self,
+        history: int = 5,
+        tol: float = 1e-6,
+        max_iter: int = 2000,
+        regularization: float = 1e-2,
+    ) -> None:
+        #: The number of previous iterations considered.
+        self.history: int = history
+        #: Singular values of the least-squares problem that are smaller than
+        #: this value (relative to the largest one) are ignored. The HNC
+        #: equations are strongly non-linear, so that a rather large value is
+        #: required to keep the scheme stable.
+        self.regularization: float = regularization
+        super().__init__(tol, max_iter)
+
+    def solve(self, fixed_point, N0, mix):
+        shape = N0.shape
+        m = self.history
+
+        def condition(val):
+            (_, _, err_best), n_iter = val[-3], val[-2]
+            return (n_iter < self.max_iter) & ~(err_best <= self.tol)
+
+        def step(val):
+            x, f_old, g_old, dF, dG, written, start, best, i, history = val
+            x_best, g_best, err_best = best
+
+            g = fixed_point(x.reshape(shape)).flatten()
+            f = g - x
+            err = jnp.sum(f**2)
+            ok = jnp.isfinite(err)
+
+            # Store the differences to the last iteration
+            slot = i % m
+            add = ok & (i > start)
+            dF = jnp.where(add, dF.at[slot].set(f - f_old), dF)
+            dG = jnp.where(add, dG.at[slot].set(g - g_old), dG)
+            written = jnp.where(add, written.at[slot].set(i), written)
+            start = jnp.where(ok, start, i + 1)
+            valid = (written > start)[:, jnp.newaxis]
+            dF_valid = jnp.where(valid, dF, 0)
+            dG_valid = jnp.where(valid, dG, 0)
+
+            gamma = jnp.linalg.lstsq(dF_valid.T, f, rcond=self.regularization)[
+                0
+            ]
+            gamma = jnp.where(jnp.any(valid), jnp.nan_to_num(gamma), 0)
+            x_new = jnp.where(
+                ok,
+                x + (1 - mix) * f - (dG_valid - mix * dF_valid).T @ gamma,
+                (1 - mix) * g_best + mix * x_best,
+            )
+
+            improved = ok & (err < err_best)
+            best = (
+                jnp.where(improved, x, x_best),
+                jnp.where(improved, g, g_best),
+                jnp.where(improved, err, err_best),
+            )
+            return (
+                x_new,
+                jnp.where(ok, f, f_old),
+                jnp.where(ok, g, g_old),
+                dF,
+                dG,
+                written,
+                start,
+                best,
+                i + 1,
+                history.at[i].set(err),
+            )
+
+        x0 = N0.flatten()
+        init = (
+            x0,
+            jnp.zeros_like(x0),
+            jnp.zeros_like(x0),
+            jnp.zeros((m, len(x0))),
+            jnp.zeros((m, len(x0))),
+            -jnp.ones(m, dtype=int),
+            0,
+            (x0, x0, jnp.inf),
+            0,
+            self._empty_history(),
+        )
+        val = jax.lax.while_loop(condition, step, init)
+        (x, _, _), n_iter, history = val[-3:]
+        return x.reshape(shape), n_iter, history
+
+    def _tree_flatten(self):
+        children = (self.tol, self.regularization)
+        aux_data = (self.max_iter, self.history)  # static values
+        return (children, aux_data)
+
+    @classmethod
+    def _tree_unflatten(cls, aux_data, children):
+        obj = object.__new__(cls)
+        obj.max_iter, obj.history = aux_data
+        obj.tol, obj.regularization = children
+        return obj
+
+
+class NgIteration(AndersonIteration):
+    """
+    The acceleration scheme of :cite:`Ng.1974`, which uses the last three
+    iterations to extrapolate the next one. This is mathematically identical
+    to an :py:class:`~.AndersonIteration` with a history of two (differences
+    between three iterations).
+    """
+
+    __name__ = "NgIteration"
+
+    def __init__(
+        self,
+        tol: float = 1e-6,
+        max_iter: int = 2000,
+        regularization: float = 1e-2,
+    ) -> None:
+        super().__init__(2, tol, max_iter, regularization)
+
+
+class NewtonGMRES(HNCSolver):
+    """
+    Solve :math:`F(N) - N = 0` with a Newton-Krylov method. The Newton steps
+    are obtained by :py:func:`jax.scipy.sparse.linalg.gmres`, where the
+    Jacobian is only applied via forward-mode differentiation. While every
+    iteration is more expensive than for the other solvers, very few
+    iterations are required close to the solution.
+
+    As the HNC equations are strongly non-linear, Newton's method does not
+    converge when starting far from the solution. Hence,
+    :py:attr:`~.picard_steps` iterations of a :py:class:`~.PicardIteration`
+    are performed, first. These are included in the number of iterations, and
+    the residual history, which has the length ``picard_steps + max_iter``.
+
+    The ``mix`` argument damps the Newton step, i.e., :math:`N_{n+1} = N_n +
+    (1 - \\text{mix}) \\Delta N`. The residual is the sum of the squares of
+    :math:`F(N_n) - N_n`.
+    """
+
+    __name__ = "NewtonGMRES"
+
+    def __init__(
+        self,
+        tol: float = 1e-6,
+        max_iter: int = 50,
+        picard_steps: int = 20,
+        restart: int = 20,
+        gmres_tol: float = 1e-3,
+    ) -> None:
+        #: The number of Picard iterations before the Newton iteration starts.
+        self.picard_steps: int = picard_steps
+        #: The size of the Krylov subspace.
+        self.restart: int = restart
+        #: The relative tolerance of the linear solve in every Newton step.
+        self.gmres_tol: float = gmres_tol
+        super().__init__(tol, max_iter)
+
+    @property
+    def iteration_limit(self) -> int:
+        return self.picard_steps + self.max_iter
+
+    def solve(self, fixed_point, N0, mix):
+        picard = PicardIteration(self.tol, self.picard_steps)
+        N0, n_picard, picard_history = picard.solve(fixed_point, N0, mix)
+
+        def residual(N):
+            return fixed_point(N) - N
+
+        def condition(val):
+            _, _, err, n_iter, _ = val
+            return (n_iter < self.max_iter) & (err > self.tol)
+
+        def step(val):
+            N, R, _, i, history = val
+            _, jvp = jax.linearize(residual, N)
+            dN, _ = jax.scipy.sparse.linalg.gmres(
+                jvp, -R, tol=self.gmres_tol, restart=self.restart, maxiter=1
+            )
+            N_new = N + (1 - mix) * dN
+            R_new = residual(N_new)
+            err = jnp.sum(R_new**2)
+            history = history.at[n_picard + i].set(err)
+            return N_new, R_new, err, i + 1, history
+
+        R0 = residual(N0)
+        history = jnp.concatenate([picard_history, self._empty_history()])
+        init = (N0, R0, jnp.sum(R0**2), 0, history)
+        N, _, _, n_iter, history = jax.lax.while_loop(condition, step, init)
+        return N, n_picard + n_iter, history
+
+    def _tree_flatten(self):
+        children = (self.tol, self.gmres_tol)
+        aux_data = (self.max_iter, self.picard_steps, self.restart)
+        return (children, aux_data)
+
+    @classmethod
+    def _tree_unflatten(cls, aux_data, children):
+        obj = object.__new__(cls)
+        obj.max_iter, obj.picard_steps, obj.restart = aux_data
+        obj.tol, obj.gmres_tol = children
+        return obj
+
+
+_all_hnc_solvers = [
+    AndersonIteration,
+    NewtonGMRES,
+    NgIteration,
+    PicardIteration,
+]
+
+for _solver in _all_hnc_solvers:
+    jax.tree_util.register_pytree_node(
+        _solver,
+        _solver._tree_flatten,
+        _solver._tree_unflatten,
+    )
+
+
+@lru_cache
+def pair_indices(nspec: int) -> tuple[onp.ndarray, onp.ndarray]:
+    """
+    The species indices :math:`(a, b)` with :math:`a \\leq b`, in the order
+    in which the pairs are stored in the packed layout of
+    :py:func:`~.pack_pairs`.
+    """
+    return onp.triu_indices(nspec)
+
+
+@lru_cache
+def _pair_lookup(nspec: int) -> onp.ndarray:
+    """
+    The position of every pair :math:`(a, b)` in the packed layout, for both
+    :math:`a \\leq b` and :math:`a > b`.
+    """
+    a, b = pair_indices(nspec)
+    lookup = onp.empty((nspec, nspec), dtype=int)
+    lookup[a, b] = onp.arange(len(a))
+    lookup[b, a] = onp.arange(len(a))
+    return lookup
+
+
+def pack_pairs(x: Quantity | jnp.ndarray) -> Quantity | jnp.ndarray:
+    """
+    Store an array of shape :math:`(n \\times n \\times m)`, which is
+    symmetric in its first two axes, in the packed, upper-triangular layout
+    of shape :math:`(n (n+1) / 2 \\times m)`. The order of the pairs is given
+    by :py:func:`~.pair_indices`.
+    """
+    a, b = pair_indices(x.shape[0])
+    return x[a, b]
+
+
+def unpack_pairs(
+    x: Quantity | jnp.ndarray, nspec: int
+) -> Quantity | jnp.ndarray:
+    """
+    Expand an array in the packed layout of :py:func:`~.pack_pairs` to the
+    full, symmetric :math:`(n \\times n \\times m)` array.
+    """
+    return x[_pair_lookup(nspec)]
+
+
+def _pair_weights(nspec: int) -> onp.ndarray:
+    """
+    Weights of the pairs in the packed layout, so that the (squared) norm of
+    a weighted packed array equals the norm of the full array.
+    """
+    a, b = pair_indices(nspec)
+    return onp.where(a == b, 1.0, onp.sqrt(2.0))[:, onp.newaxis]
+
+
 @jax.jit
-def pair_distribution_function_HNC(V_s, V_l_k, r, Ti, ni, mix=0.0):
+def ornstein_zernike(c_k: Quantity, n: Quantity) -> Quantity:
     """
-    Calculate the Pair distribution function in the Hypernetted Chain approach,
-    as it was published by :cite:`Wunsch.2011`.
+    Solve the multi-component Ornstein-Zernike relation in :math:`k` space,
 
-    The `mix` argument should lie within the interval [0, 1) and controls
-    the amount by which the short-range nodal diagram term `N_ab` is updated
-    with each iteration. `mix=0` corresponds to fully using the newly obtained
-    result, while increasing `mix` mixes more of the previous iteration's value
-    to `N_ab`. This addition to the HNC scheme presented by :cite:`Wunsch.2011`
-    was introduced in the MCSS User Guide :cite:`Chapman.2016` and is
-    especially relevant e.g., at low temperatures, where the HNC scheme becomes
-    numerically unstable.
+    .. math::
+
+       h_{ab}(k) = c_{ab}(k) + \\sum_c c_{ac}(k) n_c h_{cb}(k),
+
+    i.e., :math:`h = (I - c n)^{-1} c`, for all :math:`k` at once.
+
+    For one and two components, the inverse is calculated in closed form,
+    directly on the :math:`(n \\times n \\times m)` arrays. For more
+    components, the arrays are brought to a :math:`k`-major layout, once, and
+    a batched linear solve is used.
+
+    Parameters
+    ----------
+    c_k: Quantity
+        The direct correlation function in :math:`k` space, with shape
+        :math:`(n \\times n \\times m)`.
+    n: Quantity
+        The number densities of the :math:`n` species.
+
+    Both arguments can also be given as plain arrays, in reciprocal units.
+
+    Returns
+    -------
+    Quantity
+        The total correlation function :math:`h_{ab}(k)`, with the same shape
+        and units as ``c_k``.
     """
-    delta = 1e-6
+    if jpu.core.is_quantity(c_k):
+        unit = c_k.units
+        return ornstein_zernike(c_k.m_as(unit), n.m_as(1 / unit)) * unit
+    c = c_k
+    nspec = c.shape[0]
+
+    if nspec == 1:
+        h = c / (1 - c * n[0])
+    elif nspec == 2:
+        # M = I - c n, and h = M^{-1} c, with the explicit inverse of M
+        M00 = 1 - c[0, 0] * n[0]
+        M01 = -c[0, 1] * n[1]
+        M10 = -c[1, 0] * n[0]
+        M11 = 1 - c[1, 1] * n[1]
+        det = M00 * M11 - M01 * M10
+        h = (
+            jnp.array(
+                [
+                    [
+                        M11 * c[0, 0] - M01 * c[1, 0],
+                        M11 * c[0, 1] - M01 * c[1, 1],
+                    ],
+                    [
+                        M00 * c[1, 0] - M10 * c[0, 0],
+                        M00 * c[1, 1] - M10 * c[0, 1],
+                    ],
+                ]
+            )
+            / det
+        )
+    else:
+        c = jnp.moveaxis(c, -1, 0)
+        M = jnp.eye(nspec) - c * n[jnp.newaxis, jnp.newaxis, :]
+        h = jnp.moveaxis(jnp.linalg.solve(M, c), 0, -1)
+    return h
 
-    dr = r[1] - r[0]
-    dk = jnp.pi / (len(r) * dr)
 
-    k = jnp.pi / r[-1] + jnp.arange(len(r)) * dk
+class NodalTermCache:
+    """
+    Storage for converged nodal terms :math:`N_{ab}(r)`, which are used as
+    the initial guess for the next solution of the HNC equations with the
+    same key. The cache lives on the host and is accessed via
+    :py:func:`jax.experimental.io_callback`, so it is also used from within
+    jitted functions. Hence, the last converged result is available for the
+    next call of, e.g., :py:meth:`jaxrts.plasmastate.PlasmaState.probe`
+    without re-compiling.
 
-    beta = 1 / (ureg.boltzmann_constant * Ti)
+    The key consists of a static part, which should identify the potentials
+    and species, and the grid ``r``.
 
-    v_s = beta * V_s
-    v_l_k = beta * V_l_k
+    .. note::
 
-    log_g_r0 = -(v_s).to(ureg.dimensionless)
-    Ns_r0 = jnp.zeros_like(log_g_r0) * ureg.dimensionless
+       The cache is not differentiable. The nodal terms are stored and loaded
+       with :py:func:`jax.lax.stop_gradient`. Only results that converged
+       (i.e., that required less than the maximal number of iterations and
+       are finite) are stored.
+    """
+
+    def __init__(self) -> None:
+        self._store = {}
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def clear(self) -> None:
+        """
+        Remove all stored nodal terms.
+        """
+        self._store.clear()
 
-    d = jnp.eye(ni.shape[0]) * ni
+    @staticmethod
+    def _grid_key(r) -> tuple:
+        r = onp.asarray(r)
+        return (float(r[0]), float(r[1]), len(r))
 
-    def ozr(input_vec):
+    def load(self, key: tuple, r: Quantity, N0: jnp.ndarray) -> jnp.ndarray:
         """
-        Ornstein-Zernicke Relation
+        Return the nodal term stored for ``key`` and the grid ``r``. If there
+        is none (or the shape does not match), return ``N0``.
         """
-        return jnpu.matmul(
-            jnp.linalg.inv(
-                (jnp.eye(ni.shape[0]) - jnpu.matmul(input_vec, d)).m_as(
-                    ureg.dimensionless
-                )
-            ),
-            input_vec,
+
+        def _load(r, N0):
+            stored = self._store.get((key, self._grid_key(r)))
+            if stored is None or stored.shape != N0.shape:
+                return N0
+            return stored.astype(N0.dtype)
+
+        return io_callback(
+            _load,
+            jax.ShapeDtypeStruct(N0.shape, N0.dtype),
+            jax.lax.stop_gradient(r.m_as(ureg.a0)),
+            jax.lax.stop_gradient(N0),
         )
 
-    def condition(val):
+    def store(
+        self, key: tuple, r: Quantity, N: jnp.ndarray, converged: bool
+    ) -> None:
         """
-        If this is False, the loop will stop. Abort if too many steps were
-        reached, or if convergence was reached.
+        Save the nodal term ``N`` for ``key`` and the grid ``r``, if it is
+        ``converged``.
         """
-        _, Ns_r, Ns_r_old, n_iter = val
-        err = jnpu.sum((Ns_r - Ns_r_old) ** 2)
-        return (n_iter < 2000) & jnp.all(err > delta)
 
-    def step(val):
-        log_g_r, Ns_r, _, i = val
+        def _store(r, N, converged):
+            if converged and onp.all(onp.isfinite(N)):
+                self._store[(key, self._grid_key(r))] = onp.asarray(N)
 
-        h_r = jnpu.expm1(log_g_r)
+        io_callback(
+            _store,
+            None,
+            jax.lax.stop_gradient(r.m_as(ureg.a0)),
+            jax.lax.stop_gradient(N),
+            converged,
+        )
 
-        cs_r = h_r - Ns_r
 
-        cs_k = _3Dfour(k, r, cs_r)
+#: The default :py:class:`~.NodalTermCache`, used by the HNC models in
+#: :py:mod:`jaxrts.models` if their ``use_cache`` attribute is set.
+nodal_term_cache = NodalTermCache()
 
-        c_k = cs_k - v_l_k
 
-        # Ornstein-Zernike relation
-        h_k = jax.vmap(ozr, in_axes=2, out_axes=2)(c_k)
+@jax.jit
+@units.unit_kernel(
+    ureg.dimensionless,
+    ureg.dimensionless,
+    ureg.a0**3,
+    ureg.a0,
+    1 / ureg.a0,
+    1 / ureg.a0**3,
+)
+def _hnc_step(Ns_r, v_s, v_l_k, r, k, n):
+    """
+    A single iteration of the HNC equations for the packed nodal term
+    :math:`N_{ab}(r)`, with the potentials :math:`v = V / k_B T`, all as
+    plain arrays in atomic units.
+    """
+    nspec = n.shape[0]
+    h_r = jnpu.expm1(Ns_r - v_s)
 
-        Ns_k = h_k - cs_k
+    cs_r = h_r - Ns_r
 
-        Ns_r_new_full = (
-            _3Dfour(
-                r,
-                k,
-                Ns_k,
+    cs_k = _3Dfour(k, r, cs_r)
+
+    c_k = cs_k - v_l_k
+
+    # Ornstein-Zernike relation
+    h_k = pack_pairs(ornstein_zernike(unpack_pairs(c_k, nspec), n))
+
+    Ns_k = h_k - cs_k
+
+    return _3Dfour(r, k, Ns_k) / (2 * jnp.pi) ** 3
+
+
+def pair_distribution_function_HNC_full(
+    V_s, V_l_k, r, Ti, ni, mix=0.0, solver=None, N0=None
+):
+    """
+    Calculate the Pair distribution function in the Hypernetted Chain approach,
+    as it was published by :cite:`Wunsch.2011`, and return additional
+    information about the convergence. See
+    :py:func:`~.pair_distribution_function_HNC` for a description of the
+    arguments.
+
+    Returns
+    -------
+    Quantity
+        The pair distribution function :math:`g_{ab}(r)`.
+    Quantity
+        The short-range nodal term :math:`N_{ab}(r)`.
+    int
+        The number of iterations.
+    jnp.ndarray
+        The sum of the squared residuals for every iteration, padded with
+        ``nan``.
+    """
+    if solver is None:
+        solver = PicardIteration()
+
+    dr = r[1] - r[0]
+    dk = jnp.pi / (len(r) * dr)
+
+    k = jnp.pi / r[-1] + jnp.arange(len(r)) * dk
+
+    # All arrays are symmetric in the species. Iterate only on the upper
+    # triangle, and expand to the full matrix only for the Ornstein-Zernike
+    # relation.
+    nspec = ni.shape[0]
+    packed = V_s.ndim == 2
+    if not packed:
+        V_s = pack_pairs(V_s)
+        V_l_k = pack_pairs(V_l_k)
+    if jnp.ndim(Ti.magnitude) == 3:
+        Ti = pack_pairs(Ti)
+
+    # The iteration operates on plain arrays in atomic units (see
+    # _hnc_step), so that no units are converted within the loop.
+    beta = 1 / (ureg.boltzmann_constant * Ti)
+    v_s = (beta * V_s).m_as(ureg.dimensionless)
+    v_l_k = (beta * V_l_k).m_as(ureg.a0**3)
+    r = r.m_as(ureg.a0)
+    k = k.m_as(1 / ureg.a0)
+    n = ni.m_as(1 / ureg.a0**3)
+
+    if N0 is None:
+        Ns_r0 = jnp.zeros_like(v_s)
+    else:
+        N0 = (N0 * ureg.dimensionless).m_as(ureg.dimensionless)
+        if N0.ndim != 2:
+            N0 = pack_pairs(
+                jnp.broadcast_to(N0, (nspec, nspec, v_s.shape[-1]))
             )
-            / (2 * jnp.pi) ** 3
-        )
+        Ns_r0 = jnp.broadcast_to(N0, v_s.shape)
 
-        Ns_r_new = (1 - mix) * Ns_r_new_full + mix * Ns_r
+    # The solvers act on the packed nodal term, where the off-diagonal pairs
+    # are weighted, so that the residuals are those of the full matrix.
+    weights = _pair_weights(nspec)
 
-        log_g_r_new = Ns_r_new - v_s
+    def step(Ns_r):
+        return _hnc_step(Ns_r / weights, v_s, v_l_k, r, k, n) * weights
 
-        return log_g_r_new, Ns_r_new, Ns_r, i + 1
+    Ns_r, niter, residuals = solver.solve(step, Ns_r0 * weights, mix)
+    instrumentation.count("HNC iterations", niter)
+    Ns_r = Ns_r / weights
+    g = jnp.exp(Ns_r - v_s) * ureg.dimensionless
+    Ns_r = Ns_r * ureg.dimensionless
 
-    init = (log_g_r0, Ns_r0, Ns_r0 - 1, 0)
-    log_g_r, _, _, niter = jax.lax.while_loop(condition, step, init)
+    if not packed:
+        g = unpack_pairs(g, nspec)
+        Ns_r = unpack_pairs(Ns_r, nspec)
+    return g, Ns_r, niter, residuals
 
-    return jnpu.exp(log_g_r), niter
+
+@jax.jit
+def pair_distribution_function_HNC(
+    V_s, V_l_k, r, Ti, ni, mix=0.0, solver=None, N0=None
+):
+    """
+    Calculate the Pair distribution function in the Hypernetted Chain approach,
+    as it was published by :cite:`Wunsch.2011`.
+
+    The `mix` argument should lie within the interval [0, 1) and controls
+    the amount by which the short-range nodal diagram term `N_ab` is updated
+    with each iteration. `mix=0` corresponds to fully using the newly obtained
+    result, while increasing `mix` mixes more of the previous iteration's value
+    to `N_ab`. This addition to the HNC scheme presented by :cite:`Wunsch.2011`
+    was introduced in the MCSS User Guide :cite:`Chapman.2016` and is
+    especially relevant e.g., at low temperatures, where the HNC scheme becomes
+    numerically unstable.
+
+    The `solver` is a :py:class:`~.HNCSolver`, defining the iteration scheme.
+    It defaults to a :py:class:`~.PicardIteration`. For the other solvers,
+    `mix` damps the update of the respective scheme.
+
+    `N0` is the initial guess for the nodal term `N_ab` (defaults to zero).
+    When scanning parameters, the converged `N_ab` of a close-by state (see
+    :py:func:`~.pair_distribution_function_HNC_full`) is a good choice and
+    reduces the number of iterations considerably.
+
+    The potentials `V_s` and `V_l_k` are either given as full :math:`(n
+    \\times n \\times m)` arrays, or in the packed, upper-triangular layout of
+    :py:func:`~.pack_pairs`, and :math:`g_{ab}(r)` is returned in the same
+    layout. Internally, the iteration always uses the packed layout and
+    expands to the full matrices only to solve the Ornstein-Zernike relation
+    (see :py:func:`~.ornstein_zernike`), which nearly halves memory and the
+    number of Fourier transforms for many species. `N0` may be given in
+    either layout.
+
+    Returns
+    -------
+    Quantity
+        The pair distribution function :math:`g_{ab}(r)`.
+    int
+        The number of iterations.
+
+    See Also
+    --------
+    pair_distribution_function_HNC_full
+        Also returns the nodal term and the residual of every iteration.
+    """
+    g, _, niter, _ = pair_distribution_function_HNC_full(
+        V_s, V_l_k, r, Ti, ni, mix, solver, N0
+    )
+    return g, niter
 
 
 def geometric_mean_T(T):
@@ -0,0 +1,405 @@
+"""
+This submodule allows to find out which of the models of a
+:py:class:`jaxrts.plasmastate.PlasmaState` dominates the time spent in
+:py:meth:`~jaxrts.plasmastate.PlasmaState.probe`.
+
+While instrumentation is enabled (see :py:func:`~.instrument`),
+
+- every call to an ``evaluate*`` method of a model that is accessed via
+  ``plasma_state[key]`` is wrapped in a :py:func:`jax.named_scope`, so that
+  the operations carry the key and name of the model in XLA profiles (e.g.,
+  those recorded with :py:func:`jax.profiler.trace`),
+- the models which are called by other models (e.g., ``"screening"`` or
+  ``"BM S_ii"``) are recorded,
+- counters, such as the number of HNC iterations or of evaluations of the
+  integrands in adaptive quadratures, can be collected.
+
+:py:func:`~.profile` (or :py:meth:`jaxrts.plasmastate.PlasmaState.profile`)
+uses this to time every model separately, split into compilation and
+execution, and returns a :py:class:`~.ProfileReport`.
+
+Instrumentation is a pure trace-time switch: If it is disabled, nothing is
+added to the traced functions, and compiled code is identical to the one
+without this module. To not mix instrumented and non-instrumented
+executables, JAX's caches are cleared when instrumentation is enabled and
+disabled. Hence, the first calls afterwards have to compile again.
+
+Examples
+--------
+>>> report = state.profile(setup)
+>>> print(report)
+>>> report.to_dict()
+"""
+
+import logging
+import statistics
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from functools import partial
+
+import jax
+import numpy as onp
+
+logger = logging.getLogger(__name__)
+
+#: The model keys that are evaluated by
+#: :py:meth:`jaxrts.plasmastate.PlasmaState.probe`.
+probe_keys = [
+    "ionic scattering",
+    "free-free scattering",
+    "bound-free scattering",
+    "free-bound scattering",
+]
+
+# The currently active recorder. If this is None, instrumentation is off.
+_recorder = None
+
+
+class _Recorder:
+    """
+    Stores the information collected while instrumentation is enabled.
+    """
+
+    def __init__(self) -> None:
+        #: If ``True``, :py:func:`~.count` adds callbacks to the traced
+        #: functions.
+        self.counting = False
+        # The keys of the models that are currently traced
+        self._stack = []
+        #: Mapping of a model key to the name of the model.
+        self.models = {}
+        #: Mapping of a model key to the keys of the models it calls.
+        self.calls = defaultdict(set)
+        #: Mapping of a model key to the counters collected for it.
+        self.counters = defaultdict(lambda: defaultdict(float))
+
+    @property
+    def current_key(self) -> str | None:
+        return self._stack[-1] if self._stack else None
+
+    def enter(self, key: str, name: str) -> None:
+        self.models[key] = name
+        if self._stack and self._stack[-1] != key:
+            self.calls[self._stack[-1]].add(key)
+        self._stack.append(key)
+
+    def exit(self) -> None:
+        self._stack.pop()
+
+    def add(self, key: str | None, name: str, value) -> None:
+        self.counters[key][name] += float(onp.sum(value))
+
+
+class _InstrumentedModel:
+    """
+    Thin wrapper around a model, which is returned by
+    :py:meth:`jaxrts.plasmastate.PlasmaState.__getitem__` while
+    instrumentation is enabled. All attributes are forwarded to the model,
+    the ``evaluate*`` methods are wrapped to record the call.
+    """
+
+    def __init__(self, model, key: str) -> None:
+        object.__setattr__(self, "_model", model)
+        object.__setattr__(self, "_key", key)
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._model, name)
+        if name.startswith("evaluate") and callable(attr):
+            return partial(self._evaluate, attr)
+        return attr
+
+    def __setattr__(self, name: str, value) -> None:
+        setattr(self._model, name, value)
+
+    def _evaluate(self, method, *args, **kwargs):
+        name = type(self._model).__name__
+        if _recorder is None:
+            return method(*args, **kwargs)
+        _recorder.enter(self._key, name)
+        try:
+            with jax.named_scope(f"{self._key}:{name}"):
+                return method(*args, **kwargs)
+        finally:
+            _recorder.exit()
+
+
+def enabled() -> bool:
+    """
+    Return ``True`` if instrumentation is enabled.
+    """
+    return _recorder is not None
+
+
+def wrap(model, key: str):
+    """
+    Wrap ``model`` so that calls to it are recorded, if instrumentation is
+    enabled. Otherwise, return the model, unchanged.
+    """
+    if _recorder is None:
+        return model
+    return _InstrumentedModel(model, key)
+
+
+def count(name: str, value) -> None:
+    """
+    Add ``value`` to the counter ``name`` of the model which is currently
+    evaluated. Batched values (e.g., within :py:func:`jax.vmap`) are summed.
+
+    This can be called from within jitted functions. If counting is not
+    enabled, this does nothing and adds nothing to the traced function.
+    """
+    if _recorder is None or not _recorder.counting:
+        return
+    jax.debug.callback(
+        partial(_recorder.add, _recorder.current_key, name), value
+    )
+
+
+@contextmanager
+def instrument(counting: bool = False):
+    """
+    Context manager which enables instrumentation.
+
+    Parameters
+    ----------
+    counting: bool
+        If ``True``, the counters set via :py:func:`~.count` are collected.
+        This requires a callback to the host and slows down the execution,
+        so that it should not be combined with timing measurements.
+
+    Yields
+    ------
+    _Recorder
+        The object collecting the call graph and counters.
+    """
+    global _recorder
+    if _recorder is not None:
+        raise RuntimeError("Instrumentation is already enabled.")
+    # Functions traced before have to be traced again (and vice versa) so
+    # that the instrumentation is (not) part of the traced functions.
+    jax.clear_caches()
+    _recorder = _Recorder()
+    _recorder.counting = counting
+    try:
+        yield _recorder
+    finally:
+        _recorder = None
+        jax.clear_caches()
+
+
+class ModelProfile:
+    """
+    Timing and counters of a single model, or of the full
+    :py:meth:`~jaxrts.plasmastate.PlasmaState.probe`.
+
+    All times are in seconds. The times of a model include the times of all
+    the models it :py:attr:`~.calls`.
+    """
+
+    def __init__(
+        self,
+        key: str,
+        model: str,
+        lower_time: float,
+        compile_time: float,
+        first_call_time: float,
+        run_times: list[float],
+    ) -> None:
+        #: The key of the model in the plasma state.
+        self.key = key
+        #: The name of the model.
+        self.model = model
+        #: The time spent on tracing and lowering the evaluation.
+        self.lower_time = lower_time
+        #: The time spent on compiling the evaluation.
+        self.compile_time = compile_time
+        #: The duration of the first call to the compiled evaluation.
+        self.first_call_time = first_call_time
+        #: The durations of the subsequent calls to the compiled evaluation.
+        self.run_times = run_times
+        #: The keys of the models called by this model.
+        self.calls: list[str] = []
+        #: Counters collected for this model, e.g., the number of HNC
+        #: iterations. Counters of the models in :py:attr:`~.calls` are not
+        #: included.
+        self.counters: dict[str, float] = {}
+
+    @property
+    def run_time(self) -> float:
+        """
+        The median of :py:attr:`~.run_times`.
+        """
+        return statistics.median(self.run_times)
+
+    def to_dict(self) -> dict:
+        return {
+            "key": self.key,
+            "model": self.model,
+            "lower_time": self.lower_time,
+            "compile_time": self.compile_time,
+            "first_call_time": self.first_call_time,
+            "run_times": self.run_times,
+            "run_time": self.run_time,
+            "calls": self.calls,
+            "counters": self.counters,
+        }
+
+
+class ProfileReport:
+    """
+    The result of :py:func:`~.profile`.
+    """
+
+    def __init__(self, models: dict[str, ModelProfile], probe: ModelProfile):
+        #: Mapping of the model keys to the :py:class:`~.ModelProfile`.
+        self.models = models
+        #: The :py:class:`~.ModelProfile` of the full
+        #: :py:meth:`~jaxrts.plasmastate.PlasmaState.probe`.
+        self.probe = probe
+
+    def __getitem__(self, key: str) -> ModelProfile:
+        return self.models[key]
+
+    def to_dict(self) -> dict:
+        """
+        Return the report as a dictionary, which can be serialized to JSON.
+        """
+        return {
+            "models": {k: m.to_dict() for k, m in self.models.items()},
+            "probe": self.probe.to_dict(),
+        }
+
+    def __str__(self) -> str:
+        width = max(len(k) for k in [*self.models.keys(), "probe"]) + 2
+        lines = [
+            f"{'key':<{width}}{'model':<32}"
+            + f"{'compile [s]':>12}{'run [ms]':>12}  counters"
+        ]
+
+        def _line(profile, indent):
+            counters = ", ".join(
+                f"{k}: {v:g}" for k, v in profile.counters.items()
+            )
+            return (
+                f"{' ' * indent + profile.key:<{width}}{profile.model:<32}"
+                + f"{profile.lower_time + profile.compile_time:12.3f}"
+                + f"{profile.run_time * 1e3:12.3f}  {counters}"
+            )
+
+        def _add(key, indent, seen):
+            lines.append(_line(self.models[key], indent))
+            for child in self.models[key].calls:
+                if child not in seen:
+                    _add(child, indent + 2, seen | {child})
+
+        called = {c for m in self.models.values() for c in m.calls}
+        for key in self.models:
+            if key not in called:
+                _add(key, 0, {key})
+        lines.append(_line(self.probe, 0))
+        return "\n".join(lines)
+
+
+def _time(fun, args: tuple, repeats: int) -> tuple:
+    """
+    Lower, compile and call ``fun`` with ``args``.
+
+    Returns
+    -------
+    tuple
+        The lower time, the compile time, the time of the first call and a
+        list of the times of ``repeats`` subsequent calls (all in seconds).
+    """
+    t0 = time.perf_counter()
+    lowered = fun.lower(*args)
+    t1 = time.perf_counter()
+    compiled = lowered.compile()
+    t2 = time.perf_counter()
+    jax.block_until_ready(compiled(*args))
+    t3 = time.perf_counter()
+    run_times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        jax.block_until_ready(compiled(*args))
+        run_times.append(time.perf_counter() - start)
+    return t1 - t0, t2 - t1, t3 - t2, run_times
+
+
+def _evaluate(plasma_state, setup, key):
+    return plasma_state.evaluate(key, setup)
+
+
+def profile(
+    plasma_state,
+    setup,
+    keys: list[str] | None = None,
+    repeats: int = 3,
+    counters: bool = True,
+) -> ProfileReport:
+    """
+    Time the evaluation of every model of ``plasma_state`` separately.
+
+    Every model in ``keys``, and every model called by them, is compiled and
+    evaluated on it's own (after clearing JAX's caches, so that the compile
+    time of a model does not depend on the order). Afterwards, the full
+    :py:meth:`~jaxrts.plasmastate.PlasmaState.probe` is timed. Note that the
+    times of a model include the ones of the models it calls.
+
+    Parameters
+    ----------
+    plasma_state: PlasmaState
+        The plasma state to profile.
+    setup: Setup
+        The setup passed to the models.
+    keys: list[str] | None
+        The keys of the models which should be profiled. Defaults to the
+        keys evaluated by :py:meth:`~jaxrts.plasmastate.PlasmaState.probe`.
+    repeats: int
+        The number of timed calls after the first call of each compiled
+        evaluation.
+    counters: bool
+        If ``True``, :py:meth:`~jaxrts.plasmastate.PlasmaState.probe` is
+        evaluated once more, with counting enabled, to collect the counters
+        (e.g., HNC iterations and quadrature evaluations) of every model.
+
+    Returns
+    -------
+    ProfileReport
+        The timings, the models called by every model and the counters.
+    """
+    if keys is None:
+        keys = probe_keys
+    probe = jax.jit(type(plasma_state).probe)
+
+    profiles = {}
+    with instrument() as recorder:
+        queue = list(keys)
+        while queue:
+            key = queue.pop(0)
+            if key in profiles:
+                continue
+            jax.clear_caches()
+            evaluate = jax.jit(partial(_evaluate, key=key))
+            times = _time(evaluate, (plasma_state, setup), repeats)
+            profiles[key] = ModelProfile(key, recorder.models[key], *times)
+            logger.info(
+                f"Profiled '{key}' ({recorder.models[key]}): compile "
+                + f"{times[0] + times[1]:.2f}s, run {times[3][-1] * 1e3:.2f}ms."
+            )
+            queue.extend(sorted(recorder.calls[key]))
+        jax.clear_caches()
+        probe_profile = ModelProfile(
+            "probe", "", *_time(probe, (plasma_state, setup), repeats)
+        )
+        for key, profile in profiles.items():
+            profile.calls = sorted(recorder.calls[key])
+
+    if counters:
+        with instrument(counting=True) as recorder:
+            jax.block_until_ready(probe(plasma_state, setup))
+            jax.effects_barrier()
+        for key, values in recorder.counters.items():
+            if key in profiles:
+                profiles[key].counters = dict(values)
+    return ProfileReport(profiles, probe_profile)
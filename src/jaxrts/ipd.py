@@ -12,6 +12,7 @@ from jax import numpy as jnp
 from jpu import numpy as jnpu
 from quadax import quadts as quad
 
+from . import units
 from .math import fermi_neg12_rational_approximation_antia
 from .units import Quantity, ureg
 
@@ -327,6 +328,16 @@ def ipd_ecker_kroell(
 
 
 @jax.jit
+@units.unit_kernel(ureg.dimensionless, ureg.dimensionless, ureg.dimensionless)
+def _pauli_blocking_integrand(x, epsilon, eta):
+    """
+    The integrand of :py:func:`~.ipd_pauli_blocking`, for the dimensionless
+    momentum :math:`x = p a_Z`, with :math:`\\epsilon = \\hbar^2 / (2 m_e
+    a_Z^2 k_B T_e)` and :math:`\\eta = \\mu / k_B T_e`.
+    """
+    return x**2 / (1 + x**2) ** 3 / (jnpu.exp(epsilon * x**2 - eta) + 1)
+
+
 def ipd_pauli_blocking(
     Zi: float, ne: Quantity, ni: Quantity, Te: Quantity, Ti: Quantity
 ) -> Quantity:
@@ -360,35 +371,20 @@ def ipd_pauli_blocking(
     # Reduced Bohr radius
     a_Z = ureg.a0 / Zi
 
-    @jax.jit
-    def integrand(p):
-        p /= 1 * ureg.angstrom
-
-        res = (
-            p**2
-            / (1 + a_Z**2 * p**2) ** 3
-            * (
-                1
-                / (
-                    jnpu.exp(
-                        (
-                            (
-                                (1 * ureg.hbar * p) ** 2
-                                / (2 * ureg.electron_mass)
-                                - chem_pot
-                            )
-                            / (1 * ureg.boltzmann_constant * Te)
-                        )
-                    )
-                    + 1
-                )
-            )
-        )
-
-        return res.m_as(1 / ureg.angstrom**2)
+    # The integral is evaluated for the dimensionless momentum x = p a_Z
+    epsilon = (
+        ureg.hbar**2
+        / (2 * ureg.electron_mass * a_Z**2 * ureg.boltzmann_constant * Te)
+    ).m_as(ureg.dimensionless)
+    eta = (chem_pot / (ureg.boltzmann_constant * Te)).m_as(ureg.dimensionless)
 
-    integral, errl = quad(integrand, [0, jnp.inf], epsabs=1e-15, epsrel=1e-15)
-    integral /= 1 * ureg.angstrom**3
+    integral, errl = quad(
+        lambda x: _pauli_blocking_integrand(x, epsilon, eta),
+        [0, jnp.inf],
+        epsabs=1e-15,
+        epsrel=1e-15,
+    )
+    integral /= a_Z**3
     # The ionization potential depression energy shift
     ipd_shift = -(
         Zi
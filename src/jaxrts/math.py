@@ -3,7 +3,10 @@ This submodule is dedicated to math functions which occur frequently in the
 calculations.
 """
 
+import math
+
 import jax
+import numpy as onp
 from jax import numpy as jnp
 from quadax import quadgk
 
@@ -51,11 +54,16 @@ def _R1_mk(a, b, x):
 @jax.jit
 def _F_n(x, a, b, c, d, n):
     norm = jax.scipy.special.gamma(n + 1)
+    # Keep the branch which is not taken finite, so that its (discarded)
+    # gradient does not turn into NaN.
+    small = x < 2
+    x_small = jnp.where(small, x, 0.0)
+    x_large = jnp.where(small, 2.0, x)
     return (
         jnp.where(
-            x < 2,
-            jnp.exp(x) * _R1_mk(a, b, jnp.exp(x)),
-            x ** (n + 1) * _R1_mk(c, d, x ** (-2)),
+            small,
+            jnp.exp(x_small) * _R1_mk(a, b, jnp.exp(x_small)),
+            x_large ** (n + 1) * _R1_mk(c, d, x_large ** (-2)),
         )
         / norm
     )
@@ -124,8 +132,15 @@ def inverse_fermi_12_fukushima_single_prec(x):
     rS_coeff_upper = jnp.array([1974.50048, 144.437558, 1.0])
     rS_coeff_lower = jnp.array([10.3906494, 0.669052603])
 
+    # Evaluate the outer branches only with valid arguments, so that the
+    # branches which are not taken do not produce NaN gradients.
+    x_low = jnp.where(x < u_sgl[0], x, 0.5 * u_sgl[0])
+    x_high = jnp.where(x >= u_sgl[4], x, u_sgl[4])
+
     term1 = jnp.where(
-        x < u_sgl[0], jnp.log(x * _R1_mk(r0_coeff_upper, r0_coeff_lower, x)), 0
+        x < u_sgl[0],
+        jnp.log(x_low * _R1_mk(r0_coeff_upper, r0_coeff_lower, x_low)),
+        0,
     )
     term2 = jnp.where(
         (x >= u_sgl[0]) * (x < u_sgl[1]),
@@ -151,9 +166,11 @@ def inverse_fermi_12_fukushima_single_prec(x):
         (x >= u_sgl[4]),
         jnp.sqrt(
             _R1_mk(
-                rS_coeff_upper, rS_coeff_lower, 1.0 + beta[5] * x ** (-4 / 3)
+                rS_coeff_upper,
+                rS_coeff_lower,
+                1.0 + beta[5] * x_high ** (-4 / 3),
             )
-            / (-beta[5] * x ** (-4 / 3))
+            / (-beta[5] * x_high ** (-4 / 3))
         ),
         0,
     )
@@ -472,3 +489,169 @@ def inverse_fermi_12_rational_approximation_antia(x):
     #                 -6.067091689181E-2])
 
     return _X_n(x, a, b, c, d, 0.5)
+
+
+def _pchip_edge_slope(h0, h1, d0, d1):
+    """
+    The slope at the first (or last) point of a monotone cubic interpolation,
+    from a one-sided three-point formula, limited such that the monotonicity
+    is conserved.
+    """
+    d = ((2 * h0 + h1) * d0 - h0 * d1) / jnp.where(h0 + h1 > 0, h0 + h1, 1)
+    d = jnp.where(jnp.sign(d) != jnp.sign(d0), 0, d)
+    return jnp.where(
+        (jnp.sign(d0) != jnp.sign(d1)) & (jnp.abs(d) > 3 * jnp.abs(d0)),
+        3 * d0,
+        d,
+    )
+
+
+@jax.jit
+def monotone_cubic_interp(x, xp, fp, left=0.0, right=0.0):
+    """
+    Piecewise cubic Hermite interpolation which preserves the monotonicity of
+    the data (PCHIP, :cite:`Fritsch.1984`). In contrast to a cubic spline,
+    there is no overshoot, so that a non-negative signal stays non-negative.
+
+    The slopes at the interior points are the weighted harmonic means of the
+    adjacent secant slopes, or zero at local extrema.
+
+    Parameters
+    ----------
+    x: jnp.ndarray
+        The points where the interpolation should be evaluated.
+    xp: jnp.ndarray
+        The sampling points. Have to be sorted. Repeated points are allowed.
+    fp: jnp.ndarray
+        The values at ``xp``.
+    left, right: float
+        The values returned for ``x < xp[0]`` and ``x > xp[-1]``.
+
+    Returns
+    -------
+    jnp.ndarray
+        The interpolated values.
+    """
+    h = jnp.diff(xp)
+    valid = h > 0
+    delta = jnp.where(valid, jnp.diff(fp) / jnp.where(valid, h, 1), 0)
+
+    h0, h1 = h[:-1], h[1:]
+    d0, d1 = delta[:-1], delta[1:]
+    w1 = 2 * h1 + h0
+    w2 = h1 + 2 * h0
+    same_sign = (d0 * d1) > 0
+    slopes = jnp.where(
+        same_sign,
+        (w1 + w2)
+        / (
+            w1 / jnp.where(same_sign, d0, 1) + w2 / jnp.where(same_sign, d1, 1)
+        ),
+        0,
+    )
+    slopes = jnp.concatenate(
+        [
+            _pchip_edge_slope(h[:1], h[1:2], delta[:1], delta[1:2]),
+            slopes,
+            _pchip_edge_slope(h[-1:], h[-2:-1], delta[-1:], delta[-2:-1]),
+        ]
+    )
+
+    idx = jnp.clip(jnp.searchsorted(xp, x, side="right") - 1, 0, len(xp) - 2)
+    dx = h[idx]
+    t = jnp.where(dx > 0, (x - xp[idx]) / jnp.where(dx > 0, dx, 1), 0)
+    t2 = t * t
+    t3 = t2 * t
+    y = (
+        (2 * t3 - 3 * t2 + 1) * fp[idx]
+        + (t3 - 2 * t2 + t) * dx * slopes[idx]
+        + (-2 * t3 + 3 * t2) * fp[idx + 1]
+        + (t3 - t2) * dx * slopes[idx + 1]
+    )
+    return jnp.where(x < xp[0], left, jnp.where(x > xp[-1], right, y))
+
+
+@jax.jit
+def dawson(x):
+    """
+    Dawson's integral
+
+    .. math::
+
+       D(x) = \\exp(-x^2) \\int_0^x \\exp(t^2) \\mathrm{d}t
+
+    For :math:`|x| < 2`, we use :math:`D(x) = x\\, _1F_1(1; 3/2; -x^2)`. For
+    larger arguments, where the hypergeometric function is not stable, we use
+    Rybicki's method (see :cite:`Press.1994`) with a step of 0.2, which is
+    accurate to machine precision.
+    """
+    ax = jnp.abs(x)
+    small = ax < 2
+    # Avoid evaluating either branch outside of it's domain, which would
+    # result in nans in the gradient.
+    x_small = jnp.where(small, ax, 0.0)
+    x_large = jnp.where(small, 2.0, ax)
+
+    h = 0.2
+    n0 = 2 * jnp.round(0.5 * x_large / h)
+    xp = x_large - n0 * h
+    D_large = jnp.zeros_like(x_large)
+    for n in range(-33, 34, 2):
+        D_large += jnp.exp(-((xp - n * h) ** 2)) / (n0 + n)
+    D_large /= jnp.sqrt(jnp.pi)
+
+    D_small = x_small * jax.scipy.special.hyp1f1(1.0, 1.5, -(x_small**2))
+    return jnp.sign(x) * jnp.where(small, D_small, D_large)
+
+
+_laguerre_nodes, _laguerre_weights = onp.polynomial.laguerre.laggauss(64)
+
+
+@jax.jit
+def sine_integral_auxiliary_f(x):
+    """
+    The auxiliary function of the sine and cosine integrals
+
+    .. math::
+
+       f(x) = \\int_0^\\infty \\frac{\\sin t}{t + x} \\mathrm{d}t
+       = \\mathrm{Ci}(x) \\sin x
+       + \\left(\\frac{\\pi}{2} - \\mathrm{Si}(x)\\right) \\cos x
+
+    for :math:`x > 0`. For :math:`x < 4`, the power series of
+    :math:`\\mathrm{Si}` and :math:`\\mathrm{Ci}` are used, for larger
+    arguments, the representation
+
+    .. math::
+
+       f(x) = \\frac{1}{x} \\int_0^\\infty
+       \\frac{\\exp(-u)}{1 + u^2 / x^2} \\mathrm{d}u
+
+    is evaluated with a 64-point Gauss-Laguerre quadrature. Both are accurate
+    to about ``1e-13``.
+    """
+    small = x < 4
+    x_small = jnp.where(small, x, 1.0)
+    x_large = jnp.where(small, 4.0, x)
+
+    Si = jnp.zeros_like(x_small)
+    Ci = jnp.euler_gamma + jnp.log(x_small)
+    for n in range(30):
+        Si += (
+            (-1) ** n
+            * x_small ** (2 * n + 1)
+            / ((2 * n + 1) * float(math.factorial(2 * n + 1)))
+        )
+        if n > 0:
+            Ci += (
+                (-1) ** n
+                * x_small ** (2 * n)
+                / (2 * n * float(math.factorial(2 * n)))
+            )
+    f_small = Ci * jnp.sin(x_small) + (jnp.pi / 2 - Si) * jnp.cos(x_small)
+
+    f_large = jnp.zeros_like(x_large)
+    for u, w in zip(_laguerre_nodes, _laguerre_weights):
+        f_large += w / (1 + (u / x_large) ** 2)
+    f_large /= x_large
+    return jnp.where(small, f_small, f_large)
@@ -6,6 +6,7 @@ implemented.
 import abc
 import logging
 from copy import deepcopy
+from pathlib import Path
 from typing import TYPE_CHECKING
 
 import jax
@@ -22,12 +23,15 @@ from . import (
     free_free,
     hnc_potentials,
     hypernetted_chain,
+    instrumentation,
     ion_feature,
     ipd,
+    math,
     plasma_physics,
     static_structure_factors,
 )
 from .elements import MixElement, electron_distribution_ionized_state
+from .emulator import Emulator
 from .plasma_physics import noninteracting_susceptibility_from_eps_RPA
 from .setup import (
     Setup,
@@ -117,9 +121,19 @@ class ScatteringModel(Model):
     If set, the model is evaluated only on `sample_points` points, rather than
     all :math:`k` that are probed and is then evaluated. Afterwards, the result
     is extrapolated to match the :py:class:`~.setup.Setup`'s :math:`k`.
+
+    By default, the sample points are equidistant. If :py:attr:`~.sampling`
+    is set to ``"adaptive"``, a quarter of the points is used for an
+    equidistant pilot evaluation, and the remaining points are placed where
+    the pilot signal curves most, e.g., at the plasmon or Compton peak. The
+    result is then interpolated with a monotone cubic interpolation (see
+    :py:func:`jaxrts.math.monotone_cubic_interp`). Hence, much less points
+    are required for the same accuracy, than with equidistant sampling.
     """
 
-    def __init__(self, sample_points: int | None = None) -> None:
+    def __init__(
+        self, sample_points: int | None = None, sampling: str = "uniform"
+    ) -> None:
         super().__init__()
 
         #: The number of points for re-sampeling the model. If ``None``, no
@@ -131,6 +145,10 @@ class ScatteringModel(Model):
         #: relevant :math:`k` s and then convolved with the instrument
         #: function.
         self.sample_points = sample_points
+        #: How the :py:attr:`~.sample_points` are distributed. Either
+        #: ``"uniform"``, using :py:meth:`~.sample_grid`, or ``"adaptive"``,
+        #: using :py:meth:`~.adaptive_sample_grid` after a pilot evaluation.
+        self.sampling: str = sampling
 
     @abc.abstractmethod
     def evaluate_raw(
@@ -149,6 +167,102 @@ class ScatteringModel(Model):
         max_E = setup.measured_energy[-1]
         return jnpu.linspace(min_E, max_E, self.sample_points)
 
+    @property
+    def pilot_points(self) -> int:
+        """
+        The number of equidistant points used for the pilot evaluation when
+        :py:attr:`~.sampling` is ``"adaptive"``.
+        """
+        return max(self.sample_points // 4, 3)
+
+    def adaptive_sample_grid(self, pilot_E: Quantity, pilot: Quantity):
+        """
+        Distribute ``sample_points - pilot_points`` additional energies, based
+        on a pilot evaluation ``pilot`` on the equidistant grid ``pilot_E``.
+
+        The points are equidistributed w.r.t. the density
+        :math:`\\alpha + |S''(E)|^{1/2}`, which is the optimal density for
+        piecewise interpolation, where :math:`S''` is estimated by finite
+        differences of the pilot. :math:`\\alpha` is the mean of the second
+        term, so that about half of the points are distributed evenly and no
+        part of the spectrum is left out.
+        """
+        n_refine = self.sample_points - self.pilot_points
+        E = pilot_E.m_as(ureg.electron_volt)
+        S = jax.lax.stop_gradient(pilot.magnitude)
+        h = E[1] - E[0]
+
+        curvature = jnp.sqrt(jnp.abs(jnp.diff(S, n=2)) / h**2)
+        curvature = jnp.concatenate([curvature[:1], curvature, curvature[-1:]])
+        # The density within every interval of the pilot grid
+        density = jnp.maximum(curvature[:-1], curvature[1:])
+        density = density + jnp.mean(density) + jnp.finfo(E.dtype).tiny
+        cumulative = jnp.concatenate([jnp.zeros(1), jnp.cumsum(density * h)])
+        levels = (jnp.arange(n_refine) + 0.5) / n_refine * cumulative[-1]
+        return jnp.interp(levels, cumulative, E) * ureg.electron_volt
+
+    def _evaluate_raw_on(
+        self,
+        plasma_state: "PlasmaState",
+        setup: Setup,
+        energies: Quantity,
+        *args,
+        **kwargs,
+    ) -> Quantity:
+        """
+        Evaluate :py:meth:`~.evaluate_raw` for the given ``energies``, rather
+        than the :py:attr:`~.setup.Setup.measured_energy` of the setup.
+        """
+        low_res_setup = Setup(
+            setup.scattering_angle,
+            setup.energy,
+            energies,
+            setup.instrument,
+        )
+        return self.evaluate_raw(plasma_state, low_res_setup, *args, **kwargs)
+
+    def _evaluate_raw_adaptive(
+        self,
+        plasma_state: "PlasmaState",
+        setup: Setup,
+        *args,
+        **kwargs,
+    ) -> Quantity:
+        """
+        Evaluate :py:meth:`~.evaluate_raw` on an adaptive grid (see
+        :py:meth:`~.adaptive_sample_grid`) and interpolate the result to the
+        :py:attr:`~.setup.Setup.measured_energy`.
+        """
+        pilot_E = jnpu.linspace(
+            jnpu.min(setup.measured_energy),
+            jnpu.max(setup.measured_energy),
+            self.pilot_points,
+        )
+        pilot = self._evaluate_raw_on(
+            plasma_state, setup, pilot_E, *args, **kwargs
+        )
+        refined_E = self.adaptive_sample_grid(pilot_E, pilot)
+        refined = self._evaluate_raw_on(
+            plasma_state, setup, refined_E, *args, **kwargs
+        )
+        unit = pilot.units
+        E = jnp.concatenate(
+            [
+                pilot_E.m_as(ureg.electron_volt),
+                refined_E.m_as(ureg.electron_volt),
+            ]
+        )
+        S = jnp.concatenate([pilot.m_as(unit), refined.m_as(unit)])
+        order = jnp.argsort(E)
+        return (
+            math.monotone_cubic_interp(
+                setup.measured_energy.m_as(ureg.electron_volt),
+                E[order],
+                S[order],
+            )
+            * unit
+        )
+
     @jax.jit
     def evaluate(
         self,
@@ -164,37 +278,61 @@ class ScatteringModel(Model):
         ``setup``, interpolate it, if needed and then convolve it with the
         instrument function.
         """
+        raw = self.evaluate_unconvolved(plasma_state, setup, *args, **kwargs)
+        return convolve_stucture_factor_with_instrument(raw, setup)
+
+    @jax.jit
+    def evaluate_unconvolved(
+        self,
+        plasma_state: "PlasmaState",
+        setup: Setup,
+        *args,
+        **kwargs,
+    ) -> jnp.ndarray:
+        """
+        The result of :py:meth:`~.evaluate`, before the convolution with the
+        instrument function, i.e., :py:meth:`~.evaluate_raw`, evaluated on the
+        :py:attr:`~.sample_points` (if set) and interpolated to the
+        :py:attr:`~.setup.Setup.measured_energy`.
+
+        As the convolution is linear, the contributions of multiple
+        :py:class:`~.ScatteringModel` s can be added before convolving them
+        once (see :py:meth:`jaxrts.plasmastate.PlasmaState.probe`).
+        """
         if self.sample_points is None:
             raw = self.evaluate_raw(plasma_state, setup, *args, **kwargs)
-        else:
-            low_res_setup = Setup(
-                setup.scattering_angle,
-                setup.energy,
-                self.sample_grid(setup),
-                setup.instrument,
+        elif self.sampling == "adaptive":
+            raw = self._evaluate_raw_adaptive(
+                plasma_state, setup, *args, **kwargs
             )
-            low_res = self.evaluate_raw(
-                plasma_state, low_res_setup, *args, **kwargs
+        else:
+            sample_grid = self.sample_grid(setup)
+            low_res = self._evaluate_raw_on(
+                plasma_state, setup, sample_grid, *args, **kwargs
             )
             raw = jnpu.interp(
                 setup.measured_energy,
-                low_res_setup.measured_energy,
+                sample_grid,
                 low_res,
                 left=0,
                 right=0,
             )
-        return convolve_stucture_factor_with_instrument(raw, setup)
+        return raw
 
     # The following is required to jit a Model
     def _tree_flatten(self):
         children = ()
-        aux_data = (self.model_key, self.sample_points)  # static values
+        aux_data = (
+            self.model_key,
+            self.sample_points,
+            self.sampling,
+        )  # static values
         return (children, aux_data)
 
     @classmethod
     def _tree_unflatten(cls, aux_data, children):
         obj = object.__new__(cls)
-        obj.model_key, obj.sample_points = aux_data
+        obj.model_key, obj.sample_points, obj.sampling = aux_data
         return obj
 
 
@@ -239,6 +377,29 @@ class Neglect(Model):
 
 # ion-feature
 # -----------
+def _pair_sum(
+    x: jnp.ndarray, amplitude: jnp.ndarray | Quantity, S_ab: Quantity
+) -> Quantity:
+    """
+    Calculate :math:`\\sum_{a, b} \\sqrt{x_a x_b} A_a A_b S_{ab}` over all
+    pairs of ions at once, rather than unrolling a loop over the pairs.
+
+    The first axis of ``x`` and ``amplitude`` and the first two axes of
+    ``S_ab`` are the ions. Further axes broadcast as for a single pair.
+    """
+    amplitude = amplitude * jnp.sqrt(x).reshape(
+        (-1,) + (1,) * (amplitude.ndim - 1)
+    )
+    A = amplitude[:, jnp.newaxis] * amplitude[jnp.newaxis, :]
+    # Align the trailing axes of both factors, as for a single pair
+    n_trailing = max(A.ndim, S_ab.ndim) - 2
+    A = A[(slice(None),) * 2 + (jnp.newaxis,) * (n_trailing + 2 - A.ndim)]
+    S_ab = S_ab[
+        (slice(None),) * 2 + (jnp.newaxis,) * (n_trailing + 2 - S_ab.ndim)
+    ]
+    return jnpu.sum(A * S_ab, axis=(0, 1))
+
+
 class IonFeatModel(Model):
     """
     These set of models describe the scattering by electrons tightly bound to
@@ -304,25 +465,11 @@ class IonFeatModel(Model):
         # Get the screening from the plasma state
         q = plasma_state.evaluate("screening", setup)
 
-        # Add the contributions from all pairs
-        w_R = 0
-
-        def add_wrt(a, b):
-            return (
-                jnpu.sqrt(x[a] * x[b])
-                * (f[a] + q[a])
-                * (f[b] + q[b])
-                * S_ab[a, b]
-            ).m_as(ureg.dimensionless)
+        # The screening might have trailing axes, which f has to match
+        f = f.reshape((-1,) + (1,) * (q.ndim - 1))
 
         # The W_R is calculated as a sum over all combinations of a_b
-        ion_spec1, ion_spec2 = jnp.meshgrid(
-            jnp.arange(plasma_state.nions),
-            jnp.arange(plasma_state.nions),
-        )
-        for a, b in zip(ion_spec1.flatten(), ion_spec2.flatten()):
-            w_R += add_wrt(a, b)
-        return w_R
+        return _pair_sum(x, f + q, S_ab).m_as(ureg.dimensionless)
 
     @jax.jit
     def evaluate(
@@ -537,6 +684,9 @@ class OnePotentialHNCIonFeat(IonFeatModel):
         rmax: Quantity = 100 * ureg.a_0,
         pot: int = 14,
         mix: float = 0.0,
+        solver: hypernetted_chain.HNCSolver | None = None,
+        initial_guess: Quantity | None = None,
+        use_cache: bool = False,
     ) -> None:
         #: The minimal radius for evaluating the potentials.
         self.r_min: Quantity = rmin
@@ -551,6 +701,22 @@ class OnePotentialHNCIonFeat(IonFeatModel):
         #: increased when HNC becomes numerically unstable due to high coupling
         #: strengths.
         self.mix: float = mix
+        if solver is None:
+            solver = hypernetted_chain.PicardIteration()
+        #: The iteration scheme used to solve the HNC equations, see
+        #: :py:class:`jaxrts.hypernetted_chain.HNCSolver`. Defaults to a
+        #: :py:class:`jaxrts.hypernetted_chain.PicardIteration`.
+        self.solver: hypernetted_chain.HNCSolver = solver
+        #: The initial guess for the nodal term `N_ab`. If ``None``, the
+        #: iteration starts from zero. A converged result can be obtained
+        #: with :py:meth:`~.nodal_term`.
+        self.initial_guess: Quantity | None = initial_guess
+        #: If ``True``, the last converged nodal term `N_ab` is stored in
+        #: :py:data:`jaxrts.hypernetted_chain.nodal_term_cache` and used as
+        #: the initial guess for the next calculation with the same
+        #: potentials, ion species and grid. This speeds up scans along a
+        #: parameter path or fits considerably.
+        self.use_cache: bool = use_cache
         super().__init__()
 
     def prepare(self, plasma_state: "PlasmaState", key: str) -> None:
@@ -572,7 +738,12 @@ class OnePotentialHNCIonFeat(IonFeatModel):
         return jnp.pi / r[-1] + jnp.arange(len(r)) * dk
 
     @jax.jit
-    def S_ii(self, plasma_state: "PlasmaState", setup: Setup) -> jnp.ndarray:
+    def _solve_HNC(self, plasma_state: "PlasmaState") -> tuple:
+        """
+        Solve the HNC equations. Returns the output of
+        :py:func:`jaxrts.hypernetted_chain.pair_distribution_function_HNC_full`
+        and the densities of the species.
+        """
         # Prepare the Potentials
         # ----------------------
 
@@ -584,9 +755,63 @@ class OnePotentialHNCIonFeat(IonFeatModel):
         # ----------------------------------
         T = plasma_state["ion-ion Potential"].T(plasma_state)
         n = plasma_state.n_i
-        g, niter = hypernetted_chain.pair_distribution_function_HNC(
-            V_s_r, V_l_k, self.r, T, n
+        cache_key = (
+            self.__name__,
+            plasma_state["ion-ion Potential"].__name__,
+            tuple(ion.symbol for ion in plasma_state.ions),
         )
+        N0 = self._initial_guess(cache_key, V_s_r.shape)
+        g, N, niter, residuals = (
+            hypernetted_chain.pair_distribution_function_HNC_full(
+                V_s_r, V_l_k, self.r, T, n, self.mix, self.solver, N0
+            )
+        )
+        self._update_cache(cache_key, N, niter)
+        return g, N, niter, residuals, n
+
+    def _initial_guess(self, cache_key: tuple, shape: tuple) -> Quantity:
+        N0 = jnp.zeros(shape) * ureg.dimensionless
+        if self.initial_guess is not None:
+            N0 = N0 + self.initial_guess
+        if self.use_cache:
+            N0 = (
+                hypernetted_chain.nodal_term_cache.load(
+                    cache_key, self.r, N0.m_as(ureg.dimensionless)
+                )
+                * ureg.dimensionless
+            )
+        return N0
+
+    def _update_cache(self, cache_key: tuple, N: Quantity, niter) -> None:
+        if self.use_cache:
+            hypernetted_chain.nodal_term_cache.store(
+                cache_key,
+                self.r,
+                N.m_as(ureg.dimensionless),
+                niter < self.solver.iteration_limit,
+            )
+
+    @jax.jit
+    def convergence(self, plasma_state: "PlasmaState") -> tuple:
+        """
+        Return the number of iterations and the history of the residuals
+        which :py:attr:`~.solver` needs to solve the HNC equations.
+        """
+        _, _, niter, residuals, _ = self._solve_HNC(plasma_state)
+        return niter, residuals
+
+    @jax.jit
+    def nodal_term(self, plasma_state: "PlasmaState") -> Quantity:
+        """
+        Return the converged nodal term :math:`N_{ab}(r)`, which can be used
+        as the :py:attr:`~.initial_guess` for a similar plasma state.
+        """
+        _, N, _, _, _ = self._solve_HNC(plasma_state)
+        return N
+
+    @jax.jit
+    def S_ii(self, plasma_state: "PlasmaState", setup: Setup) -> jnp.ndarray:
+        g, _, niter, _, n = self._solve_HNC(plasma_state)
         logger.debug(
             f"{niter} Iterations of the HNC algorithm were required to reach the solution"  # noqa: 501
         )
@@ -602,18 +827,148 @@ class OnePotentialHNCIonFeat(IonFeatModel):
 
     # The following is required to jit a Model
     def _tree_flatten(self):
-        children = (self.r_min, self.r_max, self.mix)
+        children = (
+            self.r_min,
+            self.r_max,
+            self.mix,
+            self.solver,
+            self.initial_guess,
+        )
         aux_data = (
             self.model_key,
             self.pot,
+            self.use_cache,
         )  # static values
         return (children, aux_data)
 
     @classmethod
     def _tree_unflatten(cls, aux_data, children):
         obj = object.__new__(cls)
-        obj.model_key, obj.pot = aux_data
-        obj.r_min, obj.r_max, obj.mix = children
+        obj.model_key, obj.pot, obj.use_cache = aux_data
+        (
+            obj.r_min,
+            obj.r_max,
+            obj.mix,
+            obj.solver,
+            obj.initial_guess,
+        ) = children
+
+        return obj
+
+
+class EmulatedIonFeat(IonFeatModel):
+    """
+    Model for the ion feature, where the :math:`S_{ab}` are predicted by a
+    trained :py:class:`jaxrts.emulator.Emulator`, i.e., a surrogate for an
+    expensive model like :py:class:`~.OnePotentialHNCIonFeat`.
+
+    If the plasma state or the scattering vector are outside the training
+    domain of the emulator (or the composition of the plasma differs from the
+    one used for training), the ``fallback`` model is evaluated, instead.
+    While instrumentation counts (see :py:mod:`jaxrts.instrumentation`) are
+    enabled, the number of fallbacks is recorded as ``"emulator
+    fallbacks"``.
+
+    .. note::
+
+       Within :py:func:`jax.vmap`, both, the emulator and the fallback are
+       evaluated for all states, if any of them requires the fallback.
+
+    Requires a 'form-factors' model (defaults to
+    :py:class:`~PaulingFormFactors`), a 'screening' model (defaults to
+    :py:class:`Gregori2004Screening`) and all models required by the
+    ``fallback``.
+
+    See Also
+    --------
+    jaxrts.emulator
+        Data generation and training of emulators.
+    """
+
+    __name__ = "EmulatedIonFeat"
+
+    def __init__(
+        self,
+        emulator: Emulator | str | Path,
+        fallback: IonFeatModel | None = None,
+        extrapolate: bool = False,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        emulator: Emulator | str | Path
+            The emulator, or the path of a file written by
+            :py:meth:`jaxrts.emulator.Emulator.save`.
+        fallback: IonFeatModel | None
+            The model evaluated outside the training domain. Defaults to
+            :py:class:`~.OnePotentialHNCIonFeat`.
+        extrapolate: bool
+            If ``True``, the emulator is used everywhere and the fallback is
+            never evaluated.
+        """
+        if not isinstance(emulator, Emulator):
+            emulator = Emulator.load(emulator)
+        #: The trained emulator.
+        self.emulator = emulator
+        if fallback is None:
+            fallback = OnePotentialHNCIonFeat()
+        #: The model evaluated outside the training domain of the emulator.
+        self.fallback: IonFeatModel = fallback
+        #: If ``True``, the emulator is evaluated outside its training
+        #: domain, too.
+        self.extrapolate: bool = extrapolate
+        super().__init__()
+
+    def prepare(self, plasma_state: "PlasmaState", key: str) -> None:
+        super().prepare(plasma_state, key)
+        if not self.extrapolate:
+            self.fallback.prepare(plasma_state, key)
+
+    def check(self, plasma_state: "PlasmaState") -> None:
+        # Raises an error, if the plasma contains other elements
+        self.emulator.composition_of(plasma_state)
+
+    @jax.jit
+    def in_domain(self, plasma_state: "PlasmaState", setup: Setup) -> bool:
+        """
+        ``True`` if the emulator can be used for ``plasma_state`` at the
+        scattering vector of ``setup``.
+        """
+        return self.emulator.in_domain(
+            self.emulator.features(plasma_state, setup),
+            self.emulator.composition_of(plasma_state),
+        )
+
+    @jax.jit
+    def S_ii(self, plasma_state: "PlasmaState", setup: Setup) -> jnp.ndarray:
+        features = self.emulator.features(plasma_state, setup)
+
+        def emulated():
+            return self.emulator.structure_factors(plasma_state, features)
+
+        if self.extrapolate:
+            return emulated() * ureg.dimensionless
+
+        def fallback():
+            return self.fallback.S_ii(plasma_state, setup).m_as(
+                ureg.dimensionless
+            )
+
+        inside = self.in_domain(plasma_state, setup)
+        instrumentation.count("emulator fallbacks", ~inside)
+        return jax.lax.cond(inside, emulated, fallback) * ureg.dimensionless
+
+    # The following is required to jit a Model
+    def _tree_flatten(self):
+        children = (self.emulator, self.fallback)
+        aux_data = (self.model_key, self.extrapolate)  # static values
+        return (children, aux_data)
+
+    @classmethod
+    def _tree_unflatten(cls, aux_data, children):
+        obj = object.__new__(cls)
+        obj.model_key, obj.extrapolate = aux_data
+        obj.emulator, obj.fallback = children
 
         return obj
 
@@ -663,6 +1018,9 @@ class ThreePotentialHNCIonFeat(IonFeatModel):
         rmax: Quantity = 100 * ureg.a_0,
         pot: int = 14,
         mix: float = 0.0,
+        solver: hypernetted_chain.HNCSolver | None = None,
+        initial_guess: Quantity | None = None,
+        use_cache: bool = False,
     ) -> None:
         #: The minimal radius for evaluating the potentials.
         self.r_min: Quantity = rmin
@@ -677,6 +1035,22 @@ class ThreePotentialHNCIonFeat(IonFeatModel):
         #: increased when HNC becomes numerically unstable due to high coupling
         #: strengths.
         self.mix: float = mix
+        if solver is None:
+            solver = hypernetted_chain.PicardIteration()
+        #: The iteration scheme used to solve the HNC equations, see
+        #: :py:class:`jaxrts.hypernetted_chain.HNCSolver`. Defaults to a
+        #: :py:class:`jaxrts.hypernetted_chain.PicardIteration`.
+        self.solver: hypernetted_chain.HNCSolver = solver
+        #: The initial guess for the nodal term `N_ab`. If ``None``, the
+        #: iteration starts from zero. A converged result can be obtained
+        #: with :py:meth:`~.nodal_term`.
+        self.initial_guess: Quantity | None = initial_guess
+        #: If ``True``, the last converged nodal term `N_ab` is stored in
+        #: :py:data:`jaxrts.hypernetted_chain.nodal_term_cache` and used as
+        #: the initial guess for the next calculation with the same
+        #: potentials, ion species and grid. This speeds up scans along a
+        #: parameter path or fits considerably.
+        self.use_cache: bool = use_cache
         super().__init__()
 
     def prepare(self, plasma_state: "PlasmaState", key: str) -> None:
@@ -713,68 +1087,119 @@ class ThreePotentialHNCIonFeat(IonFeatModel):
         return jnp.pi / r[-1] + jnp.arange(len(r)) * dk
 
     @jax.jit
-    def _S_ii_with_electrons(
-        self, plasma_state: "PlasmaState", setup: Setup
-    ) -> jnp.ndarray:
+    def _solve_HNC(self, plasma_state: "PlasmaState") -> tuple:
+        """
+        Solve the HNC equations, including the electrons. Returns the output
+        of
+        :py:func:`jaxrts.hypernetted_chain.pair_distribution_function_HNC_full`
+        and the densities of the species.
+        """
         # Prepare the Potentials
         # ----------------------
 
-        # Populate the potential with a full ion potential, for starters
-        V_s_r = (
-            plasma_state["ion-ion Potential"]
-            .short_r(plasma_state, self.r)
-            .m_as(ureg.electron_volt)
-        )
-        # Replace the last line and column with the electron-ion potential
-        V_s_r = V_s_r.at[-1, :, :].set(
-            plasma_state["electron-ion Potential"]
-            .short_r(plasma_state, self.r)
-            .m_as(ureg.electron_volt)[-1, :, :]
-        )
-        V_s_r = V_s_r.at[:, -1, :].set(
-            plasma_state["electron-ion Potential"]
-            .short_r(plasma_state, self.r)
-            .m_as(ureg.electron_volt)[:, -1, :]
-        )
-        # Add the electron-electron Potential
-        V_s_r = V_s_r.at[-1, -1, :].set(
-            plasma_state["electron-electron Potential"]
-            .short_r(plasma_state, self.r)
-            .m_as(ureg.electron_volt)[-1, -1, :]
-        )
+        # The potentials are assembled in the packed, upper-triangular layout
+        # of hypernetted_chain.pack_pairs, directly. Every pair is taken from
+        # the ion-ion, electron-ion or electron-electron Potential, depending
+        # on the number of electrons in it.
+        n = to_array([*plasma_state.n_i, plasma_state.n_e])
+        nspec = len(n)
+        a, b = hypernetted_chain.pair_indices(nspec)
+        electrons = (a == nspec - 1).astype(int) + (b == nspec - 1)
+        pairs = jnp.arange(len(a))
+        potentials = [
+            plasma_state["ion-ion Potential"],
+            plasma_state["electron-ion Potential"],
+            plasma_state["electron-electron Potential"],
+        ]
+
+        V_s_r = jnp.stack(
+            [
+                hypernetted_chain.pack_pairs(
+                    pot.short_r(plasma_state, self.r).m_as(ureg.electron_volt)
+                )
+                for pot in potentials
+            ]
+        )[electrons, pairs]
         V_s_r *= ureg.electron_volt
 
         # Repeat this for the long-range part of the potential in k space.
         unit = ureg.electron_volt * ureg.angstrom**3
-        V_l_k = (
-            plasma_state["ion-ion Potential"]
-            .long_k(plasma_state, self.k)
-            .m_as(unit)
-        )
-        V_l_k = V_l_k.at[-1, :, :].set(
-            plasma_state["electron-ion Potential"]
-            .long_k(plasma_state, self.k)
-            .m_as(unit)[-1, :, :]
-        )
-        V_l_k = V_l_k.at[:, -1, :].set(
-            plasma_state["electron-ion Potential"]
-            .long_k(plasma_state, self.k)
-            .m_as(unit)[:, -1, :]
-        )
-        V_l_k = V_l_k.at[-1, -1, :].set(
-            plasma_state["electron-electron Potential"]
-            .long_k(plasma_state, self.k)
-            .m_as(unit)[-1, -1, :]
-        )
+        V_l_k = jnp.stack(
+            [
+                hypernetted_chain.pack_pairs(
+                    pot.long_k(plasma_state, self.k).m_as(unit)
+                )
+                for pot in potentials
+            ]
+        )[electrons, pairs]
         V_l_k *= unit
 
         # Calculate g_ab in the HNC Approach
         # ----------------------------------
         T = plasma_state["ion-ion Potential"].T(plasma_state)
-        n = to_array([*plasma_state.n_i, plasma_state.n_e])
-        g, niter = hypernetted_chain.pair_distribution_function_HNC(
-            V_s_r, V_l_k, self.r, T, n
+        cache_key = (
+            self.__name__,
+            plasma_state["ion-ion Potential"].__name__,
+            plasma_state["electron-ion Potential"].__name__,
+            plasma_state["electron-electron Potential"].__name__,
+            tuple(ion.symbol for ion in plasma_state.ions),
+        )
+        N0 = self._initial_guess(cache_key, (nspec, nspec, len(self.r)))
+        g, N, niter, residuals = (
+            hypernetted_chain.pair_distribution_function_HNC_full(
+                V_s_r, V_l_k, self.r, T, n, self.mix, self.solver, N0
+            )
         )
+        g = hypernetted_chain.unpack_pairs(g, nspec)
+        N = hypernetted_chain.unpack_pairs(N, nspec)
+        self._update_cache(cache_key, N, niter)
+        return g, N, niter, residuals, n
+
+    def _initial_guess(self, cache_key: tuple, shape: tuple) -> Quantity:
+        N0 = jnp.zeros(shape) * ureg.dimensionless
+        if self.initial_guess is not None:
+            N0 = N0 + self.initial_guess
+        if self.use_cache:
+            N0 = (
+                hypernetted_chain.nodal_term_cache.load(
+                    cache_key, self.r, N0.m_as(ureg.dimensionless)
+                )
+                * ureg.dimensionless
+            )
+        return N0
+
+    def _update_cache(self, cache_key: tuple, N: Quantity, niter) -> None:
+        if self.use_cache:
+            hypernetted_chain.nodal_term_cache.store(
+                cache_key,
+                self.r,
+                N.m_as(ureg.dimensionless),
+                niter < self.solver.iteration_limit,
+            )
+
+    @jax.jit
+    def convergence(self, plasma_state: "PlasmaState") -> tuple:
+        """
+        Return the number of iterations and the history of the residuals
+        which :py:attr:`~.solver` needs to solve the HNC equations.
+        """
+        _, _, niter, residuals, _ = self._solve_HNC(plasma_state)
+        return niter, residuals
+
+    @jax.jit
+    def nodal_term(self, plasma_state: "PlasmaState") -> Quantity:
+        """
+        Return the converged nodal term :math:`N_{ab}(r)`, which can be used
+        as the :py:attr:`~.initial_guess` for a similar plasma state.
+        """
+        _, N, _, _, _ = self._solve_HNC(plasma_state)
+        return N
+
+    @jax.jit
+    def _S_ii_with_electrons(
+        self, plasma_state: "PlasmaState", setup: Setup
+    ) -> jnp.ndarray:
+        g, _, niter, _, n = self._solve_HNC(plasma_state)
         logger.debug(
             f"{niter} Iterations of the HNC algorithm were required to reach the solution"  # noqa: 501
         )
@@ -809,11 +1234,6 @@ class ThreePotentialHNCIonFeat(IonFeatModel):
             :, jnp.newaxis
         ]
 
-        # The W_R is calculated as a sum over all combinations of a_b
-        ion_spec1, ion_spec2 = jnp.meshgrid(
-            jnp.arange(plasma_state.nions),
-            jnp.arange(plasma_state.nions),
-        )
         # Get the formfactor from the plasma state
         fi = plasma_state["form-factors"].evaluate(plasma_state, setup)
         population = electron_distribution_ionized_state(plasma_state.Z_core)
@@ -822,36 +1242,40 @@ class ThreePotentialHNCIonFeat(IonFeatModel):
         # Calculate the number-fraction per element
         x = plasma_state.number_fraction
 
-        # Add the contributions from all pairs
-        w_R = 0
-
-        def add_wrt(a, b):
-            return (
-                jnpu.sqrt(x[a] * x[b])
-                * (f[a] + q[a])
-                * (f[b] + q[b])
-                * S_ab[a, b]
-            ).m_as(ureg.dimensionless)
-
-        for a, b in zip(ion_spec1.flatten(), ion_spec2.flatten()):
-            w_R += add_wrt(a, b)
+        # The W_R is calculated as a sum over all combinations of a_b
+        # S_ab contains the electrons as the last species
+        f = f.reshape((-1,) + (1,) * (q.ndim - 1))
+        w_R = _pair_sum(x, f + q, S_ab[:-1, :-1]).m_as(ureg.dimensionless)
         # Scale the instrument function directly with w_R
         return w_R
 
     # The following is required to jit a Model
     def _tree_flatten(self):
-        children = (self.r_min, self.r_max, self.mix)
+        children = (
+            self.r_min,
+            self.r_max,
+            self.mix,
+            self.solver,
+            self.initial_guess,
+        )
         aux_data = (
             self.model_key,
             self.pot,
+            self.use_cache,
         )  # static values
         return (children, aux_data)
 
     @classmethod
     def _tree_unflatten(cls, aux_data, children):
         obj = object.__new__(cls)
-        obj.model_key, obj.pot = aux_data
-        obj.r_min, obj.r_max, obj.mix = children
+        obj.model_key, obj.pot, obj.use_cache = aux_data
+        (
+            obj.r_min,
+            obj.r_max,
+            obj.mix,
+            obj.solver,
+            obj.initial_guess,
+        ) = children
 
         return obj
 
@@ -909,7 +1333,7 @@ class PeakCollection(IonFeatModel):
     def _tree_unflatten(cls, aux_data, children):
         obj = object.__new__(cls)
         (obj.model_key,) = aux_data
-        (obj.k_pos, obj.intensity, obj.peak_function) = children
+        obj.k_pos, obj.intensity, obj.peak_function = children
 
         return obj
 
@@ -1000,7 +1424,7 @@ class DebyeWallerSolid(IonFeatModel):
     def _tree_unflatten(cls, aux_data, children):
         obj = object.__new__(cls)
         (obj.model_key,) = aux_data
-        (obj.S_plasma, obj.b) = children
+        obj.S_plasma, obj.b = children
 
         return obj
 
@@ -1119,6 +1543,11 @@ class RPA_NoDamping(FreeFreeModel):
     Requires a 'chemical potential' model (defaults to
     :py:class:`~IchimaruChemPotential`).
 
+    The integral over the wave numbers can be evaluated with a fixed-order
+    quadrature, which is faster to compile and vectorizes better than the
+    default adaptive quadrature, by setting :py:attr:`~.quadrature` to
+    ``"fixed"``.
+
     See Also
     --------
     jaxtrs.free_free.S0_ee_RPA_no_damping
@@ -1128,6 +1557,13 @@ class RPA_NoDamping(FreeFreeModel):
 
     __name__ = "RPA_NoDamping"
 
+    def __init__(self, quadrature: str = "quadgk") -> None:
+        super().__init__()
+        #: The quadrature used for the integrals of the RPA dielectric
+        #: function, either ``"quadgk"`` or ``"fixed"``. See
+        #: :py:func:`jaxrts.free_free.dielectric_function_RPA`.
+        self.quadrature: str = quadrature
+
     def prepare(self, plasma_state: "PlasmaState", key: str) -> None:
         plasma_state.update_default_model(
             "chemical potential", IchimaruChemPotential()
@@ -1146,6 +1582,7 @@ class RPA_NoDamping(FreeFreeModel):
             setup.measured_energy - setup.energy,
             mu,
             plasma_state["ee-lfc"].evaluate_fullk(plasma_state, setup),
+            quadrature=self.quadrature,
         )
 
         ff = See_0 * jnp.sum(
@@ -1178,6 +1615,7 @@ class RPA_NoDamping(FreeFreeModel):
             E,
             mu,
             plasma_state.T_e,
+            quadrature=self.quadrature,
         )
         xi0 = noninteracting_susceptibility_from_eps_RPA(eps, k)
         lfc = plasma_state["ee-lfc"].evaluate(plasma_state, setup)
@@ -1185,6 +1623,28 @@ class RPA_NoDamping(FreeFreeModel):
         xi = ee_localfieldcorrections.xi_lfc_corrected(xi0, V, lfc)
         return xi
 
+    def _tree_flatten(self):
+        children = ()
+        aux_data = (
+            self.model_key,
+            self.sample_points,
+            self.sampling,
+            self.quadrature,
+        )  # static values
+        return (children, aux_data)
+
+    @classmethod
+    def _tree_unflatten(cls, aux_data, children):
+        obj = object.__new__(cls)
+        (
+            obj.model_key,
+            obj.sample_points,
+            obj.sampling,
+            obj.quadrature,
+        ) = aux_data
+
+        return obj
+
 
 class RPA_DandreaFit(FreeFreeModel):
     """
@@ -1275,6 +1735,10 @@ class BornMerminFull(FreeFreeModel):
     Requires a 'BM V_eiS' model (defaults to
     :py:class:`~.FiniteWavelength_BM_V`).
 
+    Set :py:attr:`~.quadrature` to ``"fixed"`` to use a fixed-order quadrature
+    for the RPA dielectric functions (see
+    :py:func:`jaxrts.free_free.dielectric_function_RPA`).
+
     See Also
     --------
 
@@ -1284,6 +1748,13 @@ class BornMerminFull(FreeFreeModel):
 
     __name__ = "BornMerminFull"
 
+    def __init__(self, quadrature: str = "quadgk") -> None:
+        super().__init__()
+        #: The quadrature used for the integrals of the RPA dielectric
+        #: function, either ``"quadgk"`` or ``"fixed"``. See
+        #: :py:func:`jaxrts.free_free.dielectric_function_RPA`.
+        self.quadrature: str = quadrature
+
     def prepare(self, plasma_state: "PlasmaState", key: str) -> None:
         plasma_state.update_default_model(
             "chemical potential", IchimaruChemPotential()
@@ -1303,10 +1774,7 @@ class BornMerminFull(FreeFreeModel):
         **kwargs,
     ) -> jnp.ndarray:
 
-        @jax.tree_util.Partial
-        def S_ii(k):
-            probe_setup = get_probe_setup(k, setup)
-            return plasma_state.evaluate("BM S_ii", probe_setup)
+        S_ii = _BM_S_ii(plasma_state, setup)
 
         @jax.tree_util.Partial
         def V_eiS(k):
@@ -1327,6 +1795,7 @@ class BornMerminFull(FreeFreeModel):
             mean_Z_free,
             setup.measured_energy - setup.energy,
             plasma_state["ee-lfc"].evaluate(plasma_state, setup),
+            self.quadrature,
         )
         ff = See_0 * mean_Z_free
         # Return 0 scattering if there are no free electrons
@@ -1349,10 +1818,7 @@ class BornMerminFull(FreeFreeModel):
         **kwargs,
     ) -> jnp.ndarray:
 
-        @jax.tree_util.Partial
-        def S_ii(k):
-            probe_setup = get_probe_setup(k, setup)
-            return plasma_state.evaluate("BM S_ii", probe_setup)
+        S_ii = _BM_S_ii(plasma_state, setup)
 
         @jax.tree_util.Partial
         def V_eiS(k):
@@ -1374,6 +1840,7 @@ class BornMerminFull(FreeFreeModel):
                 S_ii,
                 V_eiS,
                 mean_Z_free,
+                self.quadrature,
             )
             xi0 = noninteracting_susceptibility_from_eps_RPA(eps, k)
             lfc = plasma_state["ee-lfc"].evaluate(plasma_state, setup)
@@ -1391,6 +1858,254 @@ class BornMerminFull(FreeFreeModel):
             jnpu.interp(E, interpE, interpchi),
         )
 
+    def _tree_flatten(self):
+        children = ()
+        aux_data = (
+            self.model_key,
+            self.sample_points,
+            self.sampling,
+            self.quadrature,
+        )  # static values
+        return (children, aux_data)
+
+    @classmethod
+    def _tree_unflatten(cls, aux_data, children):
+        obj = object.__new__(cls)
+        (
+            obj.model_key,
+            obj.sample_points,
+            obj.sampling,
+            obj.quadrature,
+        ) = aux_data
+
+        return obj
+
+
+def _interp_S_ii(k_grid: Quantity, S_grid: jnp.ndarray, k: Quantity):
+    """
+    Linearly interpolate a tabulated static ion-ion structure factor (the
+    last axis of ``S_grid`` is the one of ``k_grid``) to ``k``. Outside the
+    table, the first or last entry is returned (as for
+    :py:func:`jaxrts.hypernetted_chain.hnc_interp`).
+    """
+    _k = k.m_as(1 / ureg.angstrom)
+    _k_grid = k_grid.m_as(1 / ureg.angstrom)
+    S = jax.vmap(lambda s: jnp.interp(_k, _k_grid, s))(
+        S_grid.reshape(-1, S_grid.shape[-1])
+    )
+    return S.reshape(S_grid.shape[:-1] + jnp.shape(_k))
+
+
+def _BM_S_ii(plasma_state: "PlasmaState", setup: Setup):
+    """
+    The static ion-ion structure factor :math:`S_{ii}(k)`, as it is required
+    by the Born collision frequencies of the Born-Mermin models. It is
+    evaluated within the integrand of a quadrature over ``k``.
+
+    If the ``"BM S_ii"`` model can provide a table on its native ``k`` grid
+    (see :py:meth:`~.TabulatedSii.evaluate_table`), it is evaluated only
+    once, and the returned function interpolates this table. Otherwise, the
+    model is evaluated for every ``k`` requested.
+    """
+    evaluate_table = getattr(plasma_state["BM S_ii"], "evaluate_table", None)
+    table = (
+        evaluate_table(plasma_state, setup)
+        if evaluate_table is not None
+        else None
+    )
+    if table is not None:
+        k_grid, S_grid = table
+        return jax.tree_util.Partial(_interp_S_ii, k_grid, S_grid)
+
+    @jax.tree_util.Partial
+    def S_ii(k):
+        probe_setup = get_probe_setup(k, setup)
+        return plasma_state.evaluate("BM S_ii", probe_setup)
+
+    return S_ii
+
+
+def _BM_collision_frequency_input(
+    plasma_state: "PlasmaState", setup: Setup
+) -> tuple:
+    """
+    The input of the Born collision frequency, as it is used by the
+    Born-Mermin models: The static ion-ion structure factor, the statically
+    screened electron-ion potential, the chemical potential and the mean
+    ionization.
+    """
+
+    S_ii = _BM_S_ii(plasma_state, setup)
+
+    @jax.tree_util.Partial
+    def V_eiS(k):
+        return plasma_state["BM V_eiS"].V(plasma_state, k)
+
+    mu = plasma_state["chemical potential"].evaluate(plasma_state, setup)
+    mean_Z_free = jnpu.sum(plasma_state.Z_free * plasma_state.number_fraction)
+    return S_ii, V_eiS, mu, mean_Z_free
+
+
+def tabulate_collision_frequency(
+    plasma_state: "PlasmaState",
+    setup: Setup,
+    T_e: Quantity | None = None,
+    n_e: Quantity | None = None,
+    Z_free: jnp.ndarray | None = None,
+    E: Quantity | None = None,
+    no_of_freq: int = 32,
+    chunk_size: int | None = None,
+) -> free_free.CollisionFrequencyTable:
+    """
+    Tabulate the Born collision frequency used by the Born-Mermin models
+    (:py:class:`~.BornMermin`, :py:class:`~.BornMermin_Fit` and
+    :py:class:`~.BornMermin_Fortmann`).
+
+    The collision frequency is calculated by a direct quadrature (see
+    :py:func:`jaxrts.free_free.collision_frequency_BA_quadrature`), for every
+    combination of ``T_e``, ``n_e`` and ``Z_free``. The remaining parameters
+    (e.g., the ion temperatures) and the 'BM S_ii', 'BM V_eiS' and 'chemical
+    potential' models are taken from ``plasma_state``. The ionization of all
+    ions is scaled to obtain the mean ionization ``Z_free``, and the mass
+    density is scaled to obtain the electron density ``n_e``.
+
+    Parameters
+    ----------
+    plasma_state: PlasmaState
+        The template plasma state. Its 'free-free scattering' model has to be
+        one of the Born-Mermin models listed above, as it defines which RPA is
+        used in the collision frequency.
+    setup: Setup
+        The setup. Only used to evaluate the models and to define the default
+        energy grid.
+    T_e: Quantity | None
+        The electron temperatures of the table. Defaults to the temperature of
+        ``plasma_state``.
+    n_e: Quantity | None
+        The electron densities of the table. Defaults to the density of
+        ``plasma_state``.
+    Z_free: jnp.ndarray | None
+        The mean ionizations of the table. Defaults to the mean ionization of
+        ``plasma_state``.
+    E: Quantity | None
+        The positive energies of the table. Defaults to ``no_of_freq``
+        logarithmically spaced energies between 0.1 and 1.1 times the maximal
+        energy shift of ``setup``, which is the range used by
+        :py:func:`jaxrts.free_free.collision_frequency_BA_Chapman_interp`.
+    no_of_freq: int
+        The number of energies, if ``E`` is not given.
+    chunk_size: int | None
+        The number of parameter combinations calculated simultaneously. See
+        :py:meth:`jaxrts.plasmastate.PlasmaStateBatch.probe`.
+
+    Returns
+    -------
+    CollisionFrequencyTable
+        The tabulated collision frequency.
+    """
+    from .plasmastate import PlasmaStateBatch
+
+    try:
+        rpa = plasma_state["free-free scattering"]._collision_frequency_rpa
+    except AttributeError:
+        raise ValueError(
+            "The 'free-free scattering' model has to be a Born-Mermin model "
+            + "to tabulate the collision frequency, got "
+            + f"{plasma_state['free-free scattering'].__name__}."
+        )
+
+    mean_Z_free = jnpu.sum(plasma_state.Z_free * plasma_state.number_fraction)
+    if T_e is None:
+        T_e = plasma_state.T_e
+    if n_e is None:
+        n_e = plasma_state.n_e
+    if Z_free is None:
+        Z_free = mean_Z_free
+    if E is None:
+        dE = jnpu.max(
+            jnpu.absolute(setup.measured_energy - setup.energy)
+        ).m_as(ureg.electron_volt)
+        E = jnp.geomspace(0.1 * dE, 1.1 * dE, no_of_freq) * ureg.electron_volt
+    T_e = jnpu.ravel(to_array(T_e)).to(ureg.kelvin)
+    n_e = jnpu.ravel(to_array(n_e)).to(1 / ureg.meter**3)
+    Z_free = jnp.ravel(jnp.asarray(Z_free))
+
+    TT, nn, ZZ = jnp.meshgrid(
+        T_e.m_as(ureg.kelvin),
+        n_e.m_as(1 / ureg.meter**3),
+        Z_free,
+        indexing="ij",
+    )
+    Z_scale = ZZ.flatten() / mean_Z_free
+    rho_scale = (
+        nn.flatten() / (ureg.meter**3 * plasma_state.n_e * Z_scale)
+    ).m_as(ureg.dimensionless)
+    batch = PlasmaStateBatch(
+        plasma_state,
+        Z_free=Z_scale[:, jnp.newaxis] * plasma_state.Z_free[jnp.newaxis, :],
+        mass_density=rho_scale[:, jnp.newaxis]
+        * plasma_state.mass_density[jnp.newaxis, :],
+        T_e=TT.flatten() * ureg.kelvin,
+    )
+
+    def collision_frequency(state):
+        S_ii, V_eiS, mu, Zf = _BM_collision_frequency_input(state, setup)
+        return free_free.collision_frequency_BA_quadrature(
+            E, state.T_e, S_ii, V_eiS, state.n_e, mu, Zf, rpa
+        )
+
+    nu, _ = jax.jit(lambda b: b._map(collision_frequency, chunk_size))(batch)
+    shape = (len(T_e), len(n_e), len(Z_free), len(E))
+    return free_free.CollisionFrequencyTable(
+        T_e, n_e, Z_free, E, nu.reshape(shape)
+    )
+
+
+def collision_frequency_table_error(
+    plasma_state: "PlasmaState",
+    setup: Setup,
+    E: Quantity | None = None,
+) -> jnp.ndarray:
+    """
+    Estimate the error of the tabulated collision frequency of the
+    'free-free scattering' model of ``plasma_state`` by comparing it to the
+    direct quadrature for the parameters of ``plasma_state``.
+
+    Parameters
+    ----------
+    plasma_state: PlasmaState
+        The plasma state. The 'free-free scattering' model must have a
+        :py:attr:`collision_frequency_table`.
+    setup: Setup
+        The setup, used to evaluate the models.
+    E: Quantity | None
+        The (positive) energies at which the table is tested. Defaults to the
+        geometric mean between neighbouring energies of the table, where the
+        interpolation error is largest.
+
+    Returns
+    -------
+    jnp.ndarray
+        The relative deviation between the table and the quadrature at the
+        energies ``E``.
+    """
+    model = plasma_state["free-free scattering"]
+    table = model.collision_frequency_table
+    if E is None:
+        E = jnpu.sqrt(table.E[1:] * table.E[:-1])
+    S_ii, V_eiS, mu, Zf = _BM_collision_frequency_input(plasma_state, setup)
+    return free_free.collision_frequency_table_error(
+        table,
+        E,
+        plasma_state.T_e,
+        S_ii,
+        V_eiS,
+        plasma_state.n_e,
+        mu,
+        Zf,
+        model._collision_frequency_rpa,
+    )
+
 
 class BornMermin(FreeFreeModel):
     """
@@ -1407,6 +2122,16 @@ class BornMermin(FreeFreeModel):
     >>> state["free-free scattering"] = jaxrts.models.BornMermin
     >>> state["free-free scattering"].no_of_freq = 10
 
+    Alternatively, the collision frequency can be taken from a
+    :py:class:`jaxrts.free_free.CollisionFrequencyTable`, which is calculated
+    only once, for a grid of temperatures, densities and ionizations (see
+    :py:func:`~.tabulate_collision_frequency`). Then, :py:attr:`~.no_of_freq`
+    is ignored.
+
+    >>> state["free-free scattering"].collision_frequency_table = (
+    >>>     jaxrts.models.tabulate_collision_frequency(state, setup)
+    >>> )
+
     Requires a 'chemical potential' model (defaults to
     :py:class:`~.IchimaruChemPotential`).
     Requires a 'BM V_eiS' model (defaults to
@@ -1420,10 +2145,18 @@ class BornMermin(FreeFreeModel):
     """
 
     __name__ = "BornMermin"
+    _collision_frequency_rpa = "numerical"
 
-    def __init__(self, no_of_freq: int = 20) -> None:
+    def __init__(
+        self,
+        no_of_freq: int = 20,
+        collision_frequency_table: (
+            free_free.CollisionFrequencyTable | None
+        ) = None,
+    ) -> None:
         super().__init__()
         self.no_of_freq: int = no_of_freq
+        self.collision_frequency_table = collision_frequency_table
 
     def prepare(self, plasma_state: "PlasmaState", key: str) -> None:
         plasma_state.update_default_model(
@@ -1444,10 +2177,7 @@ class BornMermin(FreeFreeModel):
         **kwargs,
     ) -> jnp.ndarray:
 
-        @jax.tree_util.Partial
-        def S_ii(k):
-            probe_setup = get_probe_setup(k, setup)
-            return plasma_state.evaluate("BM S_ii", probe_setup)
+        S_ii = _BM_S_ii(plasma_state, setup)
 
         @jax.tree_util.Partial
         def V_eiS(k):
@@ -1469,6 +2199,7 @@ class BornMermin(FreeFreeModel):
             setup.measured_energy - setup.energy,
             plasma_state["ee-lfc"].evaluate(plasma_state, setup),
             self.no_of_freq,
+            self.collision_frequency_table,
         )
         ff = See_0 * mean_Z_free
         # Return 0 scattering if there are no free electrons
@@ -1491,10 +2222,7 @@ class BornMermin(FreeFreeModel):
         **kwargs,
     ) -> jnp.ndarray:
 
-        @jax.tree_util.Partial
-        def S_ii(k):
-            probe_setup = get_probe_setup(k, setup)
-            return plasma_state.evaluate("BM S_ii", probe_setup)
+        S_ii = _BM_S_ii(plasma_state, setup)
 
         @jax.tree_util.Partial
         def V_eiS(k):
@@ -1518,6 +2246,7 @@ class BornMermin(FreeFreeModel):
                 V_eiS,
                 mean_Z_free,
                 self.no_of_freq,
+                self.collision_frequency_table,
             )
             xi0 = noninteracting_susceptibility_from_eps_RPA(eps, k)
             lfc = plasma_state["ee-lfc"].evaluate(plasma_state, setup)
@@ -1536,10 +2265,11 @@ class BornMermin(FreeFreeModel):
         )
 
     def _tree_flatten(self):
-        children = ()
+        children = (self.collision_frequency_table,)
         aux_data = (
             self.model_key,
             self.sample_points,
+            self.sampling,
             self.no_of_freq,
         )  # static values
         return (children, aux_data)
@@ -1547,7 +2277,13 @@ class BornMermin(FreeFreeModel):
     @classmethod
     def _tree_unflatten(cls, aux_data, children):
         obj = object.__new__(cls)
-        obj.model_key, obj.sample_points, obj.no_of_freq = aux_data
+        (
+            obj.model_key,
+            obj.sample_points,
+            obj.sampling,
+            obj.no_of_freq,
+        ) = aux_data
+        (obj.collision_frequency_table,) = children
 
         return obj
 
@@ -1567,6 +2303,9 @@ class BornMermin_Fit(FreeFreeModel):
     >>> state["free-free scattering"] = jaxrts.models.BornMermin_Fit
     >>> state["free-free scattering"].no_of_freq = 10
 
+    As for :py:class:`~.BornMermin`, a tabulated collision frequency can be
+    used by setting :py:attr:`~.collision_frequency_table`.
+
     Requires a 'chemical potential' model (defaults to
     :py:class:`~.IchimaruChemPotential`).
     Requires a 'BM V_eiS' model (defaults to
@@ -1580,10 +2319,18 @@ class BornMermin_Fit(FreeFreeModel):
     """
 
     __name__ = "BornMermin_Fit"
+    _collision_frequency_rpa = "Dandrea"
 
-    def __init__(self, no_of_freq: int = 20) -> None:
+    def __init__(
+        self,
+        no_of_freq: int = 20,
+        collision_frequency_table: (
+            free_free.CollisionFrequencyTable | None
+        ) = None,
+    ) -> None:
         super().__init__()
         self.no_of_freq: int = no_of_freq
+        self.collision_frequency_table = collision_frequency_table
 
     def prepare(self, plasma_state: "PlasmaState", key: str) -> None:
         plasma_state.update_default_model(
@@ -1604,10 +2351,7 @@ class BornMermin_Fit(FreeFreeModel):
         **kwargs,
     ) -> jnp.ndarray:
 
-        @jax.tree_util.Partial
-        def S_ii(k):
-            probe_setup = get_probe_setup(k, setup)
-            return plasma_state.evaluate("BM S_ii", probe_setup)
+        S_ii = _BM_S_ii(plasma_state, setup)
 
         @jax.tree_util.Partial
         def V_eiS(k):
@@ -1629,6 +2373,7 @@ class BornMermin_Fit(FreeFreeModel):
             setup.measured_energy - setup.energy,
             plasma_state["ee-lfc"].evaluate(plasma_state, setup),
             self.no_of_freq,
+            self.collision_frequency_table,
         )
         ff = See_0 * mean_Z_free
         # Return 0 scattering if there are no free electrons
@@ -1651,10 +2396,7 @@ class BornMermin_Fit(FreeFreeModel):
         **kwargs,
     ) -> jnp.ndarray:
 
-        @jax.tree_util.Partial
-        def S_ii(k):
-            probe_setup = get_probe_setup(k, setup)
-            return plasma_state.evaluate("BM S_ii", probe_setup)
+        S_ii = _BM_S_ii(plasma_state, setup)
 
         @jax.tree_util.Partial
         def V_eiS(k):
@@ -1677,6 +2419,7 @@ class BornMermin_Fit(FreeFreeModel):
                 V_eiS,
                 mean_Z_free,
                 self.no_of_freq,
+                self.collision_frequency_table,
             )
             xi0 = noninteracting_susceptibility_from_eps_RPA(eps, k)
             lfc = plasma_state["ee-lfc"].evaluate(plasma_state, setup)
@@ -1695,10 +2438,11 @@ class BornMermin_Fit(FreeFreeModel):
         )
 
     def _tree_flatten(self):
-        children = ()
+        children = (self.collision_frequency_table,)
         aux_data = (
             self.model_key,
             self.sample_points,
+            self.sampling,
             self.no_of_freq,
         )  # static values
         return (children, aux_data)
@@ -1706,7 +2450,13 @@ class BornMermin_Fit(FreeFreeModel):
     @classmethod
     def _tree_unflatten(cls, aux_data, children):
         obj = object.__new__(cls)
-        obj.model_key, obj.sample_points, obj.no_of_freq = aux_data
+        (
+            obj.model_key,
+            obj.sample_points,
+            obj.sampling,
+            obj.no_of_freq,
+        ) = aux_data
+        (obj.collision_frequency_table,) = children
 
         return obj
 
@@ -1726,6 +2476,9 @@ class BornMermin_Fortmann(FreeFreeModel):
     >>> state["free-free scattering"] = jaxrts.models.BornMermin_Fortmann
     >>> state["free-free scattering"].no_of_freq = 10
 
+    As for :py:class:`~.BornMermin`, a tabulated collision frequency can be
+    used by setting :py:attr:`~.collision_frequency_table`.
+
     Requires a 'chemical potential' model (defaults to
     :py:class:`~.IchimaruChemPotential`).
     Requires a 'BM V_eiS' model (defaults to
@@ -1741,10 +2494,18 @@ class BornMermin_Fortmann(FreeFreeModel):
     """
 
     __name__ = "BornMermin_Fortmann"
+    _collision_frequency_rpa = "Dandrea"
 
-    def __init__(self, no_of_freq: int = 20) -> None:
+    def __init__(
+        self,
+        no_of_freq: int = 20,
+        collision_frequency_table: (
+            free_free.CollisionFrequencyTable | None
+        ) = None,
+    ) -> None:
         super().__init__()
         self.no_of_freq: int = no_of_freq
+        self.collision_frequency_table = collision_frequency_table
 
     def prepare(self, plasma_state: "PlasmaState", key: str) -> None:
         plasma_state.update_default_model(
@@ -1765,10 +2526,7 @@ class BornMermin_Fortmann(FreeFreeModel):
         **kwargs,
     ) -> jnp.ndarray:
 
-        @jax.tree_util.Partial
-        def S_ii(k):
-            probe_setup = get_probe_setup(k, setup)
-            return plasma_state.evaluate("BM S_ii", probe_setup)
+        S_ii = _BM_S_ii(plasma_state, setup)
 
         @jax.tree_util.Partial
         def V_eiS(k):
@@ -1790,6 +2548,7 @@ class BornMermin_Fortmann(FreeFreeModel):
             setup.measured_energy - setup.energy,
             plasma_state["ee-lfc"].evaluate(plasma_state, setup),
             self.no_of_freq,
+            self.collision_frequency_table,
         )
         ff = See_0 * mean_Z_free
         # Return 0 scattering if there are no free electrons
@@ -1812,10 +2571,7 @@ class BornMermin_Fortmann(FreeFreeModel):
         **kwargs,
     ) -> jnp.ndarray:
 
-        @jax.tree_util.Partial
-        def S_ii(k):
-            probe_setup = get_probe_setup(k, setup)
-            return plasma_state.evaluate("BM S_ii", probe_setup)
+        S_ii = _BM_S_ii(plasma_state, setup)
 
         @jax.tree_util.Partial
         def V_eiS(k):
@@ -1838,14 +2594,16 @@ class BornMermin_Fortmann(FreeFreeModel):
             mean_Z_free,
             plasma_state["ee-lfc"].evaluate(plasma_state, setup),
             self.no_of_freq,
+            self.collision_frequency_table,
         )
         return xi
 
     def _tree_flatten(self):
-        children = ()
+        children = (self.collision_frequency_table,)
         aux_data = (
             self.model_key,
             self.sample_points,
+            self.sampling,
             self.no_of_freq,
         )  # static values
         return (children, aux_data)
@@ -1853,7 +2611,13 @@ class BornMermin_Fortmann(FreeFreeModel):
     @classmethod
     def _tree_unflatten(cls, aux_data, children):
         obj = object.__new__(cls)
-        obj.model_key, obj.sample_points, obj.no_of_freq = aux_data
+        (
+            obj.model_key,
+            obj.sample_points,
+            obj.sampling,
+            obj.no_of_freq,
+        ) = aux_data
+        (obj.collision_frequency_table,) = children
 
         return obj
 
@@ -1869,6 +2633,10 @@ class SchumacherImpulse(ScatteringModel):
     asymmetric correction to the impulse approximation, as given in the
     aforementioned paper.
 
+    The Compton profiles are interpolated from the tables of
+    :py:func:`jaxrts.bound_free.compton_profile_table`, and all ions are
+    evaluated at once (see :py:func:`jaxrts.bound_free.J_impulse_tabulated`).
+
     Requires a 'form-factors' model (defaults to
     :py:class:`~PaulingFormFactors`).
 
@@ -1912,50 +2680,46 @@ class SchumacherImpulse(ScatteringModel):
         omega = omega_0 - setup.measured_energy / ureg.hbar
         x = plasma_state.number_fraction
 
-        out = 0 * ureg.second
-        for idx in range(plasma_state.nions):
-            Z_c = plasma_state.Z_core[idx]
-            E_b = (
-                plasma_state.ions[idx].binding_energies
-                + plasma_state.models["ipd"].evaluate(plasma_state, None)[idx]
-            )
-            E_b = jnpu.where(
-                E_b < 0 * ureg.electron_volt, 0 * ureg.electron_volt, E_b
-            )
-
-            Zeff = (
-                plasma_state.ions[idx].Z
-            ) - form_factors.pauling_size_screening_constants(Z_c)
-            population = electron_distribution_ionized_state(Z_c)
-
-            def rk_on(r_k):
-                # Gregori.2004, Eqn 20
-                fi = plasma_state["form-factors"].evaluate(
-                    plasma_state, setup
-                )[:, idx]
-                new_r_k = 1 - jnp.sum(population * (fi) ** 2) / Z_c
-                # Catch the division by zero error
-                new_r_k = jax.lax.cond(Z_c == 0, lambda: 1.0, lambda: new_r_k)
-                return new_r_k
-
-            def rk_off(r_k):
-                """
-                Use the rk provided by the user
-                """
-                return r_k
-
-            r_k = jax.lax.cond(self.r_k < 0, rk_on, rk_off, self.r_k)
-            B = 1 + 1 / omega_0 * (ureg.hbar * k**2) / (2 * ureg.electron_mass)
-            # B should be close to unity
-            # B = 1 * ureg.dimensionless
-            factor = r_k / (Z_c * B**3).m_as(ureg.dimensionless)
-            sbe = factor * bound_free.J_impulse_approx(
-                omega, k, population, Zeff, E_b
-            )
-            val = sbe * Z_c * x[idx]
-            out += jnpu.where(
-                jnp.isnan(val.m_as(ureg.second)), 0 * ureg.second, val
+        # All ions are evaluated at once, with the orbitals along the first
+        # and the ions along the second axis.
+        Z_c = plasma_state.Z_core
+        E_b = plasma_state.species.binding_energies + plasma_state.models[
+            "ipd"
+        ].evaluate(plasma_state, None)
+        E_b = jnpu.where(
+            E_b < 0 * ureg.electron_volt, 0 * ureg.electron_volt, E_b
+        )
+        Zeff = (
+            plasma_state.Z_A
+            - form_factors.pauling_size_screening_constants(Z_c)
+        )
+        population = electron_distribution_ionized_state(Z_c)
+
+        if self.r_k < 0:
+            # Gregori.2004, Eqn 20
+            fi = plasma_state["form-factors"].evaluate(plasma_state, setup)
+            # Catch the division by zero error
+            safe_Z_c = jnp.where(Z_c == 0, 1.0, Z_c)
+            r_k = jnp.where(
+                Z_c == 0,
+                1.0,
+                1 - jnp.sum(population * fi**2, axis=0) / safe_Z_c,
             )
+        else:
+            # Use the rk provided by the user
+            r_k = self.r_k
+        B = 1 + 1 / omega_0 * (ureg.hbar * k**2) / (2 * ureg.electron_mass)
+        # B should be close to unity
+        # B = 1 * ureg.dimensionless
+        factor = (r_k / Z_c)[:, jnp.newaxis] / (B**3).m_as(ureg.dimensionless)
+        sbe = factor * bound_free.J_impulse_tabulated(
+            omega, k, population, Zeff, E_b
+        )
+        val = sbe * (Z_c * x)[:, jnp.newaxis]
+        out = jnpu.sum(
+            jnpu.where(jnp.isnan(val.m_as(ureg.second)), 0 * ureg.second, val),
+            axis=0,
+        )
         return out / plasma_state.mean_Z_A
 
     def _tree_flatten(self):
@@ -1963,6 +2727,7 @@ class SchumacherImpulse(ScatteringModel):
         aux_data = (
             self.model_key,
             self.sample_points,
+            self.sampling,
             self.r_k,
         )  # static values
         return (children, aux_data)
@@ -1970,7 +2735,12 @@ class SchumacherImpulse(ScatteringModel):
     @classmethod
     def _tree_unflatten(cls, aux_data, children):
         obj = object.__new__(cls)
-        obj.model_key, obj.sample_points, obj.r_k = aux_data
+        (
+            obj.model_key,
+            obj.sample_points,
+            obj.sampling,
+            obj.r_k,
+        ) = aux_data
 
         return obj
 
@@ -2077,13 +2847,14 @@ class SchumacherImpulseFitRk(ScatteringModel):
         aux_data = (
             self.model_key,
             self.sample_points,
+            self.sampling,
         )  # static values
         return (children, aux_data)
 
     @classmethod
     def _tree_unflatten(cls, aux_data, children):
         obj = object.__new__(cls)
-        obj.model_key, obj.sample_points = aux_data
+        obj.model_key, obj.sample_points, obj.sampling = aux_data
 
         return obj
 
@@ -3014,21 +3785,21 @@ class Sum_Sii(Model):
         S_ab = plasma_state["ionic scattering"].S_ii(plasma_state, setup)
         x = plasma_state.number_fraction
         # Add the contributions from all pairs
-        S_ii = 0
-
-        def add_Sii(a, b):
-            return (jnpu.sqrt(x[a] * x[b]) * S_ab[a, b]).m_as(
-                ureg.dimensionless
-            )[jnp.newaxis]
+        S_ii = _pair_sum(x, jnp.ones(plasma_state.nions), S_ab)
+        return S_ii.m_as(ureg.dimensionless)[jnp.newaxis]
 
-        # The W_R is calculated as a sum over all combinations of a_b
-        ion_spec1, ion_spec2 = jnp.meshgrid(
-            jnp.arange(plasma_state.nions),
-            jnp.arange(plasma_state.nions),
-        )
-        for a, b in zip(ion_spec1.flatten(), ion_spec2.flatten()):
-            S_ii += add_Sii(a, b)
-        return S_ii
+    def evaluate_table(
+        self, plasma_state: "PlasmaState", setup: Setup
+    ) -> tuple[Quantity, jnp.ndarray] | None:
+        """
+        Tabulate :math:`S_{ii}` on the native ``k`` grid of the ``"ionic
+        scattering"`` model, if it has one (as the HNC models do). Returns
+        ``None``, otherwise.
+        """
+        k = getattr(plasma_state["ionic scattering"], "k", None)
+        if k is None:
+            return None
+        return k, self.evaluate(plasma_state, get_probe_setup(k, setup))
 
 
 class AverageAtom_Sii(Model):
@@ -3081,6 +3852,18 @@ class AverageAtom_Sii(Model):
     def evaluate(
         self, plasma_state: "PlasmaState", setup: Setup
     ) -> jnp.ndarray:
+        k, S_ii = self.evaluate_table(plasma_state, setup)
+        # Interpolate this to the k given by the setup
+        return _interp_S_ii(k, S_ii, setup.k) * ureg.dimensionless
+
+    @jax.jit
+    def evaluate_table(
+        self, plasma_state: "PlasmaState", setup: Setup
+    ) -> tuple[Quantity, jnp.ndarray]:
+        """
+        Return the static ion-ion structure factor on the native ``k`` grid
+        of the HNC calculation (see :py:attr:`~.k`).
+        """
         # Average the Plasma State
         aaState = averagePlasmaState(plasma_state)
 
@@ -3104,12 +3887,7 @@ class AverageAtom_Sii(Model):
         # Calculate S_ab by Fourier-transforming g_ab
         # ---------------------------------------------
         S_ab_HNC = hypernetted_chain.S_ii_HNC(self.k, g, n, self.r)
-
-        # Interpolate this to the k given by the setup
-
-        S_ab = hypernetted_chain.hnc_interp(setup.k, self.k, S_ab_HNC)
-        # Return the Sii with the correct shape
-        return S_ab[0, 0]
+        return self.k, S_ab_HNC[0, 0].m_as(ureg.dimensionless)
 
     # The following is required to jit a Model
     def _tree_flatten(self):
@@ -3129,6 +3907,88 @@ class AverageAtom_Sii(Model):
         return obj
 
 
+class TabulatedSii(Model):
+    """
+    A static ion-ion structure factor :math:`S_{ii}(k)` which is interpolated
+    linearly from a table. Outside of the table, the first or last value is
+    returned.
+
+    This allows to re-use a (costly) HNC calculation, e.g., for the Born
+    collision frequencies of the Born-Mermin models. Use :py:meth:`from_state`
+    to tabulate another ``"BM S_ii"`` model for a given plasma state.
+    """
+
+    allowed_keys = ["BM S_ii"]
+    __name__ = "TabulatedSii"
+
+    def __init__(self, k: Quantity, S_ii: jnp.ndarray) -> None:
+        #: The scattering vectors at which :py:attr:`~.S_ii` is tabulated.
+        #: Have to be increasing.
+        self.k: Quantity = k
+        #: The static ion-ion structure factor, the last axis corresponding to
+        #: :py:attr:`~.k`.
+        self.S_ii: jnp.ndarray = jnp.asarray(S_ii)
+        super().__init__()
+
+    @classmethod
+    def from_state(
+        cls,
+        plasma_state: "PlasmaState",
+        setup: Setup,
+        model: Model | None = None,
+    ) -> "TabulatedSii":
+        """
+        Tabulate the ``"BM S_ii"`` model of ``plasma_state`` (or ``model``,
+        if given) on its native ``k`` grid.
+
+        Raises
+        ------
+        ValueError
+            If the model cannot be tabulated.
+        """
+        if model is None:
+            model = plasma_state["BM S_ii"]
+        evaluate_table = getattr(model, "evaluate_table", None)
+        table = (
+            evaluate_table(plasma_state, setup)
+            if evaluate_table is not None
+            else None
+        )
+        if table is None:
+            raise ValueError(
+                f"The model {model.__name__} does not provide a table of S_ii."
+            )
+        return cls(*table)
+
+    @jax.jit
+    def evaluate(
+        self, plasma_state: "PlasmaState", setup: Setup
+    ) -> jnp.ndarray:
+        return _interp_S_ii(self.k, self.S_ii, setup.k)
+
+    def evaluate_table(
+        self, plasma_state: "PlasmaState", setup: Setup
+    ) -> tuple[Quantity, jnp.ndarray]:
+        """
+        Return the table, i.e., :py:attr:`~.k` and :py:attr:`~.S_ii`.
+        """
+        return self.k, self.S_ii
+
+    # The following is required to jit a Model
+    def _tree_flatten(self):
+        children = (self.k, self.S_ii)
+        aux_data = (self.model_key,)  # static values
+        return (children, aux_data)
+
+    @classmethod
+    def _tree_unflatten(cls, aux_data, children):
+        obj = object.__new__(cls)
+        (obj.model_key,) = aux_data
+        obj.k, obj.S_ii = children
+
+        return obj
+
+
 # BM V_eiS models
 # ===============
 
@@ -3250,6 +4110,7 @@ _all_models = [
     ElectronicLFCGeldartVosko,
     ElectronicLFCStaticInterpolation,
     ElectronicLFCUtsumiIchimaru,
+    EmulatedIonFeat,
     FiniteWavelengthScreening,
     FiniteWavelength_BM_V,
     FixedSii,
@@ -3275,6 +4136,7 @@ _all_models = [
     SchumacherImpulseFitRk,
     Sum_Sii,
     StewartPyattIPD,
+    TabulatedSii,
     ThreePotentialHNCIonFeat,
 ]
 
@@ -1,5 +1,6 @@
 import logging
 from abc import ABCMeta
+from functools import partial
 from typing import List
 
 import jax
@@ -7,11 +8,16 @@ import jpu.numpy as jnpu
 import numpy as np
 from jax import numpy as jnp
 
+from . import instrumentation, units
 from .plasma_physics import wiegner_seitz_radius, fermi_energy
-from .elements import Element
+from .elements import Element, SpeciesTable, species_table
 from .helpers import JittableDict
-from .models import DebyeHueckelScreeningLength, ElectronicLFCConstant
-from .setup import Setup
+from .models import (
+    DebyeHueckelScreeningLength,
+    ElectronicLFCConstant,
+    ScatteringModel,
+)
+from .setup import Setup, convolve_stucture_factor_with_instrument
 from .units import Quantity, to_array, ureg
 
 logger = logging.getLogger(__name__)
@@ -67,7 +73,7 @@ class PlasmaState:
         return len(self.ions)
 
     def __getitem__(self, key: str):
-        return self.models[key]
+        return instrumentation.wrap(units.wrap(self.models[key], key), key)
 
     def __setitem__(self, key: str, model) -> None:
         if key not in model.allowed_keys:
@@ -149,12 +155,20 @@ class PlasmaState:
             )
             self[model_name] = model_class
 
+    @property
+    def species(self) -> SpeciesTable:
+        """
+        The data of all ion species as arrays, see
+        :py:class:`jaxrts.elements.SpeciesTable`.
+        """
+        return species_table(self.ions)
+
     @property
     def Z_A(self) -> jnp.ndarray:
         """
         The atomic number of the atom-species.
         """
-        return jnp.array([i.Z for i in self.ions])
+        return jnp.asarray(self.species.Z)
 
     @property
     def nions(self) -> int:
@@ -179,8 +193,8 @@ class PlasmaState:
         """
         The atomic weight of the atoms.
         """
-        return jnp.array(
-            [i.atomic_mass.m_as(ureg.atomic_mass_constant) for i in self.ions]
+        return jnp.asarray(
+            self.species.atomic_mass.m_as(ureg.atomic_mass_constant)
         ) * (1 * ureg.atomic_mass_constant)
 
     @property
@@ -233,8 +247,9 @@ class PlasmaState:
         pass
 
     def _lookup_ion_core_radius(self):
-        ioc = [e.atomic_radius_calc for e in self.ions]
-        return to_array(ioc)
+        return jnp.asarray(self.species.atomic_radius.m_as(ureg.picometer)) * (
+            1 * ureg.picometer
+        )
 
     @property
     def ion_core_radius(self):
@@ -270,57 +285,110 @@ class PlasmaState:
         x = self.n_i / jnpu.sum(self.n_i)
         return x.m_as(ureg.dimensionless)
 
-    def db_wavelength(self, kind: List | str):
-
-        wavelengths = []
+    def db_wavelength(self, kind: List | str) -> Quantity:
+        """
+        The thermal de Broglie wavelength :math:`h / \\sqrt{2 \\pi m k_B T}`
+        of the electrons and ions.
 
-        if isinstance(kind, str):
+        Parameters
+        ----------
+        kind: List | str
+            ``"e-"`` for the electrons (at :py:attr:`~.T_e`), or an ion
+            species of this state (at its temperature :py:attr:`~.T_i`), or a
+            list of these.
+
+        Returns
+        -------
+        Quantity
+            The wavelengths, with one entry per ``kind``.
+        """
+        if isinstance(kind, (str, Element)):
             kind = [kind]
+        # Index 0 are the electrons, i + 1 the ion species i
+        index = []
         for par in kind:
-            assert (par == "e-") or (
-                par in self.ions
-            ), "Kind must be one of the ion species or an electron (e-)!"
-            if par == "e-":
-                wavelengths.append(
-                    (
-                        (1 * ureg.planck_constant)
-                        / jnpu.sqrt(
-                            2.0
-                            * jnp.pi
-                            * 1
-                            * ureg.electron_mass
-                            * 1
-                            * ureg.boltzmann_constant
-                            * self.T_e
-                        )
-                    ).to_base_units()
-                )
+            if isinstance(par, str) and par == "e-":
+                index.append(0)
+            elif isinstance(par, Element) and par in self.ions:
+                index.append(self.ions.index(par) + 1)
             else:
-                wavelengths.append(
-                    (
-                        (1 * ureg.planck_constant)
-                        / jnpu.sqrt(
-                            2.0
-                            * jnp.pi
-                            * 1
-                            * self.atomic_masses[
-                                np.argwhere(np.array(self.ions == par))
-                            ]
-                            * 1
-                            * ureg.boltzmann_constant
-                            * self.T_e
-                        )
-                    ).to_base_units()
+                raise ValueError(
+                    f"Kind must be one of the ion species or an electron "
+                    + f"(e-), not {par}."
                 )
+        index = np.array(index)
+        m = jnp.concatenate(
+            [
+                jnp.array(
+                    [(1 * ureg.electron_mass).m_as(ureg.atomic_mass_constant)]
+                ),
+                self.atomic_masses.m_as(ureg.atomic_mass_constant),
+            ]
+        ) * (1 * ureg.atomic_mass_constant)
+        T = jnp.concatenate(
+            [
+                jnp.atleast_1d(self.T_e.m_as(ureg.kelvin)),
+                self.T_i.m_as(ureg.kelvin),
+            ]
+        ) * (1 * ureg.kelvin)
+        return (
+            (1 * ureg.planck_constant)
+            / jnpu.sqrt(
+                2.0
+                * jnp.pi
+                * m[index]
+                * (1 * ureg.boltzmann_constant)
+                * T[index]
+            )
+        ).to_base_units()
 
     @jax.jit
     def probe(self, setup: Setup) -> Quantity:
-        ionic = self["ionic scattering"].evaluate(self, setup)
-        free_free = self["free-free scattering"].evaluate(self, setup)
-        bound_free = self["bound-free scattering"].evaluate(self, setup)
-        free_bound = self["free-bound scattering"].evaluate(self, setup)
+        """
+        The full scattering signal, i.e., the sum of the ``"ionic
+        scattering"``, ``"free-free scattering"``, ``"bound-free scattering"``
+        and ``"free-bound scattering"``, convolved with the instrument
+        function.
+
+        The contributions of all :py:class:`jaxrts.models.ScatteringModel` s
+        are added before they are convolved with the instrument function, so
+        that only a single convolution is required.
+        """
+        signal, unconvolved = self._probe_contributions(setup)
+        if unconvolved is not None:
+            signal += convolve_stucture_factor_with_instrument(
+                unconvolved, setup
+            )
+        return signal
 
-        return ionic + free_free + bound_free + free_bound
+    def _probe_contributions(
+        self, setup: Setup
+    ) -> tuple[Quantity, Quantity | None]:
+        """
+        The contributions to :py:meth:`~.probe`.
+
+        Returns
+        -------
+        Quantity
+            The sum of all contributions which are not evaluated by a
+            :py:class:`jaxrts.models.ScatteringModel`, i.e., which already
+            contain the instrument function.
+        Quantity | None
+            The sum of the contributions of all
+            :py:class:`jaxrts.models.ScatteringModel` s, which still have to
+            be convolved with the instrument function. ``None``, if there are
+            none.
+        """
+        signal = jnp.zeros(len(setup.measured_energy)) * (1 * ureg.second)
+        unconvolved = []
+        for key in instrumentation.probe_keys:
+            if isinstance(self.models[key], ScatteringModel):
+                unconvolved.append(self[key].evaluate_unconvolved(self, setup))
+            else:
+                signal += self[key].evaluate(self, setup)
+        if not unconvolved:
+            return signal, None
+        return signal, sum(unconvolved[1:], unconvolved[0])
 
     def evaluate(self, key: str, setup: Setup) -> Quantity:
         """
@@ -329,6 +397,25 @@ class PlasmaState:
         """
         return self[key].evaluate(self, setup)
 
+    def profile(
+        self,
+        setup: Setup,
+        keys: List[str] | None = None,
+        repeats: int = 3,
+        counters: bool = True,
+    ) -> "instrumentation.ProfileReport":
+        """
+        Time the evaluation of every model separately, split into compilation
+        and execution, and collect counters like the number of HNC iterations.
+        See :py:func:`jaxrts.instrumentation.profile` for details.
+
+        Returns
+        -------
+        jaxrts.instrumentation.ProfileReport
+            The timings, the models called by every model and the counters.
+        """
+        return instrumentation.profile(self, setup, keys, repeats, counters)
+
     # Set labels for a save state that is better readable by humans
     _children_labels = (
         "Z_free",
@@ -406,3 +493,236 @@ jax.tree_util.register_pytree_node(
     PlasmaState._tree_flatten,
     PlasmaState._tree_unflatten,
 )
+
+
+class PlasmaStateBatch:
+    """
+    A stack of :py:class:`~.PlasmaState` objects which share the same ions and
+    models, but differ in their parameters. Instead of creating one state (and
+    one compiled call of :py:meth:`~.PlasmaState.probe`) per point of a
+    parameter scan, the parameters are stacked along a leading batch axis and
+    all states are evaluated by a single compiled kernel.
+
+    The batch has the same pytree children as a :py:class:`~.PlasmaState`,
+    with the difference that ``Z_free``, ``mass_density``, ``T_i`` and the
+    ion core radius have the shape ``(len(batch), nions)``, and ``T_e`` has
+    the shape ``(len(batch),)``. The models are not batched.
+
+    Examples
+    --------
+    >>> batch = PlasmaStateBatch(
+    >>>     state, T_e=jnp.linspace(10, 100, 200) * ureg.electron_volt / ureg.k_B
+    >>> )
+    >>> S_ee = batch.probe(setup, chunk_size=32)
+    """
+
+    def __init__(
+        self,
+        plasma_state: PlasmaState,
+        Z_free: Quantity | None = None,
+        mass_density: Quantity | None = None,
+        T_e: Quantity | None = None,
+        T_i: Quantity | None = None,
+        ion_core_radius: Quantity | None = None,
+    ):
+        """
+        Parameters
+        ----------
+        plasma_state: PlasmaState
+            The template state. It defines the ions and models of the batch,
+            and all parameters which are not given explicitly.
+        Z_free: Quantity | None
+            The ionization of the ions. Shape ``(n, nions)``. If ``nions`` is
+            one, an array of shape ``(n,)`` is also accepted.
+        mass_density: Quantity | None
+            The mass density of the ions. Shape ``(n, nions)`` or ``(n,)``,
+            see ``Z_free``.
+        T_e: Quantity | None
+            The electron temperature, shape ``(n,)``.
+        T_i: Quantity | None
+            The ion temperatures. Shape ``(n, nions)`` or ``(n,)``, see
+            ``Z_free``. If ``None``, the ion temperatures of ``plasma_state``
+            are used, also if ``T_e`` is varied.
+        ion_core_radius: Quantity | None
+            Overwrite the ion core radius. Shape ``(n, nions)`` or ``(n,)``,
+            see ``Z_free``.
+
+        Raises
+        ------
+        ValueError
+            If no parameter was given, or the given parameters have
+            inconsistent shapes.
+        """
+        self.ions = plasma_state.ions
+        self.models = plasma_state.models
+
+        given = {
+            "Z_free": Z_free,
+            "mass_density": mass_density,
+            "T_e": T_e,
+            "T_i": T_i,
+            "ion_core_radius": ion_core_radius,
+        }
+        lengths = {len(v) for v in given.values() if v is not None}
+        if len(lengths) == 0:
+            raise ValueError("At least one batched parameter is required.")
+        if len(lengths) > 1:
+            raise ValueError(
+                "All batched parameters must have the same leading axis, "
+                + f"got lengths {lengths}."
+            )
+        (n,) = lengths
+
+        template = plasma_state._tree_flatten()[0]
+        (
+            self.Z_free,
+            self.mass_density,
+            self.T_e,
+            self.T_i,
+            self._ion_core_radius,
+        ) = (
+            self._stack(key, value, default, n)
+            for (key, value), default in zip(given.items(), template)
+        )
+
+    def _stack(self, key: str, value, default, n: int):
+        if value is None:
+            default = to_array(default)
+            return jnpu.repeat(default[jnp.newaxis, ...], n, axis=0)
+        value = to_array(value)
+        if key == "T_e":
+            shape = (n,)
+        else:
+            shape = (n, self.nions)
+            if (self.nions == 1) and (len(value.shape) == 1):
+                value = value[:, jnp.newaxis]
+        if value.shape != shape:
+            raise ValueError(
+                f"Batched {key} should have shape {shape}, "
+                + f"got {value.shape}."
+            )
+        return value
+
+    @classmethod
+    def from_states(cls, states: List[PlasmaState]) -> "PlasmaStateBatch":
+        """
+        Stack a list of :py:class:`~.PlasmaState` objects. All states have to
+        share the ions and the models of the first state.
+        """
+        first = states[0]
+        for state in states[1:]:
+            if (state.ions != first.ions) or (
+                state._eq_characteristic()[1:]
+                != first._eq_characteristic()[1:]
+            ):
+                raise ValueError(
+                    "All states in a batch must have the same ions and models."
+                )
+        children = [s._tree_flatten()[0][:-1] for s in states]
+        stacked = [to_array([c[i] for c in children]) for i in range(5)]
+        return cls(
+            first,
+            Z_free=stacked[0],
+            mass_density=stacked[1],
+            T_e=stacked[2],
+            T_i=stacked[3],
+            ion_core_radius=stacked[4],
+        )
+
+    def __len__(self) -> int:
+        return self.T_e.shape[0]
+
+    def __getitem__(self, idx: int) -> PlasmaState:
+        """
+        Return a single :py:class:`~.PlasmaState` of the batch.
+        """
+        children, aux_data = self._tree_flatten()
+        children = (*[c[idx] for c in children[:-1]], children[-1])
+        return PlasmaState._tree_unflatten(aux_data, children)
+
+    @property
+    def nions(self) -> int:
+        return len(self.ions)
+
+    def _map(self, fun, chunk_size: int | None):
+        """
+        Apply ``fun`` to every :py:class:`~.PlasmaState` of the batch. If
+        ``chunk_size`` is ``None``, the whole batch is vectorized with
+        :py:func:`jax.vmap`. Otherwise, :py:func:`jax.lax.map` evaluates
+        ``chunk_size`` states at once, which bounds the memory consumption.
+        """
+        children, aux_data = self._tree_flatten()
+        models = children[-1]
+
+        def single(params):
+            return fun(
+                PlasmaState._tree_unflatten(aux_data, (*params, models))
+            )
+
+        if chunk_size is None:
+            return jax.vmap(single)(children[:-1])
+        return jax.lax.map(single, children[:-1], batch_size=chunk_size)
+
+    @partial(jax.jit, static_argnames=["chunk_size"])
+    def probe(self, setup: Setup, chunk_size: int | None = None) -> Quantity:
+        """
+        Evaluate :py:meth:`~.PlasmaState.probe` for all states of the batch.
+
+        Parameters
+        ----------
+        setup: Setup
+            The setup, shared by all states.
+        chunk_size: int | None
+            Number of states evaluated simultaneously. If ``None``, all
+            states are evaluated at once.
+
+        Returns
+        -------
+        Quantity
+            The scattering signal, with shape ``(len(batch),
+            len(setup.measured_energy))``.
+        """
+        return self._map(lambda s: s.probe(setup), chunk_size)
+
+    @partial(jax.jit, static_argnames=["key", "chunk_size"])
+    def evaluate(
+        self, key: str, setup: Setup, chunk_size: int | None = None
+    ) -> Quantity:
+        """
+        Evaluate the model stored under ``key`` for all states of the batch.
+        See :py:meth:`~.probe` for the meaning of ``chunk_size``.
+        """
+        return self._map(lambda s: s.evaluate(key, setup), chunk_size)
+
+    def _tree_flatten(self):
+        children = (
+            self.Z_free,
+            self.mass_density,
+            self.T_e,
+            self.T_i,
+            self._ion_core_radius,
+            self.models,
+        )
+        aux_data = (self.ions,)
+        return (children, aux_data)
+
+    @classmethod
+    def _tree_unflatten(cls, aux_data, children):
+        obj = object.__new__(cls)
+        (obj.ions,) = aux_data
+        (
+            obj.Z_free,
+            obj.mass_density,
+            obj.T_e,
+            obj.T_i,
+            obj._ion_core_radius,
+            obj.models,
+        ) = children
+        return obj
+
+
+jax.tree_util.register_pytree_node(
+    PlasmaStateBatch,
+    PlasmaStateBatch._tree_flatten,
+    PlasmaStateBatch._tree_unflatten,
+)
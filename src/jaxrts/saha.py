@@ -12,7 +12,9 @@ import jax.numpy as jnp
 import jpu.numpy as jnpu
 import numpy as onp
 
-from .elements import Element
+from . import instrumentation
+from .elements import Element, species_table
+from .plasmastate import PlasmaStateBatch
 from .units import Quantity, ureg, to_array
 
 h = 1 * ureg.planck_constant
@@ -89,53 +91,208 @@ def saha_equation(
     )
 
 
-@partial(jax.jit, static_argnames=["element_list"])
-def solve_saha(
-    element_list: List[Element],
-    T_e: Quantity,
-    ion_number_densities: Quantity,
-    continuum_lowering: Quantity = 0 * ureg.electron_volt,
-) -> (Quantity, Quantity):
+def _log_fractions(log_ne, log_saha, mask):
     """
-    Solve the Saha equation for a list of elements at a given temperature.
+    The logarithm of the fractions of all ionization states, given the
+    logarithm of the free electron density, ``log_ne``, and the logarithm of
+    the right-hand side of the Saha equation for every ionization step,
+    ``log_saha``.
+    """
+    steps = jnp.where(mask, log_saha - log_ne, -jnp.inf)
+    log_population = jnp.concatenate(
+        [jnp.zeros_like(steps[:, :1]), jnp.cumsum(steps, axis=1)], axis=1
+    )
+    return log_population - jax.nn.logsumexp(
+        log_population, axis=1, keepdims=True
+    )
 
-    This function uses a similar approach to solve the set of equations as
-    Jamal El Kuweiss' `many-ion-saha-equation tool
-    <https://github.com/jelkuweiss/many-ion-saha-equation>`_
-    by
 
-    #. Creating an abstract matrix which for each element consists of
+def _solve_charge_neutrality(log_ni, log_saha, mask, tol, max_iter):
+    """
+    Find the logarithm of the free electron density, for which the free
+    electrons of all ionization states add up to the electron density.
 
-        #. `Z + 1` rows of which have the solution of the Saha equation as
-           diagonal entries, multiplied by -i and the free electron density
-           `n_e` on the first off-diagonal element. These rows reflect that
-           every neighboring number densities `n_{i+1}` and `n_i` fulfill
-           the Saha equation
+    The residual
 
-        #. A row with `Z + 1` entries of 1, ending with the diagonal entry,
-           and the ion number density as last entry of the row. This guarantees
-           that the individual ionization number densities add up to the full
-           ion number density.
+    .. math::
 
-       And additionally a final row, which contains the possible charge
-       states for all ions, respectively, and, finally, the free electron
-       number density n_e.
-       For all not-specified entries, this matrix is sparse:
+       f(\\log n_e) = \\log\\left(\\sum_a n_a \\bar{Z}_a(n_e)\\right)
+       - \\log n_e
 
-       .. image:: ../images/SahaMatrix.svg
+    is strictly decreasing, so that it has a single root. It is found by a
+    Newton iteration in :math:`\\log n_e`, which falls back to bisection
+    whenever a step would leave the bracket around the root. The root is
+    differentiated implicitly (see :py:func:`jax.lax.custom_root`).
+    """
+    charges = jnp.broadcast_to(
+        jnp.arange(mask.shape[1] + 1), (mask.shape[0], mask.shape[1] + 1)
+    )
+
+    def residual(log_ne):
+        log_x = _log_fractions(log_ne, log_saha, mask)
+        return (
+            jax.nn.logsumexp(log_ni[:, jnp.newaxis] + log_x, b=charges)
+            - log_ne
+        )
+
+    def solve(f, log_ne_max):
+        # f(log_ne_max) <= 0, as there cannot be more free electrons than in
+        # the fully ionized plasma. Search a lower bound, below.
+        def expand_condition(val):
+            lo, i = val
+            return (f(lo) <= 0) & (i < 100)
+
+        def expand(val):
+            lo, i = val
+            return lo - 50.0, i + 1
 
-       Throughout the functions, densities are converted to non-dimensional
-       quantities. The scale has impact in numerical stability.
+        lo, _ = jax.lax.while_loop(
+            expand_condition, expand, (log_ne_max - 10.0, 0)
+        )
+
+        def condition(val):
+            _, _, _, step, i = val
+            return (step > tol) & (i < max_iter)
+
+        def newton_step(val):
+            y, lo, hi, _, i = val
+            f_y, df_y = jax.jvp(f, (y,), (jnp.ones_like(y),))
+            lo = jnp.where(f_y > 0, y, lo)
+            hi = jnp.where(f_y > 0, hi, y)
+            y_new = y - f_y / df_y
+            y_new = jnp.where(
+                (y_new > lo) & (y_new < hi) & jnp.isfinite(y_new),
+                y_new,
+                (lo + hi) / 2,
+            )
+            return y_new, lo, hi, jnp.abs(y_new - y), i + 1
+
+        y, *_ = jax.lax.while_loop(
+            condition,
+            newton_step,
+            ((lo + log_ne_max) / 2, lo, log_ne_max, jnp.inf, 0),
+        )
+        return y
+
+    log_ne_max = jax.nn.logsumexp(log_ni, b=jnp.sum(mask, axis=1))
+    return jax.lax.custom_root(
+        residual,
+        log_ne_max,
+        solve,
+        lambda g, y: y / g(1.0),
+    )
 
-    #. Finding the correct free electron density, which is given by the root
-       of the determinant of the matrix.
 
-    #. Building a concrete matrix by inserting the free electron density
+@partial(jax.jit, static_argnames=["element_list", "max_iter"])
+def saha_ionization_fractions(
+    element_list: tuple[Element],
+    T_e: Quantity,
+    ion_number_densities: Quantity,
+    continuum_lowering: Quantity = 0 * ureg.electron_volt,
+    tol: float = 1e-12,
+    max_iter: int = 100,
+) -> tuple[jnp.ndarray, Quantity]:
+    """
+    Solve the Saha equations of all elements in ``element_list``, together
+    with the condition of charge neutrality.
+
+    For given free electron density :math:`n_e`, the Saha equation fixes the
+    ratio of the populations of neighboring ionization states. The fractions
+    of all ionization states of an element follow from a cumulative product
+    along its ladder of ionization states (which is evaluated in log-space
+    to avoid under- and overflows). Hence, the only unknown is :math:`n_e`,
+    which has to be equal to the sum of the free electrons of all ionization
+    states. This one-dimensional root is found by a safeguarded Newton
+    iteration (see :py:func:`~._solve_charge_neutrality`). Rather than a
+    dense matrix containing all ionization states, the elements are stored
+    in a padded array of shape ``(len(element_list), max(Z) + 1)``.
+
+    All arguments can have additional leading batch dimensions, which are
+    broadcast against each other. Hence, tables over, e.g., temperatures and
+    densities are calculated in a single call. The function can also be used
+    with :py:func:`jax.vmap` and differentiated with respect to all
+    arguments.
+
+    Parameters
+    ----------
+    element_list: tuple[Element]
+        A tuple of :py:class:`jaxrts.elements.Element`.
+    T_e: Quantity
+        The electron temperature of the plasma. Shape ``(...)``.
+    ion_number_densities: Quantity
+        The number densities of the individual elements. Shape
+        ``(..., len(element_list))``.
+    continuum_lowering: Quantity, default: 0 eV
+        A value that is added to all binding energies, i.e., a (negative)
+        ionization potential depression. Either a scalar per batch entry, or
+        one value per element, i.e., shape ``(...)`` or
+        ``(..., len(element_list))``. Binding energies are not allowed to
+        become negative.
+    tol: float
+        The tolerance for :math:`\\log(n_e)`.
+    max_iter: int
+        The maximal number of iterations.
+
+    Returns
+    -------
+    jnp.ndarray
+        The fractions of every ionization state, per element. Shape
+        ``(..., len(element_list), max(Z) + 1)``. Charge states which are
+        higher than the atomic number of an element are zero.
+    Quantity
+        The free electron density. Shape ``(...)``.
+    """
+    species = species_table(element_list)
+    energies = species.ionization_energies.m_as(ureg.electron_volt)
+    log_g_ratio = species.log_g_ratio
+    mask = species.ionization_mask
+    n_elements = len(element_list)
+
+    T_e = T_e.m_as(ureg.electron_volt / ureg.k_B)
+    n_i = ion_number_densities.m_as(1 / ureg.m**3)
+    cl = continuum_lowering.m_as(ureg.electron_volt)
+    # Bring the continuum lowering to the shape (..., n_elements)
+    cl = jnp.asarray(cl)
+    if cl.ndim == 0 or cl.shape[-1] != n_elements or n_elements == 1:
+        cl = cl[..., jnp.newaxis]
+    cl = jnp.broadcast_to(cl, (*cl.shape[:-1], n_elements))
+
+    # log(2 (2 pi m_e k_B T_e)^1.5 / h^3) in 1/m^3 for T_e = 1 eV / k_B
+    log_prefactor = jnp.log(
+        (
+            2 * (2 * jnp.pi * m_e * (1 * ureg.electron_volt)) ** 1.5 / h**3
+        ).m_as(1 / ureg.m**3)
+    )
+
+    def single(T_e, n_i, cl):
+        Eb = jnp.clip(energies + cl[:, jnp.newaxis], 0, None)
+        log_saha = log_prefactor + 1.5 * jnp.log(T_e) + log_g_ratio - Eb / T_e
+        log_ni = jnp.log(n_i)
+        log_ne = _solve_charge_neutrality(
+            log_ni, log_saha, mask, tol, max_iter
+        )
+        return jnp.exp(_log_fractions(log_ne, log_saha, mask)), jnp.exp(log_ne)
+
+    fractions, n_e = jnp.vectorize(single, signature="(),(n),(n)->(n,m),()")(
+        T_e, n_i, cl
+    )
+    return fractions, n_e * (1 / ureg.m**3)
+
+
+@partial(jax.jit, static_argnames=["element_list"])
+def solve_saha(
+    element_list: List[Element],
+    T_e: Quantity,
+    ion_number_densities: Quantity,
+    continuum_lowering: Quantity = 0 * ureg.electron_volt,
+) -> (Quantity, Quantity):
+    """
+    Solve the Saha equation for a list of elements at a given temperature.
 
-    #. Finding the number densities for all ionization levels by solving the
-       remaining set of equations by stripping the last row and column of the
-       matrix, where the latter is the in-homogeneity of the set of
-       equations.
+    The equations are solved by :py:func:`~.saha_ionization_fractions`, and
+    the result is brought to the same layout as a many-ion Saha-solver like
+    Jamal El Kuweiss' `many-ion-saha-equation tool
+    <https://github.com/jelkuweiss/many-ion-saha-equation>`_.
 
     The ionization energies are taken from the provided
     :py:class:`jaxrts.element.Element`, but we allow for a modification in form
@@ -151,7 +308,7 @@ def solve_saha(
         A list of number densities for the individual ions. Has to have the
         same size as `element_list`.
     continuum_lowering: Quantity, default: 0 eV
-        A fixed value that is subtracted from all binding energies. Defaults to
+        A fixed value that is added to all binding energies. Defaults to
         0 eV.
 
     Returns
@@ -168,140 +325,44 @@ def solve_saha(
     jaxrts.saha.saha_equation
          Function used to calculate the Saha equation for two ionization
          degrees.
+    jaxrts.saha.saha_ionization_fractions
+         Function used to solve the equations, which also allows for batched
+         inputs.
     """
-
-    Z = [i.Z for i in element_list]
-
-    # Set up the empty matrix
-    M = jnp.zeros(
-        (
-            len(element_list) + int(onp.sum(Z)) + 1,
-            len(element_list) + int(onp.sum(Z)) + 1,
-        )
+    fractions, n_e = saha_ionization_fractions(
+        tuple(element_list), T_e, ion_number_densities, continuum_lowering
     )
+    densities = fractions * ion_number_densities[..., jnp.newaxis]
 
-    # Maximal electron number density per element, if fully ionized -> Sum up
-    # for maximal full electron number density
-    max_ne = jnpu.sum(
-        jnp.array([elem.Z for elem in element_list]) * ion_number_densities
+    Z = species_table(element_list).Z
+    flat_index = onp.flatnonzero(
+        onp.arange(fractions.shape[-1])[onp.newaxis, :] <= Z[:, onp.newaxis]
     )
+    densities = densities.reshape(*densities.shape[:-2], -1)
+    return densities[..., flat_index], n_e
 
-    # ne_scale = max_ne
-    # ne_scale = 1e0 / (1 * ureg.m**3)
-
-    # Interpolate between a small ne and the maximal ne, depending on the
-    # temperature to avoid numerical instabilities
-    _ne_range = jnp.array([1, max_ne.m_as(1 / ureg.m**3)])
-    ne_scale = jnp.interp(
-        (T_e * k_B).m_as(ureg.electron_volt),
-        jnp.array([5, 1000]),
-        _ne_range,
-        left=_ne_range[0],
-        right=_ne_range[-1],
-    ) * (1 / ureg.m**3)
-
-    # Offset (each element will have a block of size Z+1) This value specifies
-    # the block.
-    skip = 0
-    ionization_states = []
-
-    # Fill the matrix, without any entries containing n_e, the free electron
-    # number density (the Saha part does contain n_e, but implicitly).
-    # Note: The matrix is transposed, here. It will be transposed when n_e is
-    # inserted.
-    for ion_dens, element in zip(ion_number_densities, element_list):
-
-        stat_weight = element.ionization.statistical_weights
-        Eb = element.ionization.energies + continuum_lowering
-
-        # Don't allow negative binding energies.
-        Eb = jnpu.where(Eb < 0, 0, Eb)
-
-        coeff = (
-            saha_equation(
-                stat_weight[:-1],
-                stat_weight[1:],
-                T_e,
-                Eb,
-            )
-            / ne_scale
-        ).m_as(ureg.dimensionless)
-
-        diag = jnp.diag((-1) * coeff)
-        dens_row = jnp.ones((element.Z + 1))
-
-        # Set the diagonal for the Saha-rows
-        M = M.at[skip : skip + element.Z, skip : skip + element.Z].set(diag)
-        # Create ones for the density row.
-        M = M.at[skip : skip + element.Z + 1, skip + element.Z].set(dens_row)
-        # Set the last element of the density row to the ion number density
-        M = M.at[-1, skip + element.Z].set(
-            (ion_dens / ne_scale).m_as(ureg.dimensionless)
-        )
-
-        # Each element requires a block of Z+1 size.
-        skip += element.Z + 1
-
-        # This is for the final row, which lists all ionization states for the
-        # elements
-        ionization_states += list(jnp.arange(element.Z + 1))
-
-    # Set the row for all ionization states.
-    M = M.at[:-1, -1].set(jnp.array(ionization_states))
-
-    def insert_ne(M, ne):
-        """
-        Add n_e to the off-diagonal end the last entry (last row and column.
-        """
-
-        ne_line = jnp.ones(len(element_list) + int(onp.sum(Z))) * ne
-
-        skip = -1
-        for element in element_list:
-
-            # Not the full off-diagonal equals n_e: The density rows don't
-            # contain it!
-            ne_line = ne_line.at[skip + element.Z + 1].set(0.0)
-            skip += element.Z + 1
-
-        _diag = jnp.diag(ne_line, -1)
-        out = M + _diag
-        out = out.at[-1, -1].set(ne)
-        # Transpose
-        return out.T
-
-    def det_M(M, ne):
-        res = jnp.linalg.det(insert_ne(M, ne))
-        return res
-
-    # Find n_e by finding the root where the determinant of M is 0
-    # Use the bisection method, boundaries are fixed by max_ne and 0.
-    sol_ne, iterations = bisection(
-        jax.tree_util.Partial(lambda ne: det_M(M=M, ne=ne)),
-        0,
-        (max_ne / ne_scale).m_as(ureg.dimensionless),
-        tolerance=1e-2,
-        max_iter=1e2,
-        min_iter=0,
-    )
 
-    # jax.debug.print("Needed iterations for convergence: {x}", x=iterations)
-
-    # Create the matrix that describes the linear system of equations we solve.
-    # Insert n_e.
-    concrete_M = insert_ne(M, sol_ne)
-
-    # Strip the last row and column. Use the latter as inhomogeneity.
-    M1 = concrete_M[: (len(concrete_M[0]) - 1), 0 : (len(concrete_M[0]) - 1)]
-    M2 = concrete_M[: (len(concrete_M[0]) - 1), (len(concrete_M[0]) - 1)]
-
-    # Get the solution of the set of linear equations of the form
-    # (nIon0_0+,nIon0_1+, ..., nIon1_0+,nIon1_1+, ...)
-    ionised_number_densities = jnp.linalg.solve(M1, M2)
+@partial(jax.jit, static_argnames=["element_list"])
+def mean_free_charge_saha(
+    element_list: tuple[Element],
+    T_e: Quantity,
+    ion_number_densities: Quantity,
+    continuum_lowering: Quantity = 0 * ureg.electron_volt,
+) -> jnp.ndarray:
+    """
+    The mean ionization of every element in Saha equilibrium. See
+    :py:func:`~.saha_ionization_fractions` for the meaning of the arguments,
+    which can also be batched.
 
-    # Rescale the dimensionless number densities so that units are
-    # 1/[length]**3.
-    return ionised_number_densities * ne_scale, sol_ne * ne_scale
+    Returns
+    -------
+    jnp.ndarray
+        The mean ionization, shape ``(..., len(element_list))``.
+    """
+    fractions, _ = saha_ionization_fractions(
+        tuple(element_list), T_e, ion_number_densities, continuum_lowering
+    )
+    return jnp.sum(fractions * jnp.arange(fractions.shape[-1]), axis=-1)
 
 
 def calculate_mean_free_charge_saha(plasma_state, ipd=True):
@@ -309,56 +370,190 @@ def calculate_mean_free_charge_saha(plasma_state, ipd=True):
     Calculates the mean charge of each ion in a plasma using the Saha-Boltzmann
     equation.
 
+    If a :py:class:`jaxrts.plasmastate.PlasmaStateBatch` is given, all states
+    of the batch are solved in a single, vectorized call.
+
     Parameters
     ----------
-    plasma_state : PlasmaState
+    plasma_state : PlasmaState | PlasmaStateBatch
         The plasma state object.
     ipd : bool
         If true, the ipd correction of the plasma state is used to reduce the
         continuum. Note: the IPD can very much depend on the ionization state.
-        this could result in some circular dependency.
+        this could result in some circular dependency. Use
+        :py:func:`~.solve_saha_ipd` to find a self-consistent solution.
 
     Returns
     -------
     jnp.ndarray
-        An array containing the mean charge of each ion in the plasma.
+        An array containing the mean charge of each ion in the plasma. For a
+        batch, the shape is ``(len(batch), nions)``.
 
     See Also
     --------
-    jaxrts.saha.solve_saha
+    jaxrts.saha.mean_free_charge_saha
         Function used to solve the saha equation
+    jaxrts.saha.solve_saha_ipd
+        Self-consistent solution of the Saha equation and the IPD.
     """
+    if isinstance(plasma_state, PlasmaStateBatch):
+        return plasma_state._map(
+            partial(calculate_mean_free_charge_saha, ipd=ipd), None
+        )
 
     if ipd:
         cl = jnpu.mean(plasma_state["ipd"].evaluate(plasma_state, None))
         cl = jnpu.where(jnp.isnan(cl.magnitude), 0 * ureg.electron_volt, cl)
     else:
         cl = 0 * ureg.electron_volt
-    sol, _ = solve_saha(
+    return mean_free_charge_saha(
         tuple(plasma_state.ions),
         plasma_state.T_e,
         (plasma_state.mass_density / plasma_state.atomic_masses),
         continuum_lowering=cl,
     )
-    sol = sol.m_as(1 / ureg.cc)
 
-    indices = jnp.cumsum(
-        jnp.array([0] + list([ion.Z + 1 for ion in plasma_state.ions]))
+
+def _anderson_step(xs, gs, ridge):
+    """
+    Anderson mixing of the last iterates ``xs`` and their images under the
+    fixed-point map, ``gs``. Both have the shape ``(history, n)``. The weights
+    minimize the norm of the combined residual, under the constraint that
+    they sum to one (see :cite:`Walker.2011`).
+    """
+    fs = gs - xs
+    m = fs.shape[0]
+    H = fs @ fs.T
+    H = H + ridge * (jnp.trace(H) / m + 1e-30) * jnp.eye(m)
+    A = jnp.block(
+        [
+            [jnp.zeros((1, 1)), jnp.ones((1, m))],
+            [jnp.ones((m, 1)), H],
+        ]
     )
-    Z_total = []
-    Z_free = []
-    for i in range(len(indices) - 1):
-        idx = jnp.arange(len(sol))
-        relevant_part = jnp.where(
-            (idx >= indices[i]) & (idx < indices[i + 1]), sol, 0
-        )
-        ionizations = jnp.where(
-            (idx >= indices[i]) & (idx < indices[i + 1]),
-            jnp.arange(len(sol)) - indices[i],
-            0,
+    b = jnp.zeros(m + 1).at[0].set(1.0)
+    alpha = jnp.linalg.solve(A, b)[1:]
+    return alpha @ gs
+
+
+@partial(jax.jit, static_argnames=["max_iter", "history"])
+def solve_saha_ipd(
+    plasma_state,
+    tol: float = 1e-8,
+    max_iter: int = 100,
+    history: int = 3,
+) -> tuple[jnp.ndarray, Quantity, jnp.ndarray]:
+    """
+    Find the ionization, which is consistent with the Saha equation and the
+    ionization potential depression (IPD) of ``plasma_state["ipd"]``.
+
+    The IPD depends on the ionization, which in turn depends on the IPD. Hence,
+    the mean ionization :math:`\\bar{Z}` is a fixed point of the map
+    :math:`\\bar{Z} \\mapsto \\bar{Z}_\\text{Saha}(\\text{IPD}(\\bar{Z}))`. It
+    is found by an Anderson-accelerated fixed-point iteration, starting at
+    ``plasma_state.Z_free``. Every ion species is lowered by its own IPD.
+
+    The solution is differentiated implicitly (see
+    :py:func:`jax.lax.custom_root`), i.e., gradients with respect to the
+    parameters of ``plasma_state`` do not propagate through the iterations.
+    If a :py:class:`jaxrts.plasmastate.PlasmaStateBatch` is given, all states
+    of the batch are solved at once.
+
+    Parameters
+    ----------
+    plasma_state : PlasmaState | PlasmaStateBatch
+        The plasma state object. The ``"ipd"`` model can be any of the models
+        for this key.
+    tol : float
+        The iteration stops if no mean ionization changes by more than
+        ``tol`` in one step.
+    max_iter : int
+        The maximal number of fixed-point iterations.
+    history : int
+        The number of previous iterates used for the Anderson acceleration.
+        For ``history=1``, this is a plain fixed-point iteration.
+
+    Returns
+    -------
+    jnp.ndarray
+        The self-consistent mean ionization of every ion species.
+    Quantity
+        The IPD of every ion species at this ionization.
+    jnp.ndarray
+        The number of iterations needed. If it is equal to ``max_iter``, the
+        iteration did not converge.
+
+    See Also
+    --------
+    jaxrts.saha.calculate_mean_free_charge_saha
+        The Saha ionization for an IPD at a fixed ionization.
+    """
+    if isinstance(plasma_state, PlasmaStateBatch):
+        return plasma_state._map(
+            partial(
+                solve_saha_ipd, tol=tol, max_iter=max_iter, history=history
+            ),
+            None,
         )
-        Z_total.append(jnp.sum(relevant_part))
-        Z_free.append(jnp.sum(relevant_part / Z_total[i] * ionizations))
-    Z_free = jnp.array(Z_free)
 
-    return Z_free
+    children, aux_data = plasma_state._tree_flatten()
+    ions = tuple(plasma_state.ions)
+    n_i = plasma_state.mass_density / plasma_state.atomic_masses
+    Z_A = jnp.asarray(plasma_state.Z_A, dtype=float)
+
+    def saha_map(Z):
+        state = plasma_state._tree_unflatten(aux_data, (Z, *children[1:]))
+        ipd = (state["ipd"].evaluate(state, None) * jnp.ones(len(ions))).m_as(
+            ureg.electron_volt
+        )
+        ipd = jnp.where(jnp.isnan(ipd), 0.0, ipd)
+        Z_new = mean_free_charge_saha(
+            ions,
+            plasma_state.T_e,
+            n_i,
+            continuum_lowering=ipd * ureg.electron_volt,
+        )
+        return Z_new, ipd
+
+    def solve(f, Z0):
+        def g(Z):
+            return f(Z) + Z
+
+        def condition(val):
+            _, _, step, i = val
+            return (step > tol) & (i < max_iter)
+
+        def iteration(val):
+            xs, gs, _, i = val
+            Z = jnp.clip(_anderson_step(xs, gs, 1e-10), 0.0, Z_A)
+            g_Z = g(Z)
+            xs = jnp.roll(xs, -1, axis=0).at[-1].set(Z)
+            gs = jnp.roll(gs, -1, axis=0).at[-1].set(g_Z)
+            return xs, gs, jnp.max(jnp.abs(g_Z - Z)), i + 1
+
+        g0 = g(Z0)
+        xs, gs, _, n_iter = jax.lax.while_loop(
+            condition,
+            iteration,
+            (
+                jnp.repeat(Z0[jnp.newaxis, :], history, axis=0),
+                jnp.repeat(g0[jnp.newaxis, :], history, axis=0),
+                jnp.max(jnp.abs(g0 - Z0)),
+                1,
+            ),
+        )
+        # Integer auxiliary outputs are not supported by the JVP rule of
+        # custom_root.
+        return xs[-1], jnp.asarray(n_iter, dtype=float)
+
+    Z, n_iter = jax.lax.custom_root(
+        lambda Z: saha_map(Z)[0] - Z,
+        jnp.clip(to_array(plasma_state.Z_free), 0.0, Z_A),
+        solve,
+        lambda g, y: jnp.linalg.solve(jax.jacobian(g)(y), y),
+        has_aux=True,
+    )
+    n_iter = jax.lax.stop_gradient(n_iter).astype(int)
+    instrumentation.count("Saha-IPD iterations", n_iter)
+    _, ipd = saha_map(Z)
+    return Z, ipd * ureg.electron_volt, n_iter
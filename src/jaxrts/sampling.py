@@ -0,0 +1,822 @@
+"""
+This submodule samples the posterior distribution of the parameters of a
+:py:class:`jaxrts.plasmastate.PlasmaState`, given a measured spectrum, with
+Hamiltonian Monte Carlo (HMC) :cite:`Neal.2011`.
+
+The free parameters are the :py:class:`jaxrts.fitting.Parameter` objects
+which are also used for fitting. The chains move in the unbounded internal
+representation of the parameters, and the prior is uniform within the bounds
+of the physical parameters. The gradients of the log posterior, which guide
+the trajectories, are obtained by differentiating through
+:py:meth:`~jaxrts.plasmastate.PlasmaState.probe`.
+
+- Multiple chains are run simultaneously with :py:func:`jax.vmap`. If a
+  mesh (see :py:func:`jaxrts.sharding.device_mesh`) is given, the chains are
+  distributed over its batch axis.
+- During the warmup, the step size is adapted by dual averaging
+  :cite:`Hoffman.2014`, and a diagonal mass matrix is estimated from the
+  positions of every chain.
+- The state of the chains can be written to a checkpoint file regularly, so
+  that interrupted runs can be resumed.
+- Optionally, the trajectories are integrated with the gradients of a
+  cheaper surrogate (e.g., the plasma state with faster models), and only
+  the acceptance step evaluates the full model :cite:`Zhang.2017`. As the
+  leapfrog integrator is reversible and volume-preserving for any potential,
+  the chains still sample the posterior of the full model. A poor surrogate
+  only lowers the acceptance rate.
+
+The building blocks :py:func:`~.init_state`, :py:func:`~.hmc_step`,
+:py:func:`~.warmup` and :py:func:`~.sample_chain` work with any log density
+and can be used, e.g., to sample a posterior which combines multiple spectra.
+
+Examples
+--------
+>>> parameters = (
+>>>     jaxrts.fitting.Parameter(("T_e", "T_i"), 1, 100, unit="eV/k_B"),
+>>>     jaxrts.fitting.Parameter("Z_free", 0, 6, index=0),
+>>> )
+>>> result = jaxrts.sampling.sample(
+>>>     state, setup, data, parameters, sigma=0.02, checkpoint="chains.npz"
+>>> )
+>>> print(result)
+"""
+
+import logging
+import os
+from functools import partial
+from pathlib import Path
+
+import jax
+import jax.numpy as jnp
+import numpy as onp
+from jax.sharding import Mesh, NamedSharding
+from jax.sharding import PartitionSpec as P
+
+from . import fitting
+from .fitting import Parameter
+from .plasmastate import PlasmaState
+from .setup import Setup
+from .sharding import batch_axis
+from .units import Quantity
+
+logger = logging.getLogger(__name__)
+
+
+def log_prior(parameters: tuple[Parameter], u: jnp.ndarray) -> jnp.ndarray:
+    """
+    The logarithm of a prior which is uniform in the physical parameters
+    (within their bounds), expressed in the internal parameters ``u``.
+    """
+    return sum(p.log_jacobian(u[i]) for i, p in enumerate(parameters))
+
+
+def log_posterior(
+    u: jnp.ndarray,
+    parameters: tuple[Parameter],
+    plasma_state: PlasmaState,
+    setup: Setup,
+    data: jnp.ndarray,
+    sigma: jnp.ndarray | float = 1.0,
+    free_amplitude: bool = True,
+) -> jnp.ndarray:
+    """
+    The (unnormalized) logarithm of the posterior of the internal parameters
+    ``u``, i.e., :math:`-\\chi^2 / 2` (see :py:func:`jaxrts.fitting.loss`)
+    plus the :py:func:`~.log_prior`.
+
+    If ``free_amplitude`` is ``True``, the amplitude of the spectrum is not
+    sampled, but set to its best value for every ``u``. See
+    :py:func:`jaxrts.fitting.residuals` for the arguments.
+    """
+    chi2 = fitting.loss(
+        u, parameters, plasma_state, setup, data, sigma, free_amplitude
+    )
+    return -0.5 * chi2 + log_prior(parameters, u)
+
+
+def init_state(u: jnp.ndarray, logdensity, surrogate=None) -> tuple:
+    """
+    The state of a chain at position ``u``.
+
+    Parameters
+    ----------
+    u: jnp.ndarray
+        The position of the chain.
+    logdensity: Callable
+        The logarithm of the density to sample.
+    surrogate: Callable | None
+        The logarithm of the surrogate density, which guides the
+        trajectories. If ``None``, ``logdensity`` is used.
+
+    Returns
+    -------
+    tuple
+        The position, the value of ``logdensity`` and the gradient of the
+        density guiding the trajectories, at ``u``.
+    """
+    if surrogate is None:
+        logp, grad = jax.value_and_grad(logdensity)(u)
+    else:
+        logp = logdensity(u)
+        grad = jax.grad(surrogate)(u)
+    return u, logp, grad
+
+
+def hmc_step(
+    key: jax.Array,
+    state: tuple,
+    logdensity,
+    step_size: float,
+    inverse_mass: jnp.ndarray,
+    n_leapfrog: int,
+    surrogate=None,
+) -> tuple[tuple, jnp.ndarray]:
+    """
+    A single HMC transition. The step size is jittered by up to 20% to avoid
+    periodic trajectories.
+
+    Parameters
+    ----------
+    key: jax.Array
+        The random key.
+    state: tuple
+        The state of the chain, see :py:func:`~.init_state`.
+    logdensity: Callable
+        The logarithm of the density to sample.
+    step_size: float
+        The step size of the leapfrog integrator.
+    inverse_mass: jnp.ndarray
+        The diagonal of the inverse mass matrix.
+    n_leapfrog: int
+        The number of leapfrog steps per trajectory.
+    surrogate: Callable | None
+        The logarithm of the surrogate density, whose gradients guide the
+        trajectory. The acceptance step uses ``logdensity``.
+
+    Returns
+    -------
+    tuple
+        The new state of the chain.
+    jnp.ndarray
+        The acceptance probability of the proposal.
+    """
+    u, logp, grad = state
+    key_p, key_eps, key_accept = jax.random.split(key, 3)
+    p = jax.random.normal(key_p, u.shape) / jnp.sqrt(inverse_mass)
+    eps = step_size * jax.random.uniform(key_eps, minval=0.8, maxval=1.2)
+    value_and_grad = jax.value_and_grad(
+        logdensity if surrogate is None else surrogate
+    )
+
+    def leapfrog(_, val):
+        u, p, _, grad = val
+        p = p + 0.5 * eps * grad
+        u = u + eps * inverse_mass * p
+        value, grad = value_and_grad(u)
+        p = p + 0.5 * eps * grad
+        return u, p, value, grad
+
+    u_new, p_new, logp_new, grad_new = jax.lax.fori_loop(
+        0, n_leapfrog, leapfrog, (u, p, logp, grad)
+    )
+    if surrogate is not None:
+        logp_new = logdensity(u_new)
+
+    def kinetic(p):
+        return 0.5 * jnp.sum(inverse_mass * p**2)
+
+    log_ratio = logp_new - kinetic(p_new) - logp + kinetic(p)
+    # Diverging trajectories (NaN or -inf) are always rejected
+    accept_prob = jnp.where(
+        jnp.isnan(log_ratio), 0.0, jnp.minimum(1.0, jnp.exp(log_ratio))
+    )
+    accept = jax.random.uniform(key_accept) < accept_prob
+    new_state = jax.tree_util.tree_map(
+        lambda new, old: jnp.where(accept, new, old),
+        (u_new, logp_new, grad_new),
+        state,
+    )
+    return new_state, accept_prob
+
+
+def _dual_averaging(
+    carry: tuple, accept_prob: jnp.ndarray, target: float
+) -> tuple:
+    """
+    One update of the dual averaging of the logarithm of the step size,
+    following :cite:`Hoffman.2014`.
+    """
+    log_eps, log_eps_bar, h_bar, t, mu = carry
+    gamma, t0, kappa = 0.05, 10.0, 0.75
+    t = t + 1
+    h_bar = (1 - 1 / (t + t0)) * h_bar + (target - accept_prob) / (t + t0)
+    log_eps = mu - jnp.sqrt(t) / gamma * h_bar
+    eta = t ** (-kappa)
+    log_eps_bar = eta * log_eps + (1 - eta) * log_eps_bar
+    return log_eps, log_eps_bar, h_bar, t, mu
+
+
+def _adapt_step_size(
+    key,
+    state,
+    logdensity,
+    step_size,
+    inverse_mass,
+    n_steps,
+    n_leapfrog,
+    target_accept,
+    surrogate,
+):
+    log_eps0 = jnp.log(step_size)
+    carry = (log_eps0, log_eps0, 0.0, 0.0, jnp.log(10 * step_size))
+
+    def step(val, i):
+        state, carry = val
+        state, accept_prob = hmc_step(
+            jax.random.fold_in(key, i),
+            state,
+            logdensity,
+            jnp.exp(carry[0]),
+            inverse_mass,
+            n_leapfrog,
+            surrogate,
+        )
+        carry = _dual_averaging(carry, accept_prob, target_accept)
+        return (state, carry), state[0]
+
+    (state, carry), positions = jax.lax.scan(
+        step, (state, carry), jnp.arange(n_steps)
+    )
+    return state, jnp.exp(carry[1]), positions
+
+
+def warmup(
+    key: jax.Array,
+    state: tuple,
+    logdensity,
+    n_warmup: int,
+    n_leapfrog: int,
+    target_accept: float = 0.8,
+    surrogate=None,
+    step_size: float = 0.1,
+) -> tuple[tuple, jnp.ndarray, jnp.ndarray]:
+    """
+    Adapt the step size and the diagonal inverse mass matrix of a chain.
+
+    In the first half of the warmup, the step size is adapted with a unit
+    mass matrix. The inverse mass matrix is then set to the (regularized)
+    variance of the positions in the second quarter, and the step size is
+    adapted once more in the second half.
+
+    Parameters
+    ----------
+    key: jax.Array
+        The random key.
+    state: tuple
+        The initial state of the chain, see :py:func:`~.init_state`.
+    logdensity: Callable
+        The logarithm of the density to sample.
+    n_warmup: int
+        The number of warmup steps.
+    n_leapfrog: int
+        The number of leapfrog steps per trajectory.
+    target_accept: float
+        The targeted mean acceptance probability.
+    surrogate: Callable | None
+        The logarithm of the surrogate density, see :py:func:`~.hmc_step`.
+    step_size: float
+        The initial step size.
+
+    Returns
+    -------
+    tuple
+        The state of the chain after the warmup.
+    jnp.ndarray
+        The adapted step size.
+    jnp.ndarray
+        The adapted diagonal of the inverse mass matrix.
+    """
+    n_first = n_warmup // 2
+    inverse_mass = jnp.ones_like(state[0])
+    key_first, key_second = jax.random.split(key)
+    state, step_size, positions = _adapt_step_size(
+        key_first,
+        state,
+        logdensity,
+        step_size,
+        inverse_mass,
+        n_first,
+        n_leapfrog,
+        target_accept,
+        surrogate,
+    )
+    n = n_first - n_first // 2
+    if n >= 2:
+        # Regularize the variance towards a small value, see the Stan
+        # reference manual.
+        var = jnp.var(positions[n_first // 2 :], axis=0, ddof=1)
+        inverse_mass = n / (n + 5) * var + 1e-3 * 5 / (n + 5)
+    state, step_size, _ = _adapt_step_size(
+        key_second,
+        state,
+        logdensity,
+        step_size,
+        inverse_mass,
+        n_warmup - n_first,
+        n_leapfrog,
+        target_accept,
+        surrogate,
+    )
+    return state, step_size, inverse_mass
+
+
+def sample_chain(
+    key: jax.Array,
+    state: tuple,
+    logdensity,
+    step_size: float,
+    inverse_mass: jnp.ndarray,
+    n_leapfrog: int,
+    n_samples: int,
+    first: int = 0,
+    surrogate=None,
+) -> tuple[tuple, tuple[jnp.ndarray, jnp.ndarray]]:
+    """
+    Draw ``n_samples`` samples with :py:func:`~.hmc_step`.
+
+    The random key of the :math:`i`-th sample is ``fold_in(key, i)``, where
+    the samples are counted from ``first``. Hence, a chain which is sampled
+    in multiple blocks gives the same samples as a chain sampled at once.
+
+    Returns
+    -------
+    tuple
+        The final state of the chain.
+    tuple[jnp.ndarray, jnp.ndarray]
+        The positions, of shape ``(n_samples, n)``, and the acceptance
+        probabilities of all steps.
+    """
+
+    def step(state, i):
+        state, accept_prob = hmc_step(
+            jax.random.fold_in(key, i),
+            state,
+            logdensity,
+            step_size,
+            inverse_mass,
+            n_leapfrog,
+            surrogate,
+        )
+        return state, (state[0], accept_prob)
+
+    return jax.lax.scan(step, state, first + jnp.arange(n_samples))
+
+
+def _log_densities(
+    parameters, plasma_state, setup, data, sigma, free_amplitude, surrogate
+):
+    logdensity = partial(
+        log_posterior,
+        parameters=parameters,
+        plasma_state=plasma_state,
+        setup=setup,
+        data=data,
+        sigma=sigma,
+        free_amplitude=free_amplitude,
+    )
+    if surrogate is None:
+        return logdensity, None
+    return logdensity, partial(logdensity, plasma_state=surrogate)
+
+
+@partial(
+    jax.jit,
+    static_argnames=["parameters", "free_amplitude", "n_warmup", "n_leapfrog"],
+)
+def _warmup(
+    keys,
+    u0,
+    step_size,
+    target_accept,
+    parameters,
+    plasma_state,
+    setup,
+    data,
+    sigma,
+    free_amplitude,
+    surrogate,
+    n_warmup,
+    n_leapfrog,
+):
+    logdensity, guide = _log_densities(
+        parameters, plasma_state, setup, data, sigma, free_amplitude, surrogate
+    )
+
+    def chain(key, u0):
+        state = init_state(u0, logdensity, guide)
+        return warmup(
+            key,
+            state,
+            logdensity,
+            n_warmup,
+            n_leapfrog,
+            target_accept,
+            guide,
+            step_size,
+        )
+
+    return jax.vmap(chain)(keys, u0)
+
+
+@partial(
+    jax.jit,
+    static_argnames=[
+        "parameters",
+        "free_amplitude",
+        "n_leapfrog",
+        "n_samples",
+    ],
+)
+def _sample(
+    keys,
+    states,
+    step_size,
+    inverse_mass,
+    first,
+    parameters,
+    plasma_state,
+    setup,
+    data,
+    sigma,
+    free_amplitude,
+    surrogate,
+    n_leapfrog,
+    n_samples,
+):
+    logdensity, guide = _log_densities(
+        parameters, plasma_state, setup, data, sigma, free_amplitude, surrogate
+    )
+
+    def chain(key, state, step_size, inverse_mass):
+        return sample_chain(
+            key,
+            state,
+            logdensity,
+            step_size,
+            inverse_mass,
+            n_leapfrog,
+            n_samples,
+            first,
+            guide,
+        )
+
+    return jax.vmap(chain)(keys, states, step_size, inverse_mass)
+
+
+def _save_checkpoint(path: Path, **arrays) -> None:
+    """
+    Write ``arrays`` to ``path``. The file is replaced atomically, so that an
+    interruption cannot corrupt an existing checkpoint.
+    """
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        onp.savez(f, **{k: onp.asarray(v) for k, v in arrays.items()})
+    os.replace(tmp, path)
+
+
+def _load_checkpoint(
+    path: Path, parameters: tuple[Parameter], n_chains: int
+) -> dict:
+    with onp.load(path) as f:
+        saved = {k: f[k] for k in f.files}
+    labels = [p.label for p in parameters]
+    if list(saved["labels"]) != labels:
+        raise ValueError(
+            f"The checkpoint {path} was written for the parameters "
+            + f"{list(saved['labels'])}, not {labels}."
+        )
+    if saved["u"].shape[0] != n_chains:
+        raise ValueError(
+            f"The checkpoint {path} contains {saved['u'].shape[0]} chains, "
+            + f"not {n_chains}."
+        )
+    return saved
+
+
+class SamplingResult:
+    """
+    The result of :py:func:`~.sample`.
+    """
+
+    def __init__(
+        self,
+        parameters: tuple[Parameter],
+        samples: jnp.ndarray,
+        acceptance: jnp.ndarray,
+        step_size: jnp.ndarray,
+        inverse_mass: jnp.ndarray,
+    ) -> None:
+        #: The sampled parameters.
+        self.parameters = parameters
+        #: The samples of the parameters, in their units, with the shape
+        #: ``(n_chains, n_samples, len(parameters))``.
+        self.samples = samples
+        #: The acceptance probability of every step, with the shape
+        #: ``(n_chains, n_samples)``.
+        self.acceptance = acceptance
+        #: The adapted step size of every chain.
+        self.step_size = step_size
+        #: The adapted diagonal inverse mass matrix of every chain (in the
+        #: internal parameters).
+        self.inverse_mass = inverse_mass
+
+    @property
+    def flat_samples(self) -> jnp.ndarray:
+        """
+        The samples of all chains, with the shape
+        ``(n_chains * n_samples, len(parameters))``.
+        """
+        return self.samples.reshape(-1, self.samples.shape[-1])
+
+    @property
+    def mean(self) -> jnp.ndarray:
+        return jnp.mean(self.flat_samples, axis=0)
+
+    @property
+    def std(self) -> jnp.ndarray:
+        return jnp.std(self.flat_samples, axis=0, ddof=1)
+
+    @property
+    def acceptance_rate(self) -> jnp.ndarray:
+        """
+        The mean acceptance probability of every chain.
+        """
+        return jnp.mean(self.acceptance, axis=1)
+
+    def _split_chains(self) -> onp.ndarray:
+        # Split every chain in two halves, with the shape
+        # (len(parameters), 2 * n_chains, n_samples // 2).
+        samples = onp.moveaxis(onp.asarray(self.samples), -1, 0)
+        n = samples.shape[-1] // 2
+        samples = samples[:, :, : 2 * n]
+        return onp.concatenate([samples[:, :, :n], samples[:, :, n:]], axis=1)
+
+    @property
+    def r_hat(self) -> jnp.ndarray:
+        """
+        The split :math:`\\hat{R}` of every parameter :cite:`Vehtari.2021`.
+        Values close to 1 indicate that the chains have converged.
+        """
+        x = self._split_chains()
+        n = x.shape[-1]
+        W = onp.mean(onp.var(x, axis=-1, ddof=1), axis=-1)
+        B = n * onp.var(onp.mean(x, axis=-1), axis=-1, ddof=1)
+        var_plus = (n - 1) / n * W + B / n
+        return jnp.asarray(onp.sqrt(var_plus / W))
+
+    @property
+    def effective_sample_size(self) -> jnp.ndarray:
+        """
+        The effective sample size of every parameter, estimated from the
+        autocorrelation of the (split) chains :cite:`Vehtari.2021`.
+        """
+        x = self._split_chains()
+        m, n = x.shape[1:]
+        x = x - onp.mean(x, axis=-1, keepdims=True)
+        f = onp.fft.rfft(x, n=2 * n, axis=-1)
+        autocov = onp.fft.irfft(f * onp.conj(f), axis=-1)[..., :n] / n
+        ess = []
+        for i in range(x.shape[0]):
+            W = onp.mean(autocov[i, :, 0]) * n / (n - 1)
+            var_plus = (n - 1) / n * W + onp.var(
+                onp.mean(x[i], axis=-1), ddof=1
+            )
+            rho = 1 - (W - onp.mean(autocov[i], axis=0)) / var_plus
+            rho[0] = 1
+            # Sum pairs of autocorrelations, until they become negative
+            pairs = rho[: n - n % 2 : 2] + rho[1 : n - n % 2 : 2]
+            negative = onp.nonzero(pairs < 0)[0]
+            k = negative[0] if len(negative) > 0 else len(pairs)
+            tau = max(-1 + 2 * onp.sum(pairs[:k]), 1 / onp.log10(m * n))
+            ess.append(m * n / tau)
+        return jnp.asarray(ess)
+
+    def as_dict(self) -> dict[str, tuple[float, float]]:
+        """
+        Map the labels of the parameters to their posterior means and
+        standard deviations.
+        """
+        return {
+            p.label: (float(v), float(e))
+            for p, v, e in zip(self.parameters, self.mean, self.std)
+        }
+
+    def __str__(self) -> str:
+        lines = [
+            f"{p.label}: {v:g} ± {e:g} {p.unit or ''}".rstrip()
+            + f" (R_hat {r:.3f}, ESS {n:.0f})"
+            for p, v, e, r, n in zip(
+                self.parameters,
+                self.mean,
+                self.std,
+                self.r_hat,
+                self.effective_sample_size,
+            )
+        ]
+        lines.append(f"acceptance rate: {jnp.mean(self.acceptance):.3f}")
+        return "\n".join(lines)
+
+
+def sample(
+    plasma_state: PlasmaState,
+    setup: Setup,
+    data: jnp.ndarray | Quantity,
+    parameters: tuple[Parameter],
+    sigma: jnp.ndarray | float = 1.0,
+    n_samples: int = 1000,
+    n_warmup: int = 500,
+    n_chains: int = 4,
+    initial: jnp.ndarray | None = None,
+    free_amplitude: bool = True,
+    surrogate: PlasmaState | None = None,
+    n_leapfrog: int = 10,
+    step_size: float = 0.1,
+    target_accept: float = 0.8,
+    seed: int = 0,
+    checkpoint: str | Path | None = None,
+    checkpoint_every: int = 100,
+    mesh: Mesh | None = None,
+) -> SamplingResult:
+    """
+    Sample the posterior of the ``parameters`` of ``plasma_state``, given the
+    measured spectrum ``data``.
+
+    Parameters
+    ----------
+    plasma_state: PlasmaState
+        The plasma state, defining the models and all fixed parameters.
+    setup: Setup
+        The setup of the measurement.
+    data: jnp.ndarray | Quantity
+        The measured spectrum, on the :py:attr:`~.Setup.measured_energy`.
+    parameters: tuple[Parameter]
+        The sampled parameters.
+    sigma: jnp.ndarray | float
+        The uncertainty of ``data``. Contrary to
+        :py:func:`jaxrts.fitting.fit`, it is not estimated from the data, as
+        it defines the width of the posterior.
+    n_samples: int
+        The number of samples per chain, after the warmup.
+    n_warmup: int
+        The number of warmup steps per chain, see :py:func:`~.warmup`.
+    n_chains: int
+        The number of chains, which are run simultaneously.
+    initial: jnp.ndarray | None
+        The starting values of the parameters, in their units. Either of
+        shape ``(n_chains, len(parameters))``, or ``(len(parameters),)``, in
+        which case the chains start at small random perturbations of it
+        (e.g., the result of :py:func:`jaxrts.fitting.fit`). If ``None``, the
+        values of ``plasma_state`` are used.
+    free_amplitude: bool
+        If ``True``, the data can have arbitrary units, and the amplitude of
+        the calculated spectrum is set to its best value (see
+        :py:func:`~.log_posterior`).
+    surrogate: PlasmaState | None
+        A plasma state with cheaper models, whose gradients guide the
+        trajectories. Only the acceptance step evaluates ``plasma_state``,
+        so that the cost per sample is ``n_leapfrog`` gradients of the
+        surrogate and one evaluation of the full model.
+    n_leapfrog: int
+        The number of leapfrog steps per trajectory.
+    step_size: float
+        The initial step size, in the internal parameters.
+    target_accept: float
+        The mean acceptance probability targeted during the warmup.
+    seed: int
+        The seed of the random numbers.
+    checkpoint: str | Path | None
+        If not ``None``, the state of the chains is written to this file
+        after the warmup and every ``checkpoint_every`` samples. If the file
+        exists, the chains are resumed from it (with the seed of the
+        interrupted run) and only the remaining samples are drawn. The other
+        arguments should not be changed, except ``n_samples``.
+    checkpoint_every: int
+        The number of samples between two checkpoints.
+    mesh: Mesh | None
+        If given, the chains are distributed over the
+        :py:data:`jaxrts.sharding.batch_axis` of the mesh.
+
+    Returns
+    -------
+    SamplingResult
+        The samples and diagnostics of the chains.
+    """
+    parameters = tuple(parameters)
+    n = len(parameters)
+    checkpoint = None if checkpoint is None else Path(checkpoint)
+    if mesh is not None and n_chains % mesh.shape[batch_axis] != 0:
+        raise ValueError(
+            f"Cannot distribute {n_chains} chains over "
+            + f"{mesh.shape[batch_axis]} devices."
+        )
+
+    def distribute(x):
+        if mesh is None:
+            return x
+        return jax.device_put(x, NamedSharding(mesh, P(batch_axis)))
+
+    args = (parameters, plasma_state, setup, data, sigma, free_amplitude)
+    if checkpoint is not None and checkpoint.exists():
+        saved = _load_checkpoint(checkpoint, parameters, n_chains)
+        seed = int(saved["seed"])
+        states = tuple(
+            distribute(jnp.asarray(saved[k])) for k in ["u", "logp", "grad"]
+        )
+        step_size = distribute(jnp.asarray(saved["step_size"]))
+        inverse_mass = distribute(jnp.asarray(saved["inverse_mass"]))
+        samples = jnp.asarray(saved["samples"])
+        acceptance = jnp.asarray(saved["acceptance"])
+        logger.info(
+            f"Resuming {n_chains} chains from {checkpoint} after "
+            + f"{samples.shape[1]} samples."
+        )
+    else:
+        key = jax.random.fold_in(jax.random.PRNGKey(seed), 0)
+        if initial is None:
+            initial = jnp.array([p.get(plasma_state) for p in parameters])
+        initial = jnp.asarray(initial, dtype=float)
+        u0 = fitting.to_internal(parameters, initial)
+        if u0.ndim == 1:
+            u0 = u0 + 0.1 * jax.random.normal(key, (n_chains, n))
+        if not jnp.all(jnp.isfinite(u0)):
+            raise ValueError(
+                "All starting values have to be within the bounds."
+            )
+        states, step_size, inverse_mass = _warmup(
+            distribute(jax.random.split(jax.random.fold_in(key, 1), n_chains)),
+            distribute(u0),
+            step_size,
+            target_accept,
+            *args,
+            surrogate,
+            n_warmup,
+            n_leapfrog,
+        )
+        samples = jnp.zeros((n_chains, 0, n))
+        acceptance = jnp.zeros((n_chains, 0))
+        logger.info(
+            f"Finished the warmup of {n_chains} chains, step sizes: "
+            + f"{step_size}."
+        )
+
+    def save():
+        if checkpoint is None:
+            return
+        _save_checkpoint(
+            checkpoint,
+            labels=onp.array([p.label for p in parameters]),
+            seed=seed,
+            u=states[0],
+            logp=states[1],
+            grad=states[2],
+            step_size=step_size,
+            inverse_mass=inverse_mass,
+            samples=samples,
+            acceptance=acceptance,
+        )
+
+    save()
+    keys = distribute(
+        jax.random.split(
+            jax.random.fold_in(jax.random.PRNGKey(seed), 2), n_chains
+        )
+    )
+    block = n_samples if checkpoint is None else checkpoint_every
+    while samples.shape[1] < n_samples:
+        n_block = min(block, n_samples - samples.shape[1])
+        states, (u, accept_prob) = _sample(
+            keys,
+            states,
+            step_size,
+            inverse_mass,
+            samples.shape[1],
+            *args,
+            surrogate,
+            n_leapfrog,
+            n_block,
+        )
+        samples = jnp.concatenate([samples, u], axis=1)
+        acceptance = jnp.concatenate([acceptance, accept_prob], axis=1)
+        save()
+        logger.info(
+            f"Drew {samples.shape[1]}/{n_samples} samples, acceptance rate "
+            + f"{jnp.mean(accept_prob):.3f}."
+        )
+
+    return SamplingResult(
+        parameters,
+        fitting.to_physical(parameters, samples[:, :n_samples]),
+        acceptance[:, :n_samples],
+        step_size,
+        inverse_mass,
+    )
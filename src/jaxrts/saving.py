@@ -24,8 +24,11 @@ import numpy as onp
 from jaxlib.xla_extension import ArrayImpl
 
 from .elements import Element
+from .emulator import Emulator
+from .free_free import CollisionFrequencyTable
 from .helpers import partialclass
 from .hnc_potentials import HNCPotential
+from .hypernetted_chain import HNCSolver
 from .models import Model
 from .plasmastate import PlasmaState
 from .setup import Setup
@@ -67,9 +70,11 @@ class JaXRTSEncoder(json.JSONEncoder):
                 "value": _flatten_obj(obj),
             }
         if isinstance(obj, Setup):
+            children, aux = _flatten_obj(obj)
+            # The cached instrument kernel is re-calculated when loading.
             return {
                 "_type": "Setup",
-                "value": _flatten_obj(obj),
+                "value": (children[:4], aux),
             }
         if isinstance(obj, HNCPotential):
             out = _flatten_obj(obj)
@@ -78,7 +83,7 @@ class JaXRTSEncoder(json.JSONEncoder):
             # FourierTransform in it's current implementation, it should be
             # spaced equidistantly, anyways. Reduce it therefore.
             # Get _transform_r. If it exists, it is the first entry in children
-            if hasattr(obj, "_transform_r"):
+            if getattr(obj, "_transform_r", None) is not None:
                 if isinstance(out[0], dict):
                     _transform_r = out[0]["_transform_r"]
                     out[0]["_transform_r"] = (
@@ -102,6 +107,21 @@ class JaXRTSEncoder(json.JSONEncoder):
                         out[1],
                     )
             return {"_type": "HNCPotential", "value": (obj.__name__, out)}
+        elif isinstance(obj, HNCSolver):
+            return {
+                "_type": "HNCSolver",
+                "value": (obj.__name__, _flatten_obj(obj)),
+            }
+        elif isinstance(obj, CollisionFrequencyTable):
+            return {
+                "_type": "CollisionFrequencyTable",
+                "value": _flatten_obj(obj),
+            }
+        elif isinstance(obj, Emulator):
+            return {
+                "_type": "Emulator",
+                "value": _flatten_obj(obj),
+            }
         elif isinstance(obj, Model):
             return {
                 "_type": "Model",
@@ -163,6 +183,17 @@ class JaXRTSDecoder(json.JSONDecoder):
         pot_dict.update(self.additional_mappings)
         return pot_dict
 
+    @property
+    def hnc_solvers(self) -> dict:
+        solver_dict = {
+            key: value
+            for (key, value) in jaxrts.hypernetted_chain.__dict__.items()
+            if (value in jaxrts.hypernetted_chain._all_hnc_solvers)
+            and not key.startswith("_")
+        }
+        solver_dict.update(self.additional_mappings)
+        return solver_dict
+
     @property
     def models(self) -> dict:
         model_dict = {
@@ -209,19 +240,35 @@ class JaXRTSDecoder(json.JSONDecoder):
             # Fix the transform_r
             # This uses that _transform_r will always be the first entry of the
             # children tuple.
-            if hasattr(new, "_transform_r"):
+            if getattr(new, "_transform_r", None) is not None:
                 new._transform_r = jnpu.linspace(**children[0])
             return new
-        elif _type == "PlasmaState":
-            new = object.__new__(PlasmaState)
+        elif _type == "HNCSolver":
+            name, tree = val
+
+            solver = self.hnc_solvers[name]
+            new = object.__new__(solver)
+            children, aux_data = _parse_tree_save(new, *tree)
+            new = new._tree_unflatten(aux_data, children)
+            return new
+        elif _type == "CollisionFrequencyTable":
+            new = object.__new__(CollisionFrequencyTable)
             children, aux_data = _parse_tree_save(new, *val)
             new = new._tree_unflatten(aux_data, children)
             return new
-        elif _type == "Setup":
-            new = object.__new__(Setup)
+        elif _type == "Emulator":
+            new = object.__new__(Emulator)
             children, aux_data = _parse_tree_save(new, *val)
             new = new._tree_unflatten(aux_data, children)
             return new
+        elif _type == "PlasmaState":
+            new = object.__new__(PlasmaState)
+            children, aux_data = _parse_tree_save(new, *val)
+            new = new._tree_unflatten(aux_data, children)
+            return new
+        elif _type == "Setup":
+            children, aux_data = val
+            return Setup(*children, *aux_data)
         return obj
 
 
@@ -287,7 +334,7 @@ def load(fp, unit_reg, additional_mappings={}, *args, **kwargs):
     --------
     >>> with open("state.json", "w") as f:
     >>>     state = load(f, unit_reg = jaxrts.ureg)
-    
+
     Custom models have to be passed to :py:func:`~load` as shown bellow.
 
     >>> class AlwaysPiModel(jaxrts.models.Model):
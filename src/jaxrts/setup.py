@@ -12,6 +12,19 @@ from jpu import numpy as jnpu
 from .plasma_physics import plasma_frequency
 from .units import Quantity, ureg
 
+#: Number of energies, above which the convolution with the instrument
+#: function is calculated via FFT, rather than directly. The direct
+#: convolution scales with :math:`N^2`, but is faster for small :math:`N`.
+fft_convolution_threshold: int = 400
+
+
+def _fft_length(n: int) -> int:
+    """
+    The length of the FFT required for a linear convolution of two arrays of
+    length ``n``, rounded up to the next power of two.
+    """
+    return 1 << (2 * n - 2).bit_length()
+
 
 class Setup:
 
@@ -29,13 +42,8 @@ class Setup:
         #: The base-energy at which we probe. This should be the central
         #: energy, for the instrument function, see :py:attr:`~.instrument`.
         self.energy: Quantity = energy
-        #: The energies at which the scattering is recorded. This is an array
-        #: of absolute energies and not an energy shift.
-        self.measured_energy: Quantity = measured_energy
-        #: A callable function over energy shifts that gives the total
-        #: instrument spread. The curve should be normed so that the integral
-        #: from `-inf` to `inf` should be one.
-        self.instrument: Callable = jax.tree_util.Partial(instrument)
+        self._measured_energy: Quantity = measured_energy
+        self._instrument: Callable = jax.tree_util.Partial(instrument)
         #: In an experiment, the value of k is dependent on the measured energy
         #: at this position on the detector. When including this effect, the
         #: returned spectrum will, however, violate detailed balance. It might
@@ -43,6 +51,79 @@ class Setup:
         #: default) to ``False`` to #: check, e.g. temperature differences when
         #: applying ITCF analysis methods.
         self.correct_k_dispersion: bool = correct_k_dispersion
+        self._cache_instrument_kernel()
+
+    @property
+    def measured_energy(self) -> Quantity:
+        """
+        The energies at which the scattering is recorded. This is an array of
+        absolute energies and not an energy shift.
+        """
+        return self._measured_energy
+
+    @measured_energy.setter
+    def measured_energy(self, value: Quantity) -> None:
+        self._measured_energy = value
+        self._cache_instrument_kernel()
+
+    @property
+    def instrument(self) -> Callable:
+        """
+        A callable function over energy shifts that gives the total
+        instrument spread. The curve should be normed so that the integral
+        from `-inf` to `inf` should be one.
+        """
+        return self._instrument
+
+    @instrument.setter
+    def instrument(self, value: Callable) -> None:
+        self._instrument = value
+        self._cache_instrument_kernel()
+
+    @property
+    def conv_grid(self) -> Quantity:
+        """
+        The frequency shifts at which the instrument function is sampled for
+        the convolution with the scattering signal, centered on the
+        :py:attr:`~.measured_energy`.
+        """
+        conv_grid = (
+            self.measured_energy - jnpu.mean(self.measured_energy)
+        ) / ureg.hbar
+        # Shift the grid by the minimal difference to zero.
+        # This ensures that the position of a peak will not move during
+        # convolution. See the test
+        # test_setup.test_peak_position_stability_with_convolution.
+        # Even a small shift might be very relevant for ITCF based analysis and
+        # tests.
+        return conv_grid + jnpu.min(jnpu.absolute(conv_grid))
+
+    def _cache_instrument_kernel(self) -> None:
+        """
+        Sample the :py:attr:`~.instrument` on the :py:attr:`~.conv_grid` and
+        store the kernel, and its Fourier transform, so that they are not
+        re-evaluated for every convolution.
+        """
+        kernel = self.instrument(self.conv_grid).m_as(ureg.second)
+        self._instrument_kernel = kernel
+        self._instrument_kernel_fft = jnp.fft.rfft(
+            kernel, _fft_length(len(kernel))
+        )
+
+    @property
+    def instrument_kernel(self) -> Quantity:
+        """
+        The :py:attr:`~.instrument`, evaluated on the :py:attr:`~.conv_grid`.
+        """
+        return self._instrument_kernel * (1 * ureg.second)
+
+    @property
+    def instrument_kernel_fft(self) -> jnp.ndarray:
+        """
+        The real FFT of the (zero-padded) :py:attr:`~.instrument_kernel`, in
+        units of seconds.
+        """
+        return self._instrument_kernel_fft
 
     @property
     def k(self) -> Quantity:
@@ -114,6 +195,8 @@ class Setup:
             self.energy,
             self.measured_energy,
             self.instrument,
+            self._instrument_kernel,
+            self._instrument_kernel_fft,
         )
         aux_data = (self.correct_k_dispersion,)  # static values
         return (children, aux_data)
@@ -124,8 +207,10 @@ class Setup:
         (
             obj.scattering_angle,
             obj.energy,
-            obj.measured_energy,
-            obj.instrument,
+            obj._measured_energy,
+            obj._instrument,
+            obj._instrument_kernel,
+            obj._instrument_kernel_fft,
         ) = children
         (obj.correct_k_dispersion,) = aux_data
         return obj
@@ -139,6 +224,12 @@ def convolve_stucture_factor_with_instrument(
     Colvolve a dynamic structure factor with the instrument function, given by
     the ``setup``.
 
+    The instrument function is not evaluated, again, but the
+    :py:attr:`~.Setup.instrument_kernel` cached in the ``setup`` is used. For
+    more than :py:data:`~.fft_convolution_threshold` energies, the
+    convolution is calculated via FFT, using the cached
+    :py:attr:`~.Setup.instrument_kernel_fft`.
+
     .. note::
        The convolution grid is automatically determined from the ``setup``.
        This step requires :py:attr:`jaxrts.setup.Setup.measured_energy` to be
@@ -156,23 +247,18 @@ def convolve_stucture_factor_with_instrument(
     Quantity
         The convolution of the structure factor with the instrument function.
     """
-    conv_grid = (
-        setup.measured_energy - jnpu.mean(setup.measured_energy)
-    ) / ureg.hbar
-
-    # Shift the grid by the minimal difference to zero.
-    # This ensures that the position of a peak will not move during
-    # convolution. See the test
-    # test_setup.test_peak_position_stability_with_convolution.
-    # Even a small shift might be very relevant for ITCF based analysis and
-    # tests.
-    conv_grid += jnpu.min(jnpu.absolute(conv_grid))
+    S = Sfac.m_as(ureg.second)
+    n = S.shape[-1]
+    if n < fft_convolution_threshold:
+        conv = jnp.convolve(S, setup._instrument_kernel, mode="same")
+    else:
+        length = _fft_length(n)
+        start = (n - 1) // 2
+        conv = jnp.fft.irfft(
+            jnp.fft.rfft(S, length) * setup.instrument_kernel_fft, length
+        )[..., start : start + n]
     return (
-        jnp.convolve(
-            Sfac.m_as(ureg.second),
-            setup.instrument(conv_grid).m_as(ureg.second),
-            mode="same",
-        )
+        conv
         * (1 * ureg.second**2)
         * (jnpu.diff(setup.measured_energy)[0] / ureg.hbar)
     )
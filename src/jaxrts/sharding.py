@@ -0,0 +1,370 @@
+"""
+This submodule distributes the calculation of spectra over multiple devices,
+e.g., the cores of a CPU, several GPUs, or both.
+
+Two axes can be distributed:
+
+- ``"energy"``: The channels of :py:attr:`jaxrts.setup.Setup.measured_energy`
+  of a single spectrum.
+- ``"batch"``: The states of a :py:class:`jaxrts.plasmastate.PlasmaStateBatch`.
+
+The devices are arranged in a :py:class:`jax.sharding.Mesh` with these two
+axes (see :py:func:`~.device_mesh`). The evaluation of the models is
+partitioned by XLA, based on a :py:class:`jax.sharding.NamedSharding` of the
+energies and the states of a batch. The convolution with the instrument
+function couples neighboring channels. It is calculated with
+:py:func:`jax.experimental.shard_map.shard_map`: every device convolves only
+its own channels, and receives the channels at the borders of its
+neighbors (the *halo*) which are within the width of the instrument function.
+
+.. note::
+
+   To use multiple devices on a CPU, the number of host devices has to be set
+   **before** JAX is initialized, e.g., with
+
+   >>> import os
+   >>> os.environ["XLA_FLAGS"] = "--xla_force_host_platform_device_count=64"
+
+Examples
+--------
+>>> mesh = jaxrts.sharding.device_mesh(n_energy=8)
+>>> S_ee = jaxrts.sharding.probe(state, setup, mesh)
+"""
+
+import logging
+from functools import partial
+
+import jax
+import jax.numpy as jnp
+import jpu.numpy as jnpu
+import numpy as onp
+from jax.experimental.shard_map import shard_map
+from jax.sharding import Mesh, NamedSharding
+from jax.sharding import PartitionSpec as P
+
+from .models import ScatteringModel
+from .plasmastate import PlasmaState, PlasmaStateBatch
+from .setup import Setup, fft_convolution_threshold
+from .units import Quantity, ureg
+
+logger = logging.getLogger(__name__)
+
+#: The name of the mesh axis distributing the states of a batch.
+batch_axis = "batch"
+#: The name of the mesh axis distributing the energy channels.
+energy_axis = "energy"
+
+
+def device_mesh(
+    n_batch: int | None = None,
+    n_energy: int | None = None,
+    devices: list | None = None,
+) -> Mesh:
+    """
+    Arrange devices in a :py:class:`jax.sharding.Mesh` with the axes
+    :py:data:`~.batch_axis` and :py:data:`~.energy_axis`.
+
+    Parameters
+    ----------
+    n_batch: int | None
+        The number of devices along the batch axis. If ``None``, all devices
+        which are not used for the energy axis.
+    n_energy: int | None
+        The number of devices along the energy axis. If ``None``, all devices
+        which are not used for the batch axis. If both are ``None``, all
+        devices are used for the energy axis.
+    devices: list | None
+        The devices to use. Defaults to :py:func:`jax.devices`.
+
+    Raises
+    ------
+    ValueError
+        If the number of devices does not match ``n_batch * n_energy``.
+    """
+    if devices is None:
+        devices = jax.devices()
+    n = len(devices)
+    if n_batch is None and n_energy is None:
+        n_batch = 1
+    if n_batch is None:
+        n_batch = n // n_energy
+    if n_energy is None:
+        n_energy = n // n_batch
+    if n_batch * n_energy != n:
+        raise ValueError(
+            f"Cannot arrange {n} devices in a mesh of {n_batch} x {n_energy}."
+        )
+    return Mesh(
+        onp.array(devices).reshape(n_batch, n_energy),
+        (batch_axis, energy_axis),
+    )
+
+
+def instrument_halo(setup: Setup, rtol: float = 1e-12) -> int:
+    """
+    The half-width of the instrument function of ``setup``, in channels. It
+    contains all channels where the :py:attr:`~.Setup.instrument_kernel` is
+    larger than ``rtol`` times its maximum.
+
+    This has to be called outside of jitted functions, as the width
+    determines the shape of the halo exchanged between the devices.
+    """
+    kernel = onp.abs(onp.asarray(setup._instrument_kernel))
+    center = (len(kernel) - 1) // 2
+    (support,) = onp.nonzero(kernel > rtol * onp.max(kernel))
+    if len(support) == 0:
+        return 0
+    return int(onp.max(onp.abs(support - center)))
+
+
+def _pad_to(x: jnp.ndarray, n: int, axis: int) -> jnp.ndarray:
+    """
+    Zero-pad ``x`` along ``axis`` so that its length is divisible by ``n``.
+    """
+    pad = -x.shape[axis] % n
+    if pad == 0:
+        return x
+    widths = [(0, 0)] * x.ndim
+    widths[axis] = (0, pad)
+    return jnp.pad(x, widths)
+
+
+def _local_convolution(x, kernel, halo: int, n_energy: int):
+    """
+    Convolve the channels ``x`` of a single device with the truncated
+    ``kernel`` (of length ``2 * halo + 1``), after exchanging the halo with
+    the neighboring devices. The devices at the borders of the spectrum
+    receive zeros, which is identical to the zero-padding of the convolution
+    on a single device.
+    """
+    if halo > 0:
+        left = jax.lax.ppermute(
+            x[..., -halo:],
+            energy_axis,
+            [(i, i + 1) for i in range(n_energy - 1)],
+        )
+        right = jax.lax.ppermute(
+            x[..., :halo],
+            energy_axis,
+            [(i + 1, i) for i in range(n_energy - 1)],
+        )
+        x = jnp.concatenate([left, x, right], axis=-1)
+
+    if len(kernel) < fft_convolution_threshold:
+        convolve = partial(jnp.convolve, mode="valid")
+    else:
+        convolve = partial(jax.scipy.signal.fftconvolve, mode="valid")
+    return jnp.vectorize(lambda x: convolve(x, kernel), signature="(n)->(m)")(
+        x
+    )
+
+
+def convolve_with_instrument(
+    Sfac: Quantity, setup: Setup, mesh: Mesh, halo: int
+) -> Quantity:
+    """
+    Sharded version of
+    :py:func:`jaxrts.setup.convolve_stucture_factor_with_instrument`.
+
+    Parameters
+    ----------
+    Sfac: Quantity
+        The dynamic structure factor, in units of [time]. Shape
+        ``(n_energies,)`` or ``(n_states, n_energies)``. The energies are
+        distributed over the :py:data:`~.energy_axis` of ``mesh``, the states
+        over the :py:data:`~.batch_axis`.
+    setup: Setup
+        The Setup object containing the instrument function.
+    mesh: Mesh
+        The devices, see :py:func:`~.device_mesh`.
+    halo: int
+        The half-width of the instrument function, in channels (see
+        :py:func:`~.instrument_halo`). The kernel is truncated to
+        ``2 * halo + 1`` channels.
+
+    Returns
+    -------
+    Quantity
+        The convolution of the structure factor with the instrument function.
+    """
+    S = Sfac.m_as(ureg.second)
+    n = S.shape[-1]
+    n_energy = mesh.shape[energy_axis]
+    kernel = setup._instrument_kernel
+    center = (len(kernel) - 1) // 2
+    halo = min(halo, center, len(kernel) - 1 - center)
+    kernel = kernel[center - halo : center + halo + 1]
+
+    batched = S.ndim == 2
+    spec = P(batch_axis, energy_axis) if batched else P(energy_axis)
+    S = _pad_to(S, n_energy, -1)
+    if batched:
+        S = _pad_to(S, mesh.shape[batch_axis], 0)
+
+    if halo > S.shape[-1] // n_energy:
+        # The instrument function is wider than the channels per device:
+        # Every device needs the full spectrum.
+        logger.warning(
+            f"The instrument function ({halo} channels) is wider than the "
+            + f"{S.shape[-1] // n_energy} channels per device. Consider "
+            + "using less devices along the energy axis."
+        )
+
+        def local(x, kernel):
+            full = jax.lax.all_gather(
+                x, energy_axis, axis=x.ndim - 1, tiled=True
+            )
+            idx = jax.lax.axis_index(energy_axis)
+            conv = _local_convolution(
+                jnp.pad(full, [(0, 0)] * (full.ndim - 1) + [(halo, halo)]),
+                kernel,
+                0,
+                n_energy,
+            )
+            return jax.lax.dynamic_slice_in_dim(
+                conv, idx * x.shape[-1], x.shape[-1], axis=-1
+            )
+
+    else:
+        local = partial(_local_convolution, halo=halo, n_energy=n_energy)
+
+    conv = shard_map(
+        local,
+        mesh=mesh,
+        in_specs=(spec, P()),
+        out_specs=spec,
+        check_rep=False,
+    )(S, kernel)
+    conv = conv[..., :n]
+    if batched:
+        conv = conv[: Sfac.shape[0]]
+    return (
+        conv
+        * (1 * ureg.second**2)
+        * (jnpu.diff(setup.measured_energy)[0] / ureg.hbar)
+    )
+
+
+def _constrain(tree, mesh: Mesh, spec: P):
+    return jax.lax.with_sharding_constraint(tree, NamedSharding(mesh, spec))
+
+
+def _shard_setup(setup: Setup, mesh: Mesh) -> Setup:
+    """
+    Distribute the :py:attr:`~.Setup.measured_energy` over the energy axis
+    of ``mesh``.
+    """
+    children, aux_data = setup._tree_flatten()
+    energy = _constrain(children[2], mesh, P(energy_axis))
+    return type(setup)._tree_unflatten(
+        aux_data, (*children[:2], energy, *children[3:])
+    )
+
+
+def _shard_batch(batch: PlasmaStateBatch, mesh: Mesh) -> PlasmaStateBatch:
+    """
+    Distribute the states of ``batch`` over the batch axis of ``mesh``.
+    """
+    children, aux_data = batch._tree_flatten()
+    params = _constrain(children[:-1], mesh, P(batch_axis))
+    return PlasmaStateBatch._tree_unflatten(aux_data, (*params, children[-1]))
+
+
+@partial(jax.jit, static_argnames=["mesh", "halo"])
+def _probe(plasma_state, setup: Setup, mesh: Mesh, halo: int) -> Quantity:
+    setup = _shard_setup(setup, mesh)
+    if isinstance(plasma_state, PlasmaStateBatch):
+        plasma_state = _shard_batch(plasma_state, mesh)
+        signal, unconvolved = plasma_state._map(
+            lambda s: s._probe_contributions(setup), None
+        )
+        spec = P(batch_axis, energy_axis)
+    else:
+        signal, unconvolved = plasma_state._probe_contributions(setup)
+        spec = P(energy_axis)
+    if unconvolved is not None:
+        unconvolved = _constrain(unconvolved, mesh, spec)
+        signal = signal + convolve_with_instrument(
+            unconvolved, setup, mesh, halo
+        )
+    return _constrain(signal, mesh, spec)
+
+
+def probe(
+    plasma_state: PlasmaState | PlasmaStateBatch,
+    setup: Setup,
+    mesh: Mesh | None = None,
+    rtol: float = 1e-12,
+) -> Quantity:
+    """
+    Evaluate :py:meth:`jaxrts.plasmastate.PlasmaState.probe` (or
+    :py:meth:`jaxrts.plasmastate.PlasmaStateBatch.probe`) distributed over
+    the devices of ``mesh``.
+
+    Parameters
+    ----------
+    plasma_state: PlasmaState | PlasmaStateBatch
+        The plasma state, or a batch of states.
+    setup: Setup
+        The setup. It has to be concrete, i.e., this function cannot be
+        called with a traced setup within a jitted function, as the width of
+        the instrument function defines the communication between the
+        devices.
+    mesh: Mesh | None
+        The devices, see :py:func:`~.device_mesh`. If ``None``, all devices
+        are used, along the batch axis for a
+        :py:class:`~jaxrts.plasmastate.PlasmaStateBatch`, and along the
+        energy axis, otherwise.
+    rtol: float
+        The instrument function is truncated where it is smaller than
+        ``rtol`` times its maximum (see :py:func:`~.instrument_halo`).
+
+    Returns
+    -------
+    Quantity
+        The scattering signal. Shape ``(len(setup.measured_energy),)``, or
+        ``(len(batch), len(setup.measured_energy))`` for a batch. It is
+        distributed over the devices if its shape is divisible by the shape
+        of ``mesh``, and replicated, otherwise.
+    """
+    if mesh is None:
+        if isinstance(plasma_state, PlasmaStateBatch):
+            mesh = device_mesh(n_energy=1)
+        else:
+            mesh = device_mesh(n_batch=1)
+    halo = instrument_halo(setup, rtol)
+    return _probe(plasma_state, setup, mesh, halo)
+
+
+@partial(jax.jit, static_argnames=["key", "mesh", "halo"])
+def _evaluate(plasma_state, key: str, setup: Setup, mesh: Mesh, halo: int):
+    setup = _shard_setup(setup, mesh)
+    model = plasma_state[key]
+    if isinstance(plasma_state.models[key], ScatteringModel):
+        unconvolved = _constrain(
+            model.evaluate_unconvolved(plasma_state, setup),
+            mesh,
+            P(energy_axis),
+        )
+        return convolve_with_instrument(unconvolved, setup, mesh, halo)
+    return model.evaluate(plasma_state, setup)
+
+
+def evaluate(
+    plasma_state: PlasmaState,
+    key: str,
+    setup: Setup,
+    mesh: Mesh | None = None,
+    rtol: float = 1e-12,
+) -> Quantity:
+    """
+    Evaluate the model stored under ``key``, with the energies distributed
+    over the devices of ``mesh``. For a
+    :py:class:`jaxrts.models.ScatteringModel`, the convolution with the
+    instrument function is sharded, too. See :py:func:`~.probe` for the
+    arguments.
+    """
+    if mesh is None:
+        mesh = device_mesh(n_batch=1)
+    halo = instrument_halo(setup, rtol)
+    return _evaluate(plasma_state, key, setup, mesh, halo)
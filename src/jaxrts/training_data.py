@@ -0,0 +1,455 @@
+"""
+This submodule generates large training data sets for the
+:py:class:`jaxrts.emulator.Emulator`.
+
+The inputs are drawn from a space-filling design (a scrambled Sobol sequence
+or a Latin hypercube, see :py:func:`~.design`) within the domain of the
+emulator. They are evaluated in chunks, with the batched (and, if a device
+mesh is given, sharded) reference model of
+:py:func:`jaxrts.emulator.reference_structure_factors`. Every chunk is written
+to disk as soon as it is done. An interrupted run continues with the first
+missing chunk, when :py:func:`~.generate` is called again with the same
+arguments.
+
+Two storage formats are available:
+
+- ``"npz"``: a directory with a ``manifest.json``, the design and one
+  ``.npy`` file per chunk. It requires no additional dependency.
+- ``"hdf5"``: a single HDF5 file with chunked datasets ``inputs`` and
+  ``outputs``. It requires :py:mod:`h5py`.
+
+Both store provenance metadata (versions, date, devices, the domain, the
+design and the serialized plasma state).
+
+Examples
+--------
+>>> jaxrts.training_data.generate(
+>>>     emulator, state, "CH_data", 10**6, mesh=jaxrts.sharding.device_mesh()
+>>> )
+>>> x, S, metadata = jaxrts.training_data.load("CH_data")
+>>> emulator, history = jaxrts.emulator.train(
+>>>     emulator, x, S, jax.random.PRNGKey(2)
+>>> )
+"""
+
+import datetime
+import json
+import logging
+import os
+import platform
+import warnings
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import jax
+import numpy as onp
+from jax.sharding import Mesh
+from scipy.stats import qmc
+
+from .emulator import Emulator, reference_structure_factors
+
+if TYPE_CHECKING:
+    from .plasmastate import PlasmaState
+
+logger = logging.getLogger(__name__)
+
+#: The version of the layout written by the stores. Stores with a newer
+#: version cannot be opened.
+format_version = 1
+
+
+def design(
+    n: int,
+    lower: onp.ndarray,
+    upper: onp.ndarray,
+    method: str = "sobol",
+    seed: int = 0,
+) -> onp.ndarray:
+    """
+    Draw ``n`` points within the box ``[lower, upper]``.
+
+    Parameters
+    ----------
+    n: int
+        The number of points.
+    lower: onp.ndarray
+        The lower bounds of the dimensions.
+    upper: onp.ndarray
+        The upper bounds of the dimensions.
+    method: str
+        ``"sobol"`` for a scrambled Sobol sequence, ``"lhs"`` for a Latin
+        hypercube, or ``"uniform"`` for independent uniform samples.
+    seed: int
+        The seed. The same arguments always give the same points.
+
+    Returns
+    -------
+    onp.ndarray
+        The points, with the shape ``(n, len(lower))``.
+    """
+    lower = onp.asarray(lower, dtype=float)
+    upper = onp.asarray(upper, dtype=float)
+    d = len(lower)
+    if method == "sobol":
+        sampler = qmc.Sobol(d, scramble=True, rng=seed)
+        # The balance properties are only exact for powers of two, which is
+        # not required here.
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", UserWarning)
+            unit = sampler.random(n)
+    elif method == "lhs":
+        unit = qmc.LatinHypercube(d, rng=seed).random(n)
+    elif method == "uniform":
+        unit = onp.random.default_rng(seed).random((n, d))
+    else:
+        raise ValueError(
+            f"Unknown design {method}. Use 'sobol', 'lhs' or 'uniform'."
+        )
+    return lower + unit * (upper - lower)
+
+
+def _provenance(emulator: Emulator, plasma_state: "PlasmaState") -> dict:
+    """
+    Metadata identifying how a data set was generated.
+    """
+    from . import __version__, saving
+
+    try:
+        state = saving.dumps(plasma_state)
+    except Exception as e:  # pragma: no cover
+        logger.warning(f"The plasma state could not be serialized: {e}")
+        state = None
+    return {
+        "jaxrts": __version__,
+        "jax": jax.__version__,
+        "numpy": onp.__version__,
+        "created": datetime.datetime.now().isoformat(),
+        "host": platform.node(),
+        "devices": [str(d) for d in jax.devices()],
+        "reference": plasma_state["ionic scattering"].__name__,
+        "elements": list(emulator.elements),
+        "composition": onp.asarray(emulator.composition).tolist(),
+        "domain": emulator.domain,
+        "plasma_state": state,
+    }
+
+
+def _atomic_write(path: Path, write) -> None:
+    """
+    Write a file with ``write(f)``. The file is replaced atomically, so that
+    an interruption cannot corrupt it.
+    """
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        write(f)
+    os.replace(tmp, path)
+
+
+class NpzStore:
+    """
+    A data set in a directory, containing a ``manifest.json``, the design
+    (``inputs.npy``) and the outputs of every chunk
+    (``outputs_<first index>.npy``).
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.manifest = json.loads((self.path / "manifest.json").read_text())
+        if self.manifest["format_version"] > format_version:
+            raise ValueError(
+                f"{self.path} has the format version "
+                + f"{self.manifest['format_version']}, but only versions up "
+                + f"to {format_version} are supported."
+            )
+
+    @classmethod
+    def create(
+        cls,
+        path: str | Path,
+        inputs: onp.ndarray,
+        n_outputs: int,
+        metadata: dict,
+    ) -> "NpzStore":
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        _atomic_write(path / "inputs.npy", lambda f: onp.save(f, inputs))
+        manifest = {
+            "format_version": format_version,
+            "n_samples": len(inputs),
+            "n_outputs": n_outputs,
+            "n_done": 0,
+            "metadata": metadata,
+        }
+        _atomic_write(
+            path / "manifest.json",
+            lambda f: f.write(json.dumps(manifest, indent=2).encode()),
+        )
+        return cls(path)
+
+    @property
+    def metadata(self) -> dict:
+        return self.manifest["metadata"]
+
+    @property
+    def n_done(self) -> int:
+        """
+        The number of samples, for which the outputs are stored.
+        """
+        return self.manifest["n_done"]
+
+    @property
+    def inputs(self) -> onp.ndarray:
+        return onp.load(self.path / "inputs.npy")
+
+    def append(self, outputs: onp.ndarray) -> None:
+        """
+        Store the outputs of the next ``len(outputs)`` samples.
+        """
+        start = self.n_done
+        _atomic_write(
+            self.path / f"outputs_{start:09d}.npy",
+            lambda f: onp.save(f, onp.asarray(outputs)),
+        )
+        # The chunk is only counted after it was written completely
+        self.manifest["n_done"] = start + len(outputs)
+        _atomic_write(
+            self.path / "manifest.json",
+            lambda f: f.write(json.dumps(self.manifest, indent=2).encode()),
+        )
+
+    @property
+    def outputs(self) -> onp.ndarray:
+        """
+        The stored outputs, with the shape ``(n_done, n_outputs)``.
+        """
+        chunks = []
+        start = 0
+        while start < self.n_done:
+            chunk = onp.load(self.path / f"outputs_{start:09d}.npy")
+            chunks.append(chunk)
+            start += len(chunk)
+        if not chunks:
+            return onp.zeros((0, self.manifest["n_outputs"]))
+        return onp.concatenate(chunks)[: self.n_done]
+
+
+class HDF5Store:
+    """
+    A data set in a HDF5 file, with the datasets ``inputs`` and ``outputs``.
+    The outputs are chunked, so that every chunk of samples is written to
+    disk when it is done. Requires :py:mod:`h5py`.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        h5py = self._h5py()
+        with h5py.File(self.path, "r") as f:
+            self._format_version = int(f.attrs["format_version"])
+            self._metadata = json.loads(f.attrs["metadata"])
+        if self._format_version > format_version:
+            raise ValueError(
+                f"{self.path} has the format version {self._format_version}, "
+                + f"but only versions up to {format_version} are supported."
+            )
+
+    @staticmethod
+    def _h5py():
+        try:
+            import h5py
+        except ImportError as e:
+            raise ImportError(
+                "Storing training data as HDF5 requires h5py. Install it, or "
+                + "use store='npz'."
+            ) from e
+        return h5py
+
+    @classmethod
+    def create(
+        cls,
+        path: str | Path,
+        inputs: onp.ndarray,
+        n_outputs: int,
+        metadata: dict,
+        chunk_size: int = 1024,
+    ) -> "HDF5Store":
+        h5py = cls._h5py()
+        path = Path(path)
+        with h5py.File(path, "w") as f:
+            f.attrs["format_version"] = format_version
+            f.attrs["metadata"] = json.dumps(metadata)
+            f.attrs["n_done"] = 0
+            f.create_dataset("inputs", data=inputs)
+            f.create_dataset(
+                "outputs",
+                shape=(0, n_outputs),
+                maxshape=(len(inputs), n_outputs),
+                chunks=(min(chunk_size, len(inputs)), n_outputs),
+                dtype=float,
+            )
+        return cls(path)
+
+    @property
+    def metadata(self) -> dict:
+        return self._metadata
+
+    @property
+    def n_done(self) -> int:
+        with self._h5py().File(self.path, "r") as f:
+            return int(f.attrs["n_done"])
+
+    @property
+    def inputs(self) -> onp.ndarray:
+        with self._h5py().File(self.path, "r") as f:
+            return f["inputs"][...]
+
+    def append(self, outputs: onp.ndarray) -> None:
+        with self._h5py().File(self.path, "a") as f:
+            start = int(f.attrs["n_done"])
+            data = f["outputs"]
+            data.resize(start + len(outputs), axis=0)
+            data[start:] = onp.asarray(outputs)
+            f.flush()
+            # The chunk is only counted after it was written completely
+            f.attrs["n_done"] = start + len(outputs)
+
+    @property
+    def outputs(self) -> onp.ndarray:
+        with self._h5py().File(self.path, "r") as f:
+            return f["outputs"][: int(f.attrs["n_done"])]
+
+
+_stores = {"npz": NpzStore, "hdf5": HDF5Store}
+
+
+def _open(path: Path) -> NpzStore | HDF5Store:
+    return NpzStore(path) if path.is_dir() else HDF5Store(path)
+
+
+def generate(
+    emulator: Emulator,
+    plasma_state: "PlasmaState",
+    path: str | Path,
+    n_samples: int,
+    method: str = "sobol",
+    seed: int = 0,
+    chunk_size: int = 1024,
+    batch_size: int = 64,
+    mesh: Mesh | None = None,
+    store: str = "npz",
+) -> NpzStore | HDF5Store:
+    """
+    Calculate :math:`S_{ab}` with the ``"ionic scattering"`` model of
+    ``plasma_state`` for ``n_samples`` inputs within the domain of the
+    ``emulator`` and store them at ``path``.
+
+    The inputs are drawn with :py:func:`~.design` and evaluated in chunks of
+    ``chunk_size`` samples, each of which is written to disk when it is done.
+    If ``path`` exists, the generation continues after the last stored
+    chunk. The stored inputs are used then; the arguments defining them have
+    to be unchanged.
+
+    Parameters
+    ----------
+    emulator: Emulator
+        The emulator, defining the elements and the domain.
+    plasma_state: PlasmaState
+        The plasma state, with one ion per element of the emulator, defining
+        the composition and all models required by the reference model.
+    path: str | Path
+        The directory (``store="npz"``) or file (``store="hdf5"``).
+    n_samples: int
+        The number of samples.
+    method: str
+        The design, see :py:func:`~.design`.
+    seed: int
+        The seed of the design.
+    chunk_size: int
+        The number of samples written to disk at once.
+    batch_size: int
+        The number of samples evaluated at once, see
+        :py:func:`jaxrts.emulator.reference_structure_factors`.
+    mesh: Mesh | None
+        The device mesh, see :py:func:`jaxrts.sharding.device_mesh`.
+    store: str
+        ``"npz"`` or ``"hdf5"``.
+
+    Returns
+    -------
+    NpzStore | HDF5Store
+        The completed store.
+    """
+    if store not in _stores:
+        raise ValueError(f"Unknown store {store}. Use 'npz' or 'hdf5'.")
+    path = Path(path)
+    if chunk_size % batch_size != 0:
+        raise ValueError(
+            f"The chunk size {chunk_size} is not a multiple of the batch "
+            + f"size {batch_size}."
+        )
+    emulator.metadata["reference"] = plasma_state["ionic scattering"].__name__
+    parameters = {
+        "n_samples": n_samples,
+        "method": method,
+        "seed": seed,
+        "input_names": list(emulator.input_names),
+        "output_names": list(emulator.output_names),
+        "input_min": onp.asarray(emulator.input_min).tolist(),
+        "input_max": onp.asarray(emulator.input_max).tolist(),
+    }
+    if path.exists():
+        data = _open(path)
+        stored = {k: data.metadata.get(k) for k in parameters}
+        if stored != parameters:
+            changed = [k for k in parameters if stored[k] != parameters[k]]
+            raise ValueError(
+                f"{path} was generated with different {changed}. Use another "
+                + "path to generate a new data set."
+            )
+        logger.info(f"Continuing {path} after {data.n_done} samples.")
+    else:
+        inputs = design(
+            n_samples, emulator.input_min, emulator.input_max, method, seed
+        )
+        metadata = {**parameters, **_provenance(emulator, plasma_state)}
+        if store == "hdf5":
+            data = HDF5Store.create(
+                path, inputs, len(emulator.output_names), metadata, chunk_size
+            )
+        else:
+            data = NpzStore.create(
+                path, inputs, len(emulator.output_names), metadata
+            )
+    inputs = data.inputs
+    while data.n_done < n_samples:
+        start = data.n_done
+        outputs = reference_structure_factors(
+            emulator,
+            plasma_state,
+            inputs[start : start + chunk_size],
+            batch_size,
+            mesh,
+        )
+        data.append(onp.asarray(outputs))
+        logger.info(f"Stored {data.n_done}/{n_samples} samples in {path}.")
+    return data
+
+
+def load(path: str | Path) -> tuple[onp.ndarray, onp.ndarray, dict]:
+    """
+    Load the data set at ``path``, written by :py:func:`~.generate`.
+
+    Returns
+    -------
+    onp.ndarray
+        The inputs, for which the outputs are stored, with the shape
+        ``(n_done, n_inputs)``.
+    onp.ndarray
+        The upper triangle of :math:`S_{ab}`, with the shape ``(n_done,
+        n_outputs)``. Samples for which the reference model did not give a
+        finite result contain NaN.
+    dict
+        The metadata.
+    """
+    data = _open(Path(path))
+    n_done = data.n_done
+    return data.inputs[:n_done], data.outputs, data.metadata
@@ -1,14 +1,82 @@
 """
 This submodule defines the unit registry for calculations involving
 dimensionful quantities.
+
+Units are attached at the boundaries of the models, only. Numerical kernels,
+i.e., the integrands of quadratures, the bodies of iterations and similar
+functions, which are traced many times or are evaluated in loops, operate on
+plain arrays, which are either dimensionless or given in a fixed unit. Every
+unit conversion in such a kernel would otherwise be repeated in the traced
+function. The kernels are marked with :py:func:`~.unit_kernel`, which
+documents the units of the arguments and converts quantities at the call.
+
+The unit checks can be re-enabled for debugging with :py:func:`~.check_units`
+(or by setting the environment variable ``JAXRTS_CHECK_UNITS=1``). Then,
+
+- the kernels are evaluated with quantities, so that every operation in them
+  is checked, and
+- the inputs of the models, accessed via
+  :py:meth:`jaxrts.plasmastate.PlasmaState.__getitem__` are checked when
+  entering their ``evaluate*`` methods, and the results are checked against
+  the units in :py:data:`~.model_units`.
+
+Like the instrumentation (see :py:mod:`jaxrts.instrumentation`), this is a
+pure trace-time switch, and JAX's caches are cleared when it is toggled.
+
+Examples
+--------
+>>> with jaxrts.units.check_units():
+...     state.probe(setup)
 """
 
+import os
+from contextlib import contextmanager
+from functools import partial, wraps
+
+import jax
 import jax.numpy as jnp
 import jpu
-from pint import Quantity, Unit  # noqa: F401
+from pint import DimensionalityError, Quantity, Unit  # noqa: F401
 
 ureg = jpu.UnitRegistry()
 
+# If True, the kernels are evaluated with quantities, and the inputs and
+# results of the models are checked.
+_checking = os.environ.get("JAXRTS_CHECK_UNITS", "0") not in ("", "0")
+
+#: The units of the results of the models, by the key under which they are
+#: stored in a :py:class:`jaxrts.plasmastate.PlasmaState`. The results are
+#: checked against these if unit checks are enabled (see
+#: :py:func:`~.check_units`). Plain arrays are treated as dimensionless.
+model_units = {
+    "ionic scattering": ureg.second,
+    "free-free scattering": ureg.second,
+    "bound-free scattering": ureg.second,
+    "free-bound scattering": ureg.second,
+    "ipd": ureg.electron_volt,
+    "chemical potential": ureg.electron_volt,
+    "screening length": ureg.angstrom,
+    "Debye temperature": ureg.kelvin,
+    "BM V_eiS": ureg.electron_volt * ureg.angstrom**3,
+    "BM S_ii": ureg.dimensionless,
+    "form-factors": ureg.dimensionless,
+    "screening": ureg.dimensionless,
+    "ee-lfc": ureg.dimensionless,
+}
+
+# The units of the attributes of the plasma state and the setup which are
+# checked when a model is evaluated.
+_argument_units = {
+    "T_e": ureg.kelvin,
+    "T_i": ureg.kelvin,
+    "mass_density": ureg.gram / ureg.centimeter**3,
+    "energy": ureg.electron_volt,
+    "measured_energy": ureg.electron_volt,
+}
+
+# The methods, the results of which are checked against model_units.
+_checked_methods = ("evaluate", "evaluate_raw", "evaluate_unconvolved")
+
 
 def to_array(obj) -> jnp.ndarray:
     """
@@ -34,3 +102,162 @@ def to_array(obj) -> jnp.ndarray:
             return jnp.array(obj)
     else:
         return jnp.array(obj)
+
+
+def checking_units() -> bool:
+    """
+    Return ``True`` if unit checks are enabled (see :py:func:`~.check_units`).
+    """
+    return _checking
+
+
+@contextmanager
+def check_units():
+    """
+    Context manager which enables the full unit checks: The
+    :py:func:`~.unit_kernel` s are evaluated with quantities, and the inputs
+    and results of the models are checked.
+
+    This is meant for debugging, only. It makes the traced functions larger
+    and, with that, compilation slower.
+    """
+    global _checking
+    previous = _checking
+    # Functions traced before have to be traced again (and vice versa), so
+    # that the checks are (not) part of the traced functions.
+    jax.clear_caches()
+    _checking = True
+    try:
+        yield
+    finally:
+        _checking = previous
+        jax.clear_caches()
+
+
+def magnitude(x, unit) -> jnp.ndarray:
+    """
+    Return the magnitude of ``x`` in ``unit``. Plain arrays (and numbers) are
+    assumed to be given in ``unit``, already, and are returned unchanged.
+    """
+    if jpu.core.is_quantity(x):
+        return x.m_as(unit)
+    return x
+
+
+def check_dimensionality(x, unit, name: str = "value") -> None:
+    """
+    Raise a :py:class:`pint.DimensionalityError` if ``x`` can not be converted
+    to ``unit``. Plain arrays (and numbers) are treated as dimensionless.
+    """
+    x_units = x.units if jpu.core.is_quantity(x) else ureg.dimensionless
+    if x_units.dimensionality != ureg.Unit(unit).dimensionality:
+        raise DimensionalityError(
+            x_units, unit, extra_msg=f" (unit check of {name})"
+        )
+
+
+def _as_quantity(x, unit, name: str) -> Quantity:
+    if jpu.core.is_quantity(x):
+        check_dimensionality(x, unit, name)
+        return x
+    return ureg.Quantity(x, unit)
+
+
+def unit_kernel(*units, result=ureg.dimensionless):
+    """
+    Decorator for numerical kernels, which operate on plain arrays, given in
+    fixed units.
+
+    ``units`` are the units of the positional arguments of the kernel
+    (``None`` for arguments which are passed unchanged, e.g., callables or
+    integers), ``result`` the unit of the returned array. Quantities are
+    converted to these units when the kernel is called; plain arrays are
+    assumed to be given in these units, already. Hence, arguments which do
+    not change between the calls (e.g., in an iteration) should be converted
+    once, before.
+
+    If unit checks are enabled (see :py:func:`~.check_units`), the kernel is
+    evaluated with quantities in the given units, instead, so that all
+    operations within it are checked, and the result is converted to
+    ``result``. To allow for this, the kernels have to use
+    :py:mod:`jpu.numpy` rather than :py:mod:`jax.numpy` functions, which
+    accept both quantities and plain arrays.
+    """
+
+    def decorator(fun):
+        @wraps(fun)
+        def wrapper(*args, **kwargs):
+            if len(args) != len(units):
+                raise TypeError(
+                    f"{fun.__name__} takes {len(units)} positional "
+                    + f"arguments, but {len(args)} were given."
+                )
+            if not _checking:
+                return fun(
+                    *(
+                        arg if unit is None else magnitude(arg, unit)
+                        for arg, unit in zip(args, units)
+                    ),
+                    **kwargs,
+                )
+            out = fun(
+                *(
+                    (
+                        arg
+                        if unit is None
+                        else _as_quantity(arg, unit, fun.__name__)
+                    )
+                    for arg, unit in zip(args, units)
+                ),
+                **kwargs,
+            )
+            check_dimensionality(out, result, fun.__name__)
+            return magnitude(out, result)
+
+        return wrapper
+
+    return decorator
+
+
+class _UnitCheckedModel:
+    """
+    Thin wrapper around a model, which is returned by
+    :py:meth:`jaxrts.plasmastate.PlasmaState.__getitem__` while unit checks
+    are enabled. All attributes are forwarded to the model, the ``evaluate*``
+    methods check the inputs and results.
+    """
+
+    def __init__(self, model, key: str) -> None:
+        object.__setattr__(self, "_model", model)
+        object.__setattr__(self, "_key", key)
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._model, name)
+        if name.startswith("evaluate") and callable(attr):
+            return partial(self._evaluate, name, attr)
+        return attr
+
+    def __setattr__(self, name: str, value) -> None:
+        setattr(self._model, name, value)
+
+    def _evaluate(self, name, method, *args, **kwargs):
+        model = f"{self._key}: {type(self._model).__name__}.{name}"
+        for arg in args:
+            for attr, unit in _argument_units.items():
+                value = getattr(arg, attr, None)
+                if value is not None:
+                    check_dimensionality(value, unit, f"{model}, {attr}")
+        result = method(*args, **kwargs)
+        if name in _checked_methods and self._key in model_units:
+            check_dimensionality(result, model_units[self._key], model)
+        return result
+
+
+def wrap(model, key: str):
+    """
+    Wrap ``model`` so that its inputs and results are checked, if unit checks
+    are enabled. Otherwise, return the model, unchanged.
+    """
+    if not _checking:
+        return model
+    return _UnitCheckedModel(model, key)
@@ -0,0 +1,61 @@
+import copy
+
+from jax import numpy as jnp
+
+import jaxrts
+
+ureg = jaxrts.ureg
+
+test_state = jaxrts.PlasmaState(
+    ions=[jaxrts.Element("C")],
+    Z_free=jnp.array([2]),
+    mass_density=jnp.array([3.5]) * ureg.gram / ureg.centimeter**3,
+    T_e=jnp.array([80]) * ureg.electron_volt / ureg.k_B,
+)
+test_state["ionic scattering"] = jaxrts.models.Gregori2003IonFeat()
+test_state["free-free scattering"] = jaxrts.models.RPA_DandreaFit()
+test_state["bound-free scattering"] = jaxrts.models.Neglect()
+test_state["free-bound scattering"] = jaxrts.models.Neglect()
+
+test_setup = jaxrts.Setup(
+    ureg("60°"),
+    ureg("4768.6eV"),
+    jnp.linspace(4750, 4800, 50) * ureg.electron_volt,
+    lambda x: jaxrts.instrument_function.instrument_gaussian(
+        x, 1 / ureg.second
+    ),
+)
+
+
+def test_warmup_reports_compile_times():
+    compiled, times = jaxrts.compilation.warmup(test_state, test_setup)
+    assert set(times.keys()) == {*jaxrts.compilation.probe_keys, "probe"}
+    for t in times.values():
+        assert t["lower"] >= 0
+        assert t["compile"] >= 0
+
+    # The compiled function can be used with other states of the same shape
+    state = copy.deepcopy(test_state)
+    state.T_e *= 2
+    assert jnp.allclose(
+        compiled(state, test_setup).m_as(ureg.second),
+        state.probe(test_setup).m_as(ureg.second),
+    )
+
+
+def test_persistent_cache_writes_to_directory(tmp_path):
+    cache_dir = jaxrts.compilation.enable_cache(
+        tmp_path / "cache", min_compile_time=0
+    )
+    # Use a new shape, so that nothing is taken from the in-memory cache
+    setup = jaxrts.Setup(
+        test_setup.scattering_angle,
+        test_setup.energy,
+        jnp.linspace(4750, 4800, 42) * ureg.electron_volt,
+        test_setup.instrument,
+    )
+    try:
+        jaxrts.compilation.warmup(test_state, setup, keys=[])
+        assert len(list(cache_dir.iterdir())) > 0
+    finally:
+        jaxrts.compilation.disable_cache()
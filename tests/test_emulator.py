@@ -0,0 +1,142 @@
+import jax
+import jax.numpy as jnp
+import pytest
+
+import jaxrts
+from jaxrts import emulator
+
+ureg = jaxrts.ureg
+
+domain = {
+    "theta": (0.3, 3),
+    "rho": (1, 4),
+    "Z_C": (2, 4),
+    "k/q_k": (0.2, 3),
+}
+
+
+def _carbon_state():
+    state = jaxrts.PlasmaState(
+        ions=[jaxrts.Element("C")],
+        Z_free=jnp.array([3.0]),
+        mass_density=jnp.array([2.0]) * ureg.gram / ureg.centimeter**3,
+        T_e=10 * ureg.electron_volt / ureg.k_B,
+    )
+    state["ion-ion Potential"] = jaxrts.hnc_potentials.DebyeHueckelPotential()
+    state["ionic scattering"] = jaxrts.models.OnePotentialHNCIonFeat(pot=10)
+    return state
+
+
+setup = jaxrts.Setup(
+    ureg("60°"),
+    ureg("8keV"),
+    jnp.linspace(7.9, 8.1, 50) * ureg.kiloelectron_volts,
+    lambda x: jaxrts.instrument_function.instrument_gaussian(
+        x, ureg("3eV") / ureg.hbar
+    ),
+)
+
+
+def test_expanded_ions_reproduce_element_structure_factors():
+    # An element split into multiple ions must give the same partial
+    # structure factors of the elements, when summed up.
+    mixture = jaxrts.PlasmaState(
+        ions=[jaxrts.Element("C"), jaxrts.Element("H")],
+        Z_free=jnp.array([3.0, 1.0]),
+        mass_density=jnp.array([1.0, 0.2]) * ureg.gram / ureg.centimeter**3,
+        T_e=10 * ureg.electron_volt / ureg.k_B,
+    )
+    expanded = jaxrts.PlasmaState(
+        ions=[jaxrts.Element("C"), jaxrts.Element("C"), jaxrts.Element("H")],
+        Z_free=jnp.array([2.0, 4.0, 1.0]),
+        mass_density=jnp.array([0.5, 0.5, 0.2])
+        * ureg.gram
+        / ureg.centimeter**3,
+        T_e=10 * ureg.electron_volt / ureg.k_B,
+    )
+    emu = emulator.Emulator.create(
+        jax.random.PRNGKey(0),
+        mixture,
+        {**domain, "Z_H": (0.5, 1)},
+    )
+    features = emu.features(expanded, setup)
+    S_el = emu.structure_factors(mixture, features)
+    S_ion = emu.structure_factors(expanded, features)
+
+    x = expanded.number_fraction
+    x_el = emu.composition_of(expanded)
+    assert jnp.allclose(x_el, emu.composition)
+    members = [[0, 1], [2]]
+    for s in range(2):
+        for t in range(2):
+            summed = sum(
+                jnp.sqrt(x[a] * x[b]) * S_ion[a, b]
+                for a in members[s]
+                for b in members[t]
+            )
+            assert jnp.isclose(
+                summed, jnp.sqrt(x_el[s] * x_el[t]) * S_el[s, t]
+            )
+
+
+def test_emulator_save_and_load(tmp_path):
+    emu = emulator.Emulator.create(
+        jax.random.PRNGKey(0), _carbon_state(), domain, hidden=(8, 8)
+    )
+    emu.metadata["note"] = "test"
+    emu.save(tmp_path / "C.npz")
+    loaded = emulator.Emulator.load(tmp_path / "C.npz")
+    assert loaded.elements == ("C",)
+    assert loaded.metadata == emu.metadata
+    assert loaded.hidden == (8, 8)
+    x = jnp.array([0.0, 0.3, 3.0, 0.0, 0.0])
+    assert jnp.allclose(loaded(x), emu(x))
+
+    emulator.format_version += 1
+    try:
+        emu.save(tmp_path / "future.npz")
+    finally:
+        emulator.format_version -= 1
+    with pytest.raises(ValueError):
+        emulator.Emulator.load(tmp_path / "future.npz")
+
+
+def test_emulated_ion_feat_with_fallback(tmp_path):
+    state = _carbon_state()
+    emu = emulator.Emulator.create(
+        jax.random.PRNGKey(0), state, domain, hidden=(32, 32)
+    )
+    x, S = emulator.generate_training_data(
+        emu, state, 512, jax.random.PRNGKey(1), batch_size=128
+    )
+    emu, history = emulator.train(
+        emu,
+        x,
+        S,
+        jax.random.PRNGKey(2),
+        n_epochs=300,
+        batch_size=64,
+        learning_rate=3e-3,
+    )
+    assert history["validation"][-1] < 10 * history["train"][-1]
+    assert emu.metadata["validation_rmse"]["S_CC"] < 0.02
+    emu.save(tmp_path / "C.npz")
+
+    hnc = state["ionic scattering"]
+    model = jaxrts.models.EmulatedIonFeat(tmp_path / "C.npz", fallback=hnc)
+    state["ionic scattering"] = model
+    assert model.in_domain(state, setup)
+    assert jnp.allclose(
+        model.S_ii(state, setup).m_as(ureg.dimensionless),
+        hnc.S_ii(state, setup).m_as(ureg.dimensionless),
+        atol=0.03,
+    )
+
+    # Outside the training domain, HNC is used
+    state.T_e = 100 * ureg.electron_volt / ureg.k_B
+    state.T_i = jnp.array([100.0]) * ureg.electron_volt / ureg.k_B
+    assert not model.in_domain(state, setup)
+    assert jnp.allclose(
+        model.S_ii(state, setup).m_as(ureg.dimensionless),
+        hnc.S_ii(state, setup).m_as(ureg.dimensionless),
+    )
@@ -0,0 +1,91 @@
+import jax
+import jax.numpy as jnp
+
+import jaxrts
+from jaxrts import fitting
+
+ureg = jaxrts.ureg
+
+
+def _synthetic_spectrum():
+    state = jaxrts.PlasmaState(
+        ions=[jaxrts.Element("C")],
+        Z_free=jnp.array([2.0]),
+        mass_density=jnp.array([2.0]) * ureg.gram / ureg.centimeter**3,
+        T_e=jnp.array([20]) * ureg.electron_volt / ureg.k_B,
+    )
+    state["ionic scattering"] = jaxrts.models.Neglect()
+    state["free-free scattering"] = jaxrts.models.RPA_DandreaFit()
+    state["bound-free scattering"] = jaxrts.models.Neglect()
+    state["free-bound scattering"] = jaxrts.models.Neglect()
+    setup = jaxrts.Setup(
+        ureg("145°"),
+        ureg("5keV"),
+        jnp.linspace(4.85, 5.05, 300) * ureg.kiloelectron_volts,
+        lambda x: jaxrts.instrument_function.instrument_gaussian(
+            x, ureg("3eV") / ureg.hbar
+        ),
+    )
+    truth = state.probe(setup).m_as(ureg.second)
+    noise = jax.random.normal(jax.random.PRNGKey(0), truth.shape)
+    data = truth / jnp.max(truth) * (1 + 0.01 * noise)
+    return state, setup, data
+
+
+parameters = (
+    fitting.Parameter(("T_e", "T_i"), 1, 200, unit="eV/k_B"),
+    fitting.Parameter("Z_free", 0.1, 6, index=0),
+)
+
+
+def test_parameter_transformation_roundtrip():
+    x = jnp.array([150.0, 3.0])
+    u = fitting.to_internal(parameters, x)
+    assert jnp.allclose(fitting.to_physical(parameters, u), x)
+    # The physical values stay within the bounds for any internal value
+    for u in [-1e3, 0.0, 1e3]:
+        phys = fitting.to_physical(parameters, jnp.array([u, u]))
+        assert jnp.all(phys >= jnp.array([1, 0.1]))
+        assert jnp.all(phys <= jnp.array([200, 6]))
+
+
+def test_fit_recovers_synthetic_parameters():
+    state, setup, data = _synthetic_spectrum()
+    result = fitting.fit(
+        state,
+        setup,
+        data,
+        parameters,
+        initial=[[10, 1.0], [50, 4.0]],
+    )
+    assert jnp.allclose(result.values, jnp.array([20.0, 2.0]), rtol=0.02)
+    assert jnp.all(jnp.isfinite(result.uncertainties))
+    assert jnp.all(result.uncertainties > 0)
+    # Both starts end up in the same minimum
+    assert jnp.allclose(result.starts_chi2[0], result.starts_chi2[1])
+    assert result.reduced_chi2 < 1e-3
+
+
+def test_lbfgs_reaches_the_minimum():
+    state, setup, data = _synthetic_spectrum()
+    u0 = fitting.to_internal(parameters, jnp.array([10.0, 1.0]))
+    u, _, _ = fitting.solve(u0, parameters, state, setup, data, method="lbfgs")
+    assert jnp.allclose(
+        fitting.to_physical(parameters, u),
+        jnp.array([20.0, 2.0]),
+        rtol=0.02,
+    )
+
+
+def test_loss_gradient_against_finite_differences():
+    state, setup, data = _synthetic_spectrum()
+    u = fitting.to_internal(parameters, jnp.array([15.0, 1.5]))
+    _, grad = fitting.value_and_grad(u, parameters, state, setup, data)
+    h = 1e-5
+    for i in range(len(u)):
+        du = jnp.zeros_like(u).at[i].set(h)
+        fd = (
+            fitting.loss(u + du, parameters, state, setup, data)
+            - fitting.loss(u - du, parameters, state, setup, data)
+        ) / (2 * h)
+        assert jnp.isclose(grad[i], fd, rtol=1e-4)
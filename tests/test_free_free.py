@@ -460,3 +460,103 @@ def test_Fortman_reproduces_vanilla_BMA_without_LFC():
     )
     assert jnp.isclose(jnp.real(classical_BMA), jnp.real(fortmann_BMA)).all()
     assert jnp.isclose(jnp.imag(classical_BMA), jnp.imag(fortmann_BMA)).all()
+
+
+def test_tabulated_collision_frequency_reproduces_quadrature():
+    Zf = 1.0
+    lambda_0 = 4.13 * ureg.nanometer
+    theta = 60
+    n_e = 1e21 / ureg.centimeter**3
+
+    k = (4 * jnp.pi / lambda_0) * jnp.sin(jnp.deg2rad(theta) / 2.0)
+    w_pl = jaxrts.plasma_physics.plasma_frequency(n_e)
+    E = jnp.linspace(-6, 6, 200) * w_pl * ureg.hbar
+
+    T = 50000 * ureg.kelvin
+    mu = jaxrts.plasma_physics.chem_pot_interpolationIchimaru(T, n_e)
+
+    @jax.tree_util.Partial
+    def S_ii(q):
+        return jnpu.ones_like(q)
+
+    @jax.tree_util.Partial
+    def V_eiS(q):
+        return jaxrts.plasma_physics.coulomb_potential_fourier(Zf, -1, q)
+
+    E_table = jnp.geomspace(0.1, 1.1, 24) * 6 * w_pl * ureg.hbar
+    T_table = jnp.array([45000.0, 55000.0]) * ureg.kelvin
+    nu = jnp.array(
+        [
+            jaxrts.free_free.collision_frequency_BA_quadrature(
+                E_table, T_i, S_ii, V_eiS, n_e, None, Zf, "Dandrea"
+            )[0].m_as(1 / ureg.second)
+            for T_i in T_table
+        ]
+    )
+    table = jaxrts.free_free.CollisionFrequencyTable(
+        T_table,
+        jnp.array([n_e.m_as(1 / ureg.meter**3)]) / (1 * ureg.meter**3),
+        jnp.array([Zf]),
+        E_table,
+        nu[:, jnp.newaxis, jnp.newaxis, :] / (1 * ureg.second),
+    )
+    # On the nodes, the table is exact
+    assert jnp.allclose(
+        table(E_table, T_table[0], n_e, Zf).m_as(1 / ureg.second), nu[0]
+    )
+    # In between, the interpolation error is small
+    E_mid = jnpu.sqrt(E_table[1:] * E_table[:-1])
+    error = jaxrts.free_free.collision_frequency_table_error(
+        table, E_mid, T, S_ii, V_eiS, n_e, mu, Zf, "Dandrea"
+    )
+    assert jnp.max(error) < 0.02
+
+    See_quad = jaxrts.free_free.S0_ee_BMA_chapman_interpFit(
+        k, T, mu, S_ii, V_eiS, n_e, Zf, E
+    )
+    See_table = jaxrts.free_free.S0_ee_BMA_chapman_interpFit(
+        k, T, mu, S_ii, V_eiS, n_e, Zf, E, coll_freq_table=table
+    )
+    assert jnpu.max(jnpu.absolute(See_quad - See_table)) < 0.02 * jnpu.max(
+        See_quad
+    )
+
+
+def test_fixed_quadrature_RPA_agrees_with_quadgk():
+    n_e = 1e23 / ureg.centimeter**3
+    T = 10 * ureg.electron_volt / ureg.k_B
+    k = 2 / ureg.angstrom
+    mu = jaxrts.plasma_physics.chem_pot_interpolationIchimaru(T, n_e)
+    w_pl = jaxrts.plasma_physics.plasma_frequency(n_e)
+    E = jnp.linspace(-20, 20, 81) * w_pl * ureg.hbar
+
+    eps_quadgk = jaxrts.free_free.dielectric_function_RPA_no_damping(
+        k, E, mu, T
+    )
+    eps_fixed = jaxrts.free_free.dielectric_function_RPA_no_damping(
+        k, E, mu, T, quadrature="fixed"
+    )
+    assert (
+        jnp.max(jnp.abs(eps_fixed - eps_quadgk) / jnp.abs(eps_quadgk - 1))
+        < 5e-3
+    )
+
+    E_damped = E + 0.5j * w_pl * ureg.hbar
+    eps_quadgk = jaxrts.free_free.dielectric_function_RPA(k, E_damped, mu, T)
+    eps_fixed = jaxrts.free_free.dielectric_function_RPA(
+        k, E_damped, mu, T, quadrature="fixed"
+    )
+    assert (
+        jnp.max(jnp.abs(eps_fixed - eps_quadgk) / jnp.abs(eps_quadgk - 1))
+        < 1e-6
+    )
+
+    # The fixed quadrature can be vectorized over all parameters
+    T_scan = jnp.array([5, 10, 20]) * ureg.electron_volt / ureg.k_B
+    eps_scan = jax.vmap(
+        lambda _T: jaxrts.free_free.dielectric_function_RPA(
+            k, E_damped, mu, _T, quadrature="fixed"
+        )
+    )(T_scan)
+    assert eps_scan.shape == (3, len(E))
+    assert jnp.allclose(eps_scan[1], eps_fixed)
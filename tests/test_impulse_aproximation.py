@@ -146,3 +146,42 @@ def test_Schum_vs_BM():
     assert jnpu.max(jnpu.absolute(J21BM - J21Schum) / jnpu.max(J21BM)) < 1e-6
     assert jnpu.max(jnpu.absolute(J20BM - J20Schum) / jnpu.max(J20BM)) < 1e-6
     assert jnpu.max(jnpu.absolute(J10BM - J10Schum) / jnpu.max(J10BM)) < 1e-6
+
+
+def test_tabulated_impulse_approximation_matches_closed_form():
+    omega = jnp.linspace(-100, 1500, 800) * ureg.electron_volt / ureg.hbar
+    k = 7.9 / ureg.angstrom
+    E_b = jaxrts.Element("Ar").binding_energies
+    for Z_b in [3, 6, 10, 16]:
+        Zeff = 18 - jaxrts.form_factors.pauling_size_screening_constants(Z_b)
+        population = jaxrts.elements.electron_distribution_ionized_state(Z_b)
+        closed = jaxrts.bound_free.J_impulse_approx(
+            omega, k, population, Zeff, E_b
+        )
+        tabulated = jaxrts.bound_free.J_impulse_tabulated(
+            omega, k, population, Zeff, E_b
+        )
+        assert (
+            jnpu.max(jnpu.absolute(tabulated - closed)) / jnpu.max(closed)
+        ).m_as(ureg.dimensionless) < 1e-5
+
+
+def test_tabulated_impulse_approximation_is_vectorized_over_ions():
+    omega = jnp.linspace(0, 800, 300) * ureg.electron_volt / ureg.hbar
+    k = 4 / ureg.angstrom
+    Z_b = jnp.array([2.0, 3.5, 5.0])
+    Zeff = 6 - jaxrts.form_factors.pauling_size_screening_constants(Z_b)
+    population = jaxrts.elements.electron_distribution_ionized_state(Z_b)
+    E_b = jaxrts.Element("C").binding_energies
+    E_b = jnp.stack([E_b.m_as(ureg.electron_volt)] * 3, axis=1)
+    E_b = E_b * ureg.electron_volt
+
+    all_ions = jaxrts.bound_free.J_impulse_tabulated(
+        omega, k, population, Zeff, E_b
+    )
+    assert all_ions.shape == (3, len(omega))
+    for i in range(3):
+        single = jaxrts.bound_free.J_impulse_tabulated(
+            omega, k, population[:, i], Zeff[:, i], E_b[:, i]
+        )
+        assert jnpu.allclose(all_ions[i], single)
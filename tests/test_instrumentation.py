@@ -0,0 +1,68 @@
+import jax
+from jax import numpy as jnp
+
+import jaxrts
+
+ureg = jaxrts.ureg
+
+test_state = jaxrts.PlasmaState(
+    ions=[jaxrts.Element("C")],
+    Z_free=jnp.array([2]),
+    mass_density=jnp.array([3.5]) * ureg.gram / ureg.centimeter**3,
+    T_e=jnp.array([80]) * ureg.electron_volt / ureg.k_B,
+)
+test_state["ionic scattering"] = jaxrts.models.OnePotentialHNCIonFeat(pot=8)
+test_state["free-free scattering"] = jaxrts.models.RPA_DandreaFit()
+test_state["bound-free scattering"] = jaxrts.models.Neglect()
+test_state["free-bound scattering"] = jaxrts.models.Neglect()
+
+test_setup = jaxrts.Setup(
+    ureg("60°"),
+    ureg("4768.6eV"),
+    jnp.linspace(4750, 4800, 50) * ureg.electron_volt,
+    lambda x: jaxrts.instrument_function.instrument_gaussian(
+        x, 1 / ureg.second
+    ),
+)
+
+
+def test_profile_reports_nested_models_and_counters():
+    report = test_state.profile(test_setup, repeats=1)
+
+    assert set(jaxrts.instrumentation.probe_keys) <= set(report.models)
+    ionic = report["ionic scattering"]
+    assert ionic.model == "OnePotentialHNCIonFeat"
+    assert "form-factors" in ionic.calls
+    assert "form-factors" in report.models
+    assert ionic.counters["HNC iterations"] > 0
+    for profile in [*report.models.values(), report.probe]:
+        assert profile.compile_time > 0
+        assert len(profile.run_times) == 1
+    assert "ionic scattering" in str(report)
+    assert not jaxrts.instrumentation.enabled()
+
+
+def test_instrumentation_only_changes_traced_code_when_enabled():
+    def hlo():
+        return (
+            jax.jit(jaxrts.PlasmaState.probe)
+            .lower(test_state, test_setup)
+            .as_text(debug_info=True)
+        )
+
+    plain = hlo()
+    assert "ionic scattering:" not in plain
+    assert "callback" not in plain
+
+    with jaxrts.instrumentation.instrument():
+        scoped = hlo()
+    assert "ionic scattering:OnePotentialHNCIonFeat" in scoped
+    assert "callback" not in scoped
+
+    with jaxrts.instrumentation.instrument(counting=True):
+        assert "callback" in hlo()
+
+    # After disabling the instrumentation, nothing is added, anymore
+    plain = hlo()
+    assert "ionic scattering:" not in plain
+    assert "callback" not in plain
@@ -1,3 +1,4 @@
+import scipy.special
 from jax import numpy as jnp
 
 import jaxrts
@@ -27,3 +28,41 @@ def test_fukushima_inversion():
         )
         < 0.001
     )
+
+
+def test_monotone_cubic_interp_preserves_monotonicity():
+    xp = jnp.array([0.0, 1.0, 2.0, 2.5, 4.0, 6.0])
+    fp = jnp.array([0.0, 0.0, 1.0, 1.0, 5.0, 5.1])
+    x = jnp.linspace(0, 6, 301)
+    y = jaxrts.math.monotone_cubic_interp(x, xp, fp)
+
+    # The data is reproduced and there is no overshoot
+    assert jnp.allclose(jaxrts.math.monotone_cubic_interp(xp, xp, fp), fp)
+    assert jnp.all(jnp.diff(y) >= -1e-12)
+    assert jnp.all((y >= 0) & (y <= 5.1))
+    # Cubic polynomials which are monotonous are interpolated accurately
+    xp = jnp.linspace(0, 1, 40)
+    x = jnp.linspace(0, 1, 301)
+    assert jnp.allclose(
+        jaxrts.math.monotone_cubic_interp(x, xp, xp**3), x**3, atol=1e-4
+    )
+    # Outside of the data range, left and right are returned
+    y = jaxrts.math.monotone_cubic_interp(
+        jnp.array([-1.0, 2.0]), xp, xp, left=-2.0, right=3.0
+    )
+    assert jnp.allclose(y, jnp.array([-2.0, 3.0]))
+
+
+def test_dawson_integral():
+    x = jnp.linspace(-50, 50, 20001)
+    D = jaxrts.math.dawson(x)
+    assert jnp.allclose(D, scipy.special.dawsn(x), rtol=1e-12, atol=0)
+
+
+def test_sine_integral_auxiliary_f():
+    x = jnp.logspace(-3, 4, 2000)
+    Si, Ci = scipy.special.sici(x)
+    f = Ci * jnp.sin(x) + (jnp.pi / 2 - Si) * jnp.cos(x)
+    assert jnp.allclose(
+        jaxrts.math.sine_integral_auxiliary_f(x), f, rtol=1e-10, atol=0
+    )
@@ -1,5 +1,6 @@
 import copy
 import logging
+import jax
 import pytest
 from jax import numpy as jnp
 
@@ -50,6 +51,12 @@ def additional_model_parameters(
             jnp.ones((no_of_ions, no_of_ions)) * 1.23 * ureg.dimensionless,
         )
 
+    if model == jaxrts.models.TabulatedSii:
+        return (
+            jnp.linspace(0.1, 10, 64) / (1 * ureg.angstrom),
+            jnp.ones(64),
+        )
+
     if model == jaxrts.models.PeakCollection:
         return (
             jnp.array([1, 2]) / (1 * ureg.angstrom),
@@ -69,6 +76,25 @@ def additional_model_parameters(
             S_plasmaModel,
             PowderModel,
         )
+    if model == jaxrts.models.EmulatedIonFeat:
+        # An untrained emulator for the states used below, which is used
+        # everywhere.
+        ions = [jaxrts.Element("C"), jaxrts.Element("Cl")][:no_of_ions]
+        state = jaxrts.PlasmaState(
+            ions=ions,
+            Z_free=jnp.ones(no_of_ions),
+            mass_density=jnp.ones(no_of_ions) * ureg.gram / ureg.centimeter**3,
+            T_e=jnp.array([80]) * ureg.electron_volt / ureg.k_B,
+        )
+        domain = {"theta": (0.1, 10), "rho": (1, 5), "k/q_k": (0.1, 10)}
+        domain.update({f"Z_{ion.symbol}": (0, 5) for ion in ions})
+        return (
+            jaxrts.emulator.Emulator.create(
+                jax.random.PRNGKey(0), state, domain, hidden=(4,)
+            ),
+            None,
+            True,
+        )
     return ()
 
 
@@ -179,3 +205,75 @@ def test_all_models_can_be_evaluated_two_component():
                 assert out is not None
             except Exception:
                 raise AssertionError(f"Error evaluating {model} as {key}.")
+
+
+def test_adaptive_sampling_is_more_accurate_than_uniform_sampling():
+    state = jaxrts.PlasmaState(
+        ions=[jaxrts.Element("C")],
+        Z_free=jnp.array([2]),
+        mass_density=jnp.array([1.5]) * ureg.gram / ureg.centimeter**3,
+        T_e=jnp.array([20]) * ureg.electron_volt / ureg.k_B,
+    )
+    setup = jaxrts.setup.Setup(
+        ureg("30°"),
+        ureg("8keV"),
+        jnp.linspace(7.5, 8.1, 400) * ureg.kiloelectron_volts,
+        lambda x: jaxrts.instrument_function.instrument_gaussian(
+            x, 1 * ureg.electron_volt / ureg.hbar
+        ),
+    )
+    state["free-free scattering"] = jaxrts.models.RPA_DandreaFit()
+    reference = state.evaluate("free-free scattering", setup)
+
+    errors = {}
+    for sampling in ["uniform", "adaptive"]:
+        model = jaxrts.models.RPA_DandreaFit(sample_points=48)
+        model.sampling = sampling
+        state["free-free scattering"] = model
+        S_ee = state.evaluate("free-free scattering", setup)
+        errors[sampling] = jnp.linalg.norm(
+            (S_ee - reference).m_as(ureg.second)
+        ) / jnp.linalg.norm(reference.m_as(ureg.second))
+    assert errors["adaptive"] < 0.01
+    assert errors["adaptive"] < errors["uniform"] / 3
+
+
+def test_pair_sum_matches_loop_over_ion_pairs():
+    x = jnp.array([0.2, 0.3, 0.5])
+    amplitude = jnp.array([[1.0], [2.0], [0.5]])
+    S_ab = jnp.arange(9.0).reshape(3, 3) * ureg.dimensionless
+    expected = 0
+    for a in range(3):
+        for b in range(3):
+            expected += (
+                jnp.sqrt(x[a] * x[b])
+                * amplitude[a]
+                * amplitude[b]
+                * S_ab[a, b]
+            )
+    result = jaxrts.models._pair_sum(x, amplitude, S_ab)
+    assert result.shape == expected.shape
+    assert jnp.allclose(result.m_as(ureg.dimensionless), expected.magnitude)
+
+
+def test_tabulated_BM_S_ii_matches_direct_evaluation():
+    state = copy.deepcopy(test_state)
+    state["ionic scattering"] = jaxrts.models.OnePotentialHNCIonFeat(pot=10)
+    state["BM S_ii"] = jaxrts.models.Sum_Sii()
+    setup = jaxrts.setup.get_probe_setup(
+        jnp.linspace(0.5, 8, 20) / (1 * ureg.angstrom), test_setup
+    )
+
+    direct = state.evaluate("BM S_ii", setup)
+    S_ii = jaxrts.models._BM_S_ii(state, test_setup)
+    tabulated = jaxrts.models.TabulatedSii.from_state(state, test_setup)
+
+    assert jnp.allclose(S_ii(setup.k), direct, rtol=1e-3)
+    assert jnp.allclose(tabulated.evaluate(state, setup), direct, rtol=1e-3)
+    # A scalar k is returned with the same shape as by Sum_Sii
+    assert S_ii(setup.k[0]).shape == (1,)
+
+    # Models without a native k grid cannot be tabulated
+    state["ionic scattering"] = jaxrts.models.Gregori2003IonFeat()
+    with pytest.raises(ValueError):
+        jaxrts.models.TabulatedSii.from_state(state, test_setup)
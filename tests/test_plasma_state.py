@@ -1,5 +1,6 @@
 import copy
 
+import jpu.numpy as jnpu
 from jax import numpy as jnp
 
 import jaxrts
@@ -20,6 +21,7 @@ mult_comp_test_state = jaxrts.PlasmaState(
     T_e=jnp.array([80]) * ureg.electron_volt / ureg.k_B,
 )
 
+
 def plasmaStateEquality(state):
     # Test comparison with some random type
     assert state != 6
@@ -42,3 +44,93 @@ def test_OneComponentPlasmaStateEquality():
 
 def test_MultComponentPlasmaStateEquality():
     plasmaStateEquality(mult_comp_test_state)
+
+
+def test_PlasmaStateBatchMatchesSingleStates():
+    state = copy.deepcopy(one_comp_test_state)
+    state["ionic scattering"] = jaxrts.models.Gregori2003IonFeat()
+    state["free-free scattering"] = jaxrts.models.RPA_DandreaFit()
+    state["bound-free scattering"] = jaxrts.models.Neglect()
+    state["free-bound scattering"] = jaxrts.models.Neglect()
+    setup = jaxrts.Setup(
+        ureg("60°"),
+        ureg("4768.6eV"),
+        jnp.linspace(4750, 4800, 50) * ureg.electron_volt,
+        lambda x: jaxrts.instrument_function.instrument_gaussian(
+            x, 1 / ureg.second
+        ),
+    )
+    batch = jaxrts.PlasmaStateBatch(
+        state,
+        T_e=jnp.linspace(20, 100, 3) * ureg.electron_volt / ureg.k_B,
+        Z_free=jnp.array([1.5, 2.0, 3.0]),
+    )
+    assert len(batch) == 3
+    vmapped = batch.probe(setup)
+    chunked = batch.probe(setup, chunk_size=2)
+    for i in range(len(batch)):
+        single = batch[i].probe(setup)
+        assert jnp.allclose(
+            vmapped[i].m_as(ureg.second), single.m_as(ureg.second)
+        )
+        assert jnp.allclose(
+            chunked[i].m_as(ureg.second), single.m_as(ureg.second)
+        )
+
+
+def test_probe_with_shared_convolution_matches_sum_of_models():
+    state = copy.deepcopy(one_comp_test_state)
+    state["ionic scattering"] = jaxrts.models.Gregori2003IonFeat()
+    state["free-free scattering"] = jaxrts.models.RPA_DandreaFit()
+    state["bound-free scattering"] = jaxrts.models.SchumacherImpulse()
+    state["free-bound scattering"] = jaxrts.models.Neglect()
+    setup = jaxrts.Setup(
+        ureg("60°"),
+        ureg("4768.6eV"),
+        jnp.linspace(4600, 4800, 500) * ureg.electron_volt,
+        lambda x: jaxrts.instrument_function.instrument_gaussian(
+            x, ureg("2eV") / ureg.hbar
+        ),
+    )
+    separate = sum(
+        state.evaluate(key, setup).m_as(ureg.second)
+        for key in jaxrts.instrumentation.probe_keys
+    )
+    assert jnp.allclose(state.probe(setup).m_as(ureg.second), separate)
+
+
+def test_species_table_matches_elements():
+    state = mult_comp_test_state.expand_integer_ionization_states()
+    table = state.species
+    assert table is jaxrts.elements.species_table(state.ions)
+    assert table.binding_energies.shape == (10, state.nions)
+    for i, ion in enumerate(state.ions):
+        assert table.Z[i] == ion.Z
+        u = ureg.atomic_mass_constant
+        assert jnp.isclose(
+            state.atomic_masses[i].m_as(u), ion.atomic_mass.m_as(u)
+        )
+        eV = ureg.electron_volt
+        assert jnp.allclose(
+            table.binding_energies[:, i].m_as(eV),
+            ion.binding_energies.m_as(eV),
+        )
+        assert jnp.allclose(
+            table.ionization_energies[i, : ion.Z].m_as(eV),
+            ion.ionization.energies.m_as(eV),
+        )
+        assert not jnp.any(table.ionization_mask[i, ion.Z :])
+
+
+def test_db_wavelength():
+    state = mult_comp_test_state
+    wavelengths = state.db_wavelength(["e-", jaxrts.Element("Cl")])
+    for m, T, wavelength in zip(
+        [1 * ureg.electron_mass, state.atomic_masses[1]],
+        [state.T_e, state.T_i[1]],
+        wavelengths,
+    ):
+        expected = (1 * ureg.planck_constant) / jnpu.sqrt(
+            2 * jnp.pi * m * (1 * ureg.boltzmann_constant) * T
+        )
+        assert jnpu.isclose(wavelength, expected)
@@ -1,8 +1,14 @@
 import pathlib
 
-from jaxrts.saha import solve_saha
+from jaxrts.saha import (
+    mean_free_charge_saha,
+    saha_ionization_fractions,
+    solve_saha,
+    solve_saha_ipd,
+)
 from jaxrts.units import ureg
 import jaxrts
+import jax
 import jax.numpy as jnp
 import numpy as onp
 
@@ -92,3 +98,86 @@ def test_against_MALGS_calculation():
                 jnp.abs((calc - interp) / full_electron_density[idx])
             )
             assert diff < 5e-3
+
+
+def test_batched_saha_fulfills_charge_neutrality():
+    ions = (jaxrts.Element("C"), jaxrts.Element("H"), jaxrts.Element("O"))
+    T_e = jnp.logspace(0, 3, 7)[:, jnp.newaxis] * ureg.electron_volt / ureg.k_B
+    n_i = (
+        jnp.logspace(26, 30, 5)[:, jnp.newaxis]
+        * jnp.array([1.0, 2.0, 0.5])
+        * (1 / ureg.meter**3)
+    )
+    fractions, n_e = saha_ionization_fractions(ions, T_e, n_i)
+    assert fractions.shape == (7, 5, 3, 9)
+    assert n_e.shape == (7, 5)
+
+    assert jnp.allclose(jnp.sum(fractions, axis=-1), 1)
+    Z = mean_free_charge_saha(ions, T_e, n_i)
+    assert jnp.allclose(
+        jnp.sum(Z * n_i.m_as(1 / ureg.meter**3), axis=-1),
+        n_e.m_as(1 / ureg.meter**3),
+        rtol=1e-8,
+    )
+    # The batched call agrees with the individual calls
+    for i, j in [(0, 0), (3, 2), (6, 4)]:
+        assert jnp.allclose(
+            mean_free_charge_saha(ions, T_e[i, 0], n_i[j]), Z[i, j]
+        )
+
+
+def test_saha_gradient_against_finite_differences():
+    ions = (jaxrts.Element("C"), jaxrts.Element("H"))
+    n_i = jnp.array([1e28, 2e28]) * (1 / ureg.meter**3)
+
+    def Z_C(T):
+        return mean_free_charge_saha(
+            ions, T * ureg.electron_volt / ureg.k_B, n_i
+        )[0]
+
+    T, dT = 10.0, 1e-4
+    fd = (Z_C(T + dT) - Z_C(T - dT)) / (2 * dT)
+    assert jnp.isclose(jax.grad(Z_C)(T), fd, rtol=1e-5)
+
+
+def test_self_consistent_saha_ipd():
+    ions = [jaxrts.Element("C"), jaxrts.Element("H")]
+    mass_fraction = jaxrts.helpers.mass_from_number_fraction(
+        jnp.array([0.5, 0.5]), ions
+    )
+    plasma_state = jaxrts.PlasmaState(
+        ions=ions,
+        Z_free=jnp.array([1.0, 0.5]),
+        mass_density=ureg("3g/cc") * mass_fraction,
+        T_e=ureg("20eV") / ureg.k_B,
+    )
+    plasma_state["ipd"] = jaxrts.models.StewartPyattIPD()
+
+    Z, ipd, n_iter = solve_saha_ipd(plasma_state, tol=1e-10)
+    Z_plain, _, n_iter_plain = solve_saha_ipd(
+        plasma_state, tol=1e-10, history=1
+    )
+    assert n_iter < n_iter_plain < 100
+    assert jnp.allclose(Z, Z_plain, rtol=1e-8)
+
+    # Z is a fixed point: The IPD at Z results in the Saha ionization Z
+    plasma_state.Z_free = Z
+    assert jnp.allclose(
+        ipd.m_as(ureg.electron_volt),
+        plasma_state["ipd"]
+        .evaluate(plasma_state, None)
+        .m_as(ureg.electron_volt),
+    )
+    n_i = plasma_state.mass_density / plasma_state.atomic_masses
+    assert jnp.allclose(
+        mean_free_charge_saha(tuple(ions), plasma_state.T_e, n_i, ipd), Z
+    )
+
+    # Batched solution
+    T_e = jnp.array([10.0, 20.0, 40.0]) * ureg.electron_volt / ureg.k_B
+    batch = jaxrts.plasmastate.PlasmaStateBatch(plasma_state, T_e=T_e)
+    Z_batch, ipd_batch, n_iter_batch = solve_saha_ipd(batch, tol=1e-10)
+    assert Z_batch.shape == (3, 2)
+    assert ipd_batch.shape == (3, 2)
+    assert n_iter_batch.shape == (3,)
+    assert jnp.allclose(Z_batch[1], Z, rtol=1e-8)
@@ -0,0 +1,103 @@
+from functools import partial
+
+import jax
+import jax.numpy as jnp
+
+import jaxrts
+from jaxrts import fitting, sampling
+
+ureg = jaxrts.ureg
+
+mu = jnp.array([1.0, -2.0])
+sd = jnp.array([0.5, 2.0])
+
+
+def gaussian(u):
+    return -0.5 * jnp.sum(((u - mu) / sd) ** 2)
+
+
+def shifted_gaussian(u):
+    return -0.5 * jnp.sum(((u - mu - 0.3 * sd) / (1.2 * sd)) ** 2)
+
+
+@partial(jax.jit, static_argnames=["surrogate"])
+def _run_chains(key, surrogate=None):
+    def chain(key):
+        key_warmup, key_sample = jax.random.split(key)
+        state = sampling.init_state(jnp.zeros(2), gaussian, surrogate)
+        state, step_size, inverse_mass = sampling.warmup(
+            key_warmup, state, gaussian, 200, 10, surrogate=surrogate
+        )
+        _, (u, _) = sampling.sample_chain(
+            key_sample,
+            state,
+            gaussian,
+            step_size,
+            inverse_mass,
+            10,
+            500,
+            surrogate=surrogate,
+        )
+        return u
+
+    return jax.vmap(chain)(jax.random.split(key, 8)).reshape(-1, 2)
+
+
+def test_hmc_samples_gaussian():
+    u = _run_chains(jax.random.PRNGKey(1))
+    assert jnp.allclose(jnp.mean(u, axis=0), mu, atol=0.1 * sd)
+    assert jnp.allclose(jnp.std(u, axis=0), sd, rtol=0.1)
+
+
+def test_surrogate_trajectories_sample_the_full_density():
+    # The trajectories are guided by a wrong density, but the acceptance step
+    # corrects for it.
+    u = _run_chains(jax.random.PRNGKey(2), shifted_gaussian)
+    assert jnp.allclose(jnp.mean(u, axis=0), mu, atol=0.1 * sd)
+    assert jnp.allclose(jnp.std(u, axis=0), sd, rtol=0.1)
+
+
+def test_sample_spectrum_with_checkpoint(tmp_path):
+    state = jaxrts.PlasmaState(
+        ions=[jaxrts.Element("C")],
+        Z_free=jnp.array([2.0]),
+        mass_density=jnp.array([2.0]) * ureg.gram / ureg.centimeter**3,
+        T_e=jnp.array([20]) * ureg.electron_volt / ureg.k_B,
+    )
+    state["ionic scattering"] = jaxrts.models.Neglect()
+    state["free-free scattering"] = jaxrts.models.RPA_DandreaFit()
+    state["bound-free scattering"] = jaxrts.models.Neglect()
+    state["free-bound scattering"] = jaxrts.models.Neglect()
+    setup = jaxrts.Setup(
+        ureg("145°"),
+        ureg("5keV"),
+        jnp.linspace(4.85, 5.05, 100) * ureg.kiloelectron_volts,
+        lambda x: jaxrts.instrument_function.instrument_gaussian(
+            x, ureg("3eV") / ureg.hbar
+        ),
+    )
+    truth = state.probe(setup).m_as(ureg.second)
+    data = truth / jnp.max(truth)
+    parameters = (fitting.Parameter(("T_e", "T_i"), 1, 200, unit="eV/k_B"),)
+
+    checkpoint = tmp_path / "chains.npz"
+    kwargs = dict(
+        sigma=0.02,
+        n_warmup=40,
+        n_chains=2,
+        n_leapfrog=4,
+        checkpoint=checkpoint,
+        checkpoint_every=10,
+    )
+    first = sampling.sample(
+        state, setup, data, parameters, n_samples=20, **kwargs
+    )
+    assert checkpoint.exists()
+    # Resuming the run only draws the missing samples
+    result = sampling.sample(
+        state, setup, data, parameters, n_samples=30, **kwargs
+    )
+    assert result.samples.shape == (2, 30, 1)
+    assert jnp.all(result.samples[:, :20] == first.samples)
+    assert jnp.all(jnp.isfinite(result.r_hat))
+    assert jnp.abs(result.mean[0] - 20) < 3 * result.std[0] + 0.5
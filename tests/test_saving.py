@@ -98,6 +98,31 @@ def test_save_and_load_setup():
     )
 
 
+def test_save_and_load_collision_frequency_table():
+    table = jaxrts.free_free.CollisionFrequencyTable(
+        jnp.array([1e4, 2e4]) * ureg.kelvin,
+        jnp.array([1e27]) / (1 * ureg.meter**3),
+        jnp.array([1.0, 2.0]),
+        jnp.geomspace(1, 10, 5) * ureg.electron_volt,
+        (1 + 2j) * jnp.ones((2, 1, 2, 5)) / (1 * ureg.second),
+    )
+    model = jaxrts.models.BornMermin_Fit(collision_frequency_table=table)
+    with tempfile.NamedTemporaryFile() as tmp:
+        with open(tmp.name, "w") as f:
+            saving.dump(model, f)
+        with open(tmp.name, "r") as f:
+            loaded_model = saving.load(f, jaxrts.ureg)
+    loaded_table = loaded_model.collision_frequency_table
+    assert loaded_table.nu.shape == (2, 1, 2, 5)
+    assert jnp.allclose(
+        loaded_table.nu.m_as(1 / ureg.second), table.nu.m_as(1 / ureg.second)
+    )
+    assert jnp.allclose(
+        loaded_table.E.m_as(ureg.electron_volt),
+        table.E.m_as(ureg.electron_volt),
+    )
+
+
 def test_function_saving_and_loading():
     test_function = jax.tree_util.Partial(
         jaxrts.instrument_function.instrument_gaussian
@@ -1,3 +1,4 @@
+import jax
 import pytest
 from jax import numpy as jnp
 
@@ -49,3 +50,44 @@ def test_peak_position_stability_with_convolution() -> None:
 
 
 test_peak_position_stability_with_convolution()
+
+
+def test_fft_convolution_agrees_with_direct_convolution() -> None:
+    setup = jaxrts.setup.Setup(
+        ureg("145°"),
+        ureg("5keV"),
+        jnp.linspace(4.8, 5.189, 1001) * ureg.kiloelectron_volts,
+        lambda x: jaxrts.instrument_function.instrument_gaussian(
+            x, ureg("3eV") / ureg.hbar
+        ),
+    )
+    S = jaxrts.instrument_function.instrument_gaussian(
+        (setup.measured_energy - ureg("4.9keV")) / ureg.hbar,
+        ureg("10eV") / ureg.hbar,
+    )
+    assert len(setup.measured_energy) > (
+        jaxrts.setup.fft_convolution_threshold
+    )
+    direct = jnp.convolve(
+        S.m_as(ureg.second),
+        setup.instrument(setup.conv_grid).m_as(ureg.second),
+        mode="same",
+    )
+    fft = jaxrts.setup.convolve_stucture_factor_with_instrument(S, setup) / (
+        (1 * ureg.second**2)
+        * ((setup.measured_energy[1] - setup.measured_energy[0]) / ureg.hbar)
+    )
+    assert jnp.allclose(
+        fft.m_as(ureg.dimensionless), direct, atol=1e-12 * jnp.max(direct)
+    )
+
+    # The cached kernel is updated, if the instrument changes
+    setup.instrument = jax.tree_util.Partial(
+        lambda x: jaxrts.instrument_function.instrument_gaussian(
+            x, ureg("1eV") / ureg.hbar
+        )
+    )
+    assert jnp.allclose(
+        setup.instrument_kernel.m_as(ureg.second),
+        setup.instrument(setup.conv_grid).m_as(ureg.second),
+    )
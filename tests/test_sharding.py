@@ -0,0 +1,47 @@
+import jax.numpy as jnp
+
+import jaxrts
+
+ureg = jaxrts.ureg
+
+
+def test_sharded_probe_matches_probe():
+    state = jaxrts.PlasmaState(
+        ions=[jaxrts.Element("C")],
+        Z_free=jnp.array([2.0]),
+        mass_density=jnp.array([2.0]) * ureg.gram / ureg.centimeter**3,
+        T_e=jnp.array([20]) * ureg.electron_volt / ureg.k_B,
+    )
+    state["ionic scattering"] = jaxrts.models.Gregori2003IonFeat()
+    state["free-free scattering"] = jaxrts.models.RPA_DandreaFit()
+    state["bound-free scattering"] = jaxrts.models.SchumacherImpulse()
+    state["free-bound scattering"] = jaxrts.models.Neglect()
+    setup = jaxrts.Setup(
+        ureg("145°"),
+        ureg("5keV"),
+        jnp.linspace(4.5, 5.1, 301) * ureg.kiloelectron_volts,
+        lambda x: jaxrts.instrument_function.instrument_gaussian(
+            x, ureg("5eV") / ureg.hbar
+        ),
+    )
+    mesh = jaxrts.sharding.device_mesh()
+    assert 0 < jaxrts.sharding.instrument_halo(setup) < 301 // 2
+
+    assert jnp.allclose(
+        jaxrts.sharding.probe(state, setup, mesh).m_as(ureg.second),
+        state.probe(setup).m_as(ureg.second),
+    )
+    assert jnp.allclose(
+        jaxrts.sharding.evaluate(
+            state, "bound-free scattering", setup, mesh
+        ).m_as(ureg.second),
+        state.evaluate("bound-free scattering", setup).m_as(ureg.second),
+    )
+
+    batch = jaxrts.PlasmaStateBatch(
+        state, T_e=jnp.linspace(10, 50, 3) * ureg.electron_volt / ureg.k_B
+    )
+    assert jnp.allclose(
+        jaxrts.sharding.probe(batch, setup).m_as(ureg.second),
+        batch.probe(setup).m_as(ureg.second),
+    )
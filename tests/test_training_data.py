@@ -0,0 +1,82 @@
+import jax
+import jax.numpy as jnp
+import numpy as onp
+import pytest
+
+import jaxrts
+from jaxrts import emulator, training_data
+
+ureg = jaxrts.ureg
+
+domain = {
+    "theta": (0.3, 3),
+    "rho": (1, 4),
+    "Z_C": (2, 4),
+    "k/q_k": (0.2, 3),
+}
+
+
+def _carbon_state():
+    state = jaxrts.PlasmaState(
+        ions=[jaxrts.Element("C")],
+        Z_free=jnp.array([3.0]),
+        mass_density=jnp.array([2.0]) * ureg.gram / ureg.centimeter**3,
+        T_e=10 * ureg.electron_volt / ureg.k_B,
+    )
+    state["ion-ion Potential"] = jaxrts.hnc_potentials.DebyeHueckelPotential()
+    state["ionic scattering"] = jaxrts.models.OnePotentialHNCIonFeat(pot=10)
+    return state
+
+
+@pytest.mark.parametrize("method", ["sobol", "lhs", "uniform"])
+def test_design_is_reproducible_and_within_bounds(method):
+    lower = onp.array([0.0, -1.0, 2.0])
+    upper = onp.array([1.0, 1.0, 5.0])
+    x = training_data.design(100, lower, upper, method, seed=3)
+    assert x.shape == (100, 3)
+    assert onp.all(x >= lower) and onp.all(x <= upper)
+    assert onp.array_equal(
+        x, training_data.design(100, lower, upper, method, seed=3)
+    )
+
+
+@pytest.mark.parametrize("method", ["sobol", "lhs"])
+def test_design_is_stratified(method):
+    # Every one of n equally sized intervals of every dimension contains
+    # exactly one point of a Latin hypercube, and of a Sobol sequence with
+    # a power of two points.
+    n = 64
+    x = training_data.design(n, onp.zeros(4), onp.ones(4), method)
+    for dim in range(4):
+        counts = onp.bincount((x[:, dim] * n).astype(int), minlength=n)
+        assert onp.all(counts == 1)
+
+
+def test_interrupted_generation_is_continued(tmp_path):
+    state = _carbon_state()
+    emu = emulator.Emulator.create(jax.random.PRNGKey(0), state, domain)
+    path = tmp_path / "data"
+
+    complete = training_data.generate(
+        emu, state, tmp_path / "complete", 12, chunk_size=4, batch_size=4
+    )
+    x, S, metadata = training_data.load(tmp_path / "complete")
+    assert x.shape == (12, 5)
+    assert S.shape == (12, 1)
+    assert jnp.all(jnp.isfinite(S))
+    assert metadata["reference"] == "OnePotentialHNCIonFeat"
+    assert metadata["input_names"] == list(emu.input_names)
+
+    # Simulate a crash after the first two chunks, by writing them only
+    store = training_data.NpzStore.create(
+        path, complete.inputs, 1, complete.metadata
+    )
+    store.append(S[:4])
+    store.append(S[4:8])
+    training_data.generate(emu, state, path, 12, chunk_size=4, batch_size=4)
+    x_resumed, S_resumed, _ = training_data.load(path)
+    assert onp.array_equal(x_resumed, x)
+    assert onp.allclose(S_resumed, S)
+
+    with pytest.raises(ValueError):
+        training_data.generate(emu, state, path, 12, seed=1, chunk_size=4)
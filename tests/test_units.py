@@ -0,0 +1,138 @@
+import jax.numpy as jnp
+import pytest
+
+import jaxrts
+from jaxrts import free_free
+from jaxrts import hypernetted_chain as hnc
+from jaxrts import units
+
+ureg = jaxrts.ureg
+
+test_state = jaxrts.PlasmaState(
+    ions=[jaxrts.Element("C")],
+    Z_free=jnp.array([2]),
+    mass_density=jnp.array([3.5]) * ureg.gram / ureg.centimeter**3,
+    T_e=jnp.array([80]) * ureg.electron_volt / ureg.k_B,
+)
+test_state["ionic scattering"] = jaxrts.models.Gregori2003IonFeat()
+test_state["free-free scattering"] = jaxrts.models.RPA_DandreaFit()
+test_state["bound-free scattering"] = jaxrts.models.SchumacherImpulse()
+test_state["free-bound scattering"] = jaxrts.models.DetailedBalance()
+test_state["ipd"] = jaxrts.models.PauliBlockingIPD()
+
+test_setup = jaxrts.Setup(
+    ureg("60°"),
+    ureg("4768.6eV"),
+    jnp.linspace(4750, 4800, 50) * ureg.electron_volt,
+    lambda x: jaxrts.instrument_function.instrument_gaussian(
+        x, 1 / ureg.second
+    ),
+)
+
+
+@units.unit_kernel(ureg.a0, 1 / ureg.a0)
+def _kr(r, k):
+    return r * k
+
+
+@units.unit_kernel(ureg.a0, 1 / ureg.a0)
+def _r_plus_k(r, k):
+    return r + k
+
+
+def test_unit_kernel_converts_quantities():
+    r = jnp.array([1.0, 2.0])
+    assert jnp.allclose(
+        _kr(r * ureg.a0, 3.0 / ureg.angstrom), r * 3 * 0.529177
+    )
+    # Plain arrays are given in the units of the kernel
+    assert jnp.allclose(_kr(r, 3.0), r * 3)
+    with pytest.raises(units.DimensionalityError):
+        _kr(r * ureg.electron_volt, 3.0)
+
+
+def test_unit_kernel_is_checked_only_in_debug_mode():
+    # Without the checks, the kernel just adds the magnitudes
+    assert _r_plus_k(1.0, 2.0) == 3.0
+    assert not units.checking_units()
+    with units.check_units():
+        assert units.checking_units()
+        assert jnp.allclose(_kr(2.0, 3.0), 6.0)
+        with pytest.raises(units.DimensionalityError):
+            _r_plus_k(1.0, 2.0)
+    assert not units.checking_units()
+
+
+def test_check_units_checks_model_results():
+    class WrongIPD(jaxrts.models.Model):
+        allowed_keys = ["ipd"]
+
+        def evaluate(self, plasma_state, setup):
+            return plasma_state.T_e
+
+    state = jaxrts.PlasmaState(
+        ions=[jaxrts.Element("H")],
+        Z_free=jnp.array([1.0]),
+        mass_density=jnp.array([1.0]) * ureg.gram / ureg.centimeter**3,
+        T_e=jnp.array([10.0]) * ureg.electron_volt / ureg.k_B,
+    )
+    state["ipd"] = WrongIPD()
+    # Without the checks, the model is returned unchanged
+    assert state["ipd"] is state.models["ipd"]
+    state.evaluate("ipd", test_setup)
+    with units.check_units():
+        with pytest.raises(units.DimensionalityError):
+            state.evaluate("ipd", test_setup)
+
+
+def test_probe_with_unit_checks_matches_unchecked_probe():
+    fast = test_state.probe(test_setup)
+    with units.check_units():
+        checked = test_state.probe(test_setup)
+        for key in test_state.models.keys():
+            test_state.evaluate(key, test_setup)
+    assert jnp.allclose(
+        fast.m_as(ureg.second), checked.m_as(ureg.second), rtol=1e-10
+    )
+
+
+def test_kernels_with_unit_checks_match_unchecked_kernels():
+    state = jaxrts.PlasmaState(
+        ions=[jaxrts.Element("H"), jaxrts.Element("C")],
+        Z_free=[1, 4],
+        mass_density=[
+            2.5e23 / ureg.centimeter**3 * jaxrts.Element("H").atomic_mass,
+            2.5e23 / ureg.centimeter**3 * jaxrts.Element("C").atomic_mass,
+        ],
+        T_e=2e4 * ureg.kelvin,
+    )
+    r = jnp.linspace(0.0001, 1000, 2**8) * (1 * ureg.a0)
+    k = jnp.pi / r[-1] + jnp.arange(len(r)) * jnp.pi / (len(r) * r[1])
+    potential = jaxrts.hnc_potentials.DebyeHueckelPotential()
+    hnc_args = (
+        potential.short_r(state, r),
+        potential.long_k(state, k),
+        r,
+        potential.T(state),
+        state.n_i,
+    )
+    T = 10 * ureg.electron_volt / ureg.k_B
+    n_e = 1e23 / (1 * ureg.centimeter**3)
+    mu = jaxrts.plasma_physics.chem_pot_interpolationIchimaru(T, n_e)
+    E = jnp.linspace(-50, 50, 8) * ureg.electron_volt
+    rpa_args = (1.2 / ureg.angstrom, E - 2j * ureg.electron_volt, mu, T)
+
+    def evaluate():
+        g, _, niter, _ = hnc.pair_distribution_function_HNC_full(*hnc_args)
+        eps = free_free.dielectric_function_RPA(*rpa_args)
+        eps_fixed = free_free.dielectric_function_RPA(
+            *rpa_args, quadrature="fixed"
+        )
+        return g.m_as(ureg.dimensionless), niter, eps, eps_fixed
+
+    fast = evaluate()
+    with units.check_units():
+        checked = evaluate()
+    assert fast[1] == checked[1]
+    for f, c in zip(fast, checked):
+        assert jnp.allclose(f, c, rtol=1e-10)
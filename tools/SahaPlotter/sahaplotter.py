@@ -29,7 +29,7 @@ import numpy as np
 
 from jaxrts.units import ureg
 from jaxrts.saha import calculate_mean_free_charge_saha
-from jaxrts.plasmastate import PlasmaState
+from jaxrts.plasmastate import PlasmaState, PlasmaStateBatch
 import jaxrts.elements
 
 import jax.numpy as jnp
@@ -215,12 +215,13 @@ class MainWindow(QMainWindow):
                 "Pauli-Blocking",
             ]
         )
-        self.option_dropdown.currentIndexChanged.connect(self.update_selected_ipd)
+        self.option_dropdown.currentIndexChanged.connect(
+            self.update_selected_ipd
+        )
         input_column.addWidget(self.option_dropdown)
 
         self.selected_ipd = "None"  # Default selection
 
-
     def update_selected_ipd(self, index):
         self.selected_ipd = self.option_dropdown.itemText(index)
 
@@ -391,11 +392,9 @@ class MainWindow(QMainWindow):
             plasma_state["ipd"] = ipd_options[self.selected_ipd]
 
             T_e_plot = jnpu.linspace(T1, T2, 500)
-            Zfree = []
-
-            for T_e in T_e_plot:
-                plasma_state.T_e = T_e
-                Zfree.append(calculate_mean_free_charge_saha(plasma_state))
+            Zfree = calculate_mean_free_charge_saha(
+                PlasmaStateBatch(plasma_state, T_e=T_e_plot)
+            )
 
             labels = list(
                 zip(
@@ -477,11 +476,12 @@ class MainWindow(QMainWindow):
             plasma_state["ipd"] = ipd_options[self.selected_ipd]
 
             rho_plot = jnpu.linspace(rho1, rho2, 500)
-            Zfree = []
-
-            for rho in rho_plot:
-                plasma_state.mass_density = rho * mass_fraction
-                Zfree.append(calculate_mean_free_charge_saha(plasma_state))
+            Zfree = calculate_mean_free_charge_saha(
+                PlasmaStateBatch(
+                    plasma_state,
+                    mass_density=rho_plot[:, jnp.newaxis] * mass_fraction,
+                )
+            )
 
             labels = list(
                 zip(